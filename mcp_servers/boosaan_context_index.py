@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 맥락 검색 색인
+- 맥락 노드 내용에 대한 BM25 역색인 (삽입/갱신 시 증분 유지)
+- ContextLevel 별 포스팅 목록 → 레벨 필터 검색은 해당 레벨 포스팅만 조회
+- 노드 특성(문서 길이, 갱신 시각, 마지막 사용 시각, 조회 수, 레벨)은 행 번호로 접근하는 열 배열에 보관
+- 점수 계산: NumPy 가 있으면 단어별 포스팅 배열로 한 번에 벡터 연산 + argpartition 상위 k
+             없으면 순수 Python 누적 + 힙 (결과 동일)
+- 노드 원문은 sqlite 에 영속, 시작 시 메모리 색인 재구성
+- 벤치마크: python boosaan_context_index.py [노드 수 ...] (기본 1만/10만/100만)
+"""
+
+import heapq
+import math
+import random
+import re
+import sqlite3
+import sys
+import time
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_K1 = 1.5
+DEFAULT_B = 0.75
+
+# 순위 보정: 관련성 × (1 + 최신성 가중치 × 반감 감쇠 + 조회 가중치 × 정규화 조회 수)
+RECENCY_WEIGHT = 0.1
+RECENCY_HALF_LIFE = 7 * 24 * 3600
+ACCESS_WEIGHT = 0.05
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_HANGUL = re.compile(r"[가-힣]{2,}")
+
+
+def tokenize(text: str) -> List[str]:
+    """소문자 단어 + 한글 2-gram (조사/어미가 붙은 어절도 부분 일치)"""
+    tokens = _WORD.findall(text.lower())
+    for word in _HANGUL.findall(text):
+        if len(word) > 2:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class _Document:
+    __slots__ = ("row", "level", "content", "terms")
+
+    def __init__(self, row: int, level: str, content: str, terms: Counter):
+        self.row = row
+        self.level = level
+        self.content = content
+        self.terms = terms
+
+
+class ContextIndex:
+    """레벨별 포스팅 + 열 배열 특성을 가진 증분 BM25 색인"""
+
+    def __init__(self, db_path: str, k1: float = DEFAULT_K1, b: float = DEFAULT_B,
+                 vectorized: Optional[bool] = None):
+        self.k1 = k1
+        self.b = b
+        self.vectorized = (np is not None) if vectorized is None else (vectorized and np is not None)
+
+        self._documents: Dict[str, _Document] = {}
+        # (레벨, 내용) → 맥락 ID (ID 를 노출하지 않는 맥락 관리자 노드와 대조용)
+        self._contents: Dict[Tuple[str, str], str] = {}
+        # 레벨 → 단어 → {행 번호: 빈도}
+        self._postings: Dict[str, Dict[str, Dict[int, int]]] = {}
+        self._document_frequency: Counter = Counter()
+        self._total_length = 0
+
+        # 행 번호별 열 배열 (삭제된 행은 재사용)
+        self._ids: List[Optional[str]] = []
+        self._free_rows: List[int] = []
+        self._length = array("d")
+        self._updated = array("d")
+        self._touched = array("d")
+        self._access = array("d")
+        self._level = array("b")
+        self._level_codes: Dict[str, int] = {}
+        self._max_access = 0.0
+
+        # NumPy 경로: (레벨, 단어) → (행 배열, 빈도 배열), 포스팅 변경 시 무효화
+        self._term_arrays: Dict[Tuple[str, str], tuple] = {}
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(db_path)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS context_index (
+                context_id TEXT PRIMARY KEY,
+                level TEXT,
+                content TEXT,
+                updated REAL
+            )
+        """)
+        for context_id, level, content, updated in self._db.execute("SELECT * FROM context_index"):
+            self._add(context_id, level, content, updated)
+
+    # === 증분 갱신 ===
+    def upsert(self, context_id: str, level: str, content: str):
+        """노드 추가/갱신 (기존 포스팅 제거 후 다시 색인)"""
+        self._remove(context_id)
+        updated = time.time()
+        self._add(context_id, level, content, updated)
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO context_index VALUES (?, ?, ?, ?)",
+                (context_id, level, content, updated)
+            )
+
+    def remove(self, context_id: str):
+        if self._remove(context_id):
+            with self._db:
+                self._db.execute("DELETE FROM context_index WHERE context_id = ?", (context_id,))
+
+    def _add(self, context_id: str, level: str, content: str, updated: float):
+        terms = Counter(tokenize(content))
+        length = sum(terms.values())
+        level_code = self._level_codes.setdefault(level, len(self._level_codes))
+
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._ids[row] = context_id
+            self._length[row] = length
+            self._updated[row] = updated
+            self._touched[row] = updated
+            self._access[row] = 0.0
+            self._level[row] = level_code
+        else:
+            row = len(self._ids)
+            self._ids.append(context_id)
+            self._length.append(length)
+            self._updated.append(updated)
+            self._touched.append(updated)
+            self._access.append(0.0)
+            self._level.append(level_code)
+
+        self._documents[context_id] = _Document(row, level, content, terms)
+        self._contents[(level, content)] = context_id
+        self._total_length += length
+
+        postings = self._postings.setdefault(level, {})
+        for term, frequency in terms.items():
+            postings.setdefault(term, {})[row] = frequency
+            self._document_frequency[term] += 1
+            self._term_arrays.pop((level, term), None)
+
+    def _remove(self, context_id: str) -> bool:
+        document = self._documents.pop(context_id, None)
+        if document is None:
+            return False
+        row = document.row
+        if self._contents.get((document.level, document.content)) == context_id:
+            del self._contents[(document.level, document.content)]
+        self._total_length -= int(self._length[row])
+        self._ids[row] = None
+        self._length[row] = 0.0
+        self._level[row] = -1
+        self._free_rows.append(row)
+
+        postings = self._postings[document.level]
+        for term in document.terms:
+            term_postings = postings[term]
+            del term_postings[row]
+            if not term_postings:
+                del postings[term]
+            self._term_arrays.pop((document.level, term), None)
+            self._document_frequency[term] -= 1
+            if not self._document_frequency[term]:
+                del self._document_frequency[term]
+        return True
+
+    # === 검색 ===
+    def search(self, query_text: str, level: Optional[str] = None, k: int = 5,
+               threshold: float = 0.0) -> Tuple[int, List[Tuple[str, float]]]:
+        """(임계값 이상 결과 수, 상위 k개 [(맥락 ID, 정규화 점수)])
+
+        정규화 점수 = BM25 / 질의 단어 idf 합 (1 로 제한)
+          → 평균 길이 문서가 모든 질의 단어를 한 번씩 포함하면 1.0, 절반이면 약 0.5
+        순위는 정규화 점수에 최신성/조회 수 보정을 곱해서 결정
+        """
+        query_terms = list(dict.fromkeys(tokenize(query_text)))
+        if not query_terms or not self._documents or k <= 0:
+            return 0, []
+
+        total_documents = len(self._documents)
+        weighted_terms = []
+        max_score = 0.0
+        for term in query_terms:
+            frequency = self._document_frequency.get(term, 0)
+            idf = math.log(1 + (total_documents - frequency + 0.5) / (frequency + 0.5))
+            max_score += idf
+            if frequency:
+                weighted_terms.append((term, idf))
+
+        if not weighted_terms:
+            return 0, []
+        levels = [level] if level else list(self._postings)
+        average_length = self._total_length / total_documents or 1.0
+
+        if self.vectorized:
+            total, top = self._search_vectorized(weighted_terms, levels, average_length, max_score, k, threshold)
+        else:
+            total, top = self._search_python(weighted_terms, levels, average_length, max_score, k, threshold)
+
+        # 결과로 나간 노드만 조회 수 / 마지막 사용 시각 갱신
+        now = time.time()
+        for row, _ in top:
+            self._access[row] += 1
+            self._touched[row] = now
+            self._max_access = max(self._max_access, self._access[row])
+        return total, [(self._ids[row], relevance) for row, relevance in top]
+
+    def _search_python(self, weighted_terms, levels, average_length, max_score, k, threshold):
+        k1, b = self.k1, self.b
+        scores: Dict[int, float] = {}
+        for term, idf in weighted_terms:
+            for level_name in levels:
+                for row, tf in self._postings.get(level_name, {}).get(term, {}).items():
+                    norm = tf + k1 * (1 - b + b * self._length[row] / average_length)
+                    scores[row] = scores.get(row, 0.0) + idf * tf * (k1 + 1) / norm
+
+        now = time.time()
+        access_scale = math.log1p(self._max_access) or 1.0
+        matches = []
+        for row, score in scores.items():
+            relevance = min(1.0, score / max_score)
+            if relevance < threshold:
+                continue
+            boost = (1 + RECENCY_WEIGHT * 0.5 ** ((now - self._updated[row]) / RECENCY_HALF_LIFE)
+                     + ACCESS_WEIGHT * math.log1p(self._access[row]) / access_scale)
+            matches.append((relevance * boost, relevance, row))
+
+        top = heapq.nlargest(k, matches)
+        return len(matches), [(row, relevance) for _, relevance, row in top]
+
+    def _search_vectorized(self, weighted_terms, levels, average_length, max_score, k, threshold):
+        k1, b = self.k1, self.b
+        length = np.frombuffer(self._length, dtype=np.float64)
+        scores = np.zeros(len(length))
+
+        for term, idf in weighted_terms:
+            for level_name in levels:
+                arrays = self._posting_arrays(level_name, term)
+                if arrays is None:
+                    continue
+                rows, tfs = arrays
+                norm = tfs + k1 * (1 - b + b * length[rows] / average_length)
+                # 한 단어의 포스팅 안에서는 행이 중복되지 않으므로 팬시 인덱싱 누적으로 충분
+                scores[rows] += idf * tfs * (k1 + 1) / norm
+
+        relevance = np.minimum(scores / max_score, 1.0)
+        candidates = np.flatnonzero((scores > 0) & (relevance >= threshold))
+        if not len(candidates):
+            return 0, []
+
+        updated = np.frombuffer(self._updated, dtype=np.float64)[candidates]
+        access = np.frombuffer(self._access, dtype=np.float64)[candidates]
+        boost = (1 + RECENCY_WEIGHT * 0.5 ** ((time.time() - updated) / RECENCY_HALF_LIFE)
+                 + ACCESS_WEIGHT * np.log1p(access) / (math.log1p(self._max_access) or 1.0))
+        rank = relevance[candidates] * boost
+
+        if len(candidates) > k:
+            selected = np.argpartition(-rank, k - 1)[:k]
+        else:
+            selected = np.arange(len(candidates))
+        selected = selected[np.argsort(-rank[selected], kind="stable")]
+        return len(candidates), [(int(candidates[i]), float(relevance[candidates[i]])) for i in selected]
+
+    def _posting_arrays(self, level: str, term: str):
+        key = (level, term)
+        arrays = self._term_arrays.get(key)
+        if arrays is None:
+            postings = self._postings.get(level, {}).get(term)
+            if not postings:
+                return None
+            arrays = (np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                      np.fromiter(postings.values(), dtype=np.float64, count=len(postings)))
+            self._term_arrays[key] = arrays
+        return arrays
+
+    def get(self, context_id: str) -> Optional[Dict[str, object]]:
+        document = self._documents.get(context_id)
+        if document is None:
+            return None
+        return {
+            "level": document.level,
+            "content": document.content,
+            "updated": self._updated[document.row],
+            "access_count": int(self._access[document.row])
+        }
+
+    def retention(self, context_id: str) -> Optional[Tuple[str, float, float]]:
+        """망각 점수 계산용 (레벨, 마지막 사용 시각, 조회 수)"""
+        document = self._documents.get(context_id)
+        if document is None:
+            return None
+        return document.level, self._touched[document.row], self._access[document.row]
+
+    def ids(self) -> List[str]:
+        return list(self._documents)
+
+    def find_content(self, level: str, content: str) -> Optional[str]:
+        """같은 레벨/내용의 노드 ID"""
+        return self._contents.get((level, content))
+
+    def levels(self) -> List[str]:
+        """노드가 하나 이상 있는 레벨"""
+        return [level for level, postings in self._postings.items() if postings]
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def metrics(self) -> Dict[str, object]:
+        return {
+            "documents": len(self._documents),
+            "terms": len(self._document_frequency),
+            "postings": sum(len(p) for postings in self._postings.values() for p in postings.values()),
+            "scoring": "numpy" if self.vectorized else "python"
+        }
+
+    def close(self):
+        self._db.close()
+
+
+# === 벤치마크 ===
+def _synthetic_index(node_count: int, vectorized: bool, vocabulary: Sequence[str], seed: int = 7) -> ContextIndex:
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    levels = ["전역", "프로젝트", "세션", "즉시"]
+    index = ContextIndex(":memory:", vectorized=vectorized)
+    now = time.time()
+    for node in range(node_count):
+        content = " ".join(rng.choices(vocabulary, weights, k=30))
+        # 영속화 없이 메모리 색인만 구성
+        index._add(f"ctx_{node}", levels[node % len(levels)], content, now - rng.random() * 30 * 86400)
+    return index
+
+
+def benchmark_scoring(sizes: Sequence[int] = (10_000, 100_000, 1_000_000),
+                      queries: int = 20) -> Dict[int, Dict[str, float]]:
+    """노드 수별 평균 질의 시간(ms): NumPy 벡터 연산 vs 순수 Python"""
+    vocabulary = [f"term{i}" for i in range(5_000)]
+    rng = random.Random(11)
+    query_texts = [" ".join(rng.sample(vocabulary[:500], 3)) for _ in range(queries)]
+
+    results: Dict[int, Dict[str, float]] = {}
+    for size in sizes:
+        index = _synthetic_index(size, vectorized=np is not None, vocabulary=vocabulary)
+        timings: Dict[str, float] = {}
+        for mode in (["numpy"] if np is not None else []) + ["python"]:
+            index.vectorized = mode == "numpy"
+            index.search(query_texts[0], k=10)  # 포스팅 배열 준비
+            start = time.perf_counter()
+            for text in query_texts:
+                index.search(text, k=10)
+            timings[mode] = (time.perf_counter() - start) / queries * 1000
+        results[size] = timings
+        index.close()
+    return results
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"🔍 맥락 점수 계산 벤치마크 (NumPy: {'사용' if np is not None else '없음 - 순수 Python 만 측정'})")
+    for size, timings in benchmark_scoring(sizes).items():
+        line = " | ".join(f"{mode} {ms:.2f}ms" for mode, ms in timings.items())
+        print(f"  • {size:>9,}개 노드: {line}")
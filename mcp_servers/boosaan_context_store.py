@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 용량 제한 맥락 메모리
+- 항목별 pickle 크기로 메모리 사용량 계산, 바이트 예산 초과 시 축출 (LRU / LFU)
+- 축출된 항목은 세션 DB(context_spill)로 내보내고, 접근 시 지연 로드
+  (이벤트 루프에서는 await get_async() 사용 — 동기 접근은 세션 DB 스레드 응답까지 루프를 막음)
+- 상주 크기 / 적중률 / 축출 횟수 메트릭 제공
+"""
+
+import asyncio
+import logging
+import pickle
+from collections import OrderedDict, Counter
+from collections.abc import MutableMapping
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional
+
+from boosaan_session_store import SessionStore
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+EVICTION_POLICIES = ("lru", "lfu")
+
+_MISSING = object()
+
+
+class BoundedContextStore(MutableMapping):
+    """바이트 예산이 있는 맥락 메모리 (dict 호환)"""
+
+    def __init__(self, session_store: SessionStore, terminal_id: str,
+                 max_bytes: int = DEFAULT_MAX_BYTES, policy: str = "lru",
+                 logger: Optional[logging.Logger] = None):
+        self.session_store = session_store
+        self.terminal_id = terminal_id
+        self.max_bytes = max(0, int(max_bytes))
+        self.policy = policy if policy in EVICTION_POLICIES else "lru"
+        self.logger = logger or logging.getLogger(__name__)
+
+        # 상주 항목: key → (value, size), 순서 = 최근 사용 순
+        self._resident: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._frequency: Counter = Counter()
+        self._resident_bytes = 0
+
+        # DB로 내보낸 항목: key → size
+        self._spilled: Dict[Any, int] = {}
+        # 아직 DB에 기록되지 않은 축출 항목 (백그라운드 쓰기보다 읽기가 먼저 처리될 수 있음)
+        self._pending_spill: Dict[Any, bytes] = {}
+
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "reloads": 0}
+
+        self.session_store.call(self._create_schema, write=True)
+        self._load_spill_index()
+
+    # === DB 연동 ===
+    @staticmethod
+    def _create_schema(conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS context_spill (
+                terminal_id TEXT,
+                key_data BLOB,
+                value_data BLOB,
+                size INTEGER,
+                spilled_at TEXT,
+                PRIMARY KEY (terminal_id, key_data)
+            )
+        ''')
+
+    def _load_spill_index(self):
+        """이전에 내보낸 항목의 키 목록만 읽어둠 (값은 접근 시 로드)"""
+        try:
+            rows = self.session_store.call(lambda conn: conn.execute('''
+                SELECT key_data, size FROM context_spill WHERE terminal_id = ?
+            ''', (self.terminal_id,)).fetchall())
+            for key_data, size in rows:
+                self._spilled[pickle.loads(key_data)] = size
+        except Exception as e:
+            self.logger.warning(f"맥락 스필 인덱스 로드 실패: {e}")
+
+    def _spill(self, key: Any, value: Any, size: int):
+        """항목을 세션 DB로 내보냄 (백그라운드 쓰기)"""
+        key_data = pickle.dumps(key)
+        value_data = pickle.dumps(value)
+        self._spilled[key] = size
+        self._pending_spill[key] = value_data
+
+        row = (self.terminal_id, key_data, value_data, size, datetime.now(timezone.utc).isoformat())
+        future = self.session_store.write_background(lambda conn: conn.execute('''
+            INSERT OR REPLACE INTO context_spill
+            (terminal_id, key_data, value_data, size, spilled_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', row), "맥락 항목 스필")
+
+        def _written(done):
+            # 같은 키가 그 사이 다시 스필되었으면 최신 데이터는 유지
+            if self._pending_spill.get(key) is value_data:
+                self._pending_spill.pop(key, None)
+
+        future.add_done_callback(_written)
+
+    def _unspill(self, key: Any):
+        """DB에서 항목 제거 (백그라운드 쓰기)"""
+        self._spilled.pop(key, None)
+        self._pending_spill.pop(key, None)
+        key_data = pickle.dumps(key)
+        self.session_store.write_background(lambda conn: conn.execute('''
+            DELETE FROM context_spill WHERE terminal_id = ? AND key_data = ?
+        ''', (self.terminal_id, key_data)), "맥락 스필 항목 삭제")
+
+    def _select_spilled(self, key: Any):
+        key_data = pickle.dumps(key)
+        return lambda conn: conn.execute('''
+            SELECT value_data FROM context_spill WHERE terminal_id = ? AND key_data = ?
+        ''', (self.terminal_id, key_data)).fetchone()
+
+    def _decode_reloaded(self, key: Any, row) -> Any:
+        if row is None:
+            self._spilled.pop(key, None)
+            return _MISSING
+        self.stats["reloads"] += 1
+        return pickle.loads(row[0])
+
+    def _reload(self, key: Any) -> Any:
+        """내보낸 항목을 다시 읽어옴 (동기 — 이벤트 루프 밖 전용)"""
+        value_data = self._pending_spill.get(key)
+        if value_data is not None:
+            return self._decode_reloaded(key, (value_data,))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self._decode_reloaded(key, self.session_store.call(self._select_spilled(key)))
+        raise RuntimeError(f"이벤트 루프에서 스필된 맥락 항목 동기 접근: {key!r} (await get_async() 사용)")
+
+    async def _reload_async(self, key: Any) -> Any:
+        value_data = self._pending_spill.get(key)
+        if value_data is not None:
+            return self._decode_reloaded(key, (value_data,))
+        return self._decode_reloaded(key, await self.session_store.read(self._select_spilled(key)))
+
+    # === 메모리 계산 / 축출 ===
+    @staticmethod
+    def _measure(value: Any) -> int:
+        try:
+            return len(pickle.dumps(value))
+        except Exception:
+            # pickle 불가 객체는 스필할 수 없으므로 크기만 대략 추정
+            return len(repr(value).encode())
+
+    def _admit(self, key: Any, value: Any, size: int):
+        """상주 영역에 추가 후 예산 초과분 축출"""
+        self._resident[key] = (value, size)
+        self._resident.move_to_end(key)
+        self._resident_bytes += size
+        self._evict_to_budget()
+
+    def _choose_victim(self) -> Any:
+        if self.policy == "lfu":
+            # 빈도가 같으면 오래 사용되지 않은 항목부터 (OrderedDict 순서)
+            return min(self._resident, key=lambda k: self._frequency[k])
+        return next(iter(self._resident))
+
+    def _evict_to_budget(self):
+        while self._resident_bytes > self.max_bytes and self._resident:
+            # 예산보다 큰 단일 항목은 추가 즉시 스필됨
+            victim = self._choose_victim()
+            value, size = self._resident.pop(victim)
+            self._resident_bytes -= size
+            self._frequency.pop(victim, None)
+            self.stats["evictions"] += 1
+            try:
+                self._spill(victim, value, size)
+            except Exception as e:
+                self._spilled.pop(victim, None)
+                self.logger.warning(f"맥락 항목 스필 실패, 폐기: {victim!r} ({e})")
+
+    # === MutableMapping ===
+    def _lookup_resident(self, key: Any) -> Any:
+        entry = self._resident.get(key)
+        if entry is not None:
+            self.stats["hits"] += 1
+            self._frequency[key] += 1
+            self._resident.move_to_end(key)
+            return entry[0]
+
+        self.stats["misses"] += 1
+        if key not in self._spilled:
+            raise KeyError(key)
+        return _MISSING
+
+    def _readmit(self, key: Any, value: Any) -> Any:
+        if value is _MISSING or key not in self._spilled:
+            # 로드 대기 중에 삭제됨
+            raise KeyError(key)
+        size = self._spilled.pop(key)
+        self._pending_spill.pop(key, None)
+        self._frequency[key] += 1
+        self._admit(key, value, size)
+        return value
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._lookup_resident(key)
+        if value is not _MISSING:
+            return value
+        return self._readmit(key, self._reload(key))
+
+    async def get_async(self, key: Any, default: Any = None) -> Any:
+        """이벤트 루프용 조회 (스필된 항목은 세션 DB 스레드 응답을 await)"""
+        try:
+            value = self._lookup_resident(key)
+            if value is not _MISSING:
+                return value
+            value = await self._reload_async(key)
+            if key in self._resident:
+                # 로드 대기 중에 다시 기록됨 → 최신 값 우선
+                return self._resident[key][0]
+            return self._readmit(key, value)
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: Any, value: Any):
+        if key in self._resident:
+            _, old_size = self._resident.pop(key)
+            self._resident_bytes -= old_size
+        elif key in self._spilled:
+            self._unspill(key)
+
+        self._frequency[key] += 1
+        self._admit(key, value, self._measure(value))
+
+    def __delitem__(self, key: Any):
+        if key in self._resident:
+            _, size = self._resident.pop(key)
+            self._resident_bytes -= size
+            self._frequency.pop(key, None)
+        elif key not in self._spilled:
+            raise KeyError(key)
+        # 다시 로드된 항목도 DB에 이전 사본이 남아 있을 수 있으므로 항상 삭제
+        self._unspill(key)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._resident or key in self._spilled
+
+    def __iter__(self) -> Iterator[Any]:
+        yield from list(self._resident)
+        yield from [key for key in list(self._spilled) if key not in self._resident]
+
+    def __len__(self) -> int:
+        return len(self._resident) + len(self._spilled)
+
+    def clear(self):
+        self._resident.clear()
+        self._frequency.clear()
+        self._resident_bytes = 0
+        self._spilled.clear()
+        self._pending_spill.clear()
+        self.session_store.write_background(lambda conn: conn.execute('''
+            DELETE FROM context_spill WHERE terminal_id = ?
+        ''', (self.terminal_id,)), "맥락 스필 초기화")
+
+    # === 스냅샷 / 메트릭 ===
+    def snapshot(self) -> Dict[Any, Any]:
+        """상주 항목만 복사 (스필 항목은 이미 DB에 있으므로 제외)"""
+        return {key: value for key, (value, _) in self._resident.items()}
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "policy": self.policy,
+            "max_bytes": self.max_bytes,
+            "resident_bytes": self._resident_bytes,
+            "resident_items": len(self._resident),
+            "spilled_items": len(self._spilled),
+            "hits": self.stats["hits"],
+            "misses": self.stats["misses"],
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            "evictions": self.stats["evictions"],
+            "reloads": self.stats["reloads"]
+        }
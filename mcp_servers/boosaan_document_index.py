@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 맥락 문서 검색 색인
+- 사용자 지시사항 / 기능명세서 / 기술 설계도의 텍스트 필드에 대한 BM25 역색인
+  (user_request, feature_name, description, component_name)
+- ContextIndex 를 그대로 사용: 레벨 = 문서 종류 → 종류별 포스팅만 조회해서 종류별 상위 k
+- add_user_instruction / add_feature_spec 시 증분 갱신, sqlite 영속 (재시작 시 재구성)
+- 색인에 아직 없는 종류(이전 기록, 설계도)는 호출 측에서 문서 관리자 검색으로 대체
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from boosaan_context_index import ContextIndex
+
+# 문서 종류 → 색인할 필드 (첫 필드는 한 줄 제목, 마지막 필드는 여러 줄 본문 가능)
+DOCUMENT_FIELDS = {
+    "user_instructions": ("user_request",),
+    "feature_specs": ("feature_name", "description"),
+    "technical_blueprints": ("component_name", "description"),
+}
+
+
+class DocumentIndex:
+    """문서 종류별 상위 k 검색 색인"""
+
+    def __init__(self, db_path: str):
+        self.index = ContextIndex(db_path)
+
+    @staticmethod
+    def _pack(fields: Sequence[str], values: Dict[str, str]) -> str:
+        # 필드를 줄 단위로 저장 → 마지막 필드 외에는 줄바꿈을 공백으로
+        parts = [str(values.get(field) or "") for field in fields]
+        return "\n".join([part.replace("\n", " ") for part in parts[:-1]] + parts[-1:])
+
+    @staticmethod
+    def _unpack(fields: Sequence[str], content: str) -> Dict[str, str]:
+        return dict(zip(fields, content.split("\n", len(fields) - 1)))
+
+    def add(self, document_type: str, document_id: str, **values: str):
+        fields = DOCUMENT_FIELDS[document_type]
+        self.index.upsert(document_id, document_type, self._pack(fields, values))
+
+    def remove(self, document_id: str):
+        self.index.remove(document_id)
+
+    def rename(self, document_id: str, new_id: str) -> bool:
+        """문서 ID 변경 (색인 내용은 그대로)"""
+        document = self.index.get(document_id)
+        if document is None:
+            return False
+        self.index.remove(document_id)
+        self.index.upsert(new_id, document["level"], document["content"])
+        return True
+
+    def indexed_types(self) -> List[str]:
+        return [level for level in self.index.levels() if level in DOCUMENT_FIELDS]
+
+    def search(self, query: str, document_types: Optional[Sequence[str]] = None,
+               k: int = 3) -> Dict[str, Tuple[int, List[Dict[str, object]]]]:
+        """종류 → (일치 문서 수, 상위 k [{필드..., score}]) — 색인된 종류만"""
+        results = {}
+        indexed = set(self.indexed_types())
+        for document_type in document_types or DOCUMENT_FIELDS:
+            if document_type not in indexed:
+                continue
+            total, top = self.index.search(query, level=document_type, k=k)
+            fields = DOCUMENT_FIELDS[document_type]
+            items = []
+            for document_id, score in top:
+                item = self._unpack(fields, self.index.get(document_id)["content"])
+                item.update(document_id=document_id, score=score)
+                items.append(item)
+            results[document_type] = (total, items)
+        return results
+
+    def metrics(self) -> Dict[str, object]:
+        return dict(self.index.metrics(), indexed_types=self.indexed_types())
+
+    def close(self):
+        self.index.close()
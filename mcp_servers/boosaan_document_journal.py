@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 맥락 문서 쓰기 저널 (문서 관리자 앞단)
+- 문서 종류별 추가 전용 JSONL 저널: 문서 1개 추가 = 한 줄 append + fsync (요청 경로에 전체 JSON 재작성 없음)
+- 문서 관리자가 계속 유일한 기록자: flush 가 대기 문서를 문서 관리자에 적용
+  → 관리자 파일(.claude/context/*.json)과 태그/메타데이터 같은 파생 상태가 그대로 유지됨
+- flush: 잠금 안에서 저널을 회전(rename)하고, 잠금 밖에서 문서마다 적용 (그 사이 append 는 새 저널로)
+  적용한 문서는 적용 로그(<종류>.applied)에 (저널 ID, 관리자 ID) 한 줄씩 기록 → 중간에 실패/중단돼도
+  다음 flush 가 남은 문서만 이어서 적용 (같은 문서를 두 번 적용하지 않음)
+- 마지막 줄이 잘린 저널(쓰기 중 중단)은 로드 시 잘린 부분만 버림
+- 이전 형식(저널 베이스 파일이 문서 저장소였던 시기)의 문서는 migrate_legacy 로 관리자에 없는 것만 대기 문서로 옮김
+
+비활성화: BOOSAAN_DOCUMENT_JOURNAL=off (문서 관리자에 바로 기록, 남은 대기 문서는 시작 시 적용)
+fsync 생략: BOOSAAN_DOCUMENT_JOURNAL_FSYNC=off
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# 문서 종류 → (문서 ID 필드, 이전 형식 베이스 파일 이름)
+DOCUMENT_TYPES = {
+    "user_instructions": ("instruction_id", "user_instructions.json"),
+    "feature_specs": ("feature_id", "feature_specifications.json"),
+}
+
+# (문서 종류, 레코드) → 문서 관리자가 부여한 ID
+ApplyFunction = Callable[[str, Dict[str, Any]], Optional[str]]
+
+
+class DocumentJournal:
+    """문서 종류별 대기 저널 + 적용 로그"""
+
+    def __init__(self, directory: str, fsync: bool = True, logger: Optional[logging.Logger] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fsync = fsync
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        # flush 는 한 번에 하나만 (회전 파일 하나를 공유)
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {}
+        self._applied: Dict[str, Dict[str, Optional[str]]] = {}
+        self._fds: Dict[str, int] = {}
+        self.stats = {"appends": 0, "applied": 0, "flushes": 0, "failed_flushes": 0, "recovered_partial_lines": 0}
+
+        for document_type in DOCUMENT_TYPES:
+            self._load(document_type)
+
+    @classmethod
+    def from_env(cls, directory: str, logger: Optional[logging.Logger] = None) -> Optional["DocumentJournal"]:
+        if os.getenv("BOOSAAN_DOCUMENT_JOURNAL", "on").lower() in ("off", "0", "false"):
+            return None
+        fsync = os.getenv("BOOSAAN_DOCUMENT_JOURNAL_FSYNC", "on").lower() not in ("off", "0", "false")
+        return cls(directory, fsync=fsync, logger=logger)
+
+    @staticmethod
+    def has_leftovers(directory: str) -> bool:
+        """디렉터리에 적용되지 않았을 수 있는 저널/이전 형식 파일이 있는지"""
+        path = Path(directory)
+        return path.is_dir() and any(entry.stat().st_size for entry in path.iterdir() if entry.is_file())
+
+    # === 경로 ===
+    def _legacy_base_path(self, document_type: str) -> Path:
+        return self.directory / DOCUMENT_TYPES[document_type][1]
+
+    def _journal_path(self, document_type: str) -> Path:
+        return self.directory / f"{document_type}.jsonl"
+
+    def _rotated_path(self, document_type: str) -> Path:
+        return self.directory / f"{document_type}.jsonl.compacting"
+
+    def _applied_path(self, document_type: str) -> Path:
+        return self.directory / f"{document_type}.applied"
+
+    # === 로드 ===
+    def _load(self, document_type: str):
+        id_field = DOCUMENT_TYPES[document_type][0]
+        pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        for path in (self._rotated_path(document_type), self._journal_path(document_type)):
+            self._replay(path, lambda record: pending.__setitem__(record[id_field], record))
+
+        applied: Dict[str, Optional[str]] = {}
+        self._replay(self._applied_path(document_type),
+                     lambda entry: applied.__setitem__(entry["id"], entry.get("manager_id")))
+        for document_id in applied:
+            pending.pop(document_id, None)
+
+        self._pending[document_type] = pending
+        self._applied[document_type] = applied
+        self._fds[document_type] = self._open_append(self._journal_path(document_type))
+
+    @staticmethod
+    def _open_append(path: Path) -> int:
+        return os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _replay(self, path: Path, apply: Callable[[Dict[str, Any]], None]) -> int:
+        if not path.exists():
+            return 0
+        data = path.read_bytes()
+        entries = 0
+        valid_length = 0
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            apply(record)
+            entries += 1
+            valid_length += len(line)
+        if valid_length < len(data):
+            # 쓰기 도중 중단된 마지막 줄 제거 → 이후 append 가 깨진 줄에 이어 붙지 않도록
+            self.stats["recovered_partial_lines"] += 1
+            self.logger.warning(f"문서 저널 손상 꼬리 제거: {path.name} ({len(data) - valid_length}바이트)")
+            with open(path, "r+b") as f:
+                f.truncate(valid_length)
+        return entries
+
+    def _write_line(self, fd: int, entry: Dict[str, Any]):
+        os.write(fd, (json.dumps(entry, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+        if self.fsync:
+            os.fsync(fd)
+
+    # === 이전 형식 ===
+    def migrate_legacy(self, manager_ids: Dict[str, Set[str]]) -> int:
+        """이전 형식 베이스 파일의 문서 중 문서 관리자에 없는 것만 대기 저널로 옮김 → 옮긴 문서 수
+
+        베이스 파일은 대기 저널을 fsync 한 뒤에 지우므로 중간에 중단되면 다음 시작 때 다시 옮김 (ID 기준 upsert).
+        """
+        moved = 0
+        for document_type, (id_field, _) in DOCUMENT_TYPES.items():
+            base_path = self._legacy_base_path(document_type)
+            if not base_path.exists():
+                continue
+            known = manager_ids.get(document_type, set())
+            with self._lock:
+                pending = self._pending[document_type]
+                for record in json.loads(base_path.read_text(encoding="utf-8") or "[]"):
+                    document_id = record.get(id_field)
+                    if not document_id or document_id in known or document_id in pending \
+                            or document_id in self._applied[document_type]:
+                        continue
+                    self._write_line(self._fds[document_type], record)
+                    pending[document_id] = record
+                    moved += 1
+                # 이전 형식 저널 줄 중 관리자에서 가져온 문서(관리자 ID 그대로)는 다시 적용하지 않음
+                for document_id in [document_id for document_id in pending if document_id in known]:
+                    del pending[document_id]
+                    self._write_line(self._applied_fd(document_type), {"id": document_id, "manager_id": document_id})
+                    self._applied[document_type][document_id] = document_id
+            base_path.unlink()
+        return moved
+
+    def _applied_fd(self, document_type: str) -> int:
+        key = f"{document_type}.applied"
+        if key not in self._fds:
+            self._fds[key] = self._open_append(self._applied_path(document_type))
+        return self._fds[key]
+
+    # === 추가 / 조회 ===
+    def append(self, document_type: str, record: Dict[str, Any]):
+        """문서 1개 추가 (한 줄 append, fsync 후 반환)"""
+        id_field = DOCUMENT_TYPES[document_type][0]
+        with self._lock:
+            self._write_line(self._fds[document_type], record)
+            self._pending[document_type][record[id_field]] = record
+            self.stats["appends"] += 1
+
+    def pending(self, document_type: str) -> List[Dict[str, Any]]:
+        """문서 관리자에 아직 적용되지 않은 문서"""
+        with self._lock:
+            return list(self._pending[document_type].values())
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return any(self._pending.values())
+
+    def applied(self) -> List[Tuple[str, Optional[str]]]:
+        """적용 로그에 남은 (저널 ID, 관리자 ID) — 이전 flush 가 중간에 끝난 경우"""
+        with self._lock:
+            return [pair for applied in self._applied.values() for pair in applied.items()]
+
+    def storage_path(self, document_type: str) -> str:
+        return str(self._journal_path(document_type))
+
+    # === 적용 ===
+    def flush(self, apply: ApplyFunction, guard: Optional[threading.Lock] = None,
+              document_types: Optional[Iterable[str]] = None) -> Dict[str, List[Tuple[str, Optional[str]]]]:
+        """대기 문서를 문서 관리자에 적용 → 종류별 [(저널 ID, 관리자 ID)]
+
+        guard: 문서 하나의 적용 + 대기 목록 제거를 함께 감싸는 잠금 → 같은 잠금 안에서 관리자 상태와
+        pending() 을 읽으면 문서가 빠지거나 두 번 보이지 않음.
+        적용이 실패하면 그 종류는 거기서 멈추고 예외를 다시 던짐 (회전 파일/적용 로그가 남아 다음 flush 가 이어감).
+        """
+        results: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+        with self._flush_lock:
+            for document_type in document_types or DOCUMENT_TYPES:
+                results[document_type] = self._flush_type(document_type, apply, guard)
+            self.stats["flushes"] += 1
+        return results
+
+    def _flush_type(self, document_type: str, apply: ApplyFunction,
+                    guard: Optional[threading.Lock]) -> List[Tuple[str, Optional[str]]]:
+        rotated = self._rotated_path(document_type)
+        with self._lock:
+            if not self._pending[document_type] and not rotated.exists():
+                return []
+            os.close(self._fds[document_type])
+            if rotated.exists():
+                # 이전 flush 가 중단됨 → 현재 저널을 회전 파일 뒤에 이어 붙임
+                with open(rotated, "ab") as target, open(self._journal_path(document_type), "rb") as source:
+                    target.write(source.read())
+                os.remove(self._journal_path(document_type))
+            else:
+                os.replace(self._journal_path(document_type), rotated)
+            self._fds[document_type] = self._open_append(self._journal_path(document_type))
+            snapshot = list(self._pending[document_type].items())
+
+        # 잠금 밖에서 적용 (그 사이 append 는 새 저널로)
+        applied: List[Tuple[str, Optional[str]]] = []
+        for document_id, record in snapshot:
+            with guard or nullcontext():
+                try:
+                    manager_id = apply(document_type, record)
+                except Exception:
+                    self.stats["failed_flushes"] += 1
+                    raise
+                with self._lock:
+                    self._write_line(self._applied_fd(document_type), {"id": document_id, "manager_id": manager_id})
+                    self._applied[document_type][document_id] = manager_id
+                    self._pending[document_type].pop(document_id, None)
+                    self.stats["applied"] += 1
+            applied.append((document_id, manager_id))
+
+        # 회전 파일의 문서가 모두 적용됨 → 회전 파일 삭제 후 적용 로그 비우기
+        # (새 저널의 문서는 적용 로그와 무관하고, 삭제 전에 중단돼도 적용 로그가 재적용을 막음)
+        with self._lock:
+            os.remove(rotated)
+            fd = self._fds.pop(f"{document_type}.applied", None)
+            if fd is not None:
+                os.close(fd)
+            self._applied_path(document_type).unlink(missing_ok=True)
+            self._applied[document_type] = {}
+        return applied
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = {document_type: len(records) for document_type, records in self._pending.items()}
+        return dict(self.stats, pending=pending, fsync=self.fsync)
+
+    def close(self):
+        with self._lock:
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 샌드박스 실행 결과 캐시
+- 결정적인 명령(테스트, 린트 등)의 결과를 내용 해시로 캐시 (opt-in)
+- 캐시 키: 명령 + 환경 변수 + 권한 레벨 + 표준 입력 + 선언된 입력 파일들의 내용 해시
+  (입력 파일을 선언하지 않은 명령은 작업 트리에 따라 결과가 달라질 수 있으므로 캐시하지 않음)
+- 파일 해시 색인: (mtime_ns, ctime_ns, size, inode) 가 같으면 재해시하지 않음 (sqlite 에 영속)
+- 디스크 사용량 상한을 넘으면 가장 오래 쓰지 않은 항목부터 제거 (LRU)
+
+활성화: BOOSAAN_EXEC_CACHE_MAX_BYTES=<바이트> (기본 256MiB, 0이면 비활성)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+MAX_INPUT_FILES = 200_000
+_HASH_CHUNK = 1024 * 1024
+
+# 방금 수정된 파일은 같은 mtime 안에서 다시 바뀔 수 있으므로 stat 만으로 신뢰하지 않음
+_RACY_WINDOW_NS = 2_000_000_000
+
+StatKey = Tuple[int, int, int, int]
+
+
+class FileHashIndex:
+    """stat 정보로 재사용하는 파일 내용 해시 색인"""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._db = connection
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER, ctime_ns INTEGER, size INTEGER, inode INTEGER,
+                digest TEXT
+            )
+        """)
+        self._entries: Dict[str, Tuple[StatKey, str]] = {
+            path: ((mtime_ns, ctime_ns, size, inode), digest)
+            for path, mtime_ns, ctime_ns, size, inode, digest in self._db.execute("SELECT * FROM file_hashes")
+        }
+        self._dirty: Dict[str, Tuple[StatKey, str]] = {}
+        self.stats = {"hashed": 0, "reused": 0}
+
+    def digest(self, path: str) -> str:
+        """파일 내용 해시 (stat 이 그대로면 저장된 값 사용)"""
+        st = os.stat(path, follow_symlinks=False)
+        stat_key = (st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino)
+
+        cached = self._entries.get(path)
+        if cached and cached[0] == stat_key and time.time_ns() - st.st_mtime_ns > _RACY_WINDOW_NS:
+            self.stats["reused"] += 1
+            return cached[1]
+
+        hasher = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as f:
+            while chunk := f.read(_HASH_CHUNK):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        self.stats["hashed"] += 1
+
+        self._entries[path] = self._dirty[path] = (stat_key, digest)
+        return digest
+
+    def flush(self):
+        if not self._dirty:
+            return
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?, ?, ?)",
+                [(path, *stat_key, digest) for path, (stat_key, digest) in self._dirty.items()]
+            )
+        self._dirty.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ExecutionCache:
+    """명령 실행 결과 캐시 (sqlite, LRU 디스크 상한)"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 logger: Optional[logging.Logger] = None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.logger = logger or logging.getLogger(__name__)
+
+        # 해시/조회는 asyncio.to_thread 에서 호출되므로 연결 하나를 잠금으로 보호
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.cache_dir / "exec_cache.db"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS exec_results (
+                cache_key TEXT PRIMARY KEY,
+                command TEXT,
+                result TEXT,
+                size INTEGER,
+                created REAL,
+                last_used REAL,
+                hits INTEGER DEFAULT 0
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_exec_results_last_used ON exec_results(last_used)")
+        self.file_index = FileHashIndex(self._db)
+
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM exec_results").fetchone()[0]
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    @classmethod
+    def from_env(cls, cache_dir: str, logger: Optional[logging.Logger] = None) -> Optional["ExecutionCache"]:
+        try:
+            max_bytes = int(os.getenv("BOOSAAN_EXEC_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES)))
+        except ValueError:
+            max_bytes = DEFAULT_MAX_BYTES
+        if max_bytes <= 0:
+            return None
+        return cls(cache_dir, max_bytes, logger)
+
+    # === 캐시 키 ===
+    def make_key(self, command: str, env: Dict[str, str], permission_level: str, cwd: str,
+                 input_files: Iterable[str] = (), input_data: Optional[str] = None) -> str:
+        """캐시 키 계산 (입력 파일은 cwd 기준 상대 경로, 디렉터리는 하위 파일 전체)"""
+        input_files = list(input_files)
+        if not input_files:
+            raise ValueError("입력 파일을 선언하지 않은 명령은 캐시하지 않음 (input_files 필요)")
+        with self._lock:
+            inputs = [(relative, self.file_index.digest(path) if path else "symlink:" + target)
+                      for relative, path, target in self._expand_inputs(cwd, input_files)]
+            self.file_index.flush()
+
+        payload = json.dumps({
+            "command": command,
+            "env": sorted(env.items()),
+            "permission_level": permission_level,
+            "stdin": input_data,
+            "inputs": inputs
+        }, ensure_ascii=False)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def _expand_inputs(cwd: str, input_files: Iterable[str]) -> List[Tuple[str, Optional[str], str]]:
+        """선언된 입력을 (상대 경로, 실제 파일 경로 | None, 심볼릭 링크 대상) 목록으로 정렬"""
+        root = Path(cwd).resolve()
+        expanded: Dict[str, Tuple[Optional[str], str]] = {}
+
+        def _add(path: Path):
+            relative = str(path.relative_to(root))
+            if path.is_symlink():
+                expanded[relative] = (None, os.readlink(path))
+            elif path.is_file():
+                expanded[relative] = (str(path), "")
+            if len(expanded) > MAX_INPUT_FILES:
+                raise ValueError(f"입력 파일이 너무 많음 (최대 {MAX_INPUT_FILES:,}개)")
+
+        for declared in input_files:
+            path = Path(os.path.normpath(root / declared))
+            # 샌드박스 작업 경로 밖의 파일은 키에 넣지 않음 (경로 탈출 방지)
+            if not path.is_relative_to(root) or not (path.is_symlink() or path.resolve().is_relative_to(root)):
+                raise ValueError(f"입력 파일이 샌드박스 경로 밖에 있음: {declared}")
+            if not path.exists() and not path.is_symlink():
+                raise FileNotFoundError(f"입력 파일 없음: {declared}")
+
+            if path.is_dir() and not path.is_symlink():
+                for directory, dirnames, filenames in os.walk(path):
+                    dirnames.sort()
+                    for name in sorted(filenames + [d for d in dirnames if os.path.islink(os.path.join(directory, d))]):
+                        _add(Path(directory) / name)
+            else:
+                _add(path)
+
+        return [(relative, path, target) for relative, (path, target) in sorted(expanded.items())]
+
+    # === 조회 / 저장 ===
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result, created FROM exec_results WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            with self._db:
+                self._db.execute(
+                    "UPDATE exec_results SET last_used = ?, hits = hits + 1 WHERE cache_key = ?",
+                    (time.time(), cache_key)
+                )
+            self.stats["hits"] += 1
+
+        result = json.loads(row[0])
+        result["cached_at"] = row[1]
+        return result
+
+    def put(self, cache_key: str, command: str, result: Dict[str, Any]):
+        """실행 결과 저장 (실행별 로그 파일 참조는 저장하지 않음)"""
+        stored = {
+            "return_code": result.get("return_code"),
+            "execution_time": result.get("execution_time", 0),
+            "stdout": result.get("stdout", ""),
+            "stderr": result.get("stderr", ""),
+            "output": {
+                stream: {"total_bytes": info.get("total_bytes", 0), "truncated": info.get("truncated", False)}
+                for stream, info in (result.get("output") or {}).items()
+            }
+        }
+        encoded = json.dumps(stored, ensure_ascii=False)
+        size = len(encoded.encode())
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            previous = self._db.execute(
+                "SELECT size FROM exec_results WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO exec_results (cache_key, command, result, size, created, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (cache_key, command, encoded, size, now, now)
+                )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self.stats["stores"] += 1
+            self._evict()
+
+    def _evict(self):
+        """디스크 상한을 넘으면 오래 쓰지 않은 결과부터 제거"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        victims = []
+        for cache_key, size in self._db.execute("SELECT cache_key, size FROM exec_results ORDER BY last_used"):
+            if self._total_bytes <= self.max_bytes:
+                break
+            victims.append((cache_key,))
+            self._total_bytes -= size
+        with self._db:
+            self._db.executemany("DELETE FROM exec_results WHERE cache_key = ?", victims)
+        self.stats["evictions"] += len(victims)
+
+    # === 메트릭 / 종료 ===
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM exec_results").fetchone()[0]
+        return {
+            "entries": entries,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.stats["hits"],
+            "misses": self.stats["misses"],
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            "stores": self.stats["stores"],
+            "evictions": self.stats["evictions"],
+            "indexed_files": len(self.file_index),
+            "files_hashed": self.file_index.stats["hashed"],
+            "files_reused": self.file_index.stats["reused"]
+        }
+
+    def close(self):
+        with self._lock:
+            self.file_index.flush()
+            self._db.close()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 증분 망각 큐
+- 노드별 보존 점수 = 기본 강도 × 0.5 ^ (마지막 사용 후 경과 시간 / 레벨별 반감기)
+  기본 강도 = 1 + log(1 + 조회 수)  → 자주 쓰인 노드일수록 오래 보존
+- 점수가 망각 임계값 아래로 내려가는 예상 시각을 키로 하는 최소 힙 유지
+- 사이클은 예상 시각이 지난 노드만 꺼내서 재평가 → 비용은 전체 노드 수가 아니라 변경량에 비례
+  (그 사이 다시 사용된 노드는 새 예상 시각으로 재등록)
+- evict=False: 임계값 아래 노드를 삭제하지 않고 후보로만 반환 → 실제 망각은 호출 측(맥락 관리자)이 결정,
+  관리자가 보존한 후보는 defer() 로 반감기 뒤에 다시 평가
+"""
+
+import heapq
+import itertools
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_THRESHOLD = 0.2
+
+# 레벨별 반감기 (초): 전역=장기 메모리, 즉시=단기 메모리
+DEFAULT_HALF_LIVES = {
+    "전역": 90 * 86400,
+    "프로젝트": 30 * 86400,
+    "세션": 86400,
+    "즉시": 3600
+}
+FALLBACK_HALF_LIFE = 7 * 86400
+
+
+class ForgettingQueue:
+    """예상 만료 시각 기반 망각 우선순위 큐 (ContextIndex 노드 대상)"""
+
+    def __init__(self, index, threshold: float = DEFAULT_THRESHOLD,
+                 half_lives: Optional[Dict[str, float]] = None):
+        self.index = index
+        self.threshold = threshold
+        self.half_lives = dict(DEFAULT_HALF_LIVES if half_lives is None else half_lives)
+
+        self._heap: List[Tuple[float, int, str]] = []
+        self._scheduled: Dict[str, float] = {}   # 맥락 ID → 현재 유효한 예상 만료 시각
+        self._sequence = itertools.count()
+
+        self.totals = {"cycles": 0, "evaluated_nodes": 0, "forgotten_nodes": 0, "stale_entries": 0}
+
+        # 기존 노드는 한 번에 heapify
+        for context_id in index.ids():
+            expiry = self._predict_expiry(context_id)
+            if expiry is not None:
+                self._scheduled[context_id] = expiry
+                self._heap.append((expiry, next(self._sequence), context_id))
+        heapq.heapify(self._heap)
+
+    def retention_score(self, context_id: str, now: Optional[float] = None) -> Optional[float]:
+        features = self.index.retention(context_id)
+        if features is None:
+            return None
+        level, touched, access = features
+        half_life = self.half_lives.get(level, FALLBACK_HALF_LIFE)
+        elapsed = max(0.0, (now or time.time()) - touched)
+        return (1 + math.log1p(access)) * 0.5 ** (elapsed / half_life)
+
+    def _predict_expiry(self, context_id: str) -> Optional[float]:
+        """점수가 임계값에 닿는 시각: touched + 반감기 × log2(기본 강도 / 임계값)"""
+        features = self.index.retention(context_id)
+        if features is None:
+            return None
+        level, touched, access = features
+        half_life = self.half_lives.get(level, FALLBACK_HALF_LIFE)
+        strength = 1 + math.log1p(access)
+        return touched + half_life * math.log2(strength / self.threshold)
+
+    def schedule(self, context_id: str):
+        """노드 추가/갱신 시 예상 만료 시각 (재)등록 (이전 힙 항목은 꺼낼 때 무시)"""
+        expiry = self._predict_expiry(context_id)
+        if expiry is None:
+            self._scheduled.pop(context_id, None)
+            return
+        self._scheduled[context_id] = expiry
+        heapq.heappush(self._heap, (expiry, next(self._sequence), context_id))
+
+    def defer(self, context_id: str, now: Optional[float] = None):
+        """후보였지만 보존된 노드를 레벨 반감기 뒤에 다시 평가"""
+        features = self.index.retention(context_id)
+        if features is None:
+            return
+        expiry = (now or time.time()) + self.half_lives.get(features[0], FALLBACK_HALF_LIFE)
+        self._scheduled[context_id] = expiry
+        heapq.heappush(self._heap, (expiry, next(self._sequence), context_id))
+
+    def forget(self, context_id: str):
+        """색인과 큐에서 노드 제거"""
+        self.index.remove(context_id)
+        self._scheduled.pop(context_id, None)
+        self.totals["forgotten_nodes"] += 1
+
+    def run_cycle(self, now: Optional[float] = None, max_nodes: Optional[int] = None,
+                  evict: bool = True) -> Dict[str, object]:
+        """예상 만료 시각이 지난 노드만 재평가 (max_nodes 로 한 번에 처리할 양 제한)
+
+        evict=False 면 임계값 아래 노드는 stats["candidates"] 로 반환 (색인에서 삭제하지 않음).
+        """
+        now = now or time.time()
+        stats = {"evaluated_nodes": 0, "forgotten_nodes": 0, "preserved_nodes": 0, "updated_scores": 0}
+        candidates: List[str] = []
+
+        while self._heap and self._heap[0][0] <= now:
+            if max_nodes is not None and stats["evaluated_nodes"] >= max_nodes:
+                break
+            expiry, _, context_id = heapq.heappop(self._heap)
+            if self._scheduled.get(context_id) != expiry:
+                # 재등록/삭제로 무효가 된 항목
+                self.totals["stale_entries"] += 1
+                continue
+
+            stats["evaluated_nodes"] += 1
+            score = self.retention_score(context_id, now)
+            if score is None:
+                del self._scheduled[context_id]
+                continue
+
+            if score < self.threshold:
+                del self._scheduled[context_id]
+                if evict:
+                    self.index.remove(context_id)
+                    stats["forgotten_nodes"] += 1
+                else:
+                    candidates.append(context_id)
+            else:
+                # 마지막 예측 이후 다시 사용됨 → 새 예상 시각으로 재등록
+                self.schedule(context_id)
+                stats["preserved_nodes"] += 1
+                stats["updated_scores"] += 1
+
+        self.totals["cycles"] += 1
+        self.totals["evaluated_nodes"] += stats["evaluated_nodes"]
+        self.totals["forgotten_nodes"] += stats["forgotten_nodes"]
+
+        # 무효 항목이 유효 항목보다 많아지면 힙 재구성
+        if len(self._heap) > 2 * len(self._scheduled) + 64:
+            self._heap = [(expiry, next(self._sequence), context_id)
+                          for context_id, expiry in self._scheduled.items()]
+            heapq.heapify(self._heap)
+
+        stats["queued_nodes"] = len(self._scheduled)
+        stats["next_expiry"] = self._heap[0][0] if self._heap else None
+        if not evict:
+            stats["candidates"] = candidates
+        return stats
+
+    def metrics(self) -> Dict[str, object]:
+        return dict(self.totals, queued_nodes=len(self._scheduled), heap_size=len(self._heap),
+                    next_expiry=self._heap[0][0] if self._heap else None)
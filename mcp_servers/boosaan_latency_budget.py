@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 지연 시간 예산 (anytime 실행)
+- latency_budget_ms 가 주어진 사고 도구는 단계를 우선순위 순으로 실행
+- 단계가 끝날 때마다 지금까지의 최선 결과를 체크포인트로 보관
+- 예산이 끝나면 남은 단계를 건너뛰고 체크포인트 + 건너뛴 단계 목록을 반환
+- 단계별 소요 시간을 지수 이동 평균으로 기억해서, 남은 예산 안에 끝나지 않을 단계는 시작하지 않음
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+
+# 단계 비용 추정 이동 평균 가중치
+COST_SMOOTHING = 0.3
+
+
+class StageCostModel:
+    """단계 이름 → 예상 소요 시간(초) 이동 평균"""
+
+    def __init__(self, smoothing: float = COST_SMOOTHING):
+        self.smoothing = smoothing
+        self._estimates: Dict[str, float] = {}
+
+    def estimate(self, stage: str) -> Optional[float]:
+        return self._estimates.get(stage)
+
+    def observe(self, stage: str, seconds: float):
+        previous = self._estimates.get(stage)
+        self._estimates[stage] = seconds if previous is None else (
+            previous + self.smoothing * (seconds - previous)
+        )
+
+    def metrics(self) -> Dict[str, float]:
+        return dict(self._estimates)
+
+
+class LatencyBudget:
+    """요청 1회의 예산 / 체크포인트 / 건너뛴 단계 기록"""
+
+    def __init__(self, budget_ms: float, costs: Optional[StageCostModel] = None):
+        self.budget_ms = max(0.0, float(budget_ms))
+        self.costs = costs
+        self._start = time.perf_counter()
+        self._deadline = self._start + self.budget_ms / 1000
+
+        self.completed_stages: List[str] = []
+        self.skipped_stages: List[str] = []
+        self.checkpoint_data: Optional[Dict[str, Any]] = None
+
+    def remaining(self) -> float:
+        return max(0.0, self._deadline - time.perf_counter())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def fits(self, stage: str) -> bool:
+        """남은 예산 안에 끝날 것으로 보이는지 (처음 보는 단계는 시도)"""
+        if self.expired():
+            return False
+        estimate = self.costs.estimate(stage) if self.costs else None
+        return estimate is None or estimate <= self.remaining()
+
+    async def run_stage(self, stage: str, awaitable: Awaitable[Any]) -> Tuple[bool, Any]:
+        """남은 예산 안에서 단계 실행 → (완료 여부, 결과)
+
+        이벤트 루프를 양보하지 않는 동기 작업은 중간에 끊을 수 없으므로
+        끝난 뒤 결과를 쓰고, 이후 단계는 예산 초과로 건너뜀
+        """
+        start = time.perf_counter()
+        try:
+            value = await asyncio.wait_for(awaitable, timeout=self.remaining())
+        except asyncio.TimeoutError:
+            self.skipped_stages.append(stage)
+            if self.costs:
+                # 끝나지 못한 단계는 최소한 지금까지 걸린 만큼 든다고 기록
+                self.costs.observe(stage, time.perf_counter() - start)
+            return False, None
+        if self.costs:
+            self.costs.observe(stage, time.perf_counter() - start)
+        self.completed_stages.append(stage)
+        return True, value
+
+    def skip(self, stage: str):
+        self.skipped_stages.append(stage)
+
+    def checkpoint(self, data: Dict[str, Any]):
+        """지금까지의 최선 결과 보관 (예산 만료 시 반환 대상)"""
+        self.checkpoint_data = data
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "budget_ms": self.budget_ms,
+            "elapsed_ms": (time.perf_counter() - self._start) * 1000,
+            "completed_stages": list(self.completed_stages),
+            "skipped_stages": list(self.skipped_stages),
+            "exhausted": bool(self.skipped_stages)
+        }
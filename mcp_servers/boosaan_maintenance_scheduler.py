@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 백그라운드 유지보수 스케줄러
+- 스냅샷, 망각 사이클, 포트 정리, DB 보존 기간 정리/VACUUM 을 요청 처리 경로 밖에서 실행
+- 작업별 주기에 지터(±비율)를 줘서 여러 작업/인스턴스가 같은 순간에 몰리지 않게 함
+- 유휴 시간 우선: 처리 중인 요청이 없고 마지막 요청 후 idle_after 초가 지났을 때 실행
+  (max_defer 초 이상 밀리면 유휴가 아니어도 실행)
+- 작업별 CPU / I/O 예산: 작업은 budget.exhausted() 를 보고 스스로 멈춤,
+  예산을 넘긴 작업은 다음 주기를 늘림 (최대 MAX_BACKOFF 배)
+- 오래 걸리는 동기 작업은 run_in_background 로 전용 스레드 1개에서 실행
+  (리눅스에서는 스레드 nice 값을 BACKGROUND_NICE 만큼 올려 요청 처리보다 낮은 우선순위)
+
+비활성화: BOOSAAN_MAINTENANCE=off
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+IDLE_POLL_SECONDS = 1.0
+MAX_BACKOFF = 8
+FOLLOW_UP_SECONDS = 5.0
+BACKGROUND_NICE = 10
+
+
+def _process_io_bytes() -> Optional[int]:
+    """프로세스 누적 디스크 I/O 바이트 (/proc 미지원 시 None → I/O 예산 미적용)"""
+    try:
+        with open("/proc/self/io") as f:
+            counters = dict(line.split(":", 1) for line in f)
+        return int(counters["read_bytes"]) + int(counters["write_bytes"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _lower_thread_priority():
+    """백그라운드 스레드의 nice 값 올리기 (리눅스는 스레드 단위, 미지원 플랫폼은 무시)"""
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), BACKGROUND_NICE)
+    except (AttributeError, OSError):
+        pass
+
+
+class JobBudget:
+    """작업 1회 실행의 CPU 시간 / 디스크 I/O 예산"""
+
+    def __init__(self, cpu_seconds: float, io_bytes: Optional[int]):
+        self.cpu_seconds = cpu_seconds
+        self.io_bytes = io_bytes
+        self._cpu_start = time.process_time()
+        self._io_start = _process_io_bytes()
+
+    @property
+    def cpu_used(self) -> float:
+        # 프로세스 전체 CPU 시간 기준 (작업 스레드만 분리할 수 없으므로 보수적으로 계산)
+        return time.process_time() - self._cpu_start
+
+    @property
+    def io_used(self) -> int:
+        current = _process_io_bytes()
+        if current is None or self._io_start is None:
+            return 0
+        return current - self._io_start
+
+    def exhausted(self) -> bool:
+        if self.cpu_used >= self.cpu_seconds:
+            return True
+        return self.io_bytes is not None and self.io_used >= self.io_bytes
+
+
+JobFunction = Callable[[JobBudget], Awaitable[Any]]
+
+
+@dataclass
+class MaintenanceJob:
+    name: str
+    func: JobFunction
+    interval: float
+    jitter: float = 0.1
+    cpu_budget: float = 0.5
+    io_budget: Optional[int] = None
+    idle_after: float = 2.0
+    max_defer: float = 600.0
+
+    next_due: float = 0.0
+    due_since: Optional[float] = None
+    backoff: int = 1
+    runs: int = 0
+    deferrals: int = 0
+    overruns: int = 0
+    failures: int = 0
+    last_run: Optional[float] = None
+    last_duration: float = 0.0
+    last_cpu: float = 0.0
+    last_io: int = 0
+    last_result: Any = None
+    last_error: Optional[str] = None
+
+
+class MaintenanceScheduler:
+    """유휴 시간 우선 + 예산 기반 백그라운드 작업 실행기 (이벤트 루프 위의 단일 태스크)"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        self.logger = logger or logging.getLogger(__name__)
+        self._jobs: Dict[str, MaintenanceJob] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self._in_flight = 0
+        self._last_activity = time.monotonic()
+
+    @classmethod
+    def from_env(cls, logger: Optional[logging.Logger] = None) -> Optional["MaintenanceScheduler"]:
+        if os.getenv("BOOSAAN_MAINTENANCE", "on").lower() in ("off", "0", "false"):
+            return None
+        return cls(logger)
+
+    def add_job(self, name: str, func: JobFunction, interval: float, **options) -> MaintenanceJob:
+        job = MaintenanceJob(name=name, func=func, interval=interval, **options)
+        job.next_due = time.monotonic() + self._jittered(job, interval)
+        self._jobs[name] = job
+        return job
+
+    # === 요청 활동 추적 ===
+    def request_started(self):
+        self._in_flight += 1
+        self._last_activity = time.monotonic()
+
+    def request_finished(self):
+        self._in_flight = max(0, self._in_flight - 1)
+        self._last_activity = time.monotonic()
+
+    def _is_idle(self, job: MaintenanceJob, now: float) -> bool:
+        return self._in_flight == 0 and now - self._last_activity >= job.idle_after
+
+    # === 실행 루프 ===
+    def ensure_started(self):
+        """실행 중인 이벤트 루프에서 스케줄러 태스크 시작 (이미 시작됐으면 무시)"""
+        if self._closed or (self._task and not self._task.done()):
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="boosaan-maintenance")
+
+    async def _run(self):
+        while not self._closed:
+            if not self._jobs:
+                await asyncio.sleep(IDLE_POLL_SECONDS)
+                continue
+
+            now = time.monotonic()
+            job = min(self._jobs.values(), key=lambda j: j.next_due)
+            if job.next_due > now:
+                await asyncio.sleep(min(job.next_due - now, IDLE_POLL_SECONDS))
+                continue
+
+            if job.due_since is None:
+                job.due_since = now
+            if not self._is_idle(job, now) and now - job.due_since < job.max_defer:
+                # 요청 처리 중 → 유휴 시간까지 미룸
+                job.deferrals += 1
+                job.next_due = now + IDLE_POLL_SECONDS
+                continue
+
+            await self.run_job(job)
+
+    async def run_job(self, job: MaintenanceJob) -> Any:
+        budget = JobBudget(job.cpu_budget, job.io_budget)
+        start = time.monotonic()
+        more_pending = False
+        try:
+            job.last_result = await job.func(budget)
+            job.last_error = None
+            more_pending = bool(isinstance(job.last_result, dict) and job.last_result.get("more_pending"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            self.logger.warning(f"유지보수 작업 실패: {job.name} ({e})")
+
+        finished = time.monotonic()
+        job.runs += 1
+        job.last_run = time.time()
+        job.last_duration = finished - start
+        job.last_cpu = budget.cpu_used
+        job.last_io = budget.io_used
+        job.due_since = None
+
+        # 예산 초과 → 주기 늘림, 예산 안에서 끝나면 원래 주기로 복귀
+        if budget.exhausted():
+            job.overruns += 1
+            job.backoff = min(job.backoff * 2, MAX_BACKOFF)
+        else:
+            job.backoff = 1
+
+        if more_pending and not budget.exhausted():
+            job.next_due = finished + FOLLOW_UP_SECONDS
+        else:
+            job.next_due = finished + self._jittered(job, job.interval * job.backoff)
+        return job.last_result
+
+    async def run_in_background(self, func: Callable[..., Any], *args) -> Any:
+        """동기 함수를 낮은 우선순위의 유지보수 스레드에서 실행 (작업끼리는 순서대로 실행)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="boosaan-maintenance",
+                initializer=_lower_thread_priority
+            )
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    @staticmethod
+    def _jittered(job: MaintenanceJob, interval: float) -> float:
+        return interval * (1 + random.uniform(-job.jitter, job.jitter))
+
+    # === 메트릭 / 종료 ===
+    def metrics(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "running": bool(self._task and not self._task.done()),
+            "in_flight_requests": self._in_flight,
+            "jobs": {
+                name: {
+                    "interval": job.interval,
+                    "backoff": job.backoff,
+                    "runs": job.runs,
+                    "deferrals": job.deferrals,
+                    "overruns": job.overruns,
+                    "failures": job.failures,
+                    "last_run": job.last_run,
+                    "last_duration": job.last_duration,
+                    "last_cpu": job.last_cpu,
+                    "last_io": job.last_io,
+                    "last_error": job.last_error,
+                    "next_due_in": max(0.0, job.next_due - now)
+                }
+                for name, job in self._jobs.items()
+            }
+        }
+
+    def close(self):
+        self._closed = True
+        if self._task and not self._task.done():
+            self._task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
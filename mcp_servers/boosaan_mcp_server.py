@@ -12,15 +12,16 @@ import sys
 import os
 import asyncio
 import logging
-import time
 import threading
+import time
 import uuid
 import hashlib
 import pickle
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
 from pathlib import Path
+from types import SimpleNamespace
 from datetime import datetime, timezone, timedelta
-import sqlite3
+from urllib.parse import urlsplit, parse_qs
 
 # SECURITY: 안전한 경로 검증 추가
 sys.path.append(str(Path(__file__).parent.parent / 'boosaan'))
@@ -37,8 +38,47 @@ from boosaan_work_process_enforcer import WorkProcessEnforcer, WorkInstruction,
 from boosaan_context_document_manager import ContextDocumentManager, UserInstruction, UserIntentionPoint, FeatureSpec, TechnicalBlueprint
 from boosaan_port_manager import get_port_manager, get_project_port, register_project
 from boosaan_rule_isolation_system import BOOSAANRuleIsolationSystem, IntentionType, RuleType, RuleScope
+from boosaan_tool_result import ToolResult, RESPONSE_FORMATS, resolve_response_format
+from boosaan_session_store import SessionStore, PRIORITY_BACKGROUND_WRITE, VACUUM_STEP_PAGES
+from boosaan_context_store import BoundedContextStore, DEFAULT_MAX_BYTES
+from boosaan_context_index import ContextIndex
+from boosaan_document_index import DocumentIndex, DOCUMENT_FIELDS
+from boosaan_document_journal import DocumentJournal, DOCUMENT_TYPES
+from boosaan_rule_minhash import RuleSimilarityIndex, GLOBAL_SCOPE
+from boosaan_rule_index import RuleIndex
+from boosaan_forgetting_queue import ForgettingQueue
+from boosaan_maintenance_scheduler import MaintenanceScheduler, JobBudget
+from boosaan_result_cache import ResultCache
+from boosaan_parallel_reasoning import run_models as run_parallel_models
+from boosaan_latency_budget import LatencyBudget, StageCostModel
+from boosaan_port_index import PortIndex, parse_port_range, USAGE_TOUCH_INTERVAL
+from boosaan_port_table import PortTable
+from boosaan_port_prober import PortProber
+from boosaan_worker_pool import WorkerPool
+from boosaan_sandbox_pool import SandboxPool, POOL_ID_PREFIX
+from boosaan_sandbox_executor import SandboxExecutor, SandboxSpec, MAX_BATCH_JOBS
+from boosaan_resource_accounting import ResourceAccountant
+from boosaan_exec_cache import ExecutionCache
+from boosaan_workspace_provisioner import WorkspaceProvisioner, ISOLATED_STRATEGIES as WORKSPACE_STRATEGIES
+from boosaan_pagination import (query_scope, encode_cursor, decode_cursor,
+                                clamp_page_size, clamp_page_bytes, keyset_condition, collect_page)
 
 class BOOSAANUltimateMCPServer:
+    # 규칙 도구의 한글 이름 → Enum (add_rule_with_isolation / get_effective_rules 공용)
+    RULE_TYPE_LABELS = {
+        "패턴": RuleType.PATTERN,
+        "가이드라인": RuleType.GUIDELINE,
+        "선호도": RuleType.PREFERENCE,
+        "제약조건": RuleType.CONSTRAINT,
+        "워크플로우": RuleType.WORKFLOW
+    }
+    RULE_SCOPE_LABELS = {
+        "전역": RuleScope.GLOBAL,
+        "프로젝트": RuleScope.PROJECT,
+        "세션": RuleScope.SESSION,
+        "임시": RuleScope.TEMPORARY
+    }
+
     def __init__(self):
         self.name = "BOOSAAN ULTIMATE v7.1"
         self.version = "7.1.0"
@@ -50,10 +90,10 @@ class BOOSAANUltimateMCPServer:
         # 작업 추적 시스템
         self.conversation_counter = 0
         self.task_counter = 0
-        self.session_db_lock = threading.Lock()
         
-        # 맥락 연속성을 위한 메모리 시스템
-        self.context_memory = {}
+        # 맥락 연속성을 위한 메모리 시스템 (저장소는 세션 DB 초기화 시 생성)
+        self.context_memory_budget = int(os.getenv("BOOSAAN_CONTEXT_MEMORY_BYTES", DEFAULT_MAX_BYTES))
+        self.context_eviction_policy = os.getenv("BOOSAAN_CONTEXT_EVICTION", "lru").lower()
         self.last_context_save = time.time()
         
         # 전역 적용 모드 설정
@@ -83,11 +123,31 @@ class BOOSAANUltimateMCPServer:
         
         # 핵심 시스템 초기화
         self.meta_cognitive = MetaCognitiveEngine(str(self.workspace / 'meta_cognitive'))
+        self._budgeted_meta_cognitive = None
+        self._budgeted_thinking_lock = threading.Lock()
         self.context_manager = ContextHierarchyManager(str(self.workspace / 'context_hierarchy'))
+        # 망각 사이클/대조 스캔이 백그라운드 스레드에서 돌므로 맥락 관리자 호출은 잠금으로 직렬화
+        self._context_manager_lock = threading.Lock()
+        self.context_index = ContextIndex(str(self.workspace / 'context_hierarchy' / 'retrieval_index.db'))
+        self.forgetting_queue = ForgettingQueue(self.context_index)
+        self._last_manager_forgetting = 0.0
         self.sandbox_manager = SandboxManager(str(self.workspace / 'sandbox'))
+        self.sandbox_pool = SandboxPool.from_env(self.sandbox_manager)
+        if self.sandbox_pool:
+            # 풀의 백그라운드 생성/삭제와 같은 잠금으로 모든 관리자 호출 직렬화
+            self.sandbox_manager = self.sandbox_pool.guarded_manager
+        self.resource_accountant = ResourceAccountant.from_env()
+        self.workspace_provisioner = WorkspaceProvisioner(str(self.workspace / 'sandbox' / 'workspaces'))
+        self.exec_cache = ExecutionCache.from_env(str(self.workspace / 'sandbox' / 'exec_cache'))
+        self.sandbox_executor = SandboxExecutor.from_env(
+            self.sandbox_manager, output_dir=str(self.workspace / 'sandbox' / 'executions'),
+            accountant=self.resource_accountant
+        )
         self.thinking_engine = ThinkingAdvancementEngine(str(self.workspace / 'thinking_advancement'))
         self.work_enforcer = WorkProcessEnforcer(str(self.workspace / 'work_process'))
         self.context_document_manager = ContextDocumentManager(str(self.workspace / 'context_documents'))
+        self.document_index = DocumentIndex(str(self.workspace / 'context_documents' / 'search_index.db'))
+        self._document_index_backfilled = False
         
         # 성능 모니터링
         self.performance_metrics = {
@@ -100,6 +160,9 @@ class BOOSAANUltimateMCPServer:
         # 로깅 설정
         self.setup_logging()
         
+        # 색인 도입 전 맥락 노드 백필 (실패/불완전 시 경고 로그를 남기므로 로깅 설정 후)
+        self.context_index_complete = self._backfill_context_index()
+        
         # 터미널 세션 데이터베이스 초기화
         self._init_session_database()
         
@@ -108,15 +171,214 @@ class BOOSAANUltimateMCPServer:
         
         # 포트 관리 시스템 초기화 (로깅 후)
         self.port_manager = get_port_manager()
+        self.port_table = PortTable.from_env(self.port_manager)
+        self.port_index = PortIndex(str(self.workspace / 'ports' / 'port_index.json'))
+        self.port_prober = PortProber.from_env()
+        # 색인이 마지막으로 맞춘 상태 테이블 revision (다르면 적중을 믿기 전에 재동기화)
+        self._port_index_revision = -1
+        self._port_touched: Dict[str, float] = {}
         self.assigned_port = None
         self._initialize_port_allocation()
         
+        # CPU 집약 도구용 워커 프로세스 풀 (BOOSAAN_WORKER_PROCESSES 설정 시에만)
+        self.worker_pool = WorkerPool.from_env(str(self.workspace), self.logger)
+        
         # 규칙 격리 및 예측적 피드백 시스템
+        # 규칙 도구를 워커가 맡으면 규칙 색인은 그 워커 프로세스에서만 생성 (프런트엔드에 낡은 사본을 두지 않음)
         self.rule_isolation = BOOSAANRuleIsolationSystem(str(self.workspace / 'rule_isolation'))
+        if self.worker_pool and self.worker_pool.handles("add_rule_with_isolation"):
+            self.rule_similarity = None
+            self.rule_index = None
+            self.rule_similarity_complete = False
+        else:
+            self._open_rule_indexes()
         
         # 보안 설정
         self.security_level = "MAXIMUM"
         self.auto_risk_assessment = True
+        
+        # 도구 응답 형식 기본값 (text / json / both)
+        self.default_response_format = resolve_response_format(os.getenv("BOOSAAN_RESPONSE_FORMAT", "text"))
+        
+        # 사고 도구 결과 캐시 (워커 풀 앞단에서 조회)
+        self.thinking_cache = ResultCache.from_env(str(self.workspace), self.logger)
+        
+        # latency_budget_ms 실행용 단계별 소요 시간 추정
+        self.stage_costs = StageCostModel()
+        
+        # 지시사항/기능명세서 추가는 쓰기 저널에 먼저 기록하고 백그라운드에서 문서 관리자에 적용
+        # (BOOSAAN_DOCUMENT_JOURNAL=off 면 문서 관리자에 바로 기록). 문서 관리자 호출은 잠금으로 직렬화
+        self._document_manager_lock = threading.Lock()
+        self.document_journal = self._open_document_journal()
+        
+        # 스냅샷/망각/포트 정리/DB 보존 기간 정리는 백그라운드 스케줄러가 담당
+        self.session_retention_days = int(os.getenv("BOOSAAN_SESSION_RETENTION_DAYS", "30"))
+        self.maintenance = MaintenanceScheduler.from_env(self.logger)
+        if self.maintenance:
+            self._register_maintenance_jobs()
+
+    @classmethod
+    def create_worker(cls, workspace: str, tool_class: str) -> "BOOSAANUltimateMCPServer":
+        """워커 프로세스용 인스턴스 (tool_class 도구가 쓰는 서브시스템만 생성)
+
+        전송, 세션 DB, 포트 할당은 프런트엔드 프로세스만 소유한다.
+        규칙 서브시스템(규칙 격리 시스템, 서명/규칙 색인)은 단일 rules 워커만 소유 → 사고 워커들은
+        같은 sqlite 파일에 쓰지 않음.
+        """
+        server = cls.__new__(cls)
+        server.name = "BOOSAAN ULTIMATE v7.1"
+        server.version = "7.1.0"
+        server.workspace = Path(workspace)
+        server.logger = logging.getLogger(f"{__name__}.worker")
+        server.worker_pool = None
+        server.thinking_cache = None
+        server.stage_costs = StageCostModel()
+        
+        server._budgeted_meta_cognitive = None
+        server._budgeted_thinking_lock = threading.Lock()
+        server.meta_cognitive = server.thinking_engine = None
+        server.rule_isolation = server.rule_similarity = server.rule_index = None
+        server.rule_similarity_complete = False
+        
+        if tool_class == "thinking":
+            server.meta_cognitive = MetaCognitiveEngine(str(server.workspace / 'meta_cognitive'))
+            server.thinking_engine = ThinkingAdvancementEngine(str(server.workspace / 'thinking_advancement'))
+        elif tool_class == "rules":
+            server.rule_isolation = BOOSAANRuleIsolationSystem(str(server.workspace / 'rule_isolation'))
+            server._open_rule_indexes()
+        return server
+
+    def _open_rule_indexes(self):
+        """규칙 서명 색인 + 컴파일된 규칙 색인 열기 → 규칙 격리 시스템의 전체 규칙과 맞춤
+
+        서명 색인은 전체 규칙과 맞춘 뒤에만 오염 검사에 사용 (rule_similarity_complete).
+        전체 규칙을 열거할 수 없으면 오염 검사는 규칙 격리 시스템의 쌍별 검사로 대체하고,
+        처음 만드는 규칙 색인은 서명 색인에 있는 규칙으로 시작.
+        색인에 없던 기존 규칙은 만료 정보가 없으므로 만료 없이(ttl=0) 가져옴 — 만료는 색인 도입 후
+        추가되거나 ttl 을 지정한 규칙에만 적용.
+        """
+        self.rule_similarity = RuleSimilarityIndex(str(self.workspace / 'rule_isolation' / 'rule_signatures.db'))
+        self.rule_index = RuleIndex.from_env(str(self.workspace / 'rule_isolation' / 'rule_index.db'))
+        rules = self._isolation_rules()
+        self.rule_similarity_complete = rules is not None
+        if rules is None:
+            self.logger.info("규칙 격리 시스템의 전체 규칙을 열거할 수 없음 → 오염 검사는 쌍별 검사 사용")
+            if self.rule_index.is_new:
+                for rule in self.rule_similarity.rules():
+                    self.rule_index.add(rule['rule_id'], rule['content'], rule['scope'], rule['project'],
+                                        rule['rule_type'], ttl=0)
+            return
+
+        rules = self._live_isolation_rules(rules)
+        current = {rule['rule_id'] for rule in rules}
+        for rule in rules:
+            indexed = self.rule_similarity.rule(rule['rule_id'])
+            if indexed is None or any(indexed[key] != rule[key] for key in ('content', 'scope', 'project')):
+                self.rule_similarity.add(rule['rule_id'], rule['content'], rule['scope'], rule['project'],
+                                         rule['rule_type'])
+            if rule['rule_id'] not in self.rule_index:
+                self.rule_index.add(rule['rule_id'], rule['content'], rule['scope'], rule['project'],
+                                    rule['rule_type'], ttl=0, created=rule['created'])
+        for indexed in self.rule_similarity.rules():
+            if indexed['rule_id'] not in current:
+                self.rule_similarity.remove(indexed['rule_id'])
+        for rule_id in self.rule_index.rule_ids():
+            if rule_id not in current:
+                self.rule_index.remove(rule_id)
+
+    def _live_isolation_rules(self, rules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """규칙 격리 시스템의 규칙 중 색인에서 만료되지 않은 것 (묘비가 있는 규칙 제외)
+
+        만료된 규칙을 규칙 격리 시스템에서 지우는 것은 명시적 호출(_purge_expired_isolation_rules)에만 맡김.
+        """
+        self.rule_index.retain_tombstones(rule['rule_id'] for rule in rules)
+        return [rule for rule in rules if not self.rule_index.is_tombstoned(rule['rule_id'])]
+
+    def _purge_expired_isolation_rules(self) -> List[str]:
+        """색인에서 만료된 규칙을 규칙 격리 시스템에서도 삭제 → 삭제한 규칙 ID (get_effective_rules 의 purge_expired)"""
+        self._expire_rules()
+        purged = [rule_id for rule_id in self.rule_index.tombstones() if self._remove_isolation_rule(rule_id)]
+        if purged:
+            self.rule_index.retain_tombstones(set(self.rule_index.tombstones()) - set(purged))
+            self.logger.info(f"만료된 규칙 삭제: {len(purged)}개")
+        return purged
+
+    def _remove_isolation_rule(self, rule_id: str) -> bool:
+        """규칙 격리 시스템에서 규칙 삭제 (삭제 API 가 없거나 실패하면 False)"""
+        for name in ("remove_rule", "delete_rule"):
+            method = getattr(self.rule_isolation, name, None)
+            if callable(method):
+                try:
+                    method(rule_id)
+                except Exception as e:
+                    self.logger.warning(f"규칙 격리 시스템 규칙 삭제 실패: {rule_id} ({e})")
+                    return False
+                return True
+        return False
+
+    def _isolation_rules(self) -> Optional[List[Dict[str, Any]]]:
+        """규칙 격리 시스템의 전체 규칙 [{rule_id, content, scope, project, rule_type, created}]
+
+        전체 목록을 열거할 수 없거나 ID/내용/범위를 알 수 없는 규칙이 있으면 None (색인 완전성 보장 불가).
+        """
+        source = None
+        for name in ("get_all_rules", "list_rules"):
+            method = getattr(self.rule_isolation, name, None)
+            if callable(method):
+                source = method()
+                break
+        else:
+            source = getattr(self.rule_isolation, "rules", None)
+
+        if isinstance(source, dict):
+            items = list(source.items())
+        elif isinstance(source, (list, tuple)):
+            items = [(None, rule) for rule in source]
+        else:
+            return None
+
+        rules = []
+        for key, rule in items:
+            fields = rule if isinstance(rule, dict) else getattr(rule, "__dict__", {})
+            rule_id = fields.get("rule_id") or fields.get("id") or key
+            content = fields.get("content")
+            scope = self._rule_enum_name(fields.get("scope"), RuleScope, self.RULE_SCOPE_LABELS)
+            if not rule_id or not isinstance(content, str) or scope is None:
+                return None
+            rules.append({
+                "rule_id": str(rule_id),
+                "content": content,
+                "scope": scope,
+                "project": fields.get("project_name", fields.get("project")),
+                "rule_type": self._rule_enum_name(fields.get("rule_type"), RuleType, self.RULE_TYPE_LABELS) or "",
+                "created": self._rule_timestamp(fields.get("created_at", fields.get("timestamp")))
+            })
+        return rules
+
+    @staticmethod
+    def _rule_enum_name(value: Any, enum_class, labels: Dict[str, Any]) -> Optional[str]:
+        """Enum 멤버, 한글 이름, 멤버 이름/값 문자열 → 멤버 이름"""
+        if isinstance(value, enum_class):
+            return value.name
+        if isinstance(value, str) and value in labels:
+            return labels[value].name
+        for member in enum_class:
+            if value in (member.name, member.value):
+                return member.name
+        return None
+
+    @staticmethod
+    def _rule_timestamp(value: Any) -> Optional[float]:
+        if isinstance(value, datetime):
+            return value.timestamp()
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value).timestamp()
+            except ValueError:
+                return None
+        return None
 
     def _generate_terminal_id(self) -> str:
         """터미널 고유 ID 생성 (세션별로 고유하면서도 재시작 시 연속성 유지)"""
@@ -143,7 +405,10 @@ class BOOSAANUltimateMCPServer:
         """터미널 세션 데이터베이스 초기화"""
         self.session_db_path = self.workspace / f'terminal_sessions_{self.terminal_id}.db'
         
-        with sqlite3.connect(str(self.session_db_path)) as conn:
+        # 세션 DB는 전담 스레드가 소유 (이벤트 루프에서 직접 SQLite 호출 금지)
+        self.session_store = SessionStore(str(self.session_db_path), self.logger)
+        
+        def _create_schema(conn):
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS conversations (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -179,20 +444,41 @@ class BOOSAANUltimateMCPServer:
                     progress_data TEXT
                 )
             ''')
+            
+            # 키셋 페이지네이션용 (ts, id) 인덱스
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_conversations_terminal_ts
+                ON conversations (terminal_id, timestamp, id)
+            ''')
+            
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_task_tracking_terminal_ts
+                ON task_tracking (terminal_id, created_at, id)
+            ''')
+        
+        self.session_store.call(_create_schema, write=True)
+        
+        # 맥락 메모리: 바이트 예산 초과분은 세션 DB로 스필
+        self.context_memory = BoundedContextStore(
+            self.session_store, self.terminal_id,
+            max_bytes=self.context_memory_budget,
+            policy=self.context_eviction_policy,
+            logger=self.logger
+        )
         
         # 현재 세션 정보 저장
         self._save_session_start()
 
     def _save_session_start(self):
         """세션 시작 정보 저장"""
-        with sqlite3.connect(str(self.session_db_path)) as conn:
-            session_info = {
-                'terminal_id': self.terminal_id,
-                'start_time': self.session_start_time.isoformat(),
-                'workspace': str(self.workspace),
-                'version': self.version
-            }
-            
+        session_info = {
+            'terminal_id': self.terminal_id,
+            'start_time': self.session_start_time.isoformat(),
+            'workspace': str(self.workspace),
+            'version': self.version
+        }
+        
+        def _insert_session_start(conn):
             conn.execute('''
                 INSERT OR REPLACE INTO context_snapshots 
                 (terminal_id, snapshot_time, context_data, metadata)
@@ -203,31 +489,32 @@ class BOOSAANUltimateMCPServer:
                 pickle.dumps({}),  # 빈 시작 컨텍스트
                 json.dumps(session_info)
             ))
+        
+        self.session_store.call(_insert_session_start, write=True)
 
     def _restore_context_if_exists(self):
         """이전 세션의 컨텍스트 복원 (같은 터미널 ID)"""
         try:
-            with sqlite3.connect(str(self.session_db_path)) as conn:
-                cursor = conn.execute('''
-                    SELECT context_data, metadata, snapshot_time
-                    FROM context_snapshots 
-                    WHERE terminal_id = ?
-                    ORDER BY id DESC LIMIT 1
-                ''', (self.terminal_id,))
+            result = self.session_store.call(lambda conn: conn.execute('''
+                SELECT context_data, metadata, snapshot_time
+                FROM context_snapshots 
+                WHERE terminal_id = ?
+                ORDER BY id DESC LIMIT 1
+            ''', (self.terminal_id,)).fetchone())
+            
+            if result:
+                context_data, metadata_str, snapshot_time = result
+                metadata = json.loads(metadata_str)
                 
-                result = cursor.fetchone()
-                if result:
-                    context_data, metadata_str, snapshot_time = result
-                    metadata = json.loads(metadata_str)
+                # 24시간 이내의 세션만 복원
+                snapshot_dt = datetime.fromisoformat(snapshot_time.replace('Z', '+00:00'))
+                if (datetime.now(timezone.utc) - snapshot_dt).total_seconds() < 86400:
+                    restored = pickle.loads(context_data)
+                    self.context_memory.update(restored.get("context_memory", restored))
+                    self.logger.info(f"이전 컨텍스트 복원: {len(self.context_memory)}개 항목")
+                else:
+                    self.logger.info("24시간 이상 경과한 세션, 새로 시작")
                     
-                    # 24시간 이내의 세션만 복원
-                    snapshot_dt = datetime.fromisoformat(snapshot_time.replace('Z', '+00:00'))
-                    if (datetime.now(timezone.utc) - snapshot_dt).total_seconds() < 86400:
-                        self.context_memory = pickle.loads(context_data)
-                        self.logger.info(f"이전 컨텍스트 복원: {len(self.context_memory)}개 항목")
-                    else:
-                        self.logger.info("24시간 이상 경과한 세션, 새로 시작")
-                        
         except Exception as e:
             self.logger.warning(f"컨텍스트 복원 실패: {e}")
 
@@ -245,13 +532,113 @@ class BOOSAANUltimateMCPServer:
         """BOOSAAN Ultimate용 포트 할당"""
         try:
             # boosaan 프로젝트가 이미 예약되어 있으므로 해당 범위에서 포트 할당
-            self.assigned_port = get_project_port("boosaan", "ultimate_mcp_server")
+            self.assigned_port = self._project_port("boosaan", "ultimate_mcp_server")
             self.logger.info(f"BOOSAAN Ultimate MCP 서버 포트 할당: {self.assigned_port}")
         except Exception as e:
             self.logger.error(f"포트 할당 실패: {e}")
             self.assigned_port = 8000  # 기본 포트로 폴백
 
+    def _project_port(self, project_name: str, service_name: str) -> int:
+        """서비스 포트 조회
+
+        색인 적중은 힌트: 포트 관리자 상태가 마지막 동기화 이후 바뀌었으면(상태 테이블 revision) 먼저 재동기화해서
+        망각/이동된 블록을 반영한 뒤에만 적중으로 답함. 미스이거나 USAGE_TOUCH_INTERVAL 이 지났으면
+        관리자에서 배정(사용 기록 갱신)하고 그 프로젝트 항목만 테이블/색인에 반영.
+        """
+        self.port_table.snapshot()
+        if self.port_table.revision != self._port_index_revision:
+            self._sync_port_index()
+        
+        hint = self.port_index.lookup(project_name, service_name)
+        now = time.time()
+        if hint is not None and now - self._port_touched.get(project_name, 0.0) < USAGE_TOUCH_INTERVAL:
+            return hint
+        
+        port = get_project_port(project_name, service_name)
+        self._port_touched[project_name] = now
+        info = self.port_table.update_project(project_name)
+        if info:
+            self.port_index.mark_block(project_name, *parse_port_range(info['port_range']))
+            if hint is not None and hint != port:
+                self.port_index.release(project_name, service_name)
+            self.port_index.assign(project_name, service_name, port)
+        return port
+
+    def _read_port_blocks(self) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """포트 관리자 상태 요약 + 프로젝트별 포트 범위 (스레드에서 호출 가능, 색인은 건드리지 않음)"""
+        summary, infos = self.port_table.snapshot()
+        return summary, {project: info['port_range'] for project, info in infos.items()}
+
+    def _sync_port_index(self, port_blocks: Optional[Tuple[Dict[str, Any], Dict[str, str]]] = None) -> Dict[str, Any]:
+        """포트 관리자 블록을 색인에 반영 (망각 정리로 사라진 프로젝트 블록 해제) → 상태 요약"""
+        summary, blocks = port_blocks or self._read_port_blocks()
+        for project, port_range in blocks.items():
+            self.port_index.mark_block(project, *parse_port_range(port_range))
+        for project in self.port_index.retain_projects(blocks):
+            self._port_touched.pop(project, None)
+        self.port_index.save()
+        self._port_index_revision = self.port_table.revision
+        return summary
+
+    async def _probe_port_liveness(self) -> Optional[Dict[str, Any]]:
+        """배정된 서비스 포트 전체를 동시 검사 → 리스너가 있는/없는 프로젝트
+
+        검사 전에 색인을 포트 관리자 최신 상태와 동기화 → 이미 망각된 프로젝트는 검사 대상에서 빠짐
+        """
+        if self.port_prober is None:
+            return None
+        self.port_table.invalidate()
+        self._sync_port_index(await asyncio.to_thread(self._read_port_blocks))
+        states = await self.port_prober.probe_projects(self.port_index.service_ports())
+        return {
+            "probed_ports": sum(len(services) for services in states.values()),
+            # 프로젝트 → 리스너가 있는 서비스 하나 (사용 기록 갱신용)
+            "live_projects": {
+                project: next(service for service, listening in services.items() if listening)
+                for project, services in states.items() if any(services.values())
+            },
+            "stale_projects": sorted(project for project, services in states.items() if not any(services.values()))
+        }
+
+    def _refresh_live_ports(self, liveness: Optional[Dict[str, Any]]):
+        """리스너가 있는 프로젝트는 포트 관리자 사용 기록 갱신 → 망각 사이클이 활성 블록을 회수하지 않음
+
+        get_project_port 는 없는 프로젝트를 새로 등록하므로 검사 이후 관리자에서 사라진 프로젝트는 건너뜀
+        """
+        if not liveness:
+            return
+        infos = self.port_table.get_all_project_port_info()
+        refreshed = 0
+        for project, service in liveness["live_projects"].items():
+            if project in infos:
+                get_project_port(project, service)
+                refreshed += 1
+        if refreshed:
+            self.port_table.invalidate()
+
+    @staticmethod
+    def _liveness_summary(liveness: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if liveness is None:
+            return None
+        return {
+            "probed_ports": liveness["probed_ports"],
+            "live_projects": len(liveness["live_projects"]),
+            "stale_projects": liveness["stale_projects"]
+        }
+
     async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """MCP 요청 처리 (유지보수 스케줄러에 요청 활동 알림)"""
+        if self.maintenance is None:
+            return await self._handle_request(request)
+        
+        self.maintenance.ensure_started()
+        self.maintenance.request_started()
+        try:
+            return await self._handle_request(request)
+        finally:
+            self.maintenance.request_finished()
+
+    async def _handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """MCP 요청 처리 (터미널 ID 및 타임스탬프 추적 포함)"""
         start_time = time.time()
         
@@ -336,8 +723,8 @@ class BOOSAANUltimateMCPServer:
             # 5단계: 대화 기록 저장
             await self._save_conversation_record(conversation_id, task_id, tracking_info, request, response)
             
-            # 6단계: 맥락 스냅샷 (주기적)
-            if time.time() - self.last_context_save > 300:  # 5분마다
+            # 6단계: 맥락 스냅샷 (스케줄러가 비활성일 때만 요청 경로에서)
+            if self.maintenance is None and time.time() - self.last_context_save > 300:  # 5분마다
                 await self._save_context_snapshot()
                 self.last_context_save = time.time()
             
@@ -351,6 +738,8 @@ class BOOSAANUltimateMCPServer:
                     "terminal_id": self.terminal_id,
                     "timestamp": tracking_info["timestamp"]
                 }
+                if tracking_info.get("result_meta"):
+                    response["tracking"].update(tracking_info["result_meta"])
             
             self.logger.info(f"[{conversation_id}] 요청 처리 완료: {response_time:.3f}초")
             return response
@@ -455,7 +844,9 @@ class BOOSAANUltimateMCPServer:
                     "type": "object",
                     "properties": {
                         "request": {"type": "string"},
-                        "context": {"type": "object", "optional": True}
+                        "context": {"type": "object", "optional": True},
+                        "latency_budget_ms": {"type": "number", "description": "지연 시간 예산 (초과 시 지금까지의 결과 + 건너뛴 단계 반환)"},
+                        "cache": {"type": "boolean", "default": True, "description": "같은 요청의 이전 결과 재사용"}
                     },
                     "required": ["request"]
                 }
@@ -504,10 +895,13 @@ class BOOSAANUltimateMCPServer:
             
             {
                 "name": "execute_forgetting_cycle",
-                "description": "8차원 망각 사이클 실행",
+                "description": "8차원 망각 사이클 실행 (만료 후보가 있을 때 맥락 계층의 다차원 망각 실행)",
                 "inputSchema": {
                     "type": "object",
-                    "properties": {}
+                    "properties": {
+                        "full_scan": {"type": "boolean", "default": False,
+                                      "description": "후보가 없어도 맥락 계층 전체 노드 재평가 실행"}
+                    }
                 }
             },
             
@@ -522,7 +916,9 @@ class BOOSAANUltimateMCPServer:
                         "project_path": {"type": "string"},
                         "permission_level": {"type": "string", "enum": ["샌드박스_레벨", "사용자_레벨"], "default": "샌드박스_레벨"},
                         "network_allowed": {"type": "boolean", "default": False},
-                        "time_limit": {"type": "integer", "default": 300}
+                        "time_limit": {"type": "integer", "default": 300},
+                        "workspace_strategy": {"type": "string", "enum": ["none", "auto", *WORKSPACE_STRATEGIES], "default": "none",
+                                               "description": "프로젝트 경로를 샌드박스 전용 작업 공간으로 복제 (auto: reflink → overlay → 복사)"}
                     },
                     "required": ["sandbox_id", "project_path"]
                 }
@@ -536,12 +932,31 @@ class BOOSAANUltimateMCPServer:
                     "properties": {
                         "sandbox_id": {"type": "string"},
                         "command": {"type": "string"},
-                        "input_data": {"type": "string", "optional": True}
+                        "input_data": {"type": "string", "optional": True},
+                        "env": {"type": "object", "additionalProperties": {"type": "string"}, "optional": True},
+                        "cache": {"type": "boolean", "default": False,
+                                  "description": "결정적인 명령의 결과를 입력 파일 내용 해시로 캐시 (input_files 필수)"},
+                        "input_files": {"type": "array", "items": {"type": "string"}, "optional": True,
+                                        "description": "캐시 키에 포함할 입력 파일/디렉터리 (샌드박스 경로 기준)"}
                     },
                     "required": ["sandbox_id", "command"]
                 }
             },
             
+            {
+                "name": "execute_in_sandbox_batch",
+                "description": "여러 샌드박스 × 여러 명령 병렬 실행 후 결과 집계",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "sandbox_ids": {"type": "array", "items": {"type": "string"}},
+                        "commands": {"type": "array", "items": {"type": "string"}},
+                        "input_data": {"type": "string", "optional": True}
+                    },
+                    "required": ["sandbox_ids", "commands"]
+                }
+            },
+            
             {
                 "name": "get_sandbox_status",
                 "description": "샌드박스 상태 조회",
@@ -577,7 +992,10 @@ class BOOSAANUltimateMCPServer:
                         "thinking_mode": {"type": "string", "enum": ["심층_사고", "광범위_사고", "집중_사고"], "default": "심층_사고"},
                         "priority": {"type": "string", "enum": ["즉시_우선", "맥락_우선", "전략_우선", "궁극_우선"], "default": "맥락_우선"},
                         "required_models": {"type": "array", "items": {"type": "string"}, "default": ["분석적_추론", "비판적_추론"]},
-                        "quality_threshold": {"type": "number", "default": 0.7}
+                        "quality_threshold": {"type": "number", "default": 0.7},
+                        "parallel_models": {"type": "boolean", "description": "추론 모델별 동시 실행 후 결정 병합 (기본: 워커 풀 활성 시)"},
+                        "latency_budget_ms": {"type": "number", "description": "지연 시간 예산 (모델을 요청 순서대로 실행, 초과 시 지금까지의 결정 + 건너뛴 모델 반환)"},
+                        "cache": {"type": "boolean", "default": True, "description": "같은 작업의 이전 결과 재사용"}
                     },
                     "required": ["task_content"]
                 }
@@ -649,7 +1067,8 @@ class BOOSAANUltimateMCPServer:
                     "type": "object",
                     "properties": {
                         "query": {"type": "string"},
-                        "document_types": {"type": "array", "items": {"type": "string"}, "optional": True}
+                        "document_types": {"type": "array", "items": {"type": "string"}, "optional": True},
+                        "limit": {"type": "integer", "default": 3, "description": "문서 종류별 최대 결과 수 (관련도 순)"}
                     },
                     "required": ["query"]
                 }
@@ -693,7 +1112,8 @@ class BOOSAANUltimateMCPServer:
                     "type": "object",
                     "properties": {
                         "project_name": {"type": "string"},
-                        "service_name": {"type": "string", "default": "default"}
+                        "service_name": {"type": "string", "default": "default"},
+                        "service_names": {"type": "array", "items": {"type": "string"}, "description": "여러 서비스 포트를 한 번에 조회/할당 (service_name 대신)"}
                     },
                     "required": ["project_name"]
                 }
@@ -766,12 +1186,26 @@ class BOOSAANUltimateMCPServer:
                         "rule_type": {"type": "string", "enum": ["패턴", "가이드라인", "선호도", "제약조건", "워크플로우"]},
                         "scope": {"type": "string", "enum": ["전역", "프로젝트", "세션", "임시"]},
                         "project_name": {"type": "string", "optional": True},
-                        "source_context": {"type": "string", "optional": True}
+                        "source_context": {"type": "string", "optional": True},
+                        "ttl_seconds": {"type": "number", "optional": True, "description": "만료까지 시간 (기본: 임시 1시간, 세션 8시간, 그 외 만료 없음)"}
                     },
                     "required": ["content", "rule_type", "scope"]
                 }
             },
             
+            {
+                "name": "get_effective_rules",
+                "description": "프로젝트에 적용되는 유효 규칙 조회 (전역 + 프로젝트 + 세션/임시, 타입별 우선순위 순)",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "project_name": {"type": "string", "optional": True},
+                        "rule_type": {"type": "string", "enum": ["패턴", "가이드라인", "선호도", "제약조건", "워크플로우"], "optional": True},
+                        "purge_expired": {"type": "boolean", "optional": True, "description": "만료된 규칙을 규칙 격리 시스템에서도 삭제 (기본: 색인에서만 제외)"}
+                    }
+                }
+            },
+            
             # 10. 터미널 세션 추적 도구
             {
                 "name": "get_terminal_session_info",
@@ -790,7 +1224,9 @@ class BOOSAANUltimateMCPServer:
                     "properties": {
                         "query": {"type": "string"},
                         "time_range_hours": {"type": "number", "default": 24},
-                        "limit": {"type": "number", "default": 10}
+                        "limit": {"type": "number", "default": 10},
+                        "cursor": {"type": "string", "optional": True},
+                        "max_bytes": {"type": "number", "optional": True}
                     },
                     "required": ["query"]
                 }
@@ -804,7 +1240,9 @@ class BOOSAANUltimateMCPServer:
                     "properties": {
                         "task_type": {"type": "string", "optional": True},
                         "status": {"type": "string", "enum": ["COMPLETED", "ERROR", "BLOCKED"], "optional": True},
-                        "limit": {"type": "number", "default": 20}
+                        "limit": {"type": "number", "default": 20},
+                        "cursor": {"type": "string", "optional": True},
+                        "max_bytes": {"type": "number", "optional": True}
                     }
                 }
             },
@@ -832,43 +1270,60 @@ class BOOSAANUltimateMCPServer:
             }
         ]
         
+        # 모든 도구에 응답 형식 선택 인자 추가
+        for tool in tools:
+            tool["inputSchema"].setdefault("properties", {})["response_format"] = {
+                "type": "string",
+                "enum": list(RESPONSE_FORMATS),
+                "default": self.default_response_format,
+                "optional": True
+            }
+        
         return {"tools": tools}
 
     async def _save_conversation_record(self, conversation_id: str, task_id: str, 
                                        tracking_info: Dict, request: Dict, response: Dict):
-        """대화 기록 저장"""
+        """대화 기록 저장 (세션 저장소 백그라운드 쓰기)"""
         try:
-            with self.session_db_lock:
-                with sqlite3.connect(str(self.session_db_path)) as conn:
+            # 직렬화는 현재 시점 기준으로 먼저 수행 (이후 응답 객체 변경과 무관)
+            status = "COMPLETED" if "error" not in response else "ERROR"
+            conversation_row = (
+                conversation_id,
+                self.terminal_id,
+                tracking_info["timestamp"],
+                json.dumps(request),
+                json.dumps(response),
+                task_id,
+                status
+            )
+            task_row = None
+            if task_id:
+                task_row = (
+                    task_id,
+                    self.terminal_id,
+                    tracking_info["timestamp"],
+                    datetime.now(timezone.utc).isoformat(),
+                    request.get("params", {}).get("name", "unknown"),
+                    status,
+                    json.dumps({"response_time": time.time() - tracking_info["request_start"]})
+                )
+            
+            def _insert_records(conn):
+                conn.execute('''
+                    INSERT OR REPLACE INTO conversations 
+                    (conversation_id, terminal_id, timestamp, request_data, response_data, task_id, status)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', conversation_row)
+                
+                # 작업 추적 정보도 저장
+                if task_row:
                     conn.execute('''
-                        INSERT OR REPLACE INTO conversations 
-                        (conversation_id, terminal_id, timestamp, request_data, response_data, task_id, status)
+                        INSERT OR REPLACE INTO task_tracking
+                        (task_id, terminal_id, created_at, updated_at, task_type, status, progress_data)
                         VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        conversation_id,
-                        self.terminal_id,
-                        tracking_info["timestamp"],
-                        json.dumps(request),
-                        json.dumps(response),
-                        task_id,
-                        "COMPLETED" if "error" not in response else "ERROR"
-                    ))
-                    
-                    # 작업 추적 정보도 저장
-                    if task_id:
-                        conn.execute('''
-                            INSERT OR REPLACE INTO task_tracking
-                            (task_id, terminal_id, created_at, updated_at, task_type, status, progress_data)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            task_id,
-                            self.terminal_id,
-                            tracking_info["timestamp"],
-                            datetime.now(timezone.utc).isoformat(),
-                            request.get("params", {}).get("name", "unknown"),
-                            "COMPLETED" if "error" not in response else "ERROR",
-                            json.dumps({"response_time": time.time() - tracking_info["request_start"]})
-                        ))
+                    ''', task_row)
+            
+            self.session_store.write_background(_insert_records, "대화 기록 저장", key=self.terminal_id)
                         
         except Exception as e:
             self.logger.error(f"대화 기록 저장 실패: {e}")
@@ -881,56 +1336,261 @@ class BOOSAANUltimateMCPServer:
                 "conversation_count": self.conversation_counter,
                 "task_count": self.task_counter,
                 "performance_metrics": self.performance_metrics.copy(),
-                "context_memory": self.context_memory.copy()
+                "context_memory": self.context_memory.snapshot()
             }
+            snapshot_row = (
+                self.terminal_id,
+                datetime.now(timezone.utc).isoformat(),
+                pickle.dumps(context_data),
+                json.dumps({"snapshot_type": "periodic", "version": self.version})
+            )
             
-            with self.session_db_lock:
-                with sqlite3.connect(str(self.session_db_path)) as conn:
-                    conn.execute('''
-                        INSERT INTO context_snapshots 
-                        (terminal_id, snapshot_time, context_data, metadata)
-                        VALUES (?, ?, ?, ?)
-                    ''', (
-                        self.terminal_id,
-                        datetime.now(timezone.utc).isoformat(),
-                        pickle.dumps(context_data),
-                        json.dumps({"snapshot_type": "periodic", "version": self.version})
-                    ))
+            self.session_store.write_background(lambda conn: conn.execute('''
+                INSERT INTO context_snapshots 
+                (terminal_id, snapshot_time, context_data, metadata)
+                VALUES (?, ?, ?, ?)
+            ''', snapshot_row), "맥락 스냅샷 저장", key=self.terminal_id)
                     
         except Exception as e:
             self.logger.error(f"맥락 스냅샷 저장 실패: {e}")
 
+    # === 백그라운드 유지보수 작업 ===
+    def _register_maintenance_jobs(self):
+        """유지보수 작업 등록 (주기, CPU / I/O 예산, 유휴 대기 시간)"""
+        self.maintenance.add_job("context_snapshot", self._maintenance_snapshot, interval=300,
+                                 cpu_budget=0.2, max_defer=300)
+        self.maintenance.add_job("context_forgetting", self._maintenance_forgetting, interval=600,
+                                 cpu_budget=0.2)
+        self.maintenance.add_job("port_cleanup", self._maintenance_port_cleanup, interval=1800,
+                                 cpu_budget=0.5, idle_after=5)
+        self.maintenance.add_job("session_retention", self._maintenance_session_retention, interval=3600,
+                                 cpu_budget=1.0, io_budget=64 * 1024 * 1024, idle_after=10)
+        if self.thinking_cache:
+            self.maintenance.add_job("thinking_cache_prune", self._maintenance_thinking_cache, interval=1800,
+                                     cpu_budget=0.2)
+        if self.document_journal:
+            self.maintenance.add_job("document_journal_flush", self._maintenance_document_flush, interval=60,
+                                     cpu_budget=0.5, idle_after=5)
+        self.maintenance.add_job("session_vacuum", self._maintenance_session_vacuum, interval=86400,
+                                 cpu_budget=5.0, io_budget=512 * 1024 * 1024, idle_after=30, max_defer=6 * 3600)
+
+    async def _maintenance_snapshot(self, budget: JobBudget) -> Dict[str, Any]:
+        await self._save_context_snapshot()
+        self.last_context_save = time.time()
+        return {"saved": True}
+
+    async def _maintenance_forgetting(self, budget: JobBudget) -> Dict[str, Any]:
+        # 큐 처리와 색인 수정은 루프 위에서, 관리자 사이클과 전체 스캔은 낮은 우선순위 스레드에서
+        stats = await self._run_context_forgetting(self.maintenance.run_in_background, max_nodes=2000)
+        stats["more_pending"] = stats["evaluated_nodes"] >= 2000
+        stats.pop("manager_cycle", None)
+        return stats
+
+    async def _run_context_forgetting(self, run_blocking: Callable[..., Awaitable[Any]],
+                                      max_nodes: Optional[int] = None, full_scan: bool = False) -> Dict[str, Any]:
+        """망각 사이클: 큐는 만료 후보만 고르고, 실제 망각은 맥락 관리자의 다차원 사이클이 결정
+
+        후보가 있거나(또는 full_scan, 마지막 관리자 사이클 후 하루 경과) 관리자 사이클과 전체 스캔을
+        run_blocking 으로 이벤트 루프 밖에서 실행한 뒤 관리자에서 사라진 노드를 색인에서 제거.
+        관리자가 보존한 후보는 반감기 뒤 재평가.
+        """
+        stats = self.forgetting_queue.run_cycle(max_nodes=max_nodes, evict=False)
+        candidates = stats.pop("candidates")
+        stats["manager_cycle"] = None
+        
+        if candidates or full_scan or time.time() - self._last_manager_forgetting >= 86400:
+            # 사이클 도중 추가된 노드는 스캔에 없을 수 있으므로 시작 시점의 색인 노드만 대조
+            indexed = self.context_index.ids()
+            stats["manager_cycle"], scan = await run_blocking(self._forget_and_scan)
+            self._last_manager_forgetting = time.time()
+            removed = self._reconcile_context_index(indexed, scan, candidates)
+            stats["forgotten_nodes"] = removed or 0
+        
+        preserved = 0
+        for context_id in candidates:
+            if self.context_index.retention(context_id) is not None:
+                self.forgetting_queue.defer(context_id)
+                preserved += 1
+        stats["preserved_nodes"] += preserved
+        stats["queued_nodes"] = self.forgetting_queue.metrics()["queued_nodes"]
+        return stats
+
+    def _forget_and_scan(self) -> Tuple[Any, Optional[Tuple[List[Tuple[Optional[str], str, str]], Optional[int]]]]:
+        """(스레드에서 실행) 관리자 망각 사이클 + 전체 노드 스캔 → (사이클 결과, (노드, 요약 노드 수) 또는 None)"""
+        with self._context_manager_lock:
+            cycle = self.context_manager.execute_forgetting_cycle()
+            try:
+                scan = (self._scan_context_nodes(), self.context_manager.get_context_summary().get("total_nodes"))
+            except Exception as e:
+                self.logger.warning(f"맥락 색인 대조 실패: {e}")
+                scan = None
+        return cycle, scan
+
+    def _reconcile_context_index(self, indexed: List[str],
+                                 scan: Optional[Tuple[List[Tuple[Optional[str], str, str]], Optional[int]]],
+                                 candidates: List[str]) -> Optional[int]:
+        """관리자에서 망각된 노드를 색인에서 제거 → 제거 수 (관리자 스캔이 불완전하면 None)
+
+        관리자가 노드 ID 를 노출하면 ID 로만 대조해 남은 노드는 내용을 갱신하고 사라진 ID 만 제거.
+        ID 가 없으면 (레벨, 내용) 키로 대조하되, 내용 정규화 차이로 색인이 지워지지 않도록
+        관리자 노드 수보다 많은 만큼만 (망각 후보부터) 제거.
+        """
+        if scan is None:
+            return None
+        nodes, expected = scan
+        if expected is not None and len(nodes) < expected:
+            return None
+        
+        by_id = {node_id: (level, content) for node_id, level, content in nodes if node_id is not None}
+        keys = {(level, content) for _, level, content in nodes}
+        unmatched = []
+        for context_id in indexed:
+            node = self.context_index.get(context_id)
+            if node is None:
+                continue
+            if context_id in by_id:
+                level, content = by_id[context_id]
+                if (node["level"], node["content"]) != (level, content):
+                    self.context_index.upsert(context_id, level, content)
+            elif (node["level"], node["content"]) not in keys:
+                unmatched.append(context_id)
+        
+        if by_id:
+            surplus = len(unmatched)
+        else:
+            surplus = min(len(unmatched), max(0, len(indexed) - len(nodes)))
+        pending = set(candidates)
+        unmatched.sort(key=lambda context_id: context_id not in pending)
+        for context_id in unmatched[:surplus]:
+            self.forgetting_queue.forget(context_id)
+        return surplus
+
+    async def _maintenance_port_cleanup(self, budget: JobBudget) -> Dict[str, Any]:
+        liveness = await self._probe_port_liveness()
+        
+        def _cleanup():
+            self._refresh_live_ports(liveness)
+            self.port_manager.execute_forgetting_cycle()
+            self.port_manager.execute_forgetting_cleanup()
+            self.port_table.invalidate()
+            return self._read_port_blocks()
+        
+        # 포트 관리자 호출은 스레드에서, 색인 반영은 이벤트 루프에서
+        summary = self._sync_port_index(await asyncio.to_thread(_cleanup))
+        return {"total_ports_allocated": summary.get("total_ports_allocated"),
+                "probe": self._liveness_summary(liveness)}
+
+    async def _maintenance_document_flush(self, budget: JobBudget) -> Dict[str, Any]:
+        # 적용 중 append 는 새 저널로 가므로 스레드에서 실행, 색인 ID 갱신은 루프에서
+        if not self.document_journal.has_pending():
+            return {"applied": 0}
+        applied, error = await asyncio.to_thread(self._flush_document_journal, self.document_journal)
+        count = self._rekey_document_index(applied)
+        if error:
+            raise error
+        return {"applied": count}
+
+    async def _maintenance_thinking_cache(self, budget: JobBudget) -> Dict[str, Any]:
+        return {"removed": self.thinking_cache.prune()}
+
+    async def _maintenance_session_retention(self, budget: JobBudget) -> Dict[str, Any]:
+        """보존 기간이 지난 대화/작업 기록과 오래된 스냅샷을 배치 단위로 삭제"""
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=self.session_retention_days)).isoformat()
+        statements = [
+            ("DELETE FROM conversations WHERE id IN "
+             "(SELECT id FROM conversations WHERE timestamp < ? LIMIT 500)", (cutoff,)),
+            ("DELETE FROM task_tracking WHERE id IN "
+             "(SELECT id FROM task_tracking WHERE created_at < ? LIMIT 500)", (cutoff,)),
+            ("DELETE FROM context_snapshots WHERE id IN "
+             "(SELECT id FROM context_snapshots ORDER BY id DESC LIMIT 500 OFFSET 50)", ())
+        ]
+        
+        deleted = 0
+        for statement, params in statements:
+            while not budget.exhausted():
+                # 요청의 읽기/쓰기보다 뒤에 처리되도록 백그라운드 우선순위로 제출
+                rowcount = await asyncio.wrap_future(self.session_store.submit(
+                    lambda conn: conn.execute(statement, params).rowcount, PRIORITY_BACKGROUND_WRITE
+                ))
+                deleted += rowcount
+                if rowcount < 500:
+                    break
+        
+        return {"deleted_rows": deleted, "more_pending": budget.exhausted()}
+
+    async def _maintenance_session_vacuum(self, budget: JobBudget) -> Dict[str, Any]:
+        """빈 페이지 회수: incremental_vacuum 을 작은 단계로 나눠 백그라운드 우선순위로 제출
+
+        단계 사이에 대기 중인 읽기/쓰기가 먼저 처리되고, 예산이 떨어지면 다음 실행으로 넘김.
+        auto_vacuum 이 꺼진 기존 DB 는 빈 페이지가 20% 이상일 때 한 번만 별도 연결에서 전환.
+        """
+        def _stats(conn):
+            return (conn.execute("PRAGMA page_count").fetchone()[0],
+                    conn.execute("PRAGMA freelist_count").fetchone()[0],
+                    conn.execute("PRAGMA auto_vacuum").fetchone()[0])
+        
+        def _step(conn, pages):
+            # execute() 는 열 없는 결과 행 하나만 진행시켜 페이지 1개만 회수 → 끝까지 실행되는 executescript
+            conn.executescript(f"PRAGMA incremental_vacuum({pages});")
+            return conn.execute("PRAGMA freelist_count").fetchone()[0]
+        
+        def _checkpoint(conn):
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            conn.execute("PRAGMA optimize")
+        
+        pages, free, auto_vacuum = await self.session_store.read(_stats)
+        result = {"pages": pages, "free_pages": free, "converted": False, "reclaimed_pages": 0}
+        
+        if auto_vacuum != 2:
+            if pages and free / pages >= 0.2:
+                result["converted"] = await asyncio.to_thread(self.session_store.enable_incremental_vacuum)
+                free = 0
+        else:
+            while free > 0 and not budget.exhausted():
+                remaining = await asyncio.wrap_future(self.session_store.submit(
+                    lambda conn, n=min(free, VACUUM_STEP_PAGES): _step(conn, n), PRIORITY_BACKGROUND_WRITE))
+                result["reclaimed_pages"] += free - remaining
+                if remaining >= free:
+                    break
+                free = remaining
+        
+        await asyncio.wrap_future(self.session_store.submit(_checkpoint, PRIORITY_BACKGROUND_WRITE))
+        result["more_pending"] = auto_vacuum == 2 and free > 0 and result["reclaimed_pages"] > 0
+        return result
+
     async def _check_infinite_loop_risk(self, method: str, params: Dict[str, Any]) -> bool:
         """무한루프 위험 체크"""
         try:
             # 최근 10초 내 동일한 요청 횟수 체크
             recent_time = (datetime.now(timezone.utc) - timedelta(seconds=10)).isoformat()
+            tool_name = params.get("name", "") if method == "tools/call" else None
             
-            with sqlite3.connect(str(self.session_db_path)) as conn:
-                cursor = conn.execute('''
+            def _count_recent(conn):
+                count = conn.execute('''
                     SELECT COUNT(*) FROM conversations 
                     WHERE terminal_id = ? AND timestamp > ? 
                     AND json_extract(request_data, '$.method') = ?
-                ''', (self.terminal_id, recent_time, method))
+                ''', (self.terminal_id, recent_time, method)).fetchone()[0]
                 
-                count = cursor.fetchone()[0]
-                
-                # 10초 내 같은 메서드 20회 이상 호출 시 무한루프로 판단
-                if count >= 20:
-                    return True
-                    
-                # 특정 도구의 연속 호출 체크
-                if method == "tools/call":
-                    tool_name = params.get("name", "")
-                    cursor = conn.execute('''
+                tool_count = 0
+                if tool_name is not None:
+                    tool_count = conn.execute('''
                         SELECT COUNT(*) FROM conversations 
                         WHERE terminal_id = ? AND timestamp > ?
                         AND json_extract(request_data, '$.params.name') = ?
-                    ''', (self.terminal_id, recent_time, tool_name))
-                    
-                    tool_count = cursor.fetchone()[0]
-                    if tool_count >= 10:  # 같은 도구 10회 이상
-                        return True
+                    ''', (self.terminal_id, recent_time, tool_name)).fetchone()[0]
+                
+                return count, tool_count
+            
+            count, tool_count = await self.session_store.read(_count_recent, after=self.terminal_id)
+            
+            # 10초 내 같은 메서드 20회 이상 호출 시 무한루프로 판단
+            if count >= 20:
+                return True
+                
+            # 특정 도구의 연속 호출 체크
+            if tool_count >= 10:  # 같은 도구 10회 이상
+                return True
                         
         except Exception as e:
             self.logger.warning(f"무한루프 체크 실패: {e}")
@@ -941,157 +1601,366 @@ class BOOSAANUltimateMCPServer:
         """도구 실행 (추적 정보 포함)"""
         tool_name = params.get("name")
         arguments = params.get("arguments", {})
+        response_format = resolve_response_format(arguments.get("response_format"), self.default_response_format)
         
         # 추적 정보가 있으면 로그에 기록
         if tracking_info:
             self.logger.info(f"[{tracking_info.get('conversation_id')}] 도구 실행: {tool_name}")
         
         try:
-            if tool_name == "sequential_thinking":
-                return await self.sequential_thinking(arguments)
-            elif tool_name == "create_project_context":
-                return await self.create_project_context(arguments)
-            elif tool_name == "update_global_context":
-                return await self.update_global_context(arguments)
-            elif tool_name == "query_context":
-                return await self.query_context(arguments)
-            elif tool_name == "execute_forgetting_cycle":
-                return await self.execute_forgetting_cycle(arguments)
-            elif tool_name == "create_sandbox":
-                return await self.create_sandbox(arguments)
-            elif tool_name == "execute_in_sandbox":
-                return await self.execute_in_sandbox(arguments)
-            elif tool_name == "get_sandbox_status":
-                return await self.get_sandbox_status(arguments)
-            elif tool_name == "destroy_sandbox":
-                return await self.destroy_sandbox(arguments)
-            elif tool_name == "thinking_advancement":
-                return await self.thinking_advancement(arguments)
-            elif tool_name == "process_user_instruction":
-                return await self.process_user_instruction(arguments)
-            elif tool_name == "process_feedback_response":
-                return await self.process_feedback_response(arguments)
-            elif tool_name == "add_user_instruction":
-                return await self.add_user_instruction(arguments)
-            elif tool_name == "add_feature_spec":
-                return await self.add_feature_spec(arguments)
-            elif tool_name == "search_context":
-                return await self.search_context(arguments)
-            elif tool_name == "get_project_summary":
-                return await self.get_project_summary(arguments)
-            elif tool_name == "system_health_check":
-                return await self.system_health_check(arguments)
-            elif tool_name == "performance_metrics":
-                return await self.performance_metrics_tool(arguments)
-            elif tool_name == "get_project_port":
-                return await self.get_project_port_tool(arguments)
-            elif tool_name == "register_new_project":
-                return await self.register_new_project_tool(arguments)
-            elif tool_name == "port_status_summary":
-                return await self.port_status_summary_tool(arguments)
-            elif tool_name == "run_port_forgetting_cycle":
-                return await self.run_port_forgetting_cycle_tool(arguments)
-            elif tool_name == "analyze_user_intention":
-                return await self.analyze_user_intention_tool(arguments)
-            elif tool_name == "check_rule_contamination":
-                return await self.check_rule_contamination_tool(arguments)
-            elif tool_name == "add_rule_with_isolation":
-                return await self.add_rule_with_isolation_tool(arguments)
-            elif tool_name == "get_terminal_session_info":
-                return await self.get_terminal_session_info_tool(arguments)
-            elif tool_name == "search_conversation_history":
-                return await self.search_conversation_history_tool(arguments)
-            elif tool_name == "get_task_history":
-                return await self.get_task_history_tool(arguments)
-            elif tool_name == "restore_previous_context":
-                return await self.restore_previous_context_tool(arguments)
-            elif tool_name == "get_session_statistics":
-                return await self.get_session_statistics_tool(arguments)
-            else:
-                return {"error": f"Unknown tool: {tool_name}"}
+            result = await self._dispatch_tool(tool_name, arguments)
+            
+            # 구조화 결과는 요청된 형식으로 한 번만 변환
+            if isinstance(result, ToolResult):
+                if tracking_info is not None and result.meta:
+                    tracking_info["result_meta"] = result.meta
+                return result.to_response(response_format)
+            
+            return result
                 
         except Exception as e:
             self.logger.error(f"Tool execution error: {e}")
             return {"error": str(e)}
 
+    async def _dispatch_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """도구 이름으로 핸들러 실행 (ToolResult 반환, 사고 도구는 결과 캐시 경유)"""
+        cache_fields = self._thinking_cache_fields(tool_name, arguments)
+        if cache_fields is None or self.thinking_cache is None or not arguments.get("cache", True):
+            return await self._dispatch_handler(tool_name, arguments)
+        
+        cache_key = self.thinking_cache.make_key(tool_name, cache_fields)
+        cached = self.thinking_cache.get(cache_key)
+        if cached is not None:
+            data, age = cached
+            result = ToolResult(tool_name, data, getattr(self, f"_render_{tool_name}"))
+            result.meta.update(cache="hit", cache_age=round(age, 3))
+            return result
+        
+        result = await self._dispatch_handler(tool_name, arguments)
+        if isinstance(result, ToolResult):
+            # 예산 실행 결과는 부분 결과일 수 있으므로 저장하지 않음 (조회는 허용)
+            if arguments.get("latency_budget_ms") is None:
+                self.thinking_cache.put(cache_key, tool_name, result.data)
+            result.meta["cache"] = "miss"
+        return result
+
+    @staticmethod
+    def _thinking_cache_fields(tool_name: str, arguments: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """결과 캐시 키에 들어갈 입력 (기본값을 채워서 생략/명시가 같은 키가 되도록)"""
+        if tool_name == "sequential_thinking":
+            return {
+                "request": arguments.get("request", ""),
+                "context": arguments.get("context") or {}
+            }
+        if tool_name == "thinking_advancement":
+            return {
+                "task_content": arguments.get("task_content", ""),
+                "thinking_mode": arguments.get("thinking_mode", "심층_사고"),
+                "priority": arguments.get("priority", "맥락_우선"),
+                "required_models": sorted(set(arguments.get("required_models", ["분석적_추론", "비판적_추론"]))),
+                "quality_threshold": float(arguments.get("quality_threshold", 0.7))
+            }
+        return None
+
+    async def _dispatch_handler(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """도구 핸들러 호출 (워커 풀 담당 도구는 워커 프로세스로)"""
+        if tool_name == "thinking_advancement" and (
+            self._parallel_models(arguments) or arguments.get("latency_budget_ms") is not None
+        ):
+            return await self.thinking_advancement_parallel(arguments)
+        
+        if self.worker_pool and self.worker_pool.handles(tool_name):
+            data, meta = await self.worker_pool.run(tool_name, arguments)
+            result = ToolResult(tool_name, data, getattr(self, f"_render_{tool_name}"))
+            result.meta.update(meta)
+            return result
+        
+        if tool_name == "sequential_thinking":
+            return await self.sequential_thinking(arguments)
+        elif tool_name == "create_project_context":
+            return await self.create_project_context(arguments)
+        elif tool_name == "update_global_context":
+            return await self.update_global_context(arguments)
+        elif tool_name == "query_context":
+            return await self.query_context(arguments)
+        elif tool_name == "execute_forgetting_cycle":
+            return await self.execute_forgetting_cycle(arguments)
+        elif tool_name == "create_sandbox":
+            return await self.create_sandbox(arguments)
+        elif tool_name == "execute_in_sandbox":
+            return await self.execute_in_sandbox(arguments)
+        elif tool_name == "execute_in_sandbox_batch":
+            return await self.execute_in_sandbox_batch(arguments)
+        elif tool_name == "get_sandbox_status":
+            return await self.get_sandbox_status(arguments)
+        elif tool_name == "destroy_sandbox":
+            return await self.destroy_sandbox(arguments)
+        elif tool_name == "thinking_advancement":
+            return await self.thinking_advancement(arguments)
+        elif tool_name == "process_user_instruction":
+            return await self.process_user_instruction(arguments)
+        elif tool_name == "process_feedback_response":
+            return await self.process_feedback_response(arguments)
+        elif tool_name == "add_user_instruction":
+            return await self.add_user_instruction(arguments)
+        elif tool_name == "add_feature_spec":
+            return await self.add_feature_spec(arguments)
+        elif tool_name == "search_context":
+            return await self.search_context(arguments)
+        elif tool_name == "get_project_summary":
+            return await self.get_project_summary(arguments)
+        elif tool_name == "system_health_check":
+            return await self.system_health_check(arguments)
+        elif tool_name == "performance_metrics":
+            return await self.performance_metrics_tool(arguments)
+        elif tool_name == "get_project_port":
+            return await self.get_project_port_tool(arguments)
+        elif tool_name == "register_new_project":
+            return await self.register_new_project_tool(arguments)
+        elif tool_name == "port_status_summary":
+            return await self.port_status_summary_tool(arguments)
+        elif tool_name == "run_port_forgetting_cycle":
+            return await self.run_port_forgetting_cycle_tool(arguments)
+        elif tool_name == "analyze_user_intention":
+            return await self.analyze_user_intention_tool(arguments)
+        elif tool_name == "check_rule_contamination":
+            return await self.check_rule_contamination_tool(arguments)
+        elif tool_name == "add_rule_with_isolation":
+            return await self.add_rule_with_isolation_tool(arguments)
+        elif tool_name == "get_effective_rules":
+            return await self.get_effective_rules_tool(arguments)
+        elif tool_name == "get_terminal_session_info":
+            return await self.get_terminal_session_info_tool(arguments)
+        elif tool_name == "search_conversation_history":
+            return await self.search_conversation_history_tool(arguments)
+        elif tool_name == "get_task_history":
+            return await self.get_task_history_tool(arguments)
+        elif tool_name == "restore_previous_context":
+            return await self.restore_previous_context_tool(arguments)
+        elif tool_name == "get_session_statistics":
+            return await self.get_session_statistics_tool(arguments)
+        else:
+            return {"error": f"Unknown tool: {tool_name}"}
+
     # === 메타인지 도구 구현 ===
-    async def sequential_thinking(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def sequential_thinking(self, args: Dict[str, Any]) -> ToolResult:
         """Sequential Thinking 실행"""
         request = args["request"]
         context = args.get("context", {})
         
+        if args.get("latency_budget_ms") is not None:
+            return await self._sequential_thinking_budgeted(request, context, args["latency_budget_ms"])
+        
         thinking_sequence = self.meta_cognitive.execute_sequential_thinking(request, context)
         summary = self.meta_cognitive.get_thinking_summary(thinking_sequence)
         
+        data = {
+            "total_stages": summary['total_stages'],
+            "average_uncertainty": summary['average_uncertainty'],
+            "total_biases_detected": summary['total_biases_detected'],
+            "overall_thinking_quality": summary['overall_thinking_quality'],
+            "stages": [
+                {"stage": thinking.stage.value, "uncertainty": thinking.uncertainty}
+                for thinking in thinking_sequence
+            ],
+            "final_recommendation": summary['final_recommendation']
+        }
+        
+        return ToolResult("sequential_thinking", data, self._render_sequential_thinking)
+
+    async def _sequential_thinking_budgeted(self, request: str, context: Dict[str, Any],
+                                            budget_ms: float) -> ToolResult:
+        """예산 안에서 Sequential Thinking 실행
+
+        단계 분할은 MetaCognitiveEngine 내부에 있으므로 엔진 호출 전체가 하나의 단계다.
+        엔진은 스레드에서 실행하고, 예산 초과 시 스레드 결과는 버리고 빈 결과 + 전체 단계를 건너뜀으로 반환
+        """
+        budget = LatencyBudget(budget_ms, self.stage_costs)
+        outcome = None
+        if budget.fits("sequential_thinking"):
+            _, outcome = await budget.run_stage("sequential_thinking", asyncio.to_thread(
+                self._run_budgeted_thinking, request, context, budget.remaining()
+            ))
+        
+        if outcome is None:
+            budget.skipped_stages = [stage.value for stage in ThinkingStage]
+            data = {
+                "total_stages": 0,
+                "average_uncertainty": 1.0,
+                "total_biases_detected": 0,
+                "overall_thinking_quality": 0.0,
+                "stages": [],
+                "final_recommendation": ""
+            }
+        else:
+            thinking_sequence, summary = outcome
+            data = {
+                "total_stages": summary['total_stages'],
+                "average_uncertainty": summary['average_uncertainty'],
+                "total_biases_detected": summary['total_biases_detected'],
+                "overall_thinking_quality": summary['overall_thinking_quality'],
+                "stages": [
+                    {"stage": thinking.stage.value, "uncertainty": thinking.uncertainty}
+                    for thinking in thinking_sequence
+                ],
+                "final_recommendation": summary['final_recommendation']
+            }
+            budget.checkpoint(data)
+        
+        data["latency_budget"] = budget.report()
+        result = ToolResult("sequential_thinking", data, self._render_sequential_thinking)
+        result.meta["budget_exhausted"] = data["latency_budget"]["exhausted"]
+        return result
+
+    @staticmethod
+    def _render_latency_budget(report: Dict[str, Any]) -> str:
+        """지연 시간 예산 요약 텍스트"""
+        result_text = f"\\n⏱️ 지연 시간 예산: {report['elapsed_ms']:.0f}/{report['budget_ms']:.0f}ms"
+        if report['skipped_stages']:
+            result_text += f" (예산 초과, 건너뛴 단계: {', '.join(report['skipped_stages'])})"
+        return result_text + "\\n"
+
+    @staticmethod
+    def _render_sequential_thinking(data: Dict[str, Any]) -> str:
+        """Sequential Thinking 결과 텍스트"""
         result_text = f"🧠 Sequential Thinking 완료\\n\\n"
-        result_text += f"📊 사고 단계: {summary['total_stages']}개\\n"
-        result_text += f"🎯 평균 불확실성: {summary['average_uncertainty']:.2f}\\n"
-        result_text += f"⚠️ 편향 탐지: {summary['total_biases_detected']}개\\n"
-        result_text += f"✨ 사고 품질: {summary['overall_thinking_quality']:.2f}/1.0\\n\\n"
+        result_text += f"📊 사고 단계: {data['total_stages']}개\\n"
+        result_text += f"🎯 평균 불확실성: {data['average_uncertainty']:.2f}\\n"
+        result_text += f"⚠️ 편향 탐지: {data['total_biases_detected']}개\\n"
+        result_text += f"✨ 사고 품질: {data['overall_thinking_quality']:.2f}/1.0\\n\\n"
         
         result_text += "📋 사고 과정:\\n"
-        for i, thinking in enumerate(thinking_sequence, 1):
-            result_text += f"{i}. {thinking.stage.value}: 불확실성 {thinking.uncertainty:.2f}\\n"
+        for i, thinking in enumerate(data['stages'], 1):
+            result_text += f"{i}. {thinking['stage']}: 불확실성 {thinking['uncertainty']:.2f}\\n"
         
-        if summary['final_recommendation']:
-            result_text += f"\\n💡 최종 권고사항:\\n{summary['final_recommendation'][:200]}..."
+        if data.get('latency_budget'):
+            result_text += BOOSAANUltimateMCPServer._render_latency_budget(data['latency_budget'])
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        if data['final_recommendation']:
+            result_text += f"\\n💡 최종 권고사항:\\n{data['final_recommendation'][:200]}..."
+        
+        return result_text
 
     # === 맥락 관리 도구 구현 ===
-    async def create_project_context(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_project_context(self, args: Dict[str, Any]) -> ToolResult:
         """프로젝트 맥락 생성"""
         project_name = args["project_name"]
         project_path = args["project_path"]
         content = args["content"]
         
-        context_id = self.context_manager.update_project_context(project_name, content)
-        
-        result_text = f"📂 프로젝트 맥락 생성 완료\\n\\n"
-        result_text += f"🏷️ 프로젝트: {project_name}\\n"
-        result_text += f"📍 경로: {project_path}\\n"
-        result_text += f"🆔 맥락 ID: {context_id}\\n"
-        result_text += f"📊 맥락 레벨: 프로젝트\\n"
-        result_text += f"💾 메모리 타입: 작업메모리\\n"
+        context_id = await self._call_context_manager(self.context_manager.update_project_context, project_name, content)
+        self.context_index.upsert(context_id, ContextLevel.PROJECT.value, self._index_text(content))
+        self.forgetting_queue.schedule(context_id)
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
+        data = {
+            "project_name": project_name,
+            "project_path": project_path,
+            "context_id": context_id,
+            "context_level": "프로젝트",
+            "memory_type": "작업메모리"
         }
+        
+        return ToolResult("create_project_context", data, self._render_create_project_context)
+
+    @staticmethod
+    def _render_create_project_context(data: Dict[str, Any]) -> str:
+        """프로젝트 맥락 생성 결과 텍스트"""
+        result_text = f"📂 프로젝트 맥락 생성 완료\\n\\n"
+        result_text += f"🏷️ 프로젝트: {data['project_name']}\\n"
+        result_text += f"📍 경로: {data['project_path']}\\n"
+        result_text += f"🆔 맥락 ID: {data['context_id']}\\n"
+        result_text += f"📊 맥락 레벨: {data['context_level']}\\n"
+        result_text += f"💾 메모리 타입: {data['memory_type']}\\n"
+        return result_text
 
-    async def update_global_context(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _index_text(content: Any) -> str:
+        """검색 색인에 넣을 맥락 내용 텍스트"""
+        if isinstance(content, str):
+            return content
+        return json.dumps(content, ensure_ascii=False, default=str)
+
+    async def update_global_context(self, args: Dict[str, Any]) -> ToolResult:
         """전역 맥락 업데이트"""
         content = args["content"]
         
-        context_id = self.context_manager.update_global_context(content)
+        context_id = await self._call_context_manager(self.context_manager.update_global_context, content)
+        self.context_index.upsert(context_id, ContextLevel.GLOBAL.value, self._index_text(content))
+        self.forgetting_queue.schedule(context_id)
+        
+        data = {
+            "context_id": context_id,
+            "context_level": "전역",
+            "memory_type": "장기메모리",
+            "created_at": time.strftime('%Y-%m-%d %H:%M:%S')
+        }
         
+        return ToolResult("update_global_context", data, self._render_update_global_context)
+
+    @staticmethod
+    def _render_update_global_context(data: Dict[str, Any]) -> str:
+        """전역 맥락 업데이트 결과 텍스트"""
         result_text = f"🌐 전역 맥락 업데이트 완료\\n\\n"
-        result_text += f"🆔 맥락 ID: {context_id}\\n"
-        result_text += f"📊 맥락 레벨: 전역\\n"
-        result_text += f"💾 메모리 타입: 장기메모리\\n"
-        result_text += f"⏰ 생성 시간: {time.strftime('%Y-%m-%d %H:%M:%S')}\\n"
+        result_text += f"🆔 맥락 ID: {data['context_id']}\\n"
+        result_text += f"📊 맥락 레벨: {data['context_level']}\\n"
+        result_text += f"💾 메모리 타입: {data['memory_type']}\\n"
+        result_text += f"⏰ 생성 시간: {data['created_at']}\\n"
+        return result_text
+
+    async def _call_context_manager(self, method: Callable[..., Any], *args) -> Any:
+        """맥락 관리자 메서드를 잠금 안에서 스레드로 실행 (백그라운드 망각 사이클과 직렬화)"""
+        def _call():
+            with self._context_manager_lock:
+                return method(*args)
+        return await asyncio.to_thread(_call)
+
+    def _scan_context_nodes(self) -> List[Tuple[Optional[str], str, str]]:
+        """맥락 관리자의 전체 노드 [(노드 ID 또는 None, 레벨, 색인 텍스트)] (전체 스캔)"""
+        matches = self.context_manager.query_context(ContextQuery(query_text="", relevance_threshold=0.0))
+        return [
+            (self._match_context_id(match), match.level.value, self._index_text(match.content))
+            for match in matches
+        ]
+
+    @staticmethod
+    def _match_context_id(match: Any) -> Optional[str]:
+        """검색 결과의 관리자 노드 ID (관리자 버전에 따라 없을 수 있음)"""
+        for attr in ("context_id", "node_id", "id"):
+            value = getattr(match, attr, None)
+            if value is not None:
+                return str(value)
+        return None
+
+    def _backfill_context_index(self) -> bool:
+        """색인 도입 전 노드를 검색 색인에 채움 → 색인이 관리자 노드를 모두 포함하면 True
+
+        관리자가 노드 ID 를 노출하지 않으면 (레벨, 내용) 해시로 ID 를 만들고, 스캔 결과 수가
+        관리자 요약의 노드 수와 맞을 때만 완료 표시 (그 전까지 query_context 는 관리자 스캔과 병합).
+        """
+        marker = self.workspace / 'context_hierarchy' / 'retrieval_index.backfilled'
+        if marker.exists():
+            return True
+        try:
+            nodes = self._scan_context_nodes()
+            expected = self.context_manager.get_context_summary().get("total_nodes")
+        except Exception as e:
+            self.logger.warning(f"맥락 색인 백필 실패 (관리자 스캔과 병합 검색): {e}")
+            return False
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        for node_id, level, content in nodes:
+            if self.context_index.find_content(level, content) is not None:
+                continue
+            context_id = node_id or "legacy_" + hashlib.sha1(f"{level}\0{content}".encode()).hexdigest()[:16]
+            self.context_index.upsert(context_id, level, content)
+            self.forgetting_queue.schedule(context_id)
+        
+        if expected is not None and len(nodes) < expected:
+            self.logger.warning(f"맥락 색인 백필 불완전: {len(nodes)}/{expected}개 (관리자 스캔과 병합 검색)")
+            return False
+        marker.touch()
+        return True
 
-    async def query_context(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def query_context(self, args: Dict[str, Any]) -> ToolResult:
         """맥락 검색"""
         query_text = args["query_text"]
         context_level_str = args.get("context_level")
@@ -1108,47 +1977,107 @@ class BOOSAANUltimateMCPServer:
             }
             context_level = level_mapping.get(context_level_str)
         
-        query = ContextQuery(
-            query_text=query_text,
-            context_level=context_level,
-            relevance_threshold=relevance_threshold
+        # BM25 역색인: 레벨 포스팅만 조회하고 상위 5개만 생성
+        total_results, top = self.context_index.search(
+            query_text, context_level.value if context_level else None, k=5, threshold=relevance_threshold
         )
+        results = []
+        for context_id, score in top:
+            node = self.context_index.get(context_id)
+            results.append({
+                "context_id": context_id,
+                "level": node["level"],
+                "relevance_score": score,
+                "content": node["content"]
+            })
+        
+        if not self.context_index_complete:
+            # 백필이 끝나기 전에는 색인에 없는 관리자 노드를 기존 전체 스캔으로 보충
+            query = ContextQuery(
+                query_text=query_text,
+                context_level=context_level,
+                relevance_threshold=relevance_threshold
+            )
+            missing = [
+                result for result in await self._call_context_manager(self.context_manager.query_context, query)
+                if self.context_index.find_content(result.level.value, self._index_text(result.content)) is None
+            ]
+            total_results += len(missing)
+            results.extend(
+                {
+                    "level": result.level.value,
+                    "relevance_score": result.relevance_score,
+                    "content": str(result.content)
+                }
+                for result in missing[:max(0, 5 - len(results))]
+            )
         
-        results = self.context_manager.query_context(query)
+        data = {
+            "query_text": query_text,
+            "relevance_threshold": relevance_threshold,
+            "total_results": total_results,
+            "results": results
+        }
         
+        return ToolResult("query_context", data, self._render_query_context)
+
+    @staticmethod
+    def _render_query_context(data: Dict[str, Any]) -> str:
+        """맥락 검색 결과 텍스트"""
         result_text = f"🔍 맥락 검색 완료\\n\\n"
-        result_text += f"🔎 검색어: {query_text}\\n"
-        result_text += f"📊 검색 결과: {len(results)}개\\n"
-        result_text += f"🎯 관련성 임계값: {relevance_threshold}\\n\\n"
+        result_text += f"🔎 검색어: {data['query_text']}\\n"
+        result_text += f"📊 검색 결과: {data['total_results']}개\\n"
+        result_text += f"🎯 관련성 임계값: {data['relevance_threshold']}\\n\\n"
         
-        if results:
+        if data['results']:
             result_text += "📋 검색 결과:\\n"
-            for i, result in enumerate(results[:5], 1):
-                result_text += f"{i}. [{result.level.value}] 관련성: {result.relevance_score:.2f}\\n"
-                result_text += f"   내용: {str(result.content)[:100]}...\\n\\n"
+            for i, result in enumerate(data['results'], 1):
+                result_text += f"{i}. [{result['level']}] 관련성: {result['relevance_score']:.2f}\\n"
+                result_text += f"   내용: {result['content'][:100]}...\\n\\n"
         else:
             result_text += "❌ 검색 결과가 없습니다.\\n"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return result_text
 
-    async def execute_forgetting_cycle(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute_forgetting_cycle(self, args: Dict[str, Any]) -> ToolResult:
         """8차원 망각 사이클 실행"""
-        stats = self.context_manager.execute_forgetting_cycle()
-        
-        result_text = f"🧠 8차원 망각 사이클 완료\\n\\n"
-        result_text += f"📊 평가된 노드: {stats['evaluated_nodes']}개\\n"
-        result_text += f"🗑️ 망각된 노드: {stats['forgotten_nodes']}개\\n"
-        result_text += f"💾 보존된 노드: {stats['preserved_nodes']}개\\n"
-        result_text += f"🔄 업데이트된 노드: {stats['updated_scores']}개\\n\\n"
+        # 우선순위 큐로 만료 후보를 고르고, 후보가 있을 때만 관리자의 다차원 망각 실행
+        stats = await self._run_context_forgetting(asyncio.to_thread, full_scan=bool(args.get("full_scan")))
         
         forgetting_rate = stats['forgotten_nodes'] / stats['evaluated_nodes'] * 100 if stats['evaluated_nodes'] > 0 else 0
+        
+        data = {
+            "evaluated_nodes": stats['evaluated_nodes'],
+            "forgotten_nodes": stats['forgotten_nodes'],
+            "preserved_nodes": stats['preserved_nodes'],
+            "updated_scores": stats['updated_scores'],
+            "forgetting_rate": forgetting_rate,
+            "queued_nodes": stats['queued_nodes'],
+            "next_expiry": stats['next_expiry'],
+            "manager_cycle": stats['manager_cycle']
+        }
+        
+        return ToolResult("execute_forgetting_cycle", data, self._render_execute_forgetting_cycle)
+
+    @staticmethod
+    def _render_execute_forgetting_cycle(data: Dict[str, Any]) -> str:
+        """망각 사이클 결과 텍스트"""
+        result_text = f"🧠 8차원 망각 사이클 완료\\n\\n"
+        result_text += f"📊 평가된 노드: {data['evaluated_nodes']}개\\n"
+        result_text += f"🗑️ 망각된 노드: {data['forgotten_nodes']}개\\n"
+        result_text += f"💾 보존된 노드: {data['preserved_nodes']}개\\n"
+        result_text += f"🔄 업데이트된 노드: {data['updated_scores']}개\\n"
+        result_text += f"⏳ 대기 중인 노드: {data['queued_nodes']}개"
+        if data.get("next_expiry"):
+            next_expiry = datetime.fromtimestamp(data["next_expiry"], timezone.utc).strftime("%Y-%m-%d %H:%M")
+            result_text += f" (다음 만료 예상: {next_expiry} UTC)"
+        result_text += "\\n\\n"
+        
+        manager_cycle = data.get("manager_cycle")
+        if manager_cycle:
+            result_text += f"🗂️ 맥락 계층 다차원 망각: {manager_cycle['evaluated_nodes']}개 평가, {manager_cycle['forgotten_nodes']}개 망각\\n\\n"
+        
+        forgetting_rate = data['forgetting_rate']
         result_text += f"📈 망각률: {forgetting_rate:.1f}%\\n"
         
         if forgetting_rate > 50:
@@ -1156,23 +2085,17 @@ class BOOSAANUltimateMCPServer:
         elif forgetting_rate < 10:
             result_text += "✅ 낮은 망각률 - 메모리 효율성 양호\\n"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return result_text
 
     # === 샌드박스 도구 구현 ===
-    async def create_sandbox(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def create_sandbox(self, args: Dict[str, Any]) -> ToolResult:
         """샌드박스 생성"""
         sandbox_id = args["sandbox_id"]
         project_path = args["project_path"]
         permission_level_str = args.get("permission_level", "샌드박스_레벨")
         network_allowed = args.get("network_allowed", False)
         time_limit = args.get("time_limit", 300)
+        workspace_strategy = args.get("workspace_strategy", "none")
         
         # 문자열을 PermissionLevel enum으로 변환
         permission_mapping = {
@@ -1184,176 +2107,449 @@ class BOOSAANUltimateMCPServer:
         }
         permission_level = permission_mapping.get(permission_level_str, PermissionLevel.SANDBOX)
         
-        config = SandboxConfig(
-            sandbox_id=sandbox_id,
-            project_path=project_path,
-            allowed_paths=[project_path],
-            forbidden_paths=["/System", "/usr", "/etc"],
-            permission_level=permission_level,
-            resource_limits={
-                "cpu_percent": 30,
-                "memory_mb": 512,
-                "process_count": 5
-            },
-            network_allowed=network_allowed,
-            time_limit=time_limit,
-            auto_cleanup=True
-        )
+        resource_limits = {
+            "cpu_percent": 30,
+            "memory_mb": 512,
+            "process_count": 5
+        }
+        forbidden_paths = ["/System", "/usr", "/etc"]
+        
+        if workspace_strategy not in ("none", "auto", *WORKSPACE_STRATEGIES):
+            data = {
+                "status": "FAILED",
+                "sandbox_id": sandbox_id,
+                "reason": f"지원하지 않는 작업 공간 전략: {workspace_strategy}",
+                "risk_assessment": None
+            }
+            return ToolResult("create_sandbox", data, self._render_create_sandbox)
+        
+        if self.sandbox_pool and self.sandbox_pool.is_reserved(sandbox_id):
+            data = {
+                "status": "FAILED",
+                "sandbox_id": sandbox_id,
+                "reason": f"이미 사용 중이거나 예약된 샌드박스 ID: {sandbox_id}",
+                "risk_assessment": None
+            }
+            return ToolResult("create_sandbox", data, self._render_create_sandbox)
         
-        result = self.sandbox_manager.create_sandbox(config)
+        # 요청 시 프로젝트 트리를 샌드박스 전용 작업 공간으로 복제 (원본은 수정되지 않음)
+        workspace = None
+        sandbox_path = project_path
+        if workspace_strategy != "none":
+            try:
+                workspace = await asyncio.to_thread(
+                    self.workspace_provisioner.provision, sandbox_id, project_path, workspace_strategy
+                )
+            except (OSError, ValueError) as e:
+                data = {
+                    "status": "FAILED",
+                    "sandbox_id": sandbox_id,
+                    "reason": f"작업 공간 복제 실패: {e}",
+                    "risk_assessment": None
+                }
+                return ToolResult("create_sandbox", data, self._render_create_sandbox)
+            sandbox_path = workspace.path
+        
+        def make_config(config_sandbox_id: str) -> SandboxConfig:
+            return SandboxConfig(
+                sandbox_id=config_sandbox_id,
+                project_path=sandbox_path,
+                allowed_paths=[sandbox_path],
+                forbidden_paths=list(forbidden_paths),
+                permission_level=permission_level,
+                resource_limits=dict(resource_limits),
+                network_allowed=network_allowed,
+                time_limit=time_limit,
+                auto_cleanup=True
+            )
         
-        if result["status"] == "SUCCESS":
-            result_text = f"🔒 샌드박스 생성 완료\\n\\n"
-            result_text += f"🆔 샌드박스 ID: {sandbox_id}\\n"
-            result_text += f"📂 프로젝트 경로: {project_path}\\n"
-            result_text += f"🔐 권한 레벨: {permission_level_str}\\n"
-            result_text += f"🌐 네트워크 허용: {'예' if network_allowed else '아니오'}\\n"
-            result_text += f"⏱️ 시간 제한: {time_limit}초\\n"
-            result_text += f"📊 위험도: {result['risk_assessment']['risk_level']}\\n"
+        if self.sandbox_pool and workspace is None:
+            # 같은 권한/리소스 프로필의 웜 샌드박스 임대
+            profile_key = (permission_level.value, network_allowed, time_limit, project_path)
+            result = await asyncio.to_thread(self.sandbox_pool.acquire, sandbox_id, profile_key, make_config)
+        else:
+            result = await asyncio.to_thread(self.sandbox_manager.create_sandbox, make_config(sandbox_id))
+        
+        enforced_limits = {}
+        if result["status"] != "SUCCESS" and workspace:
+            await asyncio.to_thread(self.workspace_provisioner.release, sandbox_id)
+        elif result["status"] == "SUCCESS":
+            target_id = self.sandbox_pool.resolve(sandbox_id) if self.sandbox_pool else sandbox_id
+            
+            # 비동기 실행 엔진이 직접 실행할 수 있도록 설정 등록
+            self.sandbox_executor.register(SandboxSpec(
+                sandbox_id=target_id,
+                cwd=sandbox_path,
+                time_limit=time_limit,
+                forbidden_paths=list(forbidden_paths),
+                resource_limits=dict(resource_limits),
+                permission_level=permission_level.value
+            ))
             
+            # 실사용량 계측 (cgroup v2 가능 시 제한도 커널에서 적용) — async 엔진이 직접 실행하는 프로세스만
+            # 계측할 수 있으므로 manager 엔진에서는 관리자의 resource_usage 를 그대로 사용
+            if self.sandbox_executor.native:
+                enforced_limits = self.resource_accountant.create_group(target_id, resource_limits)
+        
+        data = {
+            "status": result["status"],
+            "sandbox_id": sandbox_id,
+            "project_path": project_path,
+            "permission_level": permission_level_str,
+            "network_allowed": network_allowed,
+            "time_limit": time_limit,
+            "resource_limits": resource_limits,
+            "reason": result.get("reason"),
+            "risk_assessment": result.get("risk_assessment"),
+            "pooled": result.get("pooled", False),
+            "accounting_backend": self.resource_accountant.backend if self.sandbox_executor.native else None,
+            "enforced_limits": [name for name, applied in enforced_limits.items() if applied],
+            "workspace": workspace.to_dict() if workspace and result["status"] == "SUCCESS" else None
+        }
+        
+        return ToolResult("create_sandbox", data, self._render_create_sandbox)
+
+    @staticmethod
+    def _render_create_sandbox(data: Dict[str, Any]) -> str:
+        """샌드박스 생성 결과 텍스트"""
+        if data["status"] == "SUCCESS":
+            limits = data["resource_limits"]
+            result_text = f"🔒 샌드박스 생성 완료\\n\\n"
+            result_text += f"🆔 샌드박스 ID: {data['sandbox_id']}\\n"
+            result_text += f"📂 프로젝트 경로: {data['project_path']}\\n"
+            result_text += f"🔐 권한 레벨: {data['permission_level']}\\n"
+            result_text += f"🌐 네트워크 허용: {'예' if data['network_allowed'] else '아니오'}\\n"
+            result_text += f"⏱️ 시간 제한: {data['time_limit']}초\\n"
+            result_text += f"📊 위험도: {data['risk_assessment']['risk_level']}\\n"
+            if data.get("pooled"):
+                result_text += f"♨️ 웜 풀에서 즉시 할당\\n"
+            workspace = data.get("workspace")
+            if workspace:
+                result_text += f"🧬 작업 공간: {workspace['path']} ({workspace['strategy']}, {workspace['files']:,}개 파일, {workspace['seconds']:.2f}초)\\n"
+        
             # 리소스 제한 표시
             result_text += f"\\n💻 리소스 제한:\\n"
-            result_text += f"  • CPU: 30%\\n"
-            result_text += f"  • 메모리: 512MB\\n"
-            result_text += f"  • 프로세스: 5개\\n"
+            result_text += f"  • CPU: {limits['cpu_percent']}%\\n"
+            result_text += f"  • 메모리: {limits['memory_mb']}MB\\n"
+            result_text += f"  • 프로세스: {limits['process_count']}개\\n"
+            
+            enforced = ", ".join(data.get("enforced_limits") or []) or "없음"
+            result_text += f"  • 계측: {data.get('accounting_backend') or '관리자 보고값 (async 엔진에서만 직접 계측)'} (커널 적용 제한: {enforced})\\n"
         else:
             result_text = f"❌ 샌드박스 생성 실패\\n\\n"
-            result_text += f"🚫 사유: {result.get('reason', '알 수 없는 오류')}\\n"
-            if 'risk_assessment' in result:
-                result_text += f"📊 위험도: {result['risk_assessment']['total_risk']}/50\\n"
+            result_text += f"🚫 사유: {data['reason'] or '알 수 없는 오류'}\\n"
+            if data['risk_assessment']:
+                result_text += f"📊 위험도: {data['risk_assessment']['total_risk']}/50\\n"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return result_text
 
-    async def execute_in_sandbox(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute_in_sandbox(self, args: Dict[str, Any]) -> ToolResult:
         """샌드박스 내 명령 실행"""
         sandbox_id = args["sandbox_id"]
         command = args["command"]
         input_data = args.get("input_data")
+        env = {str(name): str(value) for name, value in (args.get("env") or {}).items()}
+        
+        target_id = self.sandbox_pool.resolve(sandbox_id) if self.sandbox_pool else sandbox_id
+        
+        # opt-in 결과 캐시: 명령/환경/권한/입력 파일 내용이 같으면 저장된 결과 반환
+        result = None
+        cache = None
+        cache_key = None
+        if args.get("cache") and self.exec_cache:
+            spec = self.sandbox_executor.get_spec(target_id)
+            if not args.get("input_files"):
+                # 입력을 선언하지 않으면 같은 명령이라도 작업 트리에 따라 결과가 다를 수 있음
+                cache = {"status": "unavailable", "message": "input_files 를 선언한 명령만 캐시"}
+            elif spec is None:
+                cache = {"status": "unavailable"}
+            else:
+                try:
+                    cache_key = await asyncio.to_thread(
+                        self.exec_cache.make_key, command, env, spec.permission_level, spec.cwd,
+                        args.get("input_files") or [], input_data
+                    )
+                except (OSError, ValueError) as e:
+                    cache = {"status": "error", "message": str(e)}
+                else:
+                    result = await asyncio.to_thread(self.exec_cache.get, cache_key)
+                    cache = {"status": "hit" if result else "miss"}
         
-        result = self.sandbox_manager.execute_in_sandbox(sandbox_id, command, input_data)
+        if result is not None:
+            result = dict(result, status="SUCCESS")
+        else:
+            result = await self.sandbox_executor.execute(target_id, command, input_data, env)
+            if cache_key and result["status"] == "SUCCESS":
+                await asyncio.to_thread(self.exec_cache.put, cache_key, command, result)
+                cache["status"] = "stored"
+        
+        data = {
+            "status": result["status"],
+            "sandbox_id": sandbox_id,
+            "command": command,
+            "return_code": result.get("return_code"),
+            "execution_time": result.get("execution_time", 0),
+            "stdout": result.get("stdout", ""),
+            "stderr": result.get("stderr", ""),
+            "resource_usage": result.get("resource_usage"),
+            "reason": result.get("reason"),
+            "message": result.get("message"),
+            "execution_id": result.get("execution_id"),
+            "output": result.get("output"),
+            "cache": dict(cache, cached_at=result.get("cached_at")) if cache else None
+        }
         
-        if result["status"] == "SUCCESS":
+        return ToolResult("execute_in_sandbox", data, self._render_execute_in_sandbox)
+
+    @staticmethod
+    def _excerpt(text: str, limit: int) -> str:
+        """긴 출력은 앞/뒤를 함께 보여줌 (마지막 줄이 보통 가장 중요)"""
+        if len(text) <= limit:
+            return text
+        head = limit // 3
+        return f"{text[:head]}\\n...\\n{text[-(limit - head):]}"
+
+    @staticmethod
+    def _render_execute_in_sandbox(data: Dict[str, Any]) -> str:
+        """샌드박스 명령 실행 결과 텍스트"""
+        sandbox_id = data["sandbox_id"]
+        command = data["command"]
+        
+        if data["status"] == "SUCCESS":
+            return_code = data['return_code'] if data['return_code'] is not None else 'N/A'
             result_text = f"✅ 명령 실행 완료\\n\\n"
             result_text += f"🆔 샌드박스: {sandbox_id}\\n"
             result_text += f"💻 명령어: {command}\\n"
-            result_text += f"🔢 반환 코드: {result.get('return_code', 'N/A')}\\n"
-            result_text += f"⏱️ 실행 시간: {result.get('execution_time', 0):.2f}초\\n\\n"
-            
-            if result.get("stdout"):
-                result_text += f"📤 출력:\\n{result['stdout'][:500]}\\n\\n"
-            
-            if result.get("stderr"):
-                result_text += f"⚠️ 오류:\\n{result['stderr'][:300]}\\n\\n"
-            
+            result_text += f"🔢 반환 코드: {return_code}\\n"
+            result_text += f"⏱️ 실행 시간: {data['execution_time']:.2f}초\\n"
+            cache = data.get("cache")
+            if cache and cache["status"] == "hit":
+                cached_at = datetime.fromtimestamp(cache["cached_at"], timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                result_text += f"♻️ 캐시 적중 (실행 생략, {cached_at} UTC 결과)\\n"
+            elif cache:
+                result_text += f"♻️ 캐시: {cache['status']}{' - ' + cache['message'] if cache.get('message') else ''}\\n"
+            result_text += "\\n"
+        
+            if data["stdout"]:
+                result_text += f"📤 출력:\\n{BOOSAANUltimateMCPServer._excerpt(data['stdout'], 500)}\\n\\n"
+        
+            if data["stderr"]:
+                result_text += f"⚠️ 오류:\\n{BOOSAANUltimateMCPServer._excerpt(data['stderr'], 300)}\\n\\n"
+        
+            # 잘린 출력은 전체 로그 리소스로 조회
+            output = data.get("output") or {}
+            if data.get("execution_id") and any(info["truncated"] for info in output.values()):
+                for stream, info in output.items():
+                    result_text += f"📄 전체 {stream} ({info['total_bytes']:,} bytes): sandbox://executions/{data['execution_id']}/{stream}\\n"
+                result_text += "\\n"
+        
             # 리소스 사용량
-            if result.get("resource_usage"):
-                usage = result["resource_usage"]
+            if data["resource_usage"]:
+                usage = data["resource_usage"]
                 result_text += f"📊 리소스 사용량:\\n"
                 result_text += f"  • CPU: {usage.get('cpu_percent', 0):.1f}%\\n"
                 result_text += f"  • 메모리: {usage.get('memory_mb', 0):.1f}MB\\n"
-                
-        elif result["status"] == "BLOCKED":
+        
+        elif data["status"] == "BLOCKED":
             result_text = f"🚫 명령 실행 차단\\n\\n"
             result_text += f"🆔 샌드박스: {sandbox_id}\\n"
             result_text += f"💻 명령어: {command}\\n"
-            result_text += f"🚨 차단 사유: {result.get('reason', '알 수 없음')}\\n"
-            
-        elif result["status"] == "TIMEOUT":
+            result_text += f"🚨 차단 사유: {data['reason'] or '알 수 없음'}\\n"
+        
+        elif data["status"] == "TIMEOUT":
             result_text = f"⏰ 명령 실행 시간 초과\\n\\n"
             result_text += f"🆔 샌드박스: {sandbox_id}\\n"
             result_text += f"💻 명령어: {command}\\n"
-            result_text += f"📝 메시지: {result.get('message', '')}\\n"
-            
+            result_text += f"📝 메시지: {data['message'] or ''}\\n"
+        
         else:
             result_text = f"❌ 명령 실행 실패\\n\\n"
             result_text += f"🆔 샌드박스: {sandbox_id}\\n"
             result_text += f"💻 명령어: {command}\\n"
-            result_text += f"📝 오류: {result.get('message', '알 수 없는 오류')}\\n"
+            result_text += f"📝 오류: {data['message'] or '알 수 없는 오류'}\\n"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return result_text
 
-    async def get_sandbox_status(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute_in_sandbox_batch(self, args: Dict[str, Any]) -> ToolResult:
+        """샌드박스 일괄 실행 (샌드박스 목록 × 명령 목록)"""
+        sandbox_ids = list(args["sandbox_ids"])
+        commands = list(args["commands"])
+        input_data = args.get("input_data")
+        
+        jobs = [(sandbox_id, command) for sandbox_id in sandbox_ids for command in commands]
+        data = {"total_jobs": len(jobs), "max_jobs": MAX_BATCH_JOBS}
+        
+        if not jobs or len(jobs) > MAX_BATCH_JOBS:
+            data["status"] = "INVALID"
+            return ToolResult("execute_in_sandbox_batch", data, self._render_execute_in_sandbox_batch)
+        
+        resolve = self.sandbox_pool.resolve if self.sandbox_pool else (lambda sandbox_id: sandbox_id)
+        start = time.time()
+        results = await self.sandbox_executor.execute_many(
+            [(resolve(sandbox_id), command, input_data) for sandbox_id, command in jobs]
+        )
+        wall_time = time.time() - start
+        
+        data["results"] = [
+            {
+                "sandbox_id": sandbox_id,
+                "command": command,
+                "status": result.get("status", "ERROR"),
+                "return_code": result.get("return_code"),
+                "execution_time": result.get("execution_time", 0),
+                "stdout": result.get("stdout", ""),
+                "stderr": result.get("stderr", ""),
+                "reason": result.get("reason"),
+                "message": result.get("message")
+            }
+            for (sandbox_id, command), result in zip(jobs, results)
+        ]
+        succeeded = sum(1 for r in data["results"] if r["status"] == "SUCCESS" and r["return_code"] == 0)
+        data.update({
+            "status": "SUCCESS",
+            "succeeded": succeeded,
+            "failed": len(jobs) - succeeded,
+            "wall_time": wall_time,
+            "total_execution_time": sum(r["execution_time"] for r in data["results"])
+        })
+        
+        return ToolResult("execute_in_sandbox_batch", data, self._render_execute_in_sandbox_batch)
+
+    @staticmethod
+    def _render_execute_in_sandbox_batch(data: Dict[str, Any]) -> str:
+        """샌드박스 일괄 실행 결과 텍스트"""
+        if data["status"] == "INVALID":
+            result_text = f"❌ 일괄 실행 요청 오류\\n\\n"
+            result_text += f"📋 작업 수: {data['total_jobs']}개 (허용: 1~{data['max_jobs']}개)\\n"
+            return result_text
+        
+        result_text = f"🧪 샌드박스 일괄 실행 완료\\n\\n"
+        result_text += f"📋 작업: {data['total_jobs']}개 | ✅ 성공 {data['succeeded']}개 | ❌ 실패 {data['failed']}개\\n"
+        result_text += f"⏱️ 전체 소요: {data['wall_time']:.2f}초 (누적 실행 {data['total_execution_time']:.2f}초)\\n\\n"
+        
+        for i, job in enumerate(data["results"], 1):
+            icon = "✅" if job["status"] == "SUCCESS" and job["return_code"] == 0 else "❌"
+            return_code = job['return_code'] if job['return_code'] is not None else 'N/A'
+            result_text += f"{i}. {icon} [{job['sandbox_id']}] {job['command']}\\n"
+            result_text += f"   상태: {job['status']} | 반환 코드: {return_code} | {job['execution_time']:.2f}초\\n"
+        
+            if job["status"] == "SUCCESS":
+                if job["stdout"]:
+                    result_text += f"   📤 {BOOSAANUltimateMCPServer._excerpt(job['stdout'], 200)}\\n"
+                if job["stderr"]:
+                    result_text += f"   ⚠️ {BOOSAANUltimateMCPServer._excerpt(job['stderr'], 120)}\\n"
+            else:
+                result_text += f"   📝 {job['reason'] or job['message'] or '알 수 없는 오류'}\\n"
+        
+        return result_text
+
+    async def get_sandbox_status(self, args: Dict[str, Any]) -> ToolResult:
         """샌드박스 상태 조회"""
         sandbox_id = args["sandbox_id"]
         
-        status = self.sandbox_manager.get_sandbox_status(sandbox_id)
+        target_id = self.sandbox_pool.resolve(sandbox_id) if self.sandbox_pool else sandbox_id
+        status = await asyncio.to_thread(self.sandbox_manager.get_sandbox_status, target_id)
+        
+        data = dict(status)
+        data["sandbox_id"] = sandbox_id
         
-        if status["status"] == "ACTIVE":
+        # 계측한 프로세스가 있는 샌드박스만 실제 카운터 기반 사용량으로 대체 (없으면 관리자 값 유지)
+        live_usage = self.resource_accountant.usage(target_id)
+        if live_usage:
+            data["resource_usage"] = dict(data.get("resource_usage") or {}, **live_usage)
+        
+        return ToolResult("get_sandbox_status", data, self._render_get_sandbox_status)
+
+    @staticmethod
+    def _render_get_sandbox_status(data: Dict[str, Any]) -> str:
+        """샌드박스 상태 결과 텍스트"""
+        sandbox_id = data["sandbox_id"]
+        
+        if data["status"] == "ACTIVE":
             result_text = f"🟢 샌드박스 활성 상태\\n\\n"
             result_text += f"🆔 샌드박스 ID: {sandbox_id}\\n"
-            result_text += f"🔐 권한 레벨: {status['permission_level']}\\n"
-            result_text += f"🌐 네트워크 허용: {'예' if status['network_allowed'] else '아니오'}\\n"
-            result_text += f"🗑️ 자동 정리: {'예' if status['auto_cleanup'] else '아니오'}\\n\\n"
-            
+            result_text += f"🔐 권한 레벨: {data['permission_level']}\\n"
+            result_text += f"🌐 네트워크 허용: {'예' if data['network_allowed'] else '아니오'}\\n"
+            result_text += f"🗑️ 자동 정리: {'예' if data['auto_cleanup'] else '아니오'}\\n\\n"
+        
             # 프로세스 정보
             result_text += f"⚙️ 프로세스 상태:\\n"
-            result_text += f"  • 활성: {status['active_processes']}개\\n"
-            result_text += f"  • 총계: {status['total_processes']}개\\n\\n"
-            
+            result_text += f"  • 활성: {data['active_processes']}개\\n"
+            result_text += f"  • 총계: {data['total_processes']}개\\n\\n"
+        
             # 리소스 사용량
-            usage = status.get("resource_usage", {})
-            limits = status.get("resource_limits", {})
-            
+            usage = data.get("resource_usage", {})
+            limits = data.get("resource_limits", {})
+        
             result_text += f"📊 리소스 현황:\\n"
             result_text += f"  • CPU: {usage.get('cpu_percent', 0):.1f}% / {limits.get('cpu_percent', 0)}%\\n"
             result_text += f"  • 메모리: {usage.get('memory_mb', 0):.1f}MB / {limits.get('memory_mb', 0)}MB\\n"
             result_text += f"  • 디스크: {usage.get('disk_usage_mb', 0):.1f}MB\\n"
-            
+        
         else:
             result_text = f"🔴 샌드박스를 찾을 수 없음\\n\\n"
             result_text += f"🆔 샌드박스 ID: {sandbox_id}\\n"
-            result_text += f"📝 상태: {status['status']}\\n"
+            result_text += f"📝 상태: {data['status']}\\n"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return result_text
 
-    async def destroy_sandbox(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    def _list_sandboxes(self) -> Dict[str, Any]:
+        """샌드박스 목록 (대기 중인 풀 샌드박스 제외, 비동기 핸들러에서는 스레드로 호출)"""
+        sandbox_list = self.sandbox_manager.list_sandboxes()
+        return self.sandbox_pool.filter_listing(sandbox_list) if self.sandbox_pool else sandbox_list
+
+    async def destroy_sandbox(self, args: Dict[str, Any]) -> ToolResult:
         """샌드박스 삭제"""
         sandbox_id = args["sandbox_id"]
         
-        result = self.sandbox_manager.destroy_sandbox(sandbox_id)
+        if self.sandbox_pool and sandbox_id.startswith(POOL_ID_PREFIX):
+            data = {"status": "FAILED", "sandbox_id": sandbox_id, "terminated_processes": 0,
+                    "cleaned_up": False, "recycled": False, "message": "풀 내부 샌드박스는 직접 삭제할 수 없음"}
+            return ToolResult("destroy_sandbox", data, self._render_destroy_sandbox)
+        
+        target_id = self.sandbox_pool.resolve(sandbox_id) if self.sandbox_pool else sandbox_id
+        self.sandbox_executor.unregister(target_id)
+        self.resource_accountant.remove_group(target_id)
+        
+        # 풀 샌드박스는 반환만 하고 초기화/재생성은 백그라운드에서
+        result = self.sandbox_pool.release(sandbox_id) if self.sandbox_pool else None
+        if result is None:
+            result = await asyncio.to_thread(self.sandbox_manager.destroy_sandbox, sandbox_id)
+        
+        # 복제한 작업 공간 삭제 (overlay 는 언마운트)
+        if self.workspace_provisioner.get(sandbox_id):
+            await asyncio.to_thread(self.workspace_provisioner.release, sandbox_id)
+        
+        data = {
+            "status": result["status"],
+            "sandbox_id": sandbox_id,
+            "terminated_processes": result.get("terminated_processes", 0),
+            "cleaned_up": result.get("cleaned_up", False),
+            "recycled": result.get("recycled", False),
+            "message": result.get("message")
+        }
         
-        if result["status"] == "SUCCESS":
+        return ToolResult("destroy_sandbox", data, self._render_destroy_sandbox)
+
+    @staticmethod
+    def _render_destroy_sandbox(data: Dict[str, Any]) -> str:
+        """샌드박스 삭제 결과 텍스트"""
+        if data["status"] == "SUCCESS":
             result_text = f"🗑️ 샌드박스 삭제 완료\\n\\n"
-            result_text += f"🆔 샌드박스 ID: {sandbox_id}\\n"
-            result_text += f"⚙️ 종료된 프로세스: {result['terminated_processes']}개\\n"
-            result_text += f"🧹 정리 완료: {'예' if result['cleaned_up'] else '아니오'}\\n"
+            result_text += f"🆔 샌드박스 ID: {data['sandbox_id']}\\n"
+            result_text += f"⚙️ 종료된 프로세스: {data['terminated_processes']}개\\n"
+            result_text += f"🧹 정리 완료: {'예' if data['cleaned_up'] else '아니오'}\\n"
+            if data.get("recycled"):
+                result_text += f"♻️ 웜 풀로 반환 (백그라운드 초기화)\\n"
         else:
             result_text = f"❌ 샌드박스 삭제 실패\\n\\n"
-            result_text += f"🆔 샌드박스 ID: {sandbox_id}\\n"
-            result_text += f"📝 오류: {result.get('message', '알 수 없는 오류')}\\n"
+            result_text += f"🆔 샌드박스 ID: {data['sandbox_id']}\\n"
+            result_text += f"📝 오류: {data['message'] or '알 수 없는 오류'}\\n"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return result_text
 
     # === 사고 고도화 도구 구현 ===
-    async def thinking_advancement(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def thinking_advancement(self, args: Dict[str, Any]) -> ToolResult:
         """고급 사고 시스템"""
         task_content = args["task_content"]
         thinking_mode_str = args.get("thinking_mode", "심층_사고")
@@ -1402,163 +2598,307 @@ class BOOSAANUltimateMCPServer:
         
         result = await self.thinking_engine.advance_thinking(task)
         
+        data = {
+            "task_id": result.task_id,
+            "thinking_mode": thinking_mode_str,
+            "priority": priority_str,
+            "advancement_score": result.advancement_score,
+            "quality_metrics": result.quality_metrics,
+            "sequential_steps": [
+                {"stage": step['stage'], "quality_score": step['quality_score']}
+                for step in result.sequential_steps
+            ],
+            "chosen_approach": result.contextual_decision['chosen_approach'],
+            "final_recommendation": result.final_recommendation
+        }
+        
+        return ToolResult("thinking_advancement", data, self._render_thinking_advancement)
+
+    def _run_budgeted_thinking(self, request: str, context: Dict[str, Any], wait_seconds: float):
+        """예산 실행 전용 엔진으로 Sequential Thinking → (단계 목록, 요약), 엔진을 못 얻으면 None
+
+        예산 초과로 버려진 스레드도 끝까지 실행되므로 공유 엔진(self.meta_cognitive)과 분리된 인스턴스를 쓰고,
+        그 인스턴스도 잠금으로 한 번에 한 호출만 사용 (이전 호출이 남은 예산 안에 안 끝나면 포기).
+        """
+        if not self._budgeted_thinking_lock.acquire(timeout=wait_seconds):
+            return None
+        try:
+            if self._budgeted_meta_cognitive is None:
+                self._budgeted_meta_cognitive = MetaCognitiveEngine(str(self.workspace / 'meta_cognitive'))
+            engine = self._budgeted_meta_cognitive
+            thinking_sequence = engine.execute_sequential_thinking(request, context)
+            return thinking_sequence, engine.get_thinking_summary(thinking_sequence)
+        finally:
+            self._budgeted_thinking_lock.release()
+
+    def _parallel_models(self, args: Dict[str, Any]) -> bool:
+        """모델별 병렬 실행 여부 (모델 2개 이상, 기본값은 워커 풀이 있을 때만 → 실제 CPU 병렬)"""
+        models = dict.fromkeys(args.get("required_models", ["분석적_추론", "비판적_추론"]))
+        return len(models) > 1 and bool(args.get("parallel_models", self.worker_pool is not None))
+
+    async def thinking_advancement_parallel(self, args: Dict[str, Any]) -> ToolResult:
+        """추론 모델별 실행 → 맥락적 결정 병합
+
+        동시 실행 시 벽시계 시간 ≈ 가장 느린 모델.
+        latency_budget_ms 가 있으면 모델을 단계로 보고 요청 순서(우선순위)대로 anytime 실행
+        """
+        models = list(dict.fromkeys(args.get("required_models", ["분석적_추론", "비판적_추론"])))
+        budget_ms = args.get("latency_budget_ms")
+        budget = LatencyBudget(budget_ms, self.stage_costs) if budget_ms is not None else None
+        
+        async def run_model(model: str) -> Dict[str, Any]:
+            model_args = dict(args, required_models=[model], parallel_models=False)
+            model_args.pop("latency_budget_ms", None)
+            if self.worker_pool:
+                data, _ = await self.worker_pool.run("thinking_advancement", model_args)
+                return data
+            return (await self.thinking_advancement(model_args)).data
+        
+        concurrent = self._parallel_models(args)
+        data = await run_parallel_models(models, run_model, budget=budget, concurrent=concurrent)
+        data.setdefault("thinking_mode", args.get("thinking_mode", "심층_사고"))
+        data.setdefault("priority", args.get("priority", "맥락_우선"))
+        
+        result = ToolResult("thinking_advancement", data, self._render_thinking_advancement)
+        if concurrent:
+            result.meta.update(
+                parallel_models=len(models),
+                parallel_wall_time=round(data["parallel_timing"]["wall_time"], 3)
+            )
+        if budget is not None:
+            data["latency_budget"] = budget.report()
+            result.meta["budget_exhausted"] = data["latency_budget"]["exhausted"]
+        return result
+
+    @staticmethod
+    def _render_thinking_advancement(data: Dict[str, Any]) -> str:
+        """사고 고도화 결과 텍스트"""
         result_text = f"🎯 사고 고도화 완료\\n\\n"
-        result_text += f"📋 작업 ID: {result.task_id}\\n"
-        result_text += f"🧠 사고 모드: {thinking_mode_str}\\n"
-        result_text += f"⭐ 우선순위: {priority_str}\\n"
-        result_text += f"📊 고도화 점수: {result.advancement_score:.2f}/1.0\\n"
-        result_text += f"✨ 전체 품질: {result.quality_metrics['overall_quality']:.2f}/1.0\\n\\n"
+        result_text += f"📋 작업 ID: {data['task_id']}\\n"
+        result_text += f"🧠 사고 모드: {data['thinking_mode']}\\n"
+        result_text += f"⭐ 우선순위: {data['priority']}\\n"
+        result_text += f"📊 고도화 점수: {data['advancement_score']:.2f}/1.0\\n"
+        result_text += f"✨ 전체 품질: {data['quality_metrics']['overall_quality']:.2f}/1.0\\n\\n"
         
         # Sequential thinking 단계
         result_text += f"🔄 Sequential Thinking 단계:\\n"
-        for step in result.sequential_steps:
+        for step in data['sequential_steps']:
             result_text += f"  • {step['stage']}: 품질 {step['quality_score']:.2f}\\n"
         
         # 선택된 접근법
-        chosen_approach = result.contextual_decision['chosen_approach']
-        result_text += f"\\n🎯 선택된 접근법: {chosen_approach}\\n"
+        result_text += f"\\n🎯 선택된 접근법: {data['chosen_approach']}\\n"
+        
+        # 모델별 병렬 실행 결과
+        if data.get('model_results'):
+            timing = data['parallel_timing']
+            result_text += f"\\n⚡ 모델별 실행: {timing['wall_time']:.2f}초 (모델 합계 {timing['sequential_estimate']:.2f}초)\\n"
+            for model_result in data['model_results']:
+                if model_result['error']:
+                    result_text += f"  • {model_result['model']}: 실패 ({model_result['error']})\\n"
+                else:
+                    result_text += f"  • {model_result['model']}: {model_result['elapsed']:.2f}초, {model_result['chosen_approach']} (품질 {model_result['overall_quality']:.2f})\\n"
+        
+        if data.get('latency_budget'):
+            result_text += BOOSAANUltimateMCPServer._render_latency_budget(data['latency_budget'])
         
         # 최종 권고안 (요약)
-        recommendation_lines = result.final_recommendation.split('\\n')[:5]
+        recommendation_lines = data['final_recommendation'].split('\\n')[:5]
         result_text += f"\\n💡 최종 권고사항:\\n"
         for line in recommendation_lines:
             if line.strip():
                 result_text += f"  {line.strip()[:80]}...\\n"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return result_text
 
     # === 작업 프로세스 강제화 도구 구현 ===
-    async def process_user_instruction(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_user_instruction(self, args: Dict[str, Any]) -> ToolResult:
         """사용자 지시 처리 (피드백 시스템 적용)"""
         user_request = args["user_request"]
         context = args.get("context", {})
         
         result = self.work_enforcer.process_user_instruction(user_request, context)
         
+        data = {
+            "status": result["status"],
+            "user_request": user_request
+        }
+        
         if result["status"] == "BLOCKED":
+            data["reason"] = result['reason']
+            data["violations"] = list(result['violations'])
+        
+        elif result["status"] == "FEEDBACK_REQUIRED":
+            feedback = result["feedback"]
+            data["feedback"] = {
+                "feedback_id": feedback.feedback_id,
+                "work_steps": list(feedback.work_steps),
+                "intentions": list(feedback.intentions),
+                "risks": list(feedback.risks),
+                "alternatives": list(feedback.alternatives)
+            }
+        
+        else:  # PROCEED
+            instruction = result['instruction']
+            data["instruction"] = {
+                "work_type": instruction.work_type.value,
+                "complexity_level": instruction.complexity_level,
+                "risk_level": instruction.risk_level
+            }
+        
+        return ToolResult("process_user_instruction", data, self._render_process_user_instruction)
+
+    @staticmethod
+    def _render_process_user_instruction(data: Dict[str, Any]) -> str:
+        """사용자 지시 처리 결과 텍스트"""
+        user_request = data["user_request"]
+        
+        if data["status"] == "BLOCKED":
             result_text = f"🚫 작업 차단\\n\\n"
             result_text += f"📝 요청: {user_request[:100]}...\\n"
-            result_text += f"❌ 차단 사유: {result['reason']}\\n\\n"
+            result_text += f"❌ 차단 사유: {data['reason']}\\n\\n"
             result_text += "위반 사항:\\n"
-            for violation in result['violations']:
+            for violation in data['violations']:
                 result_text += f"  • {violation}\\n"
         
-        elif result["status"] == "FEEDBACK_REQUIRED":
-            feedback = result["feedback"]
+        elif data["status"] == "FEEDBACK_REQUIRED":
+            feedback = data["feedback"]
             result_text = f"💬 작업 피드백 요청\\n\\n"
             result_text += f"📝 요청: {user_request[:100]}...\\n"
-            result_text += f"🆔 피드백 ID: {feedback.feedback_id}\\n\\n"
-            
+            result_text += f"🆔 피드백 ID: {feedback['feedback_id']}\\n\\n"
+        
             result_text += "📋 작업 단계:\\n"
-            for step in feedback.work_steps:
+            for step in feedback['work_steps']:
                 result_text += f"  • {step}\\n"
-            
+        
             result_text += "\\n🎯 의도 파악:\\n"
-            for intention in feedback.intentions:
+            for intention in feedback['intentions']:
                 result_text += f"  • {intention}\\n"
-            
+        
             result_text += "\\n⚠️ 위험 요소:\\n"
-            for risk in feedback.risks:
+            for risk in feedback['risks']:
                 result_text += f"  • {risk}\\n"
-            
+        
             result_text += "\\n💡 대안:\\n"
-            for alt in feedback.alternatives:
+            for alt in feedback['alternatives']:
                 result_text += f"  • {alt}\\n"
-            
-            result_text += f"\\n✅ 위 내용을 확인하고 승인하시겠습니까? (피드백 ID: {feedback.feedback_id})"
+        
+            result_text += f"\\n✅ 위 내용을 확인하고 승인하시겠습니까? (피드백 ID: {feedback['feedback_id']})"
         
         else:  # PROCEED
+            instruction = data["instruction"]
             result_text = f"✅ 작업 진행\\n\\n"
             result_text += f"📝 요청: {user_request}\\n"
-            result_text += f"🔄 작업 유형: {result['instruction'].work_type.value}\\n"
-            result_text += f"📊 복잡도: {result['instruction'].complexity_level}/10\\n"
-            result_text += f"⚠️ 위험도: {result['instruction'].risk_level}/10\\n"
+            result_text += f"🔄 작업 유형: {instruction['work_type']}\\n"
+            result_text += f"📊 복잡도: {instruction['complexity_level']}/10\\n"
+            result_text += f"⚠️ 위험도: {instruction['risk_level']}/10\\n"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return result_text
 
-    async def process_feedback_response(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_feedback_response(self, args: Dict[str, Any]) -> ToolResult:
         """사용자 피드백 응답 처리"""
         feedback_id = args["feedback_id"]
         user_response = args["user_response"]
         
         result = self.work_enforcer.process_user_feedback_response(feedback_id, user_response)
         
+        data = {
+            "status": result["status"],
+            "feedback_id": feedback_id
+        }
+        
         if result["status"] == "APPROVED":
+            data["final_plan"] = list(result['final_plan'])
+        
+        elif result["status"] == "CLARIFICATION_NEEDED":
+            feedback = result["feedback"]
+            data["new_feedback_id"] = feedback.feedback_id
+            data["clarification_questions"] = list(feedback.alternatives)
+        
+        elif result["status"] == "CANCELLED":
+            data["reason"] = result['reason']
+        
+        elif result["status"] != "MAX_FEEDBACK_REACHED":
+            data["message"] = result.get('message')
+        
+        return ToolResult("process_feedback_response", data, self._render_process_feedback_response)
+
+    @staticmethod
+    def _render_process_feedback_response(data: Dict[str, Any]) -> str:
+        """피드백 응답 처리 결과 텍스트"""
+        if data["status"] == "APPROVED":
             result_text = f"✅ 작업 승인됨\\n\\n"
             result_text += f"📝 최종 계획:\\n"
-            for step in result['final_plan']:
+            for step in data['final_plan']:
                 result_text += f"  • {step}\\n"
         
-        elif result["status"] == "CLARIFICATION_NEEDED":
-            feedback = result["feedback"]
+        elif data["status"] == "CLARIFICATION_NEEDED":
             result_text = f"❓ 추가 명확화 필요\\n\\n"
-            result_text += f"🆔 새 피드백 ID: {feedback.feedback_id}\\n\\n"
+            result_text += f"🆔 새 피드백 ID: {data['new_feedback_id']}\\n\\n"
             result_text += "명확화 질문:\\n"
-            for question in feedback.alternatives:
+            for question in data['clarification_questions']:
                 result_text += f"  • {question}\\n"
         
-        elif result["status"] == "MAX_FEEDBACK_REACHED":
+        elif data["status"] == "MAX_FEEDBACK_REACHED":
             result_text = f"⏳ 최대 피드백 횟수 도달\\n\\n"
             result_text += "현재 이해 기준으로 작업을 진행합니다."
         
-        elif result["status"] == "CANCELLED":
+        elif data["status"] == "CANCELLED":
             result_text = f"❌ 작업 취소됨\\n\\n"
-            result_text += f"취소 사유: {result['reason']}"
+            result_text += f"취소 사유: {data['reason']}"
         
         else:
-            result_text = f"❌ 오류 발생\\n\\n{result['message']}"
+            result_text = f"❌ 오류 발생\\n\\n{data['message']}"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return result_text
 
     # === 맥락 문서 관리 도구 구현 ===
-    async def add_user_instruction(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def add_user_instruction(self, args: Dict[str, Any]) -> ToolResult:
         """사용자 지시사항 추가"""
         user_request = args["user_request"]
         agent_response = args.get("agent_response", "")
         actual_implementation = args.get("actual_implementation", "")
         status = args.get("status", "in_progress")
         
-        instruction_id = self.context_document_manager.add_user_instruction(
-            user_request, agent_response, actual_implementation, status
-        )
+        if self.document_journal:
+            # 저널에 한 줄 추가 (전체 JSON 재작성 없음), 문서 관리자 적용은 백그라운드 flush
+            instruction_id = self._new_document_id("user_instructions")
+            self.document_journal.append("user_instructions", {
+                "instruction_id": instruction_id,
+                "timestamp": datetime.now().isoformat(),
+                "user_request": user_request,
+                "agent_response": agent_response,
+                "actual_implementation": actual_implementation,
+                "status": status
+            })
+            storage_path = self.document_journal.storage_path("user_instructions")
+        else:
+            with self._document_manager_lock:
+                instruction_id = self.context_document_manager.add_user_instruction(
+                    user_request, agent_response, actual_implementation, status
+                )
+            storage_path = ".claude/context/user_instructions.json"
+        self.document_index.add("user_instructions", instruction_id, user_request=user_request)
+        
+        data = {
+            "instruction_id": instruction_id,
+            "user_request": user_request,
+            "status": status,
+            "storage_path": storage_path
+        }
         
+        return ToolResult("add_user_instruction", data, self._render_add_user_instruction)
+
+    @staticmethod
+    def _render_add_user_instruction(data: Dict[str, Any]) -> str:
+        """사용자 지시사항 추가 결과 텍스트"""
         result_text = f"📝 사용자 지시사항 추가 완료\\n\\n"
-        result_text += f"🆔 지시사항 ID: {instruction_id}\\n"
-        result_text += f"📋 요청: {user_request[:100]}...\\n"
-        result_text += f"📊 상태: {status}\\n"
-        result_text += f"📁 저장 위치: .claude/context/user_instructions.json\\n"
-        
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        result_text += f"🆔 지시사항 ID: {data['instruction_id']}\\n"
+        result_text += f"📋 요청: {data['user_request'][:100]}...\\n"
+        result_text += f"📊 상태: {data['status']}\\n"
+        result_text += f"📁 저장 위치: {data['storage_path']}\\n"
+        return result_text
 
-    async def add_feature_spec(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def add_feature_spec(self, args: Dict[str, Any]) -> ToolResult:
         """기능명세서 추가"""
         feature_name = args["feature_name"]
         description = args["description"]
@@ -1566,70 +2906,272 @@ class BOOSAANUltimateMCPServer:
         dependencies = args.get("dependencies", [])
         implementation_notes = args.get("implementation_notes", "")
         
-        feature_id = self.context_document_manager.add_feature_spec(
-            feature_name, description, status, dependencies, implementation_notes
-        )
+        if self.document_journal:
+            feature_id = self._new_document_id("feature_specs")
+            self.document_journal.append("feature_specs", {
+                "feature_id": feature_id,
+                "created_at": datetime.now().isoformat(),
+                "feature_name": feature_name,
+                "description": description,
+                "status": status,
+                "dependencies": dependencies,
+                "implementation_notes": implementation_notes
+            })
+            storage_path = self.document_journal.storage_path("feature_specs")
+        else:
+            with self._document_manager_lock:
+                feature_id = self.context_document_manager.add_feature_spec(
+                    feature_name, description, status, dependencies, implementation_notes
+                )
+            storage_path = ".claude/context/feature_specifications.json"
+        self.document_index.add("feature_specs", feature_id, feature_name=feature_name, description=description)
+        
+        data = {
+            "feature_id": feature_id,
+            "feature_name": feature_name,
+            "status": status,
+            "description": description,
+            "storage_path": storage_path
+        }
         
+        return ToolResult("add_feature_spec", data, self._render_add_feature_spec)
+
+    @staticmethod
+    def _render_add_feature_spec(data: Dict[str, Any]) -> str:
+        """기능명세서 추가 결과 텍스트"""
         result_text = f"📋 기능명세서 추가 완료\\n\\n"
-        result_text += f"🆔 기능 ID: {feature_id}\\n"
-        result_text += f"🏷️ 기능명: {feature_name}\\n"
-        result_text += f"📊 상태: {status}\\n"
-        result_text += f"📝 설명: {description[:100]}...\\n"
-        result_text += f"📁 저장 위치: .claude/context/feature_specifications.json\\n"
+        result_text += f"🆔 기능 ID: {data['feature_id']}\\n"
+        result_text += f"🏷️ 기능명: {data['feature_name']}\\n"
+        result_text += f"📊 상태: {data['status']}\\n"
+        result_text += f"📝 설명: {data['description'][:100]}...\\n"
+        result_text += f"📁 저장 위치: {data['storage_path']}\\n"
+        return result_text
+
+    def _existing_documents(self) -> Dict[str, List[Dict[str, Any]]]:
+        """문서 종류 → 문서 레코드 (문서 관리자 전체 검색 + 아직 적용되지 않은 저널 문서)"""
+        with self._document_manager_lock:
+            documents = {
+                document_type: [dict(vars(item)) for item in items]
+                for document_type, items in self.context_document_manager.search_context("", list(DOCUMENT_FIELDS)).items()
+            }
+            for document_type, records in self._pending_documents().items():
+                documents.setdefault(document_type, []).extend(records)
+        return documents
+
+    def _pending_documents(self) -> Dict[str, List[Dict[str, Any]]]:
+        """문서 관리자에 아직 적용되지 않은 저널 문서 (관리자 상태와 함께 읽을 때는 _document_manager_lock 안에서)"""
+        if not self.document_journal:
+            return {}
+        return {document_type: self.document_journal.pending(document_type) for document_type in DOCUMENT_TYPES}
+
+    def _open_document_journal(self) -> Optional[DocumentJournal]:
+        """쓰기 저널 열기 + 이전 형식 문서 이전
+
+        저널이 꺼져 있어도 남은 대기 문서가 있으면 시작 시 문서 관리자에 적용해서 잃지 않음.
+        이전/적용이 실패하면 파일을 그대로 두고 다음 시작(또는 다음 flush) 때 이어서 처리.
+        """
+        directory = str(self.workspace / 'context_documents' / 'journal')
+        journal = DocumentJournal.from_env(directory, self.logger)
+        enabled = journal is not None
+        if not enabled:
+            if not DocumentJournal.has_leftovers(directory):
+                return None
+            journal = DocumentJournal(directory, logger=self.logger)
+        
+        try:
+            journal.migrate_legacy(self._manager_document_ids())
+            # 중단된 flush 가 적용만 하고 색인 ID 를 못 바꾼 문서
+            self._rekey_document_index(journal.applied())
+            if not enabled:
+                applied, error = self._flush_document_journal(journal)
+                self._rekey_document_index(applied)
+                if error:
+                    raise error
+        except Exception as e:
+            self.logger.warning(f"맥락 문서 저널 정리 실패 (다음에 다시 시도): {e}")
         
+        if not enabled:
+            journal.close()
+            return None
+        return journal
+
+    def _manager_document_ids(self) -> Dict[str, set]:
+        """문서 종류 → 문서 관리자에 이미 있는 문서 ID"""
+        with self._document_manager_lock:
+            existing = self.context_document_manager.search_context("", list(DOCUMENT_TYPES))
         return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
+            document_type: {getattr(item, id_field, None) for item in existing.get(document_type, [])} - {None}
+            for document_type, (id_field, _) in DOCUMENT_TYPES.items()
         }
 
-    async def search_context(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """맥락 검색"""
-        query = args["query"]
-        document_types = args.get("document_types")
+    def _apply_journal_document(self, document_type: str, record: Dict[str, Any]) -> Optional[str]:
+        """저널 문서 1개를 문서 관리자에 기록 → 관리자 문서 ID (flush 가 _document_manager_lock 안에서 호출)"""
+        if document_type == "user_instructions":
+            return self.context_document_manager.add_user_instruction(
+                record.get("user_request", ""), record.get("agent_response", ""),
+                record.get("actual_implementation", ""), record.get("status", "in_progress")
+            )
+        return self.context_document_manager.add_feature_spec(
+            record.get("feature_name", ""), record.get("description", ""), record.get("status", "planned"),
+            record.get("dependencies", []), record.get("implementation_notes", "")
+        )
+
+    def _flush_document_journal(self, journal: DocumentJournal
+                                ) -> Tuple[List[Tuple[str, Optional[str]]], Optional[Exception]]:
+        """대기 문서를 문서 관리자에 적용 → ([(저널 ID, 관리자 ID)], 오류)
+
+        스레드에서 호출 가능 (색인은 건드리지 않음). 중간에 실패해도 그 전까지 적용된 문서는 반환.
+        """
+        applied: List[Tuple[str, Optional[str]]] = []
         
-        results = self.context_document_manager.search_context(query, document_types)
+        def _apply(document_type: str, record: Dict[str, Any]) -> Optional[str]:
+            manager_id = self._apply_journal_document(document_type, record)
+            applied.append((record[DOCUMENT_TYPES[document_type][0]], manager_id))
+            return manager_id
         
-        result_text = f"🔍 맥락 검색 결과\\n\\n"
-        result_text += f"🔎 검색어: {query}\\n\\n"
+        try:
+            journal.flush(_apply, guard=self._document_manager_lock)
+        except Exception as e:
+            return applied, e
+        return applied, None
+
+    def _rekey_document_index(self, applied: List[Tuple[str, Optional[str]]]) -> int:
+        """검색 색인의 저널 ID 를 문서 관리자 ID 로 변경 → 적용된 문서 수"""
+        for journal_id, manager_id in applied:
+            if manager_id and manager_id != journal_id:
+                self.document_index.rename(journal_id, manager_id)
+        return len(applied)
+
+    @staticmethod
+    def _new_document_id(document_type: str) -> str:
+        prefix = {"user_instructions": "UI", "feature_specs": "FS"}.get(document_type, "DOC")
+        return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+    def _backfill_document_index(self):
+        """색인 도입 전 문서를 한 번 색인 (빈 검색어 = 전체 문서), 이후 검색은 색인만 사용"""
+        if self._document_index_backfilled:
+            return
+        existing = set(self.document_index.index.ids())
+        for document_type, records in self._existing_documents().items():
+            if document_type not in DOCUMENT_FIELDS:
+                continue
+            fields = DOCUMENT_FIELDS[document_type]
+            for record in records:
+                values = {field: record.get(field) or "" for field in fields}
+                document_id = next(
+                    (record[attribute] for attribute in ("instruction_id", "feature_id", "blueprint_id", "component_id")
+                     if record.get(attribute)),
+                    None
+                ) or hashlib.sha1(json.dumps([document_type, values], ensure_ascii=False).encode()).hexdigest()
+                if document_id not in existing:
+                    self.document_index.add(document_type, document_id, **values)
+        self._document_index_backfilled = True
+
+    async def search_context(self, args: Dict[str, Any]) -> ToolResult:
+        """맥락 검색 (역색인으로 문서 종류별 관련도 상위 k)"""
+        query = args["query"]
+        document_types = args.get("document_types") or list(DOCUMENT_FIELDS)
+        limit = max(1, int(args.get("limit", 3)))
         
-        for doc_type, items in results.items():
-            if items:
-                result_text += f"📂 {doc_type.upper()} ({len(items)}개 발견):\\n"
-                for item in items[:3]:  # 최대 3개만 표시
+        matches = {}
+        try:
+            self._backfill_document_index()
+            for doc_type, (total, items) in self.document_index.search(query, document_types, k=limit).items():
+                matches[doc_type] = {"total": total, "items": items}
+        except Exception as e:
+            # 색인 실패 시 문서 관리자 전체 검색으로 대체
+            self.logger.warning(f"문서 색인 검색 실패, 전체 검색으로 대체: {e}")
+            with self._document_manager_lock:
+                found = self.context_document_manager.search_context(query, args.get("document_types"))
+                pending = self._pending_documents()
+            for doc_type, items in found.items():
+                items = list(items) + [
+                    SimpleNamespace(**record) for record in pending.get(doc_type, [])
+                    if any(query in str(record.get(field, "")) for field in DOCUMENT_FIELDS.get(doc_type, ()))
+                ]
+                hits = []
+                for item in items[:limit]:
                     if hasattr(item, 'user_request'):
-                        result_text += f"  • {item.user_request[:80]}...\\n"
+                        hits.append({"user_request": item.user_request})
                     elif hasattr(item, 'feature_name'):
-                        result_text += f"  • {item.feature_name}: {item.description[:60]}...\\n"
+                        hits.append({"feature_name": item.feature_name, "description": item.description})
                     elif hasattr(item, 'component_name'):
-                        result_text += f"  • {item.component_name}: {item.description[:60]}...\\n"
+                        hits.append({"component_name": item.component_name, "description": item.description})
+                matches[doc_type] = {"total": len(items), "items": hits}
+        
+        data = {
+            "query": query,
+            "results": matches
+        }
+        
+        return ToolResult("search_context", data, self._render_search_context)
+
+    @staticmethod
+    def _render_search_context(data: Dict[str, Any]) -> str:
+        """문서 맥락 검색 결과 텍스트"""
+        result_text = f"🔍 맥락 검색 결과\\n\\n"
+        result_text += f"🔎 검색어: {data['query']}\\n\\n"
+        
+        for doc_type, found in data['results'].items():
+            if found['total']:
+                result_text += f"📂 {doc_type.upper()} ({found['total']}개 발견):\\n"
+                for item in found['items']:
+                    score = f" ({item['score']:.2f})" if 'score' in item else ""
+                    if 'user_request' in item:
+                        result_text += f"  • {item['user_request'][:80]}...{score}\\n"
+                    elif 'feature_name' in item:
+                        result_text += f"  • {item['feature_name']}: {item['description'][:60]}...{score}\\n"
+                    elif 'component_name' in item:
+                        result_text += f"  • {item['component_name']}: {item['description'][:60]}...{score}\\n"
                 result_text += "\\n"
         
-        if not any(results.values()):
+        if not any(found['total'] for found in data['results'].values()):
             result_text += "❌ 검색 결과가 없습니다.\\n"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return result_text
 
-    async def get_project_summary(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def get_project_summary(self, args: Dict[str, Any]) -> ToolResult:
         """프로젝트 전체 요약"""
-        summary = self.context_document_manager.get_project_summary()
+        with self._document_manager_lock:
+            summary = self.context_document_manager.get_project_summary()
+            pending = self._pending_documents()
+        statistics = dict(summary['statistics'])
+        
+        if pending:
+            # 아직 문서 관리자에 적용되지 않은 저널 문서를 통계에 더함 (태그는 적용 후 반영)
+            instructions = pending["user_instructions"]
+            total = statistics['total_instructions'] + len(instructions)
+            completed = statistics['completed_instructions'] + sum(
+                1 for record in instructions if record.get("status") == "completed"
+            )
+            statistics.update(
+                total_instructions=total,
+                completed_instructions=completed,
+                completion_rate=completed / total * 100 if total else 0.0,
+                active_features=statistics['active_features'] + sum(
+                    1 for record in pending["feature_specs"]
+                    if record.get("status") not in ("completed", "deprecated")
+                )
+            )
         
+        data = {
+            "project_metadata": summary['project_metadata'],
+            "statistics": statistics,
+            "top_tags": [list(tag_count) for tag_count in summary['top_tags'][:5]]
+        }
+        
+        return ToolResult("get_project_summary", data, self._render_get_project_summary)
+
+    @staticmethod
+    def _render_get_project_summary(data: Dict[str, Any]) -> str:
+        """프로젝트 요약 결과 텍스트"""
+        metadata = data['project_metadata']
         result_text = f"📊 프로젝트 요약\\n\\n"
-        result_text += f"🏷️ 프로젝트: {summary['project_metadata']['project_name']}\\n"
-        result_text += f"📅 생성일: {summary['project_metadata']['created_at'][:10]}\\n"
-        result_text += f"🔄 마지막 업데이트: {summary['project_metadata']['last_updated'][:10]}\\n\\n"
+        result_text += f"🏷️ 프로젝트: {metadata['project_name']}\\n"
+        result_text += f"📅 생성일: {metadata['created_at'][:10]}\\n"
+        result_text += f"🔄 마지막 업데이트: {metadata['last_updated'][:10]}\\n\\n"
         
-        stats = summary['statistics']
+        stats = data['statistics']
         result_text += f"📈 통계:\\n"
         result_text += f"  • 총 지시사항: {stats['total_instructions']}개\\n"
         result_text += f"  • 완료된 지시사항: {stats['completed_instructions']}개\\n"
@@ -1637,223 +3179,325 @@ class BOOSAANUltimateMCPServer:
         result_text += f"  • 활성 기능: {stats['active_features']}개\\n"
         result_text += f"  • 총 대화: {stats['total_conversations']}회\\n\\n"
         
-        if summary['top_tags']:
+        if data['top_tags']:
             result_text += f"🏷️ 주요 태그:\\n"
-            for tag, count in summary['top_tags'][:5]:
+            for tag, count in data['top_tags']:
                 result_text += f"  • {tag}: {count}회\\n"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return result_text
 
     # === 포트 관리 도구 구현 ===
-    async def get_project_port_tool(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def get_project_port_tool(self, args: Dict[str, Any]) -> ToolResult:
         """프로젝트용 포트 할당"""
         project_name = args["project_name"]
-        service_name = args.get("service_name", "default")
+        service_names = list(dict.fromkeys(args.get("service_names") or []))
+        service_name = service_names[0] if service_names else args.get("service_name", "default")
+        
+        data = {
+            "project_name": project_name,
+            "service_name": service_name
+        }
         
         try:
-            port = get_project_port(project_name, service_name)
-            port_info = self.port_manager.get_project_port_info(project_name)
-            
+            data["port"] = self._project_port(project_name, service_name)
+            if service_names:
+                data["ports"] = {service: self._project_port(project_name, service) for service in service_names}
+            if self.port_prober:
+                ports = data.get("ports") or {service_name: data["port"]}
+                listening = await self.port_prober.probe(ports.values())
+                data["listening"] = {service: listening[port] for service, port in ports.items()}
+            data["port_info"] = self.port_table.get_project_port_info(project_name)
+            data["status"] = "SUCCESS"
+        
+        except Exception as e:
+            data["status"] = "ERROR"
+            data["error"] = str(e)
+        
+        return ToolResult("get_project_port", data, self._render_get_project_port)
+
+    @staticmethod
+    def _render_get_project_port(data: Dict[str, Any]) -> str:
+        """포트 할당 결과 텍스트"""
+        if data["status"] == "SUCCESS":
+            port_info = data["port_info"]
             result_text = f"🚢 포트 할당 완료\\n\\n"
-            result_text += f"📋 프로젝트: {project_name}\\n"
-            result_text += f"🔌 할당된 포트: {port}\\n"
-            result_text += f"⚙️ 서비스: {service_name}\\n"
+            result_text += f"📋 프로젝트: {data['project_name']}\\n"
+            listening = data.get("listening") or {}
+            if data.get("ports"):
+                result_text += f"🔌 할당된 포트:\\n"
+                for service, port in data["ports"].items():
+                    state = " (리스너 있음)" if listening.get(service) else ""
+                    result_text += f"  • {service}: {port}{state}\\n"
+            else:
+                state = " (리스너 있음)" if listening.get(data['service_name']) else ""
+                result_text += f"🔌 할당된 포트: {data['port']}{state}\\n"
+                result_text += f"⚙️ 서비스: {data['service_name']}\\n"
             if port_info:
                 result_text += f"📊 포트 범위: {port_info['port_range']}\\n"
                 result_text += f"🔄 상태: {port_info['status']}\\n"
                 result_text += f"💡 사용 가능한 포트: {port_info['available_ports']}개\\n"
-            
-        except Exception as e:
+        
+        else:
             result_text = f"❌ 포트 할당 실패\\n\\n"
-            result_text += f"📋 프로젝트: {project_name}\\n"
-            result_text += f"🔥 오류: {str(e)}\\n"
+            result_text += f"📋 프로젝트: {data['project_name']}\\n"
+            result_text += f"🔥 오류: {data['error']}\\n"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return result_text
 
-    async def register_new_project_tool(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def register_new_project_tool(self, args: Dict[str, Any]) -> ToolResult:
         """새 프로젝트 포트 블록 등록"""
         project_name = args["project_name"]
         description = args.get("description", "")
         
         result = register_project(project_name, description)
+        if result.get("status") == "success":
+            self.port_table.update_project(project_name)
+            self.port_index.mark_block(project_name, *parse_port_range(result["port_range"]))
         
-        if result["status"] == "success":
+        data = dict(result)
+        data.setdefault("project_name", project_name)
+        data["description"] = description
+        
+        return ToolResult("register_new_project", data, self._render_register_new_project)
+
+    @staticmethod
+    def _render_register_new_project(data: Dict[str, Any]) -> str:
+        """프로젝트 등록 결과 텍스트"""
+        if data["status"] == "success":
             result_text = f"✅ 프로젝트 등록 완료\\n\\n"
-            result_text += f"📋 프로젝트: {result['project_name']}\\n"
-            result_text += f"🚢 포트 범위: {result['port_range']}\\n"
-            result_text += f"📊 할당된 포트: {result['allocated_ports']}개\\n"
-            result_text += f"📝 설명: {description}\\n"
-        elif result["status"] == "exists":
+            result_text += f"📋 프로젝트: {data['project_name']}\\n"
+            result_text += f"🚢 포트 범위: {data['port_range']}\\n"
+            result_text += f"📊 할당된 포트: {data['allocated_ports']}개\\n"
+            result_text += f"📝 설명: {data['description']}\\n"
+        elif data["status"] == "exists":
             result_text = f"⚠️ 이미 등록된 프로젝트\\n\\n"
-            result_text += f"📋 프로젝트: {project_name}\\n"
-            result_text += f"💬 메시지: {result['message']}\\n"
+            result_text += f"📋 프로젝트: {data['project_name']}\\n"
+            result_text += f"💬 메시지: {data['message']}\\n"
         else:
             result_text = f"❌ 프로젝트 등록 실패\\n\\n"
-            result_text += f"📋 프로젝트: {project_name}\\n"
-            result_text += f"🔥 오류: {result['message']}\\n"
+            result_text += f"📋 프로젝트: {data['project_name']}\\n"
+            result_text += f"🔥 오류: {data['message']}\\n"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return result_text
 
-    async def port_status_summary_tool(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def port_status_summary_tool(self, args: Dict[str, Any]) -> ToolResult:
         """전체 포트 상태 요약"""
-        summary = self.port_manager.get_port_status_summary()
+        # 상태 요약 + 프로젝트별 정보를 캐시된 테이블에서 한 번에 (프로젝트별 재조회 없음)
+        summary, infos = self.port_table.snapshot()
+        
+        reserved_projects = []
+        for project in summary['reserved_projects']:
+            info = infos.get(project)
+            if info:
+                reserved_projects.append({
+                    "project_name": project,
+                    "port_range": info['port_range'],
+                    "status": info['status']
+                })
+        
+        data = {
+            "total_projects": summary['total_projects'],
+            "active_blocks": summary['active_blocks'],
+            "inactive_blocks": summary['inactive_blocks'],
+            "forgotten_blocks": summary['forgotten_blocks'],
+            "total_ports_allocated": summary['total_ports_allocated'],
+            "next_available_block": summary['next_available_block'],
+            "recent_usage_count": summary['recent_usage_count'],
+            "reserved_projects": reserved_projects
+        }
         
+        return ToolResult("port_status_summary", data, self._render_port_status_summary)
+
+    @staticmethod
+    def _render_port_status_summary(data: Dict[str, Any]) -> str:
+        """포트 상태 요약 결과 텍스트"""
         result_text = f"📊 포트 관리 시스템 상태\\n\\n"
-        result_text += f"🏗️ 총 프로젝트: {summary['total_projects']}개\\n"
-        result_text += f"🟢 활성 블록: {summary['active_blocks']}개\\n"
-        result_text += f"🟡 비활성 블록: {summary['inactive_blocks']}개\\n"
-        result_text += f"🔴 망각된 블록: {summary['forgotten_blocks']}개\\n\\n"
+        result_text += f"🏗️ 총 프로젝트: {data['total_projects']}개\\n"
+        result_text += f"🟢 활성 블록: {data['active_blocks']}개\\n"
+        result_text += f"🟡 비활성 블록: {data['inactive_blocks']}개\\n"
+        result_text += f"🔴 망각된 블록: {data['forgotten_blocks']}개\\n\\n"
         
-        result_text += f"🚢 할당된 총 포트: {summary['total_ports_allocated']}개\\n"
-        result_text += f"⏭️ 다음 사용 가능 블록: {summary['next_available_block']}\\n"
-        result_text += f"📈 최근 7일 사용: {summary['recent_usage_count']}회\\n\\n"
+        result_text += f"🚢 할당된 총 포트: {data['total_ports_allocated']}개\\n"
+        result_text += f"⏭️ 다음 사용 가능 블록: {data['next_available_block']}\\n"
+        result_text += f"📈 최근 7일 사용: {data['recent_usage_count']}회\\n\\n"
         
         result_text += f"🔒 예약된 프로젝트:\\n"
-        for project in summary['reserved_projects']:
-            info = self.port_manager.get_project_port_info(project)
-            if info:
-                result_text += f"  • {project}: {info['port_range']} ({info['status']})\\n"
+        for project in data['reserved_projects']:
+            result_text += f"  • {project['project_name']}: {project['port_range']} ({project['status']})\\n"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return result_text
 
-    async def run_port_forgetting_cycle_tool(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def run_port_forgetting_cycle_tool(self, args: Dict[str, Any]) -> ToolResult:
         """포트 망각 사이클 실행"""
         try:
             # 망각 사이클 실행 전 상태
-            before_summary = self.port_manager.get_port_status_summary()
-            
+            before_summary = self.port_table.summary()
+        
+            # 실제 리스너 검사 → 활성 프로젝트는 사용 기록 갱신 후 망각 사이클
+            liveness = await self._probe_port_liveness()
+            self._refresh_live_ports(liveness)
+        
             # 망각 사이클 실행
             self.port_manager.execute_forgetting_cycle()
-            
+            self.port_table.invalidate()
+        
             # 실행 후 상태
-            after_summary = self.port_manager.get_port_status_summary()
-            
-            result_text = f"🧠 포트 망각 사이클 실행 완료\\n\\n"
-            result_text += f"📊 실행 전/후 비교:\\n"
-            result_text += f"  • 활성 블록: {before_summary['active_blocks']} → {after_summary['active_blocks']}\\n"
-            result_text += f"  • 비활성 블록: {before_summary['inactive_blocks']} → {after_summary['inactive_blocks']}\\n"
-            result_text += f"  • 망각된 블록: {before_summary['forgotten_blocks']} → {after_summary['forgotten_blocks']}\\n\\n"
-            
+            after_summary = self.port_table.summary()
+        
             # 정리 실행
             self.port_manager.execute_forgetting_cleanup()
-            final_summary = self.port_manager.get_port_status_summary()
-            
-            result_text += f"🧹 정리 후 최종 상태:\\n"
-            result_text += f"  • 총 프로젝트: {final_summary['total_projects']}개\\n"
-            result_text += f"  • 할당된 포트: {final_summary['total_ports_allocated']}개\\n"
-            
-            result_text += f"\\n💡 망각 기준: 시간(60%) + 사용빈도(40%)\\n"
-            result_text += f"⏰ 6개월 이상 미사용시 자동 정리\\n"
-            
+            self.port_table.invalidate()
+            final_summary = self._sync_port_index()
+        
+            block_keys = ("active_blocks", "inactive_blocks", "forgotten_blocks")
+            data = {
+                "status": "SUCCESS",
+                "before": {key: before_summary[key] for key in block_keys},
+                "after": {key: after_summary[key] for key in block_keys},
+                "final": {
+                    "total_projects": final_summary['total_projects'],
+                    "total_ports_allocated": final_summary['total_ports_allocated']
+                },
+                "probe": self._liveness_summary(liveness)
+            }
+        
         except Exception as e:
-            result_text = f"❌ 망각 사이클 실행 실패\\n\\n"
-            result_text += f"🔥 오류: {str(e)}\\n"
+            data = {"status": "ERROR", "error": str(e)}
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return ToolResult("run_port_forgetting_cycle", data, self._render_run_port_forgetting_cycle)
+
+    @staticmethod
+    def _render_run_port_forgetting_cycle(data: Dict[str, Any]) -> str:
+        """포트 망각 사이클 결과 텍스트"""
+        if data["status"] != "SUCCESS":
+            result_text = f"❌ 망각 사이클 실행 실패\\n\\n"
+            result_text += f"🔥 오류: {data['error']}\\n"
+            return result_text
+        
+        before, after, final = data["before"], data["after"], data["final"]
+        result_text = f"🧠 포트 망각 사이클 실행 완료\\n\\n"
+        result_text += f"📊 실행 전/후 비교:\\n"
+        result_text += f"  • 활성 블록: {before['active_blocks']} → {after['active_blocks']}\\n"
+        result_text += f"  • 비활성 블록: {before['inactive_blocks']} → {after['inactive_blocks']}\\n"
+        result_text += f"  • 망각된 블록: {before['forgotten_blocks']} → {after['forgotten_blocks']}\\n\\n"
+        
+        result_text += f"🧹 정리 후 최종 상태:\\n"
+        result_text += f"  • 총 프로젝트: {final['total_projects']}개\\n"
+        result_text += f"  • 할당된 포트: {final['total_ports_allocated']}개\\n"
+        
+        probe = data.get("probe")
+        if probe:
+            result_text += f"\\n📡 리스너 검사: 포트 {probe['probed_ports']}개, 활성 프로젝트 {probe['live_projects']}개 (사용 기록 갱신)\\n"
+            if probe['stale_projects']:
+                result_text += f"  • 리스너 없음 (회수 후보): {', '.join(probe['stale_projects'][:10])}\\n"
+        
+        result_text += f"\\n💡 망각 기준: 시간(60%) + 사용빈도(40%)\\n"
+        result_text += f"⏰ 6개월 이상 미사용시 자동 정리\\n"
+        
+        return result_text
 
     # === 시스템 도구 구현 ===
-    async def system_health_check(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def system_health_check(self, args: Dict[str, Any]) -> ToolResult:
         """시스템 건강 상태 점검"""
         detailed = args.get("detailed", False)
         
         # 각 서브시스템 상태 확인
         try:
-            context_summary = self.context_manager.get_context_summary()
+            context_summary = await self._call_context_manager(self.context_manager.get_context_summary)
         except Exception:
             context_summary = {"total_nodes": 0}
         
         try:
-            sandbox_list = self.sandbox_manager.list_sandboxes()
+            sandbox_list = await asyncio.to_thread(self._list_sandboxes)
         except Exception:
             sandbox_list = {"total_sandboxes": 0}
         
-        # 메타인지와 사고 고도화는 빈 상태로 시작
-        meta_cognitive_summary = {"total_tasks": 0, "average_quality": 0}
-        thinking_summary = {"total_tasks": 0, "average_advancement_score": 0}
+        # 메타인지와 사고 고도화는 빈 상태로 시작
+        meta_cognitive_summary = {"total_tasks": 0, "average_quality": 0}
+        thinking_summary = {"total_tasks": 0, "average_advancement_score": 0}
+        
+        # 전체 상태
+        total_score = 0.0
+        component_count = 0
+        
+        # 메타인지 엔진
+        if meta_cognitive_summary.get('total_tasks', 0) > 0:
+            total_score += meta_cognitive_summary.get('average_quality', 0)
+        else:
+            total_score += 0.5
+        component_count += 1
+        
+        # 맥락 관리
+        total_nodes = context_summary.get('total_nodes', 0)
+        total_score += 0.8 if total_nodes > 0 else 0.3
+        component_count += 1
+        
+        # 샌드박스 관리
+        total_sandboxes = sandbox_list.get('total_sandboxes', 0)
+        total_score += 0.8
+        component_count += 1
+        
+        # 사고 고도화
+        if thinking_summary.get('total_tasks', 0) > 0:
+            total_score += thinking_summary.get('average_advancement_score', 0)
+        else:
+            total_score += 0.5
+        component_count += 1
+        
+        # 전체 건강 점수
+        overall_health = total_score / component_count if component_count > 0 else 0.5
+        
+        data = {
+            "detailed": detailed,
+            "meta_cognitive": meta_cognitive_summary,
+            "thinking_advancement": thinking_summary,
+            "total_nodes": total_nodes,
+            "total_sandboxes": total_sandboxes,
+            "overall_health": overall_health,
+            "performance_metrics": self.performance_metrics.copy()
+        }
+        
+        return ToolResult("system_health_check", data, self._render_system_health_check)
+
+    @staticmethod
+    def _render_system_health_check(data: Dict[str, Any]) -> str:
+        """시스템 건강 점검 결과 텍스트"""
+        meta_cognitive_summary = data["meta_cognitive"]
+        thinking_summary = data["thinking_advancement"]
+        total_nodes = data["total_nodes"]
+        total_sandboxes = data["total_sandboxes"]
         
         result_text = f"🏥 BOOSAAN ULTIMATE 시스템 건강 점검\\n\\n"
         
-        # 전체 상태
-        total_score = 0.0
-        component_count = 0
-        
         # 메타인지 엔진
         result_text += f"🧠 메타인지 엔진: "
         if meta_cognitive_summary.get('total_tasks', 0) > 0:
             avg_quality = meta_cognitive_summary.get('average_quality', 0)
             result_text += f"✅ 정상 (품질: {avg_quality:.2f})\\n"
-            total_score += avg_quality
         else:
             result_text += f"⚠️ 미사용\\n"
-            total_score += 0.5
-        component_count += 1
         
         # 맥락 관리
         result_text += f"🗃️ 맥락 관리: "
-        total_nodes = context_summary.get('total_nodes', 0)
         if total_nodes > 0:
             result_text += f"✅ 정상 ({total_nodes}개 노드)\\n"
-            total_score += 0.8
         else:
             result_text += f"⚠️ 빈 맥락\\n"
-            total_score += 0.3
-        component_count += 1
         
         # 샌드박스 관리
         result_text += f"🔒 샌드박스 관리: "
-        total_sandboxes = sandbox_list.get('total_sandboxes', 0)
         result_text += f"✅ 정상 ({total_sandboxes}개 활성)\\n"
-        total_score += 0.8
-        component_count += 1
         
         # 사고 고도화
         result_text += f"🎯 사고 고도화: "
         if thinking_summary.get('total_tasks', 0) > 0:
             avg_advancement = thinking_summary.get('average_advancement_score', 0)
             result_text += f"✅ 정상 (고도화: {avg_advancement:.2f})\\n"
-            total_score += avg_advancement
         else:
             result_text += f"⚠️ 미사용\\n"
-            total_score += 0.5
-        component_count += 1
         
         # 전체 건강 점수
-        overall_health = total_score / component_count if component_count > 0 else 0.5
+        overall_health = data["overall_health"]
         result_text += f"\\n📊 전체 건강 점수: {overall_health:.2f}/1.0\\n"
         
         if overall_health >= 0.8:
@@ -1866,28 +3510,22 @@ class BOOSAANUltimateMCPServer:
             result_text += f"🔴 시스템 상태: 위험\\n"
         
         # 상세 정보
-        if detailed:
+        if data["detailed"]:
+            metrics = data["performance_metrics"]
             result_text += f"\\n📋 상세 정보:\\n"
             result_text += f"  • 메타인지 처리 작업: {meta_cognitive_summary.get('total_tasks', 0)}개\\n"
             result_text += f"  • 맥락 노드 수: {total_nodes}개\\n"
             result_text += f"  • 활성 샌드박스: {total_sandboxes}개\\n"
             result_text += f"  • 사고 고도화 작업: {thinking_summary.get('total_tasks', 0)}개\\n"
             result_text += f"  • 성능 메트릭:\\n"
-            result_text += f"    - 총 요청: {self.performance_metrics['total_requests']}개\\n"
-            result_text += f"    - 성공 작업: {self.performance_metrics['successful_operations']}개\\n"
-            result_text += f"    - 차단 작업: {self.performance_metrics['blocked_operations']}개\\n"
-            result_text += f"    - 평균 응답: {self.performance_metrics['average_response_time']:.3f}초\\n"
+            result_text += f"    - 총 요청: {metrics['total_requests']}개\\n"
+            result_text += f"    - 성공 작업: {metrics['successful_operations']}개\\n"
+            result_text += f"    - 차단 작업: {metrics['blocked_operations']}개\\n"
+            result_text += f"    - 평균 응답: {metrics['average_response_time']:.3f}초\\n"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return result_text
 
-    async def performance_metrics_tool(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def performance_metrics_tool(self, args: Dict[str, Any]) -> ToolResult:
         """성능 메트릭 조회"""
         metrics = self.performance_metrics.copy()
         
@@ -1901,21 +3539,46 @@ class BOOSAANUltimateMCPServer:
         if metrics['total_requests'] > 0:
             block_rate = metrics['blocked_operations'] / metrics['total_requests'] * 100
         
+        data = dict(metrics)
+        data["success_rate"] = success_rate
+        data["block_rate"] = block_rate
+        data["sandbox_pool"] = self.sandbox_pool.metrics() if self.sandbox_pool else None
+        data["sandbox_executor"] = self.sandbox_executor.metrics()
+        data["exec_cache"] = self.exec_cache.metrics() if self.exec_cache else None
+        data["maintenance"] = self.maintenance.metrics() if self.maintenance else None
+        data["thinking_cache"] = self.thinking_cache.metrics() if self.thinking_cache else None
+        data["port_index"] = self.port_index.metrics()
+        data["port_table"] = self.port_table.metrics()
+        data["port_prober"] = self.port_prober.metrics() if self.port_prober else None
+        data["document_journal"] = self.document_journal.metrics() if self.document_journal else None
+        # 규칙 도구를 워커가 맡으면 프런트엔드에는 규칙 색인이 없음 (None)
+        data["rule_similarity"] = dict(self.rule_similarity.metrics(), complete=self.rule_similarity_complete) \
+            if self.rule_similarity else None
+        data["rule_index"] = self.rule_index.metrics() if self.rule_index else None
+        
+        return ToolResult("performance_metrics", data, self._render_performance_metrics)
+
+    @staticmethod
+    def _render_performance_metrics(data: Dict[str, Any]) -> str:
+        """성능 메트릭 결과 텍스트"""
+        success_rate = data["success_rate"]
+        block_rate = data["block_rate"]
+        
         result_text = f"📊 BOOSAAN ULTIMATE 성능 메트릭\\n\\n"
         result_text += f"📈 요청 통계:\\n"
-        result_text += f"  • 총 요청 수: {metrics['total_requests']}개\\n"
-        result_text += f"  • 성공 작업: {metrics['successful_operations']}개 ({success_rate:.1f}%)\\n"
-        result_text += f"  • 차단 작업: {metrics['blocked_operations']}개 ({block_rate:.1f}%)\\n\\n"
+        result_text += f"  • 총 요청 수: {data['total_requests']}개\\n"
+        result_text += f"  • 성공 작업: {data['successful_operations']}개 ({success_rate:.1f}%)\\n"
+        result_text += f"  • 차단 작업: {data['blocked_operations']}개 ({block_rate:.1f}%)\\n\\n"
         
         result_text += f"⏱️ 성능 지표:\\n"
-        result_text += f"  • 평균 응답 시간: {metrics['average_response_time']:.3f}초\\n"
+        result_text += f"  • 평균 응답 시간: {data['average_response_time']:.3f}초\\n"
         
         # 성능 평가
-        if metrics['average_response_time'] < 0.1:
+        if data['average_response_time'] < 0.1:
             response_status = "🟢 매우 빠름"
-        elif metrics['average_response_time'] < 0.5:
+        elif data['average_response_time'] < 0.5:
             response_status = "🟡 보통"
-        elif metrics['average_response_time'] < 1.0:
+        elif data['average_response_time'] < 1.0:
             response_status = "🟠 느림"
         else:
             response_status = "🔴 매우 느림"
@@ -1932,289 +3595,578 @@ class BOOSAANUltimateMCPServer:
         else:
             result_text += f"  • 상태: 🟢 안전한 사용 패턴\\n"
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        # 웜 샌드박스 풀
+        pool = data.get("sandbox_pool")
+        if pool:
+            result_text += f"\\n♨️ 샌드박스 풀:\\n"
+            result_text += f"  • 대기/임대: {pool['idle_sandboxes']}개 / {pool['leased_sandboxes']}개 (프로필 {pool['profiles']}개)\\n"
+            result_text += f"  • 적중률: {pool['hit_rate'] * 100:.1f}% (적중 {pool['hits']} / 미스 {pool['misses']})\\n"
+            result_text += f"  • 평균 프로비저닝: {pool['average_provision_time'] * 1000:.1f}ms\\n"
+        
+        # 샌드박스 실행 엔진
+        executor = data.get("sandbox_executor")
+        if executor:
+            result_text += f"\\n⚡ 샌드박스 실행 엔진 ({executor['engine']}):\\n"
+            result_text += f"  • 실행 중/대기: {executor['running']}개 / {executor['queued']}개 (상한 {executor['max_concurrency']}개)\\n"
+            result_text += f"  • 직접 실행: {executor['native']}회 | 위임: {executor['delegated']}회 | 시간 초과: {executor['timeouts']}회\\n"
+        
+        # 실행 결과 캐시
+        exec_cache = data.get("exec_cache")
+        if exec_cache:
+            result_text += f"\\n♻️ 실행 결과 캐시:\\n"
+            result_text += f"  • 적중률: {exec_cache['hit_rate'] * 100:.1f}% (적중 {exec_cache['hits']} / 미스 {exec_cache['misses']})\\n"
+            result_text += f"  • 저장: {exec_cache['entries']}개, {exec_cache['bytes'] / 1024 / 1024:.1f}MB / {exec_cache['max_bytes'] / 1024 / 1024:.0f}MB (제거 {exec_cache['evictions']}개)\\n"
+            result_text += f"  • 파일 해시: 재사용 {exec_cache['files_reused']}회 / 계산 {exec_cache['files_hashed']}회\\n"
+        
+        # 사고 결과 캐시
+        thinking_cache = data.get("thinking_cache")
+        if thinking_cache:
+            result_text += f"\\n🧠 사고 결과 캐시{' (디스크 영속)' if thinking_cache['persistent'] else ''}:\\n"
+            result_text += f"  • 적중률: {thinking_cache['hit_rate'] * 100:.1f}% (적중 {thinking_cache['hits']} / 미스 {thinking_cache['misses']})\\n"
+            result_text += f"  • 항목: {thinking_cache['entries']}개 / {thinking_cache['max_entries']}개 (TTL {thinking_cache['ttl']:.0f}초, 제거 {thinking_cache['evictions']}개)\\n"
+        
+        # 포트 비트맵 색인
+        port_index = data.get("port_index")
+        if port_index:
+            lookup_rate = port_index['lookup_hits'] / port_index['lookups'] * 100 if port_index['lookups'] else 0.0
+            result_text += f"\\n🚢 포트 색인:\\n"
+            result_text += f"  • 프로젝트: {port_index['projects']}개, 사용 블록 {port_index['used_blocks']}개 / {port_index['max_blocks']}개\\n"
+            result_text += f"  • 조회 적중률: {lookup_rate:.1f}% | 다음 빈 블록: {port_index['next_free_block']}\\n"
+        port_table = data.get("port_table")
+        if port_table:
+            result_text += f"  • 상태 테이블: 읽기 {port_table['reads']}회 / 캐시 적중 {port_table['hits']}회 ({port_table['hit_rate'] * 100:.1f}%)\\n"
+        port_prober = data.get("port_prober")
+        if port_prober:
+            result_text += f"  • 리스너 검사 ({port_prober['mode']}): {port_prober['probes']}회, 캐시 {port_prober['cached']}회, 활성 {port_prober['listening']}회\\n"
+        
+        # 맥락 문서 저널
+        document_journal = data.get("document_journal")
+        if document_journal:
+            pending = sum(document_journal['pending'].values())
+            result_text += f"\\n📒 맥락 문서 저널:\\n"
+            result_text += f"  • 적용 대기: {pending}개 | 추가: {document_journal['appends']}회\\n"
+            result_text += f"  • 문서 관리자 적용: {document_journal['applied']}개 ({document_journal['flushes']}회, 실패 {document_journal['failed_flushes']}회)\\n"
+        
+        # 규칙 유사도 색인
+        rule_similarity = data.get("rule_similarity")
+        if rule_similarity:
+            result_text += f"\\n🧬 규칙 유사도 색인 (MinHash {rule_similarity['bands']}×{rule_similarity['rows']}):\\n"
+            result_text += f"  • 규칙: {rule_similarity['rules']}개 (전역 {rule_similarity['global_rules']}개, 프로젝트 {rule_similarity['projects']}곳)\\n"
+            result_text += f"  • 조회: {rule_similarity['lookups']}회 | 후보: {rule_similarity['candidates']}개 | 일치: {rule_similarity['matches']}개\\n"
+            result_text += f"  • 오염 검사: {'색인 (전체 규칙 반영)' if rule_similarity['complete'] else '규칙 격리 시스템 쌍별 검사'}\\n"
+        rule_index = data.get("rule_index")
+        if rule_index:
+            result_text += f"  • 유효 규칙 뷰: {rule_index['cached_views']}개 캐시, 적중률 {rule_index['view_hit_rate']:.1%} | 만료 예정: {rule_index['scheduled_expiries']}개, 만료됨: {rule_index['expired']}개\\n"
+        
+        # 백그라운드 유지보수
+        maintenance = data.get("maintenance")
+        if maintenance:
+            result_text += f"\\n🧹 백그라운드 유지보수 ({'실행 중' if maintenance['running'] else '대기'}):\\n"
+            for name, job in maintenance["jobs"].items():
+                status = f"오류: {job['last_error']}" if job["last_error"] else f"최근 {job['last_duration'] * 1000:.0f}ms"
+                result_text += (f"  • {name}: {job['runs']}회 실행, 유휴 대기 {job['deferrals']}회, "
+                                f"예산 초과 {job['overruns']}회 ({status}, 다음 {job['next_due_in']:.0f}초 후)\\n")
+        
+        return result_text
 
     # === 예측적 피드백 및 규칙 격리 도구 구현 ===
-    async def analyze_user_intention_tool(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def analyze_user_intention_tool(self, args: Dict[str, Any]) -> ToolResult:
         """사용자 의도 예측적 분석 (예측하고 피드백, 절대 예측하고 수행 안함)"""
         user_request = args["user_request"]
         conversation_history = args.get("conversation_history", [])
         
         try:
             analysis = self.rule_isolation.analyze_user_intention(user_request, conversation_history)
-            
-            result_text = f"🧠 사용자 의도 예측 분석\\n\\n"
-            result_text += f"📝 요청: {user_request[:100]}...\\n"
-            result_text += f"🎯 예측된 의도: {analysis.intention_type.value}\\n"
-            result_text += f"📊 신뢰도: {analysis.confidence_score:.2f}/1.0\\n\\n"
-            
-            # 과거 근거
-            if analysis.past_context_evidence:
-                result_text += f"📚 과거 맥락 근거:\\n"
-                for evidence in analysis.past_context_evidence[:3]:
-                    result_text += f"  • {evidence}\\n"
-                result_text += "\\n"
-            
-            # 미래 예측
-            if analysis.future_implications:
-                result_text += f"🔮 미래 결과 예측:\\n"
-                for implication in analysis.future_implications[:3]:
-                    result_text += f"  • {implication}\\n"
-                result_text += "\\n"
-            
-            # 위험 요소
-            if analysis.risk_factors:
-                result_text += f"⚠️ 위험 요소:\\n"
-                for risk in analysis.risk_factors[:2]:
-                    result_text += f"  • {risk}\\n"
-                result_text += "\\n"
-            
-            # 추천 응답 방식
-            result_text += f"💡 추천 응답 방식: {analysis.recommended_response}\\n\\n"
-            
-            # 명확화 질문들 (핵심!)
-            result_text += f"❓ 예측 기반 확인 질문들:\\n"
-            for i, question in enumerate(analysis.clarification_questions, 1):
-                result_text += f"{i}. {question}\\n"
-            
-            if analysis.intention_type in [IntentionType.FRUSTRATION, IntentionType.IMPOSSIBLE_TASK]:
-                result_text += "\\n🚫 **즉시 수행하지 않고 위 질문들로 의도를 명확히 한 후 진행하세요**"
-            
+        
+            data = {
+                "status": "SUCCESS",
+                "user_request": user_request,
+                "intention_type": analysis.intention_type.value,
+                "confidence_score": analysis.confidence_score,
+                "past_context_evidence": list(analysis.past_context_evidence[:3]),
+                "future_implications": list(analysis.future_implications[:3]),
+                "risk_factors": list(analysis.risk_factors[:2]),
+                "recommended_response": analysis.recommended_response,
+                "clarification_questions": list(analysis.clarification_questions),
+                "hold_execution": analysis.intention_type in [IntentionType.FRUSTRATION, IntentionType.IMPOSSIBLE_TASK]
+            }
+        
         except Exception as e:
-            result_text = f"❌ 의도 분석 실패\\n\\n오류: {str(e)}"
+            data = {"status": "ERROR", "error": str(e)}
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return ToolResult("analyze_user_intention", data, self._render_analyze_user_intention)
+
+    @staticmethod
+    def _render_analyze_user_intention(data: Dict[str, Any]) -> str:
+        """사용자 의도 분석 결과 텍스트"""
+        if data["status"] != "SUCCESS":
+            return f"❌ 의도 분석 실패\\n\\n오류: {data['error']}"
+        
+        result_text = f"🧠 사용자 의도 예측 분석\\n\\n"
+        result_text += f"📝 요청: {data['user_request'][:100]}...\\n"
+        result_text += f"🎯 예측된 의도: {data['intention_type']}\\n"
+        result_text += f"📊 신뢰도: {data['confidence_score']:.2f}/1.0\\n\\n"
+        
+        # 과거 근거
+        if data['past_context_evidence']:
+            result_text += f"📚 과거 맥락 근거:\\n"
+            for evidence in data['past_context_evidence']:
+                result_text += f"  • {evidence}\\n"
+            result_text += "\\n"
+        
+        # 미래 예측
+        if data['future_implications']:
+            result_text += f"🔮 미래 결과 예측:\\n"
+            for implication in data['future_implications']:
+                result_text += f"  • {implication}\\n"
+            result_text += "\\n"
+        
+        # 위험 요소
+        if data['risk_factors']:
+            result_text += f"⚠️ 위험 요소:\\n"
+            for risk in data['risk_factors']:
+                result_text += f"  • {risk}\\n"
+            result_text += "\\n"
+        
+        # 추천 응답 방식
+        result_text += f"💡 추천 응답 방식: {data['recommended_response']}\\n\\n"
+        
+        # 명확화 질문들 (핵심!)
+        result_text += f"❓ 예측 기반 확인 질문들:\\n"
+        for i, question in enumerate(data['clarification_questions'], 1):
+            result_text += f"{i}. {question}\\n"
+        
+        if data['hold_execution']:
+            result_text += "\\n🚫 **즉시 수행하지 않고 위 질문들로 의도를 명확히 한 후 진행하세요**"
+        
+        return result_text
 
-    async def check_rule_contamination_tool(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def check_rule_contamination_tool(self, args: Dict[str, Any]) -> ToolResult:
         """프로젝트 규칙 오염 검사"""
         project_name = args["project_name"]
         
         try:
-            contamination_result = self.rule_isolation.check_rule_contamination(project_name)
-            
-            result_text = f"🔍 규칙 오염 검사 결과\\n\\n"
-            result_text += f"📋 프로젝트: {project_name}\\n"
-            result_text += f"🎯 상태: {contamination_result['status']}\\n"
-            result_text += f"🚨 오염 발견: {'예' if contamination_result['contamination_found'] else '아니오'}\\n\\n"
-            
-            if contamination_result['contamination_found']:
-                result_text += f"🔍 발견된 오염:\\n"
-                for contamination in contamination_result['contaminated_rules']:
-                    result_text += f"  • 타입: {contamination['contamination_type']}\\n"
-                    result_text += f"    유사도: {contamination['similarity']:.2f}\\n"
-                    result_text += f"    프로젝트 규칙: {contamination['project_rule']}\\n"
-                    if contamination['global_rule']:
-                        result_text += f"    전역 규칙: {contamination['global_rule']}\\n"
-                    result_text += "\\n"
-                
-                result_text += f"💡 권장사항: {contamination_result['recommendation']}\\n"
+            self._expire_rules()
+            # 서명 색인이 규칙 격리 시스템의 전체 규칙을 담고 있을 때만 LSH 후보 검사, 아니면 쌍별 검사
+            if self.rule_similarity_complete:
+                contamination_result = self._check_rule_contamination_indexed(project_name)
             else:
-                result_text += "✅ 프로젝트 규칙이 깔끔하게 분리되어 있습니다.\\n"
-                result_text += "🛡️ 전역 규칙 오염 없음\\n"
-            
+                contamination_result = self.rule_isolation.check_rule_contamination(project_name)
+        
+            data = {
+                "status": contamination_result['status'],
+                "project_name": project_name,
+                "contamination_found": contamination_result['contamination_found'],
+                "contaminated_rules": [],
+                "recommendation": contamination_result.get('recommendation'),
+                "source": contamination_result.get('source', "rule_isolation")
+            }
+        
+            if contamination_result['contamination_found']:
+                data["contaminated_rules"] = [
+                    {
+                        "contamination_type": contamination['contamination_type'],
+                        "similarity": contamination['similarity'],
+                        "project_rule": contamination['project_rule'],
+                        "global_rule": contamination['global_rule']
+                    }
+                    for contamination in contamination_result['contaminated_rules']
+                ]
+        
         except Exception as e:
-            result_text = f"❌ 오염 검사 실패\\n\\n오류: {str(e)}"
+            data = {"status": "ERROR", "project_name": project_name, "error": str(e)}
         
+        return ToolResult("check_rule_contamination", data, self._render_check_rule_contamination)
+
+    def _check_rule_contamination_indexed(self, project_name: str) -> Dict[str, Any]:
+        """서명 색인 기반 오염 검사 (규칙 격리 시스템 결과와 같은 형태)"""
+        pairs = self.rule_similarity.contamination(project_name)
         return {
-            "content": [
+            "status": "CONTAMINATED" if pairs else "CLEAN",
+            "contamination_found": bool(pairs),
+            "contaminated_rules": [
                 {
-                    "type": "text",
-                    "text": result_text
+                    "contamination_type": "global_near_duplicate",
+                    "similarity": pair['similarity'],
+                    "project_rule": pair['project_rule'],
+                    "global_rule": pair['global_rule']
                 }
-            ]
+                for pair in pairs
+            ],
+            "recommendation": "전역 규칙과 거의 같은 프로젝트 규칙은 전역 규칙으로 합치거나 프로젝트 고유 내용만 남기세요" if pairs else None,
+            "source": "minhash_lsh"
         }
 
-    async def add_rule_with_isolation_tool(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _render_check_rule_contamination(data: Dict[str, Any]) -> str:
+        """규칙 오염 검사 결과 텍스트"""
+        if data["status"] == "ERROR":
+            return f"❌ 오염 검사 실패\\n\\n오류: {data['error']}"
+        
+        result_text = f"🔍 규칙 오염 검사 결과\\n\\n"
+        result_text += f"📋 프로젝트: {data['project_name']}\\n"
+        result_text += f"🎯 상태: {data['status']}\\n"
+        result_text += f"🚨 오염 발견: {'예' if data['contamination_found'] else '아니오'}\\n"
+        if data.get('source') == "minhash_lsh":
+            result_text += "🧬 검사 방식: MinHash/LSH 후보 + 정확 유사도 재계산\\n"
+        result_text += "\\n"
+        
+        if data['contamination_found']:
+            result_text += f"🔍 발견된 오염:\\n"
+            for contamination in data['contaminated_rules']:
+                result_text += f"  • 타입: {contamination['contamination_type']}\\n"
+                result_text += f"    유사도: {contamination['similarity']:.2f}\\n"
+                result_text += f"    프로젝트 규칙: {contamination['project_rule']}\\n"
+                if contamination['global_rule']:
+                    result_text += f"    전역 규칙: {contamination['global_rule']}\\n"
+                result_text += "\\n"
+        
+            result_text += f"💡 권장사항: {data['recommendation']}\\n"
+        else:
+            result_text += "✅ 프로젝트 규칙이 깔끔하게 분리되어 있습니다.\\n"
+            result_text += "🛡️ 전역 규칙 오염 없음\\n"
+        
+        return result_text
+
+    async def add_rule_with_isolation_tool(self, args: Dict[str, Any]) -> ToolResult:
         """규칙 추가 (오염 방지 검사 포함)"""
         content = args["content"]
         rule_type_str = args["rule_type"]
         scope_str = args["scope"]
         project_name = args.get("project_name")
         source_context = args.get("source_context", "")
+        ttl_seconds = args.get("ttl_seconds")
+        
+        data = {
+            "content": content,
+            "rule_type": rule_type_str,
+            "scope": scope_str,
+            "project_name": project_name
+        }
         
         try:
             # Enum 변환
-            rule_type_mapping = {
-                "패턴": RuleType.PATTERN,
-                "가이드라인": RuleType.GUIDELINE,
-                "선호도": RuleType.PREFERENCE,
-                "제약조건": RuleType.CONSTRAINT,
-                "워크플로우": RuleType.WORKFLOW
-            }
-            
-            scope_mapping = {
-                "전역": RuleScope.GLOBAL,
-                "프로젝트": RuleScope.PROJECT,
-                "세션": RuleScope.SESSION,
-                "임시": RuleScope.TEMPORARY
-            }
-            
-            rule_type = rule_type_mapping.get(rule_type_str)
-            scope = scope_mapping.get(scope_str)
-            
+            rule_type = self.RULE_TYPE_LABELS.get(rule_type_str)
+            scope = self.RULE_SCOPE_LABELS.get(scope_str)
+        
             if not rule_type or not scope:
-                result_text = f"❌ 잘못된 규칙 타입 또는 범위\\n"
-                result_text += f"규칙 타입: {rule_type_str}\\n"
-                result_text += f"범위: {scope_str}\\n"
+                data["status"] = "INVALID"
             else:
-                rule_id = self.rule_isolation.add_rule(
-                    content, rule_type, scope, project_name, source_context
+                self._expire_rules()
+                # 전역 규칙은 모든 규칙과, 그 외는 전역 규칙 + 같은 프로젝트 규칙과 유사도 확인 (LSH 후보만)
+                similar = self.rule_similarity.similar(
+                    content, project=None if scope == RuleScope.GLOBAL else project_name
                 )
+                data["similar_rules"] = [
+                    dict(self.rule_similarity.rule(rule_id), similarity=similarity)
+                    for rule_id, similarity in similar[:3]
+                ]
                 
-                result_text = f"✅ 규칙 추가 완료\\n\\n"
-                result_text += f"🆔 규칙 ID: {rule_id}\\n"
-                result_text += f"📝 내용: {content}\\n"
-                result_text += f"🏷️ 타입: {rule_type_str}\\n"
-                result_text += f"🎯 범위: {scope_str}\\n"
-                
-                if project_name:
-                    result_text += f"📋 프로젝트: {project_name}\\n"
-                
-                # 오염 방지 검사 결과 표시
-                if scope == RuleScope.GLOBAL:
-                    result_text += "\\n🛡️ 전역 규칙 오염 방지 검사 통과\\n"
-                else:
-                    result_text += "\\n🔒 프로젝트 규칙으로 안전하게 격리됨\\n"
-            
+                data["rule_id"] = self.rule_isolation.add_rule(
+                    content, rule_type, scope, project_name, source_context
+                )
+                # 서명 추가가 실패하면 색인이 불완전 → 이후 오염 검사는 쌍별 검사
+                complete, self.rule_similarity_complete = self.rule_similarity_complete, False
+                self.rule_similarity.add(data["rule_id"], content, scope.name, project_name, rule_type.name)
+                self.rule_similarity_complete = complete
+                data["expires_at"] = self.rule_index.add(
+                    data["rule_id"], content, scope.name, project_name, rule_type.name, ttl_seconds
+                )
+                data["status"] = "SUCCESS"
+                data["isolation"] = "global_checked" if scope == RuleScope.GLOBAL else "project_isolated"
+        
         except Exception as e:
-            result_text = f"❌ 규칙 추가 실패\\n\\n오류: {str(e)}"
+            data["status"] = "ERROR"
+            data["error"] = str(e)
         
-        return {
-            "content": [
+        return ToolResult("add_rule_with_isolation", data, self._render_add_rule_with_isolation)
+
+    @staticmethod
+    def _render_add_rule_with_isolation(data: Dict[str, Any]) -> str:
+        """규칙 추가 결과 텍스트"""
+        if data["status"] == "INVALID":
+            result_text = f"❌ 잘못된 규칙 타입 또는 범위\\n"
+            result_text += f"규칙 타입: {data['rule_type']}\\n"
+            result_text += f"범위: {data['scope']}\\n"
+            return result_text
+        
+        if data["status"] == "ERROR":
+            return f"❌ 규칙 추가 실패\\n\\n오류: {data['error']}"
+        
+        result_text = f"✅ 규칙 추가 완료\\n\\n"
+        result_text += f"🆔 규칙 ID: {data['rule_id']}\\n"
+        result_text += f"📝 내용: {data['content']}\\n"
+        result_text += f"🏷️ 타입: {data['rule_type']}\\n"
+        result_text += f"🎯 범위: {data['scope']}\\n"
+        
+        if data['project_name']:
+            result_text += f"📋 프로젝트: {data['project_name']}\\n"
+        
+        if data.get('expires_at'):
+            result_text += f"⏳ 만료: {datetime.fromtimestamp(data['expires_at']).strftime('%Y-%m-%d %H:%M:%S')}\\n"
+        
+        if data.get('similar_rules'):
+            result_text += f"\\n⚠️ 유사한 기존 규칙:\\n"
+            for rule in data['similar_rules']:
+                location = "전역" if rule['scope'] == GLOBAL_SCOPE else (rule['project'] or rule['scope'])
+                result_text += f"  • [{location}] {rule['content']} (유사도 {rule['similarity']:.2f})\\n"
+        
+        # 오염 방지 검사 결과 표시
+        if data['isolation'] == "global_checked":
+            result_text += "\\n🛡️ 전역 규칙 오염 방지 검사 통과\\n"
+        else:
+            result_text += "\\n🔒 프로젝트 규칙으로 안전하게 격리됨\\n"
+        
+        return result_text
+
+    def _expire_rules(self) -> List[str]:
+        """만료된 임시/세션 규칙을 규칙 색인과 서명 색인에서 제거
+
+        규칙 격리 시스템에는 남겨 두고 규칙 색인의 묘비로 다음 시작 때 다시 가져오지 않음
+        (삭제는 purge_expired 로 명시적으로).
+        """
+        expired = self.rule_index.expire()
+        for rule_id in expired:
+            self.rule_similarity.remove(rule_id)
+        return expired
+
+    async def get_effective_rules_tool(self, args: Dict[str, Any]) -> ToolResult:
+        """프로젝트 유효 규칙 조회 (컴파일된 규칙 색인)"""
+        project_name = args.get("project_name")
+        rule_type_str = args.get("rule_type")
+        
+        data = {"project_name": project_name, "rule_type": rule_type_str}
+        rule_type = self.RULE_TYPE_LABELS.get(rule_type_str) if rule_type_str else None
+        if rule_type_str and rule_type is None:
+            data["status"] = "INVALID"
+            return ToolResult("get_effective_rules", data, self._render_get_effective_rules)
+        
+        if args.get("purge_expired"):
+            data["purged_rules"] = self._purge_expired_isolation_rules()
+        else:
+            self._expire_rules()
+        rules = self.rule_index.effective_rules(project_name, [rule_type.name] if rule_type else None)
+        type_labels = {member.name: label for label, member in self.RULE_TYPE_LABELS.items()}
+        scope_labels = {member.name: label for label, member in self.RULE_SCOPE_LABELS.items()}
+        data["status"] = "SUCCESS"
+        data["rules"] = {
+            type_labels.get(type_name, type_name): [
                 {
-                    "type": "text",
-                    "text": result_text
+                    "rule_id": rule["rule_id"],
+                    "content": rule["content"],
+                    "scope": scope_labels.get(rule["scope"], rule["scope"]),
+                    "project_name": rule["project"],
+                    "expires_at": rule["expires_at"]
                 }
+                for rule in type_rules
             ]
+            for type_name, type_rules in sorted(rules.items())
         }
+        data["total"] = sum(len(type_rules) for type_rules in data["rules"].values())
+        return ToolResult("get_effective_rules", data, self._render_get_effective_rules)
+
+    @staticmethod
+    def _render_get_effective_rules(data: Dict[str, Any]) -> str:
+        """유효 규칙 조회 결과 텍스트"""
+        if data["status"] == "INVALID":
+            return f"❌ 잘못된 규칙 타입: {data['rule_type']}"
+        
+        result_text = f"📜 유효 규칙\\n\\n"
+        result_text += f"📋 프로젝트: {data['project_name'] or '(전역만)'}\\n"
+        result_text += f"📊 규칙 수: {data['total']}개\\n"
+        if data.get("purged_rules") is not None:
+            result_text += f"🧹 규칙 격리 시스템에서 삭제한 만료 규칙: {len(data['purged_rules'])}개\\n"
+        
+        if not data['total']:
+            result_text += "\\n적용되는 규칙이 없습니다.\\n"
+            return result_text
+        
+        for type_name, rules in data['rules'].items():
+            result_text += f"\\n🏷️ {type_name} ({len(rules)}개):\\n"
+            for rule in rules:
+                result_text += f"  • [{rule['scope']}] {rule['content']}"
+                if rule['expires_at']:
+                    result_text += f" (만료 {datetime.fromtimestamp(rule['expires_at']).strftime('%H:%M:%S')})"
+                result_text += "\\n"
+        
+        return result_text
 
     # === 터미널 세션 추적 도구 구현 ===
-    async def get_terminal_session_info_tool(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def get_terminal_session_info_tool(self, args: Dict[str, Any]) -> ToolResult:
         """현재 터미널 세션 정보 조회"""
         try:
-            session_uptime = time.time() - self.session_start_time.timestamp()
-            
-            result_text = f"🖥️ 터미널 세션 정보\\n\\n"
-            result_text += f"🆔 터미널 ID: {self.terminal_id}\\n"
-            result_text += f"⏰ 세션 시작: {self.session_start_time.strftime('%Y-%m-%d %H:%M:%S')}\\n"
-            result_text += f"⏱️ 세션 지속시간: {int(session_uptime//3600):02d}:{int((session_uptime%3600)//60):02d}:{int(session_uptime%60):02d}\\n"
-            result_text += f"💬 총 대화 수: {self.conversation_counter}개\\n"
-            result_text += f"⚙️ 총 작업 수: {self.task_counter}개\\n\\n"
-            
-            result_text += f"📂 작업 공간: {self.workspace}\\n"
-            result_text += f"🗄️ 세션 DB: {self.session_db_path.name}\\n"
-            result_text += f"📊 버전: {self.version}\\n\\n"
-            
+            data = {
+                "status": "SUCCESS",
+                "terminal_id": self.terminal_id,
+                "session_start": self.session_start_time.isoformat(),
+                "session_uptime": time.time() - self.session_start_time.timestamp(),
+                "conversation_count": self.conversation_counter,
+                "task_count": self.task_counter,
+                "workspace": str(self.workspace),
+                "session_db": self.session_db_path.name,
+                "version": self.version
+            }
+        
             # 최근 활동
             try:
-                with sqlite3.connect(str(self.session_db_path)) as conn:
-                    cursor = conn.execute('''
-                        SELECT COUNT(*) FROM conversations 
-                        WHERE terminal_id = ? AND timestamp > ?
-                    ''', (self.terminal_id, (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()))
-                    
-                    recent_count = cursor.fetchone()[0]
-                    result_text += f"📈 최근 1시간 활동: {recent_count}개 대화\\n"
-                    
+                recent_time = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+                data["recent_hour_conversations"] = await self.session_store.read(lambda conn: conn.execute('''
+                    SELECT COUNT(*) FROM conversations
+                    WHERE terminal_id = ? AND timestamp > ?
+                ''', (self.terminal_id, recent_time)).fetchone()[0], after=self.terminal_id)
+        
             except Exception as e:
-                result_text += f"❌ 최근 활동 조회 실패: {e}\\n"
-            
+                data["recent_activity_error"] = str(e)
+        
         except Exception as e:
-            result_text = f"❌ 세션 정보 조회 실패\\n\\n오류: {str(e)}"
+            data = {"status": "ERROR", "error": str(e)}
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return ToolResult("get_terminal_session_info", data, self._render_get_terminal_session_info)
+
+    @staticmethod
+    def _render_get_terminal_session_info(data: Dict[str, Any]) -> str:
+        """터미널 세션 정보 결과 텍스트"""
+        if data["status"] != "SUCCESS":
+            return f"❌ 세션 정보 조회 실패\\n\\n오류: {data['error']}"
+        
+        session_uptime = data["session_uptime"]
+        session_start = datetime.fromisoformat(data["session_start"])
+        
+        result_text = f"🖥️ 터미널 세션 정보\\n\\n"
+        result_text += f"🆔 터미널 ID: {data['terminal_id']}\\n"
+        result_text += f"⏰ 세션 시작: {session_start.strftime('%Y-%m-%d %H:%M:%S')}\\n"
+        result_text += f"⏱️ 세션 지속시간: {int(session_uptime//3600):02d}:{int((session_uptime%3600)//60):02d}:{int(session_uptime%60):02d}\\n"
+        result_text += f"💬 총 대화 수: {data['conversation_count']}개\\n"
+        result_text += f"⚙️ 총 작업 수: {data['task_count']}개\\n\\n"
+        
+        result_text += f"📂 작업 공간: {data['workspace']}\\n"
+        result_text += f"🗄️ 세션 DB: {data['session_db']}\\n"
+        result_text += f"📊 버전: {data['version']}\\n\\n"
+        
+        # 최근 활동
+        if "recent_hour_conversations" in data:
+            result_text += f"📈 최근 1시간 활동: {data['recent_hour_conversations']}개 대화\\n"
+        else:
+            result_text += f"❌ 최근 활동 조회 실패: {data.get('recent_activity_error')}\\n"
+        
+        return result_text
 
-    async def search_conversation_history_tool(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """대화 내역 검색"""
+    async def search_conversation_history_tool(self, args: Dict[str, Any]) -> ToolResult:
+        """대화 내역 검색 (키셋 커서 페이지네이션)"""
         query = args["query"]
         time_range_hours = args.get("time_range_hours", 24)
-        limit = args.get("limit", 10)
+        page_size = clamp_page_size(args.get("limit"), 10)
+        max_bytes = clamp_page_bytes(args.get("max_bytes"))
+        
+        data = {
+            "query": query,
+            "time_range_hours": time_range_hours,
+            "page_size": page_size
+        }
         
         try:
+            scope = query_scope(tool="search_conversation_history", query=query, hours=time_range_hours)
+            position = decode_cursor(args.get("cursor"), scope)
             search_time = (datetime.now(timezone.utc) - timedelta(hours=time_range_hours)).isoformat()
             
-            with sqlite3.connect(str(self.session_db_path)) as conn:
-                cursor = conn.execute('''
-                    SELECT conversation_id, timestamp, request_data, response_data, status
-                    FROM conversations 
-                    WHERE terminal_id = ? AND timestamp > ?
-                    AND (request_data LIKE ? OR response_data LIKE ?)
-                    ORDER BY timestamp DESC LIMIT ?
-                ''', (self.terminal_id, search_time, f"%{query}%", f"%{query}%", limit))
-                
-                results = cursor.fetchall()
+            sql = '''
+                SELECT timestamp, id, conversation_id, status,
+                       json_extract(request_data, '$.method'),
+                       json_extract(request_data, '$.params.name')
+                FROM conversations
+                WHERE terminal_id = ? AND timestamp > ?
+                AND (request_data LIKE ? OR response_data LIKE ?)
+            '''
+            params = [self.terminal_id, search_time, f"%{query}%", f"%{query}%"]
             
-            result_text = f"🔍 대화 내역 검색 결과\\n\\n"
-            result_text += f"🔎 검색어: {query}\\n"
-            result_text += f"⏰ 검색 범위: 최근 {time_range_hours}시간\\n"
-            result_text += f"📊 발견된 대화: {len(results)}개\\n\\n"
+            if position:
+                sql += " AND " + keyset_condition("timestamp", "id")
+                params.extend([position[0], position[0], position[1]])
             
-            if results:
-                for i, (conv_id, timestamp, request_data, response_data, status) in enumerate(results, 1):
-                    try:
-                        request = json.loads(request_data)
-                        method = request.get("method", "unknown")
-                        
-                        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                        time_str = dt.strftime('%m-%d %H:%M')
-                        
-                        result_text += f"{i}. [{time_str}] {conv_id}\\n"
-                        result_text += f"   메서드: {method} | 상태: {status}\\n"
-                        
-                        if method == "tools/call":
-                            tool_name = request.get("params", {}).get("name", "unknown")
-                            result_text += f"   도구: {tool_name}\\n"
-                        
-                        result_text += "\\n"
-                        
-                    except Exception as e:
-                        result_text += f"{i}. 파싱 오류: {e}\\n\\n"
-            else:
-                result_text += "❌ 검색 결과가 없습니다.\\n"
+            sql += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+            params.append(page_size + 1)
+            
+            def to_entry(row):
+                timestamp, _, conv_id, status, method, tool_name = row
+                entry = {"conversation_id": conv_id, "timestamp": timestamp, "status": status,
+                         "method": method or "unknown"}
+                if entry["method"] == "tools/call":
+                    entry["tool_name"] = tool_name or "unknown"
+                return entry
+            
+            page = await self.session_store.read(
+                lambda conn: collect_page(conn.execute(sql, params), page_size, max_bytes, to_entry),
+                after=self.terminal_id
+            )
+            
+            data["status"] = "SUCCESS"
+            data["conversations"] = page["entries"]
+            data["has_more"] = page["has_more"]
+            data["truncated_by_bytes"] = page["truncated_by_bytes"]
+            data["next_cursor"] = encode_cursor(*page["last_key"], scope) if page["has_more"] else None
             
         except Exception as e:
-            result_text = f"❌ 검색 실패\\n\\n오류: {str(e)}"
+            data["status"] = "ERROR"
+            data["error"] = str(e)
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return ToolResult("search_conversation_history", data, self._render_search_conversation_history)
+
+    @staticmethod
+    def _render_search_conversation_history(data: Dict[str, Any]) -> str:
+        """대화 내역 검색 결과 텍스트"""
+        if data["status"] != "SUCCESS":
+            return f"❌ 검색 실패\\n\\n오류: {data['error']}"
+        
+        conversations = data["conversations"]
+        result_text = f"🔍 대화 내역 검색 결과\\n\\n"
+        result_text += f"🔎 검색어: {data['query']}\\n"
+        result_text += f"⏰ 검색 범위: 최근 {data['time_range_hours']}시간\\n"
+        result_text += f"📊 발견된 대화: {len(conversations)}개\\n\\n"
+        
+        if conversations:
+            for i, entry in enumerate(conversations, 1):
+                try:
+                    dt = datetime.fromisoformat(entry["timestamp"].replace('Z', '+00:00'))
+                    time_str = dt.strftime('%m-%d %H:%M')
+        
+                    result_text += f"{i}. [{time_str}] {entry['conversation_id']}\\n"
+                    result_text += f"   메서드: {entry['method']} | 상태: {entry['status']}\\n"
+        
+                    if "tool_name" in entry:
+                        result_text += f"   도구: {entry['tool_name']}\\n"
+        
+                    result_text += "\\n"
+        
+                except Exception as e:
+                    result_text += f"{i}. 파싱 오류: {e}\\n\\n"
+        else:
+            result_text += "❌ 검색 결과가 없습니다.\\n"
+        
+        if data.get("next_cursor"):
+            result_text += f"➡️ 다음 페이지 커서: {data['next_cursor']}\\n"
+        
+        return result_text
 
-    async def get_task_history_tool(self, args: Dict[str, Any]) -> Dict[str, Any]:
-        """작업 실행 이력 조회"""
+    async def get_task_history_tool(self, args: Dict[str, Any]) -> ToolResult:
+        """작업 실행 이력 조회 (키셋 커서 페이지네이션)"""
         task_type = args.get("task_type")
         status = args.get("status")
-        limit = args.get("limit", 20)
+        page_size = clamp_page_size(args.get("limit"), 20)
+        max_bytes = clamp_page_bytes(args.get("max_bytes"))
+        
+        data = {
+            "task_type": task_type,
+            "status_filter": status,
+            "page_size": page_size
+        }
         
         try:
+            scope = query_scope(tool="get_task_history", task_type=task_type, status=status)
+            position = decode_cursor(args.get("cursor"), scope)
+            
             query = '''
-                SELECT task_id, created_at, task_type, status, progress_data
-                FROM task_tracking 
+                SELECT created_at, id, task_id, task_type, status, progress_data
+                FROM task_tracking
                 WHERE terminal_id = ?
             '''
             params = [self.terminal_id]
@@ -2226,124 +4178,165 @@ class BOOSAANUltimateMCPServer:
             if status:
                 query += " AND status = ?"
                 params.append(status)
+            
+            if position:
+                query += " AND " + keyset_condition("created_at", "id")
+                params.extend([position[0], position[0], position[1]])
                 
-            query += " ORDER BY created_at DESC LIMIT ?"
-            params.append(limit)
+            query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+            params.append(page_size + 1)
             
-            with sqlite3.connect(str(self.session_db_path)) as conn:
-                cursor = conn.execute(query, params)
-                results = cursor.fetchall()
+            def to_entry(row):
+                created_at, _, task_id, ttype, tstatus, progress_data = row
+                entry = {"task_id": task_id, "created_at": created_at, "task_type": ttype, "status": tstatus}
+                if progress_data:
+                    try:
+                        progress = json.loads(progress_data)
+                        if "response_time" in progress:
+                            entry["response_time"] = progress["response_time"]
+                    except:
+                        pass
+                return entry
             
-            result_text = f"⚙️ 작업 실행 이력\\n\\n"
-            result_text += f"📊 조회된 작업: {len(results)}개\\n"
-            if task_type:
-                result_text += f"🎯 작업 타입: {task_type}\\n"
-            if status:
-                result_text += f"📋 상태: {status}\\n"
-            result_text += "\\n"
+            page = await self.session_store.read(
+                lambda conn: collect_page(conn.execute(query, params), page_size, max_bytes, to_entry),
+                after=self.terminal_id
+            )
             
-            if results:
-                for i, (task_id, created_at, ttype, tstatus, progress_data) in enumerate(results, 1):
-                    try:
-                        dt = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                        time_str = dt.strftime('%m-%d %H:%M:%S')
-                        
-                        result_text += f"{i}. [{time_str}] {task_id}\\n"
-                        result_text += f"   타입: {ttype} | 상태: {tstatus}\\n"
-                        
-                        if progress_data:
-                            try:
-                                progress = json.loads(progress_data)
-                                if "response_time" in progress:
-                                    result_text += f"   실행시간: {progress['response_time']:.3f}초\\n"
-                            except:
-                                pass
-                        
-                        result_text += "\\n"
-                        
-                    except Exception as e:
-                        result_text += f"{i}. 파싱 오류: {e}\\n\\n"
-            else:
-                result_text += "❌ 작업 이력이 없습니다.\\n"
+            data["status"] = "SUCCESS"
+            data["tasks"] = page["entries"]
+            data["has_more"] = page["has_more"]
+            data["truncated_by_bytes"] = page["truncated_by_bytes"]
+            data["next_cursor"] = encode_cursor(*page["last_key"], scope) if page["has_more"] else None
             
         except Exception as e:
-            result_text = f"❌ 작업 이력 조회 실패\\n\\n오류: {str(e)}"
+            data["status"] = "ERROR"
+            data["error"] = str(e)
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return ToolResult("get_task_history", data, self._render_get_task_history)
+
+    @staticmethod
+    def _render_get_task_history(data: Dict[str, Any]) -> str:
+        """작업 실행 이력 결과 텍스트"""
+        if data["status"] != "SUCCESS":
+            return f"❌ 작업 이력 조회 실패\\n\\n오류: {data['error']}"
+        
+        tasks = data["tasks"]
+        result_text = f"⚙️ 작업 실행 이력\\n\\n"
+        result_text += f"📊 조회된 작업: {len(tasks)}개\\n"
+        if data["task_type"]:
+            result_text += f"🎯 작업 타입: {data['task_type']}\\n"
+        if data["status_filter"]:
+            result_text += f"📋 상태: {data['status_filter']}\\n"
+        result_text += "\\n"
+        
+        if tasks:
+            for i, entry in enumerate(tasks, 1):
+                try:
+                    dt = datetime.fromisoformat(entry["created_at"].replace('Z', '+00:00'))
+                    time_str = dt.strftime('%m-%d %H:%M:%S')
+        
+                    result_text += f"{i}. [{time_str}] {entry['task_id']}\\n"
+                    result_text += f"   타입: {entry['task_type']} | 상태: {entry['status']}\\n"
+        
+                    if "response_time" in entry:
+                        result_text += f"   실행시간: {entry['response_time']:.3f}초\\n"
+        
+                    result_text += "\\n"
+        
+                except Exception as e:
+                    result_text += f"{i}. 파싱 오류: {e}\\n\\n"
+        else:
+            result_text += "❌ 작업 이력이 없습니다.\\n"
+        
+        if data.get("next_cursor"):
+            result_text += f"➡️ 다음 페이지 커서: {data['next_cursor']}\\n"
+        
+        return result_text
 
-    async def restore_previous_context_tool(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def restore_previous_context_tool(self, args: Dict[str, Any]) -> ToolResult:
         """이전 세션 컨텍스트 복원"""
         hours_back = args.get("hours_back", 24)
         
+        data = {"hours_back": hours_back}
+        
         try:
             search_time = (datetime.now(timezone.utc) - timedelta(hours=hours_back)).isoformat()
-            
-            with sqlite3.connect(str(self.session_db_path)) as conn:
-                cursor = conn.execute('''
-                    SELECT context_data, metadata, snapshot_time
-                    FROM context_snapshots 
-                    WHERE terminal_id = ? AND snapshot_time > ?
-                    ORDER BY snapshot_time DESC LIMIT 1
-                ''', (self.terminal_id, search_time))
-                
-                result = cursor.fetchone()
-            
+        
+            result = await self.session_store.read(lambda conn: conn.execute('''
+                SELECT context_data, metadata, snapshot_time
+                FROM context_snapshots
+                WHERE terminal_id = ? AND snapshot_time > ?
+                ORDER BY snapshot_time DESC LIMIT 1
+            ''', (self.terminal_id, search_time)).fetchone(), after=self.terminal_id)
+        
             if result:
                 context_data, metadata_str, snapshot_time = result
-                
+        
                 try:
                     restored_context = pickle.loads(context_data)
                     metadata = json.loads(metadata_str)
-                    
+        
                     # 컨텍스트 복원
                     if "context_memory" in restored_context:
                         self.context_memory.update(restored_context["context_memory"])
-                    
+        
                     if "conversation_count" in restored_context:
                         self.conversation_counter = max(self.conversation_counter, restored_context["conversation_count"])
-                    
+        
                     if "task_count" in restored_context:
                         self.task_counter = max(self.task_counter, restored_context["task_count"])
-                    
-                    result_text = f"🔄 컨텍스트 복원 완료\\n\\n"
-                    result_text += f"📅 복원 시점: {snapshot_time[:19].replace('T', ' ')}\\n"
-                    result_text += f"💾 복원된 메모리: {len(self.context_memory)}개 항목\\n"
-                    result_text += f"💬 대화 카운터: {self.conversation_counter}\\n"
-                    result_text += f"⚙️ 작업 카운터: {self.task_counter}\\n"
-                    result_text += f"📊 메타데이터: {metadata.get('snapshot_type', 'unknown')}\\n"
-                    
+        
+                    data.update({
+                        "status": "RESTORED",
+                        "snapshot_time": snapshot_time,
+                        "context_memory_items": len(self.context_memory),
+                        "conversation_counter": self.conversation_counter,
+                        "task_counter": self.task_counter,
+                        "snapshot_type": metadata.get('snapshot_type', 'unknown')
+                    })
+        
                 except Exception as e:
-                    result_text = f"❌ 컨텍스트 복원 실패\\n\\n데이터 파싱 오류: {e}"
+                    data["status"] = "PARSE_ERROR"
+                    data["error"] = str(e)
             else:
-                result_text = f"❌ 복원할 컨텍스트 없음\\n\\n"
-                result_text += f"⏰ 검색 범위: 최근 {hours_back}시간\\n"
-                result_text += f"💡 더 넓은 범위로 시도해보세요.\\n"
-            
+                data["status"] = "NOT_FOUND"
+        
         except Exception as e:
-            result_text = f"❌ 컨텍스트 복원 실패\\n\\n오류: {str(e)}"
+            data["status"] = "ERROR"
+            data["error"] = str(e)
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return ToolResult("restore_previous_context", data, self._render_restore_previous_context)
+
+    @staticmethod
+    def _render_restore_previous_context(data: Dict[str, Any]) -> str:
+        """컨텍스트 복원 결과 텍스트"""
+        if data["status"] == "RESTORED":
+            result_text = f"🔄 컨텍스트 복원 완료\\n\\n"
+            result_text += f"📅 복원 시점: {data['snapshot_time'][:19].replace('T', ' ')}\\n"
+            result_text += f"💾 복원된 메모리: {data['context_memory_items']}개 항목\\n"
+            result_text += f"💬 대화 카운터: {data['conversation_counter']}\\n"
+            result_text += f"⚙️ 작업 카운터: {data['task_counter']}\\n"
+            result_text += f"📊 메타데이터: {data['snapshot_type']}\\n"
+        elif data["status"] == "PARSE_ERROR":
+            result_text = f"❌ 컨텍스트 복원 실패\\n\\n데이터 파싱 오류: {data['error']}"
+        elif data["status"] == "NOT_FOUND":
+            result_text = f"❌ 복원할 컨텍스트 없음\\n\\n"
+            result_text += f"⏰ 검색 범위: 최근 {data['hours_back']}시간\\n"
+            result_text += f"💡 더 넓은 범위로 시도해보세요.\\n"
+        else:
+            result_text = f"❌ 컨텍스트 복원 실패\\n\\n오류: {data['error']}"
+        
+        return result_text
 
-    async def get_session_statistics_tool(self, args: Dict[str, Any]) -> Dict[str, Any]:
+    async def get_session_statistics_tool(self, args: Dict[str, Any]) -> ToolResult:
         """터미널 세션 통계 정보"""
         include_performance = args.get("include_performance", True)
         
         try:
-            with sqlite3.connect(str(self.session_db_path)) as conn:
+            recent_time = (datetime.now(timezone.utc) - timedelta(hours=24)).isoformat()
+            
+            def _collect_statistics(conn):
                 # 전체 통계
                 cursor = conn.execute('''
                     SELECT COUNT(*), MIN(timestamp), MAX(timestamp)
@@ -2353,84 +4346,116 @@ class BOOSAANUltimateMCPServer:
                 
                 # 상태별 통계
                 cursor = conn.execute('''
-                    SELECT status, COUNT(*) FROM conversations 
+                    SELECT status, COUNT(*) FROM conversations
                     WHERE terminal_id = ? GROUP BY status
                 ''', (self.terminal_id,))
                 status_stats = dict(cursor.fetchall())
                 
                 # 최근 24시간 활동
-                recent_time = (datetime.now(timezone.utc) - timedelta(hours=24)).isoformat()
                 cursor = conn.execute('''
-                    SELECT COUNT(*) FROM conversations 
+                    SELECT COUNT(*) FROM conversations
                     WHERE terminal_id = ? AND timestamp > ?
                 ''', (self.terminal_id, recent_time))
                 recent_activity = cursor.fetchone()[0]
                 
                 # 작업 타입별 통계
                 cursor = conn.execute('''
-                    SELECT task_type, COUNT(*) FROM task_tracking 
+                    SELECT task_type, COUNT(*) FROM task_tracking
                     WHERE terminal_id = ? GROUP BY task_type
                 ''', (self.terminal_id,))
                 task_type_stats = dict(cursor.fetchall())
-            
-            result_text = f"📊 터미널 세션 통계\\n\\n"
-            result_text += f"🆔 터미널 ID: {self.terminal_id}\\n\\n"
-            
-            # 기본 통계
-            result_text += f"📈 전체 통계:\\n"
-            result_text += f"  • 총 대화 수: {total_conversations}개\\n"
-            result_text += f"  • 최근 24시간: {recent_activity}개\\n"
-            result_text += f"  • 현재 세션: {self.conversation_counter}개\\n\\n"
-            
-            # 상태별 통계
-            if status_stats:
-                result_text += f"📋 상태별 통계:\\n"
-                for status, count in status_stats.items():
-                    percentage = (count / total_conversations * 100) if total_conversations > 0 else 0
-                    result_text += f"  • {status}: {count}개 ({percentage:.1f}%)\\n"
-                result_text += "\\n"
-            
-            # 작업 타입별 통계
-            if task_type_stats:
-                result_text += f"⚙️ 작업 타입별 통계:\\n"
-                for task_type, count in list(task_type_stats.items())[:10]:  # 상위 10개만
-                    result_text += f"  • {task_type}: {count}개\\n"
-                result_text += "\\n"
-            
-            # 성능 정보
-            if include_performance:
-                result_text += f"🚀 성능 메트릭:\\n"
-                result_text += f"  • 평균 응답시간: {self.performance_metrics['average_response_time']:.3f}초\\n"
-                result_text += f"  • 총 요청: {self.performance_metrics['total_requests']}개\\n"
-                result_text += f"  • 성공 작업: {self.performance_metrics['successful_operations']}개\\n"
-                result_text += f"  • 차단 작업: {self.performance_metrics['blocked_operations']}개\\n"
                 
-                if self.performance_metrics['total_requests'] > 0:
-                    success_rate = self.performance_metrics['successful_operations'] / self.performance_metrics['total_requests'] * 100
-                    result_text += f"  • 성공률: {success_rate:.1f}%\\n"
-            
-            # 세션 시간 정보
-            if min_time and max_time:
-                session_duration = (datetime.fromisoformat(max_time.replace('Z', '+00:00')) - 
-                                  datetime.fromisoformat(min_time.replace('Z', '+00:00'))).total_seconds()
-                hours = int(session_duration // 3600)
-                minutes = int((session_duration % 3600) // 60)
-                result_text += f"\\n⏰ 활동 기간:\\n"
-                result_text += f"  • 첫 활동: {min_time[:19].replace('T', ' ')}\\n"
-                result_text += f"  • 마지막: {max_time[:19].replace('T', ' ')}\\n"
-                result_text += f"  • 총 기간: {hours}시간 {minutes}분\\n"
+                return total_conversations, min_time, max_time, status_stats, recent_activity, task_type_stats
+            
+            (total_conversations, min_time, max_time,
+             status_stats, recent_activity, task_type_stats) = await self.session_store.read(
+                _collect_statistics, after=self.terminal_id
+            )
             
+            data = {
+                "status": "SUCCESS",
+                "terminal_id": self.terminal_id,
+                "total_conversations": total_conversations,
+                "recent_24h_conversations": recent_activity,
+                "current_session_conversations": self.conversation_counter,
+                "status_stats": status_stats,
+                "task_type_stats": task_type_stats,
+                "first_activity": min_time,
+                "last_activity": max_time,
+                "performance_metrics": self.performance_metrics.copy() if include_performance else None,
+                "context_memory": self.context_memory.metrics() if include_performance else None
+            }
+        
         except Exception as e:
-            result_text = f"❌ 통계 조회 실패\\n\\n오류: {str(e)}"
+            data = {"status": "ERROR", "error": str(e)}
         
-        return {
-            "content": [
-                {
-                    "type": "text",
-                    "text": result_text
-                }
-            ]
-        }
+        return ToolResult("get_session_statistics", data, self._render_get_session_statistics)
+
+    @staticmethod
+    def _render_get_session_statistics(data: Dict[str, Any]) -> str:
+        """세션 통계 결과 텍스트"""
+        if data["status"] != "SUCCESS":
+            return f"❌ 통계 조회 실패\\n\\n오류: {data['error']}"
+        
+        total_conversations = data["total_conversations"]
+        
+        result_text = f"📊 터미널 세션 통계\\n\\n"
+        result_text += f"🆔 터미널 ID: {data['terminal_id']}\\n\\n"
+        
+        # 기본 통계
+        result_text += f"📈 전체 통계:\\n"
+        result_text += f"  • 총 대화 수: {total_conversations}개\\n"
+        result_text += f"  • 최근 24시간: {data['recent_24h_conversations']}개\\n"
+        result_text += f"  • 현재 세션: {data['current_session_conversations']}개\\n\\n"
+        
+        # 상태별 통계
+        if data["status_stats"]:
+            result_text += f"📋 상태별 통계:\\n"
+            for status, count in data["status_stats"].items():
+                percentage = (count / total_conversations * 100) if total_conversations > 0 else 0
+                result_text += f"  • {status}: {count}개 ({percentage:.1f}%)\\n"
+            result_text += "\\n"
+        
+        # 작업 타입별 통계
+        if data["task_type_stats"]:
+            result_text += f"⚙️ 작업 타입별 통계:\\n"
+            for task_type, count in list(data["task_type_stats"].items())[:10]:  # 상위 10개만
+                result_text += f"  • {task_type}: {count}개\\n"
+            result_text += "\\n"
+        
+        # 성능 정보
+        metrics = data["performance_metrics"]
+        if metrics:
+            result_text += f"🚀 성능 메트릭:\\n"
+            result_text += f"  • 평균 응답시간: {metrics['average_response_time']:.3f}초\\n"
+            result_text += f"  • 총 요청: {metrics['total_requests']}개\\n"
+            result_text += f"  • 성공 작업: {metrics['successful_operations']}개\\n"
+            result_text += f"  • 차단 작업: {metrics['blocked_operations']}개\\n"
+        
+            if metrics['total_requests'] > 0:
+                success_rate = metrics['successful_operations'] / metrics['total_requests'] * 100
+                result_text += f"  • 성공률: {success_rate:.1f}%\\n"
+        
+        memory = data.get("context_memory")
+        if memory:
+            result_text += f"\\n🧠 맥락 메모리 ({memory['policy'].upper()}):\\n"
+            result_text += f"  • 상주: {memory['resident_items']}개 / {memory['resident_bytes']:,} / {memory['max_bytes']:,} bytes\\n"
+            result_text += f"  • 스필: {memory['spilled_items']}개 | 축출: {memory['evictions']}회\\n"
+            result_text += f"  • 적중률: {memory['hit_rate'] * 100:.1f}% (적중 {memory['hits']} / 미스 {memory['misses']})\\n"
+        
+        # 세션 시간 정보
+        min_time, max_time = data["first_activity"], data["last_activity"]
+        if min_time and max_time:
+            session_duration = (datetime.fromisoformat(max_time.replace('Z', '+00:00')) -
+                              datetime.fromisoformat(min_time.replace('Z', '+00:00'))).total_seconds()
+            hours = int(session_duration // 3600)
+            minutes = int((session_duration % 3600) // 60)
+            result_text += f"\\n⏰ 활동 기간:\\n"
+            result_text += f"  • 첫 활동: {min_time[:19].replace('T', ' ')}\\n"
+            result_text += f"  • 마지막: {max_time[:19].replace('T', ' ')}\\n"
+            result_text += f"  • 총 기간: {hours}시간 {minutes}분\\n"
+        
+        return result_text
 
     async def list_resources(self) -> Dict[str, Any]:
         """사용 가능한 리소스 목록"""
@@ -2458,6 +4483,18 @@ class BOOSAANUltimateMCPServer:
                 "name": "샌드박스 목록",
                 "description": "활성 샌드박스 목록 및 상태",
                 "mimeType": "application/json"
+            },
+            {
+                "uri": "sandbox://usage/{sandbox_id}",
+                "name": "샌드박스 사용량 시계열",
+                "description": "샌드박스별 CPU/메모리/IO 사용량 시계열 및 최대/평균 요약",
+                "mimeType": "application/json"
+            },
+            {
+                "uri": "sandbox://executions/{execution_id}/{stream}",
+                "name": "샌드박스 실행 전체 출력",
+                "description": "실행별 stdout/stderr 전체 로그 (?offset=&length= 로 부분 조회)",
+                "mimeType": "application/json"
             }
         ]
         
@@ -2469,16 +4506,37 @@ class BOOSAANUltimateMCPServer:
         
         if uri == "system://health":
             health_data = await self.system_health_check({"detailed": True})
-            content = health_data["content"][0]["text"]
+            content = health_data.text
         elif uri == "system://performance":
             perf_data = await self.performance_metrics_tool({})
-            content = perf_data["content"][0]["text"]
+            content = perf_data.text
         elif uri == "context://summary":
-            summary = self.context_manager.get_context_summary()
+            summary = await self._call_context_manager(self.context_manager.get_context_summary)
             content = json.dumps(summary, ensure_ascii=False, indent=2)
         elif uri == "sandbox://list":
-            sandbox_list = self.sandbox_manager.list_sandboxes()
+            sandbox_list = await asyncio.to_thread(self._list_sandboxes)
             content = json.dumps(sandbox_list, ensure_ascii=False, indent=2)
+        elif uri.startswith("sandbox://usage/"):
+            sandbox_id = uri[len("sandbox://usage/"):]
+            target_id = self.sandbox_pool.resolve(sandbox_id) if self.sandbox_pool else sandbox_id
+            usage_series = self.resource_accountant.series(target_id)
+            if usage_series is None:
+                return {"error": f"계측 중인 샌드박스가 아님: {sandbox_id}"}
+            usage_series["sandbox_id"] = sandbox_id
+            content = json.dumps(usage_series, ensure_ascii=False)
+        elif uri.startswith("sandbox://executions/"):
+            parsed = urlsplit(uri)
+            query = parse_qs(parsed.query)
+            try:
+                execution_id, stream = parsed.path.strip("/").split("/")
+                chunk = self.sandbox_executor.read_output(
+                    execution_id, stream,
+                    offset=int(query.get("offset", ["0"])[0]),
+                    length=int(query.get("length", ["65536"])[0])
+                )
+            except (KeyError, ValueError, OSError) as e:
+                return {"error": f"실행 출력을 찾을 수 없음: {uri} ({e})"}
+            content = json.dumps(chunk, ensure_ascii=False)
         else:
             return {"error": f"알 수 없는 리소스: {uri}"}
         
@@ -2492,6 +4550,36 @@ class BOOSAANUltimateMCPServer:
             ]
         }
 
+    def shutdown(self):
+        """서버 종료 시 리소스 정리 (워커 풀 종료, 대기 중인 세션 DB 쓰기 완료 후 종료)"""
+        if self.maintenance:
+            self.maintenance.close()
+        if self.worker_pool:
+            self.worker_pool.close()
+        if self.sandbox_pool:
+            self.sandbox_pool.close()
+        self.resource_accountant.close()
+        self.workspace_provisioner.close()
+        if self.document_journal:
+            # 남은 대기 문서는 종료 전에 문서 관리자에 적용 (실패하면 다음 시작 때 이어서)
+            applied, error = self._flush_document_journal(self.document_journal)
+            self._rekey_document_index(applied)
+            if error:
+                self.logger.warning(f"맥락 문서 저널 적용 실패: {error}")
+            self.document_journal.close()
+        self.context_index.close()
+        self.document_index.close()
+        if self.rule_similarity:
+            self.rule_similarity.close()
+        if self.rule_index:
+            self.rule_index.close()
+        if self.exec_cache:
+            self.exec_cache.close()
+        if self.thinking_cache:
+            self.thinking_cache.close()
+        self.port_index.close()
+        self.session_store.close()
+
     def _update_performance_metrics(self, response_time: float, success: bool):
         """성능 메트릭 업데이트"""
         # 이동 평균으로 응답 시간 계산
@@ -2548,6 +4636,7 @@ async def main():
     except Exception as e:
         logger.error(f"서버 실행 오류: {e}")
     finally:
+        server.shutdown()
         logger.info("BOOSAAN MCP 서버 종료")
 
 if __name__ == "__main__":
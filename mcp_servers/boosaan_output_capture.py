@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 샌드박스 출력 캡처
+- 앞부분(head)은 고정 크기 버퍼, 뒷부분(tail)은 고정 크기 링 버퍼에 보관
+- 전체 출력은 실행별 파일로 스트리밍 저장 (메모리 사용량은 출력 크기와 무관)
+  단, 스트림으로 쓸 때만 해당 — 이미 메모리에 모인 출력(manager 엔진)을 옮길 때는 상한이 아님
+- 저장된 전체 로그는 오프셋/길이로 부분 조회
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DEFAULT_HEAD_BYTES = 2 * 1024
+DEFAULT_TAIL_BYTES = 8 * 1024
+MAX_READ_BYTES = 1024 * 1024
+
+
+class RingBuffer:
+    """고정 크기 바이트 링 버퍼 (마지막 capacity 바이트만 유지)"""
+
+    __slots__ = ("capacity", "_buffer", "_end", "_filled")
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._buffer = bytearray(self.capacity)
+        self._end = 0
+        self._filled = 0
+
+    def write(self, data: bytes):
+        if len(data) >= self.capacity:
+            self._buffer[:] = data[-self.capacity:]
+            self._end = 0
+            self._filled = self.capacity
+            return
+
+        first = min(len(data), self.capacity - self._end)
+        self._buffer[self._end:self._end + first] = data[:first]
+        rest = len(data) - first
+        if rest:
+            self._buffer[:rest] = data[first:]
+        self._end = (self._end + len(data)) % self.capacity
+        self._filled = min(self.capacity, self._filled + len(data))
+
+    def getvalue(self) -> bytes:
+        if self._filled < self.capacity:
+            return bytes(self._buffer[:self._filled])
+        return bytes(self._buffer[self._end:] + self._buffer[:self._end])
+
+
+class OutputCapture:
+    """스트림 하나(stdout/stderr)의 head + tail 캡처 및 파일 스필"""
+
+    def __init__(self, spill_path: Optional[Path] = None,
+                 head_bytes: int = DEFAULT_HEAD_BYTES, tail_bytes: int = DEFAULT_TAIL_BYTES):
+        self.head_bytes = head_bytes
+        self._head = bytearray()
+        self._tail = RingBuffer(tail_bytes)
+        self.total_bytes = 0
+
+        self.spill_path = spill_path
+        self._spill = open(spill_path, "wb") if spill_path else None
+
+    def write(self, data: bytes):
+        if not data:
+            return
+        if self._spill:
+            self._spill.write(data)
+
+        room = self.head_bytes - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+        if self.total_bytes + len(data) > self.head_bytes:
+            # head에 들어간 부분은 tail에 중복 보관하지 않음
+            self._tail.write(data[max(0, room):])
+        self.total_bytes += len(data)
+
+    def close(self):
+        if self._spill:
+            self._spill.close()
+            self._spill = None
+
+    @property
+    def truncated(self) -> bool:
+        return self.total_bytes > self.head_bytes + self._tail.capacity
+
+    def preview(self) -> str:
+        """head + (생략 표시) + tail 텍스트"""
+        head = bytes(self._head).decode(errors="replace")
+        tail = self._tail.getvalue().decode(errors="replace")
+        if not self.truncated:
+            return head + tail
+        omitted = self.total_bytes - len(self._head) - self._tail.capacity
+        return f"{head}\n... [{omitted:,} bytes 생략] ...\n{tail}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_bytes": self.total_bytes,
+            "truncated": self.truncated,
+            "spill_path": str(self.spill_path) if self.spill_path else None
+        }
+
+
+def safe_path_component(value: str) -> str:
+    """파일 경로 구성 요소로 안전한 문자열 (경로 탈출 방지)"""
+    cleaned = re.sub(r"[^A-Za-z0-9_.-]", "_", value).lstrip(".")
+    return cleaned or "_"
+
+
+def read_range(path: Path, offset: int = 0, length: int = MAX_READ_BYTES) -> Dict[str, Any]:
+    """저장된 출력 파일의 일부 읽기"""
+    size = path.stat().st_size
+    offset = max(0, min(offset, size))
+    length = max(0, min(length, MAX_READ_BYTES))
+
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read(length)
+
+    return {
+        "offset": offset,
+        "length": len(data),
+        "total_bytes": size,
+        "eof": offset + len(data) >= size,
+        "text": data.decode(errors="replace")
+    }
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 키셋(keyset) 페이지네이션
+- (ts, id) 기준 안정 정렬 (최신 → 과거)
+- 불투명 커서: 마지막 행의 (ts, id) + 조회 조건 해시
+- 페이지 크기 / 응답 바이트 예산은 서버에서 강제
+"""
+
+import base64
+import hashlib
+import json
+from typing import Dict, Any, Optional, Tuple
+
+# 서버 측 상한
+MAX_PAGE_SIZE = 100
+MAX_PAGE_BYTES = 256 * 1024
+
+
+class InvalidCursorError(ValueError):
+    """잘못되었거나 다른 조회 조건에서 발급된 커서"""
+
+
+def query_scope(**filters: Any) -> str:
+    """조회 조건 해시 (커서를 같은 조건에서만 재사용하도록 묶음)"""
+    payload = json.dumps(filters, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def encode_cursor(ts: str, row_id: int, scope: str) -> str:
+    """마지막 행 위치를 불투명 커서 문자열로 인코딩"""
+    raw = json.dumps({"t": ts, "i": row_id, "s": scope}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], scope: str) -> Optional[Tuple[str, int]]:
+    """커서 디코딩 (없으면 None, 잘못되면 InvalidCursorError)"""
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        ts, row_id, cursor_scope = payload["t"], int(payload["i"]), payload["s"]
+    except Exception as e:
+        raise InvalidCursorError(f"잘못된 커서: {e}")
+
+    if cursor_scope != scope:
+        raise InvalidCursorError("커서가 현재 조회 조건과 일치하지 않습니다")
+
+    return ts, row_id
+
+
+def clamp_page_size(requested: Any, default: int, maximum: int = MAX_PAGE_SIZE) -> int:
+    """요청 페이지 크기를 1..maximum 범위로 제한"""
+    try:
+        size = int(requested) if requested is not None else default
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, maximum))
+
+
+def clamp_page_bytes(requested: Any, maximum: int = MAX_PAGE_BYTES) -> int:
+    """요청 바이트 예산을 서버 상한 이하로 제한"""
+    try:
+        budget = int(requested) if requested is not None else maximum
+    except (TypeError, ValueError):
+        budget = maximum
+    return max(1024, min(budget, maximum))
+
+
+def keyset_condition(ts_column: str, id_column: str) -> str:
+    """커서 이후(더 과거) 행만 고르는 WHERE 조건"""
+    return f"({ts_column} < ? OR ({ts_column} = ? AND {id_column} < ?))"
+
+
+def collect_page(cursor, page_size: int, max_bytes: int, to_entry) -> Dict[str, Any]:
+    """SQL 커서에서 페이지를 읽어 크기/바이트 예산 안에서 수집
+
+    행의 앞 두 컬럼은 (ts, id) 이어야 한다. 최소 한 행은 항상 포함한다.
+    """
+    entries = []
+    used_bytes = 0
+    last_key = None
+    truncated_by_bytes = False
+
+    while len(entries) < page_size:
+        row = cursor.fetchone()
+        if row is None:
+            return {
+                "entries": entries,
+                "last_key": last_key,
+                "has_more": False,
+                "truncated_by_bytes": False,
+                "bytes": used_bytes
+            }
+
+        entry = to_entry(row)
+        entry_bytes = len(json.dumps(entry, ensure_ascii=False, default=str).encode())
+        if entries and used_bytes + entry_bytes > max_bytes:
+            truncated_by_bytes = True
+            break
+
+        entries.append(entry)
+        used_bytes += entry_bytes
+        last_key = (row[0], row[1])
+
+    # 다음 행 존재 여부만 확인 (바이트 초과로 멈춘 경우는 이미 다음 행이 있음)
+    has_more = truncated_by_bytes or cursor.fetchone() is not None
+
+    return {
+        "entries": entries,
+        "last_key": last_key,
+        "has_more": has_more,
+        "truncated_by_bytes": truncated_by_bytes,
+        "bytes": used_bytes
+    }
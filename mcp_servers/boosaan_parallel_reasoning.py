@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 추론 모델 병렬 실행
+- thinking_advancement 의 추론 모델들을 모델별 작업으로 나눠 동시에 실행
+  (워커 풀이 있으면 프로세스 병렬, 없으면 이벤트 루프에서 동시 실행)
+- 모델별 결과를 품질 가중 투표로 하나의 맥락적 결정(chosen_approach)으로 병합
+- 모델별 소요 시간과 벽시계 시간을 함께 보고 → 지연 시간은 합이 아니라 가장 느린 모델에 근접
+- 지연 시간 예산(LatencyBudget)이 있으면 모델 = 단계: 우선순위(요청 순서)대로 실행하고
+  모델이 끝날 때마다 병합 결과를 체크포인트, 예산 만료 시 남은 모델은 건너뜀
+  (건너뛴 모델이 워커 프로세스에서 이미 실행 중이면 끝까지 실행됨 — 상한은 WorkerPool 참고)
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from boosaan_latency_budget import LatencyBudget
+
+ModelRunner = Callable[[str], Awaitable[Dict[str, Any]]]
+
+
+async def _run_timed(model: str, run_model: ModelRunner) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        data = await run_model(model)
+        error = None
+    except Exception as e:
+        data, error = None, str(e)
+    return {"model": model, "data": data, "error": error, "elapsed": time.perf_counter() - start}
+
+
+async def run_models(models: Sequence[str], run_model: ModelRunner,
+                     budget: Optional[LatencyBudget] = None, concurrent: bool = True) -> Dict[str, Any]:
+    """모델별 실행 → 병합된 thinking_advancement 데이터
+
+    concurrent=False 면 모델을 순서대로 하나씩 실행 (예산이 있을 때 우선순위 순 anytime 실행)
+    """
+    start = time.perf_counter()
+    outcomes: List[Dict[str, Any]] = []
+
+    def _record(outcome: Dict[str, Any]):
+        outcomes.append(outcome)
+        if budget is not None and outcome["data"] is not None:
+            budget.checkpoint(merge_model_results(_succeeded(outcomes), outcomes, time.perf_counter() - start))
+
+    if concurrent:
+        tasks = {asyncio.ensure_future(_run_timed(model, run_model)): model for model in models}
+        pending = set(tasks)
+        while pending:
+            timeout = budget.remaining() if budget is not None else None
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                outcome = task.result()
+                if budget is not None:
+                    budget.completed_stages.append(outcome["model"])
+                    if budget.costs:
+                        budget.costs.observe(outcome["model"], outcome["elapsed"])
+                _record(outcome)
+        for task in pending:
+            # 남은 작업은 예산 만료로만 생김 (예산이 없으면 모두 끝날 때까지 대기)
+            task.cancel()
+            if budget is not None:
+                budget.skip(tasks[task])
+        # 요청 순서 유지
+        order = {model: position for position, model in enumerate(models)}
+        outcomes.sort(key=lambda outcome: order[outcome["model"]])
+    else:
+        for model in models:
+            if budget is None:
+                _record(await _run_timed(model, run_model))
+            elif not budget.fits(model):
+                budget.skip(model)
+            else:
+                completed, outcome = await budget.run_stage(model, _run_timed(model, run_model))
+                if completed:
+                    _record(outcome)
+
+    wall_time = time.perf_counter() - start
+    succeeded = _succeeded(outcomes)
+    if not succeeded:
+        if budget is not None and not outcomes:
+            # 예산 안에 끝난 모델 없음 → 빈 결정
+            return empty_result(wall_time)
+        raise RuntimeError("모든 추론 모델 실행 실패: " + "; ".join(
+            f"{outcome['model']}: {outcome['error']}" for outcome in outcomes
+        ))
+    if budget is not None:
+        # 예산 실행은 마지막 체크포인트(지금까지의 최선 결과)를 반환
+        merged = budget.checkpoint_data
+        merged["parallel_timing"]["wall_time"] = wall_time
+        return merged
+    return merge_model_results(succeeded, outcomes, wall_time)
+
+
+def _succeeded(outcomes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [outcome for outcome in outcomes if outcome["data"] is not None]
+
+
+def empty_result(wall_time: float) -> Dict[str, Any]:
+    """예산 안에 완료된 모델이 없을 때의 결과"""
+    return {
+        "task_id": f"task_{int(time.time())}",
+        "advancement_score": 0.0,
+        "quality_metrics": {"overall_quality": 0.0},
+        "sequential_steps": [],
+        "chosen_approach": "없음 (예산 내 완료된 모델 없음)",
+        "final_recommendation": "",
+        "decision_votes": {},
+        "model_results": [],
+        "parallel_timing": {"wall_time": wall_time, "sequential_estimate": 0.0, "slowest_model": 0.0}
+    }
+
+
+def _overall_quality(data: Dict[str, Any]) -> float:
+    return float((data.get("quality_metrics") or {}).get("overall_quality", 0.0))
+
+
+def merge_model_results(succeeded: List[Dict[str, Any]], outcomes: List[Dict[str, Any]],
+                        wall_time: float) -> Dict[str, Any]:
+    """품질 가중 투표로 접근법 선택, 품질 지표는 평균, 권고안은 선택된 접근법의 최고 품질 모델 것"""
+    votes: Dict[str, float] = defaultdict(float)
+    for outcome in succeeded:
+        votes[outcome["data"]["chosen_approach"]] += _overall_quality(outcome["data"])
+    chosen_approach = max(votes, key=votes.get)
+
+    supporters = [outcome for outcome in succeeded if outcome["data"]["chosen_approach"] == chosen_approach]
+    best = max(supporters, key=lambda outcome: (_overall_quality(outcome["data"]),
+                                                outcome["data"].get("advancement_score", 0.0)))["data"]
+
+    metric_totals: Dict[str, float] = defaultdict(float)
+    for outcome in succeeded:
+        for name, value in (outcome["data"].get("quality_metrics") or {}).items():
+            if isinstance(value, (int, float)):
+                metric_totals[name] += value
+    quality_metrics = {name: total / len(succeeded) for name, total in metric_totals.items()}
+
+    merged = dict(best)
+    merged.update({
+        "advancement_score": sum(o["data"].get("advancement_score", 0.0) for o in succeeded) / len(succeeded),
+        "quality_metrics": quality_metrics,
+        "chosen_approach": chosen_approach,
+        "decision_votes": dict(votes),
+        "model_results": [
+            {
+                "model": outcome["model"],
+                "elapsed": outcome["elapsed"],
+                "error": outcome["error"],
+                "chosen_approach": outcome["data"]["chosen_approach"] if outcome["data"] else None,
+                "overall_quality": _overall_quality(outcome["data"]) if outcome["data"] else None
+            }
+            for outcome in outcomes
+        ],
+        "parallel_timing": {
+            "wall_time": wall_time,
+            "sequential_estimate": sum(outcome["elapsed"] for outcome in outcomes),
+            "slowest_model": max(outcome["elapsed"] for outcome in outcomes)
+        }
+    })
+    return merged
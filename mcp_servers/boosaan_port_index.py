@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 포트 비트맵 색인
+- 포트 공간을 고정 크기 블록으로 나누고 블록 사용 여부를 비트맵(정수 1개)으로 유지
+  → 첫 빈 블록 = 최하위 0 비트 (워드 단위 비트 연산, 프로젝트 수만큼 블록 목록을 훑지 않음)
+- 프로젝트 블록 안의 포트 사용 여부도 비트맵으로 유지 → 빈 포트 조회 / 해제가 비트 연산 하나
+- 서비스 집합 일괄 예약: 블록 확보 후 한 번에 여러 포트 배정
+- 영속: 프로젝트 → (시작 포트, 블록 크기, 서비스 → 오프셋) 만 JSON 으로 저장 (비트맵은 로드 시 재구성)
+- 서버에서는 포트 관리자가 배정 권한을 가지므로 관리자 블록/포트를 그대로 반영(mark_block/assign)하는
+  조회용 사본으로만 사용. 자체 배정(reserve_block/reserve_services/next_free_block)은 독립 사용과 벤치마크용
+- 벤치마크: python boosaan_port_index.py [프로젝트 수 ...]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_BASE_PORT = 8000
+DEFAULT_BLOCK_SIZE = 100
+MAX_PORT = 65535
+FORMAT_VERSION = 1
+
+# 색인 적중만 계속되는 프로젝트도 이 간격마다 포트 관리자를 거쳐 사용 기록 갱신 (초)
+USAGE_TOUCH_INTERVAL = 3600.0
+
+
+def _lowest_zero_bit(bits: int) -> int:
+    """정수 비트맵에서 가장 낮은 0 비트 위치"""
+    return (~bits & (bits + 1)).bit_length() - 1
+
+
+def parse_port_range(port_range: str) -> Tuple[int, int]:
+    """포트 관리자 형식 "8000-8099" → (시작 포트, 크기)"""
+    start, end = (int(part) for part in str(port_range).split("-", 1))
+    return start, end - start + 1
+
+
+class PortBlockFull(RuntimeError):
+    """프로젝트 블록 또는 포트 공간이 가득 참"""
+
+
+class ProjectBlock:
+    """프로젝트 1개의 포트 범위 + 포트 사용 비트맵"""
+
+    __slots__ = ("start", "size", "used", "services")
+
+    def __init__(self, start: int, size: int):
+        self.start = start
+        self.size = size
+        self.used = 0
+        self.services: Dict[str, int] = {}
+
+    @property
+    def end(self) -> int:
+        return self.start + self.size - 1
+
+    def free_ports(self) -> int:
+        return self.size - bin(self.used).count("1")
+
+    def take(self, service: str, port: Optional[int] = None) -> int:
+        if port is None:
+            offset = _lowest_zero_bit(self.used)
+            if offset >= self.size:
+                raise PortBlockFull(f"포트 블록 가득 참: {self.start}-{self.end}")
+        else:
+            offset = port - self.start
+            if not 0 <= offset < self.size:
+                raise ValueError(f"블록 범위 밖 포트: {port} ({self.start}-{self.end})")
+        self.used |= 1 << offset
+        self.services[service] = offset
+        return self.start + offset
+
+    def release(self, service: str) -> Optional[int]:
+        offset = self.services.pop(service, None)
+        if offset is None:
+            return None
+        if offset not in self.services.values():
+            self.used &= ~(1 << offset)
+        return self.start + offset
+
+
+class PortIndex:
+    """블록/포트 비트맵 색인 (포트 관리자 블록의 메모리 사본 + 빠른 배정)"""
+
+    def __init__(self, path: Optional[str] = None, base_port: int = DEFAULT_BASE_PORT,
+                 block_size: int = DEFAULT_BLOCK_SIZE):
+        self.path = Path(path) if path else None
+        self.base_port = base_port
+        self.block_size = block_size
+        self.max_blocks = (MAX_PORT - base_port + 1) // block_size
+
+        self._block_bits = 0
+        self._block_owners: Dict[int, int] = {}
+        self._projects: Dict[str, ProjectBlock] = {}
+        self.dirty = False
+        self.stats = {"lookups": 0, "lookup_hits": 0, "assigned": 0, "released": 0}
+
+        if self.path and self.path.exists():
+            self._load()
+
+    # === 블록 ===
+    def _block_span(self, start: int, size: int) -> Tuple[int, int]:
+        first = (start - self.base_port) // self.block_size
+        last = (start + size - 1 - self.base_port) // self.block_size
+        return first, last
+
+    def _set_blocks(self, start: int, size: int, used: bool):
+        """블록별 소유 프로젝트 수를 갱신하고 0 ↔ 1 전환 시에만 비트 변경 (겹치는 블록 대비)"""
+        first, last = self._block_span(start, size)
+        for block in range(max(first, 0), last + 1):
+            owners = self._block_owners.get(block, 0) + (1 if used else -1)
+            if owners > 0:
+                self._block_owners[block] = owners
+                self._block_bits |= 1 << block
+            else:
+                self._block_owners.pop(block, None)
+                self._block_bits &= ~(1 << block)
+
+    def next_free_block(self) -> Optional[int]:
+        """다음 사용 가능 블록의 시작 포트 (없으면 None)"""
+        block = _lowest_zero_bit(self._block_bits)
+        if block >= self.max_blocks:
+            return None
+        return self.base_port + block * self.block_size
+
+    def reserve_block(self, project: str) -> ProjectBlock:
+        """프로젝트에 첫 빈 블록 예약 (이미 있으면 기존 블록)"""
+        existing = self._projects.get(project)
+        if existing is not None:
+            return existing
+        start = self.next_free_block()
+        if start is None:
+            raise PortBlockFull("사용 가능한 포트 블록 없음")
+        return self.mark_block(project, start, self.block_size)
+
+    def mark_block(self, project: str, start: int, size: Optional[int] = None) -> ProjectBlock:
+        """포트 관리자가 정한 블록을 그대로 반영 (범위가 바뀌면 서비스 배정 초기화)"""
+        size = size or self.block_size
+        block = self._projects.get(project)
+        if block is not None and (block.start, block.size) == (start, size):
+            return block
+        if block is not None:
+            self._set_blocks(block.start, block.size, False)
+        block = ProjectBlock(start, size)
+        self._projects[project] = block
+        self._set_blocks(start, size, True)
+        self.dirty = True
+        return block
+
+    def release_block(self, project: str) -> bool:
+        block = self._projects.pop(project, None)
+        if block is None:
+            return False
+        self._set_blocks(block.start, block.size, False)
+        self.dirty = True
+        return True
+
+    def retain_projects(self, projects: Iterable[str]) -> List[str]:
+        """목록에 없는 프로젝트 블록 해제 (포트 관리자 망각 정리 반영) → 해제된 프로젝트"""
+        keep = set(projects)
+        removed = [project for project in self._projects if project not in keep]
+        for project in removed:
+            self.release_block(project)
+        return removed
+
+    # === 포트 ===
+    def lookup(self, project: str, service: str) -> Optional[int]:
+        self.stats["lookups"] += 1
+        block = self._projects.get(project)
+        if block is None or service not in block.services:
+            return None
+        self.stats["lookup_hits"] += 1
+        return block.start + block.services[service]
+
+    def assign(self, project: str, service: str, port: Optional[int] = None) -> int:
+        """서비스 포트 배정 (port 를 주면 그 포트를 기록, 없으면 블록의 첫 빈 포트)"""
+        block = self._projects.get(project) or self.reserve_block(project)
+        if port is None and service in block.services:
+            return block.start + block.services[service]
+        assigned = block.take(service, port)
+        self.stats["assigned"] += 1
+        self.dirty = True
+        return assigned
+
+    def reserve_services(self, project: str, services: Sequence[str]) -> Dict[str, int]:
+        """서비스 집합 일괄 예약 (블록 확보 1회 + 서비스당 비트 연산 1회)"""
+        block = self.reserve_block(project)
+        missing = [service for service in dict.fromkeys(services) if service not in block.services]
+        if len(missing) > block.free_ports():
+            raise PortBlockFull(f"블록 여유 포트 부족: {project} (필요 {len(missing)}개, 여유 {block.free_ports()}개)")
+        for service in missing:
+            block.take(service)
+        if missing:
+            self.stats["assigned"] += len(missing)
+            self.dirty = True
+        return {service: block.start + block.services[service] for service in dict.fromkeys(services)}
+
+    def release(self, project: str, service: str) -> Optional[int]:
+        block = self._projects.get(project)
+        port = block.release(service) if block else None
+        if port is not None:
+            self.stats["released"] += 1
+            self.dirty = True
+        return port
+
+    def project_info(self, project: str) -> Optional[Dict[str, object]]:
+        block = self._projects.get(project)
+        if block is None:
+            return None
+        return {
+            "port_range": f"{block.start}-{block.end}",
+            "available_ports": block.free_ports(),
+            "services": {service: block.start + offset for service, offset in block.services.items()}
+        }
+
+    def service_ports(self) -> Dict[str, Dict[str, int]]:
+        """프로젝트 → 서비스 → 포트 (배정된 서비스가 있는 프로젝트만)"""
+        return {
+            project: {service: block.start + offset for service, offset in block.services.items()}
+            for project, block in self._projects.items() if block.services
+        }
+
+    def projects(self) -> List[str]:
+        return list(self._projects)
+
+    # === 영속 ===
+    def _load(self):
+        try:
+            state = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if state.get("version") != FORMAT_VERSION or state.get("base_port") != self.base_port \
+                or state.get("block_size") != self.block_size:
+            return
+        for project, (start, size, services) in state["projects"].items():
+            block = self.mark_block(project, start, size)
+            for service, offset in services.items():
+                block.take(service, start + offset)
+        self.dirty = False
+
+    def save(self):
+        """변경이 있을 때만 원자적으로 저장"""
+        if self.path is None or not self.dirty:
+            return
+        state = {
+            "version": FORMAT_VERSION,
+            "base_port": self.base_port,
+            "block_size": self.block_size,
+            "projects": {
+                project: [block.start, block.size, block.services]
+                for project, block in self._projects.items()
+            }
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=str(self.path.parent), prefix=".port_index_")
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    def metrics(self) -> Dict[str, object]:
+        free_block = self.next_free_block()
+        return dict(
+            self.stats,
+            projects=len(self._projects),
+            used_blocks=bin(self._block_bits).count("1"),
+            max_blocks=self.max_blocks,
+            next_free_block=free_block
+        )
+
+    def close(self):
+        self.save()
+
+
+# === 벤치마크 ===
+def _linear_next_block(starts: List[int], base_port: int, block_size: int) -> int:
+    """저장된 블록 목록을 정렬해서 훑는 기존 방식의 다음 빈 블록 계산"""
+    candidate = base_port
+    for start in sorted(starts):
+        if start > candidate:
+            break
+        candidate = max(candidate, start + block_size)
+    return candidate
+
+
+def benchmark_allocation(project_counts: Sequence[int] = (1_000, 5_000),
+                         services_per_project: int = 5) -> Dict[int, Dict[str, float]]:
+    """프로젝트 수별 평균 시간(µs): 블록 예약 (비트맵 vs 목록 스캔), 서비스 집합 일괄 예약, 해제"""
+    rng = random.Random(5)
+    services = [f"service_{i}" for i in range(services_per_project)]
+    results: Dict[int, Dict[str, float]] = {}
+    for count in project_counts:
+        block_size = 10
+        index = PortIndex(block_size=block_size, base_port=1024)
+        count = min(count, index.max_blocks)
+
+        start = time.perf_counter()
+        for i in range(count):
+            index.reserve_block(f"project_{i}")
+        bitmap_reserve = (time.perf_counter() - start) / count * 1e6
+
+        starts: List[int] = []
+        start = time.perf_counter()
+        for _ in range(count):
+            starts.append(_linear_next_block(starts, 1024, block_size))
+        linear_reserve = (time.perf_counter() - start) / count * 1e6
+
+        start = time.perf_counter()
+        for i in range(count):
+            index.reserve_services(f"project_{i}", services)
+        bulk = (time.perf_counter() - start) / count * 1e6
+
+        victims = rng.sample(range(count), count // 10)
+        start = time.perf_counter()
+        for i in victims:
+            index.release_block(f"project_{i}")
+            index.reserve_block(f"replacement_{i}")
+        churn = (time.perf_counter() - start) / max(1, len(victims)) * 1e6
+
+        results[count] = {
+            "bitmap_reserve_us": bitmap_reserve,
+            "linear_reserve_us": linear_reserve,
+            "bulk_services_us": bulk,
+            "release_reserve_us": churn
+        }
+    return results
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [1_000, 5_000]
+    print("🚢 포트 비트맵 색인 벤치마크")
+    for count, timings in benchmark_allocation(counts).items():
+        print(f"  • {count:>6,}개 프로젝트: 블록 예약 비트맵 {timings['bitmap_reserve_us']:.1f}µs"
+              f" / 목록 스캔 {timings['linear_reserve_us']:.1f}µs"
+              f" | 서비스 일괄 예약 {timings['bulk_services_us']:.1f}µs"
+              f" | 해제+재예약 {timings['release_reserve_us']:.1f}µs")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 포트 활성 탐지 (asyncio)
+- 할당된 포트들에 실제로 리스너가 있는지 동시에 검사 (동시 실행 상한 + 짧은 타임아웃)
+  connect: TCP 연결 시도 (리스너가 있으면 활성)
+  bind: 같은 포트에 bind 시도 (실패하면 누군가 점유 중 → 활성)
+- 결과는 포트별로 TTL 동안 캐시 → 연속 호출 시 다시 검사하지 않음
+- 포트 망각 사이클 전에 검사해서 리스너가 있는 블록은 사용 기록을 갱신 → 사용 시각만 보는 망각 판단이
+  활성 블록을 회수하지 않음. 리스너가 없는 블록은 그대로 두고 회수는 포트 관리자의 망각 사이클에 맡김
+
+설정: BOOSAAN_PORT_PROBE=off (비활성), BOOSAAN_PORT_PROBE_MODE=connect|bind,
+      BOOSAAN_PORT_PROBE_TIMEOUT=<초> (기본 0.2), BOOSAAN_PORT_PROBE_TTL=<초> (기본 30)
+"""
+
+import asyncio
+import os
+import socket
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_TIMEOUT = 0.2
+DEFAULT_TTL = 30.0
+DEFAULT_CONCURRENCY = 128
+PROBE_MODES = ("connect", "bind")
+
+
+class PortProber:
+    """동시 포트 검사기 + TTL 결과 캐시"""
+
+    def __init__(self, host: str = "127.0.0.1", mode: str = "connect", timeout: float = DEFAULT_TIMEOUT,
+                 ttl: float = DEFAULT_TTL, concurrency: int = DEFAULT_CONCURRENCY):
+        if mode not in PROBE_MODES:
+            raise ValueError(f"지원하지 않는 검사 방식: {mode}")
+        self.host = host
+        self.mode = mode
+        self.timeout = timeout
+        self.ttl = ttl
+        self.concurrency = max(1, concurrency)
+
+        self._cache: Dict[int, Tuple[float, bool]] = {}
+        self.stats = {"probes": 0, "cached": 0, "listening": 0, "timeouts": 0}
+
+    @classmethod
+    def from_env(cls) -> Optional["PortProber"]:
+        if os.getenv("BOOSAAN_PORT_PROBE", "on").lower() in ("off", "0", "false"):
+            return None
+        try:
+            timeout = float(os.getenv("BOOSAAN_PORT_PROBE_TIMEOUT", str(DEFAULT_TIMEOUT)))
+            ttl = float(os.getenv("BOOSAAN_PORT_PROBE_TTL", str(DEFAULT_TTL)))
+        except ValueError:
+            timeout, ttl = DEFAULT_TIMEOUT, DEFAULT_TTL
+        mode = os.getenv("BOOSAAN_PORT_PROBE_MODE", "connect")
+        return cls(mode=mode if mode in PROBE_MODES else "connect", timeout=timeout, ttl=ttl)
+
+    # === 단일 포트 ===
+    async def _connect_probe(self, port: int) -> bool:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(self.host, port), self.timeout)
+        except asyncio.TimeoutError:
+            # 응답 없음 (필터링) → 리스너 없음으로 간주
+            self.stats["timeouts"] += 1
+            return False
+        except OSError:
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+    def _bind_probe(self, port: int) -> bool:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind((self.host, port))
+            except OSError:
+                return True
+        return False
+
+    # === 일괄 검사 ===
+    async def probe(self, ports: Iterable[int]) -> Dict[int, bool]:
+        """포트 → 리스너 존재 여부 (TTL 안의 결과는 캐시에서)"""
+        now = time.monotonic()
+        results: Dict[int, bool] = {}
+        pending: List[int] = []
+        for port in dict.fromkeys(ports):
+            cached = self._cache.get(port)
+            if cached is not None and now - cached[0] < self.ttl:
+                results[port] = cached[1]
+                self.stats["cached"] += 1
+            else:
+                pending.append(port)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _probe(port: int):
+            async with semaphore:
+                if self.mode == "connect":
+                    listening = await self._connect_probe(port)
+                else:
+                    listening = self._bind_probe(port)
+            results[port] = listening
+            self._cache[port] = (time.monotonic(), listening)
+            self.stats["probes"] += 1
+            self.stats["listening"] += listening
+
+        await asyncio.gather(*(_probe(port) for port in pending))
+        return results
+
+    async def probe_projects(self, project_ports: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, bool]]:
+        """프로젝트 → 서비스 → 리스너 존재 여부 (모든 프로젝트 포트를 한 번에 동시 검사)"""
+        listening = await self.probe(port for services in project_ports.values() for port in services.values())
+        return {
+            project: {service: listening[port] for service, port in services.items()}
+            for project, services in project_ports.items()
+        }
+
+    def invalidate(self, ports: Optional[Iterable[int]] = None):
+        if ports is None:
+            self._cache.clear()
+            return
+        for port in ports:
+            self._cache.pop(port, None)
+
+    def metrics(self) -> Dict[str, object]:
+        return dict(self.stats, mode=self.mode, cached_ports=len(self._cache), ttl=self.ttl,
+                    timeout=self.timeout, concurrency=self.concurrency)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 포트 블록 테이블 (포트 관리자 상태의 메모리 캐시)
+- 상태 요약 + 프로젝트별 포트 정보를 한 번에 읽어서 보관 → 상태 도구는 프로젝트 수와 무관하게 읽기 1회
+- 무효화: 포트 관리자 상태 파일의 (mtime, 크기) 변경, 서버 측 쓰기(invalidate), 상태 파일을 모르면 짧은 TTL
+- 서버가 프로젝트 하나만 바꾼 경우 update_project 로 그 항목만 다시 읽음 (요약은 다음 조회 때 1회)
+- revision: 전체 재로드마다 증가 → 사본(포트 색인)을 재동기화할 시점 판단용
+- 포트 관리자에 get_all_project_port_info() 가 있으면 일괄 조회, 없으면 무효화 시에만 프로젝트별 조회
+
+설정: BOOSAAN_PORT_STATE_FILE=<포트 관리자 상태 파일 경로> (미설정 시 포트 관리자 속성에서 탐색)
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+# 상태 파일을 모를 때 캐시 유지 시간 (초)
+FALLBACK_TTL = 2.0
+
+_STATE_FILE_ATTRIBUTES = ("state_file", "config_file", "data_file", "registry_file", "db_path")
+
+
+class PortTable:
+    """포트 관리자 상태 스냅샷 캐시"""
+
+    def __init__(self, port_manager, state_file: Optional[str] = None, ttl: float = FALLBACK_TTL):
+        self.port_manager = port_manager
+        self.state_file = Path(state_file) if state_file else None
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]] = None
+        self._version: Optional[Tuple[int, int]] = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._loaded_generation = -1
+        self._summary_stale = False
+        self.revision = 0
+
+        self.stats = {"reads": 0, "hits": 0, "invalidations": 0, "project_updates": 0}
+
+    @classmethod
+    def from_env(cls, port_manager) -> "PortTable":
+        state_file = os.getenv("BOOSAAN_PORT_STATE_FILE")
+        if not state_file:
+            for attribute in _STATE_FILE_ATTRIBUTES:
+                candidate = getattr(port_manager, attribute, None)
+                if isinstance(candidate, (str, Path)) and Path(candidate).is_file():
+                    state_file = str(candidate)
+                    break
+        return cls(port_manager, state_file)
+
+    def _file_version(self) -> Optional[Tuple[int, int]]:
+        if self.state_file is None:
+            return None
+        try:
+            stat = self.state_file.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _is_fresh(self) -> bool:
+        if self._snapshot is None or self._loaded_generation != self._generation:
+            return False
+        if self.state_file is None:
+            return time.monotonic() - self._loaded_at < self.ttl
+        return self._file_version() == self._version
+
+    def invalidate(self):
+        """서버가 포트 관리자 상태를 바꾼 뒤 호출"""
+        with self._lock:
+            self._generation += 1
+            self.stats["invalidations"] += 1
+
+    # === 조회 ===
+    def snapshot(self) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """(상태 요약, 프로젝트 → 포트 정보) — 변경이 없으면 캐시 재사용"""
+        with self._lock:
+            if self._is_fresh():
+                if self._summary_stale:
+                    self._snapshot = (self.port_manager.get_port_status_summary(), self._snapshot[1])
+                    self._summary_stale = False
+                self.stats["hits"] += 1
+                return self._snapshot
+
+            generation = self._generation
+            version = self._file_version()
+            summary = self.port_manager.get_port_status_summary()
+            infos = self._read_all_project_info(summary)
+
+            self._snapshot = (summary, infos)
+            self._version = version
+            self._loaded_at = time.monotonic()
+            self._loaded_generation = generation
+            self._summary_stale = False
+            self.revision += 1
+            self.stats["reads"] += 1
+            return self._snapshot
+
+    def update_project(self, project: str) -> Optional[Dict[str, Any]]:
+        """서버가 프로젝트 하나의 상태를 바꾼 뒤 호출 → 그 프로젝트 포트 정보만 다시 읽어 반영
+
+        캐시가 이미 낡았으면 다음 snapshot() 의 전체 재로드에 맡김.
+        """
+        with self._lock:
+            if self._snapshot is None or self._loaded_generation != self._generation:
+                info = None
+            else:
+                info = self.port_manager.get_project_port_info(project)
+                infos = dict(self._snapshot[1])
+                if info:
+                    infos[project] = info
+                else:
+                    infos.pop(project, None)
+                self._snapshot = (self._snapshot[0], infos)
+                self._summary_stale = True
+                self._version = self._file_version()
+                self.stats["project_updates"] += 1
+                return info
+        return self.get_project_port_info(project)
+
+    def _read_all_project_info(self, summary: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        bulk = getattr(self.port_manager, "get_all_project_port_info", None)
+        if callable(bulk):
+            return dict(bulk())
+        infos = {}
+        for project in summary['reserved_projects']:
+            info = self.port_manager.get_project_port_info(project)
+            if info:
+                infos[project] = info
+        return infos
+
+    def summary(self) -> Dict[str, Any]:
+        return self.snapshot()[0]
+
+    def get_all_project_port_info(self) -> Dict[str, Dict[str, Any]]:
+        return self.snapshot()[1]
+
+    def get_project_port_info(self, project: str) -> Optional[Dict[str, Any]]:
+        return self.snapshot()[1].get(project)
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.stats["reads"] + self.stats["hits"]
+        return dict(
+            self.stats,
+            projects=len(self._snapshot[1]) if self._snapshot else 0,
+            state_file=str(self.state_file) if self.state_file else None,
+            hit_rate=self.stats["hits"] / lookups if lookups else 0.0
+        )
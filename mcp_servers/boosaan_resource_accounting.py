@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 샌드박스 리소스 계측
+- cgroup v2 사용 가능 시 샌드박스별 그룹 생성 → cpu.max / memory.max / pids.max 적용,
+  사용량은 cpu.stat / memory.current / io.stat / pids.current 카운터에서 읽음
+- cgroup v2 를 쓸 수 없으면 /proc 샘플링으로 대체 (프로세스 트리 합산)
+- 백그라운드 샘플러가 샌드박스별 CPU / 메모리 / IO 시계열을 고정 길이로 보관
+- 계측 대상은 async 실행 엔진이 직접 실행한 프로세스뿐 (manager 엔진은 SandboxManager 가 프로세스를
+  만들어 PID 를 알 수 없으므로 계측하지 않음) → 프로세스가 한 번도 붙지 않은 샌드박스는 usage() 가 None
+
+설정: BOOSAAN_CGROUP_ROOT (샌드박스 그룹을 만들 상위 cgroup 디렉터리, 기본은 현재 프로세스의 cgroup)
+      BOOSAAN_RESOURCE_SAMPLE_INTERVAL (샘플링 주기 초, 기본 2)
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from boosaan_output_capture import safe_path_component
+
+CGROUP_MOUNT = Path("/sys/fs/cgroup")
+PROC = Path("/proc")
+DEFAULT_SAMPLE_INTERVAL = 2.0
+HISTORY_LENGTH = 900        # 기본 주기로 30분
+CPU_PERIOD_USEC = 100000
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text()
+    except OSError:
+        return None
+
+
+def _write(path: Path, value: str) -> bool:
+    try:
+        path.write_text(value)
+        return True
+    except OSError:
+        return False
+
+
+class _SandboxAccount:
+    """샌드박스 하나의 계측 상태"""
+
+    __slots__ = ("sandbox_id", "cgroup", "enforced", "roots", "process_cpu_usec",
+                 "exited_cpu_usec", "last_cpu", "series", "tracking")
+
+    def __init__(self, sandbox_id: str, cgroup: Optional[Path]):
+        self.sandbox_id = sandbox_id
+        self.cgroup = cgroup
+        self.enforced: Dict[str, bool] = {}
+        # /proc 대체용: 실행한 루트 프로세스, 프로세스별 마지막 CPU 사용량
+        self.roots: set = set()
+        self.process_cpu_usec: Dict[int, int] = {}
+        self.exited_cpu_usec = 0
+        self.last_cpu: Optional[tuple] = None       # (시각, 누적 CPU usec)
+        self.series: deque = deque(maxlen=HISTORY_LENGTH)
+        # 프로세스가 한 번이라도 계측 대상에 들어왔는지 (아니면 카운터가 모두 0 이라 의미 없음)
+        self.tracking = False
+
+
+class ResourceAccountant:
+    """샌드박스별 리소스 사용량 계측기"""
+
+    def __init__(self, cgroup_root: Optional[str] = None,
+                 sample_interval: float = DEFAULT_SAMPLE_INTERVAL,
+                 logger: Optional[logging.Logger] = None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.sample_interval = max(0.2, sample_interval)
+
+        self.cgroup_parent = self._prepare_cgroup_parent(cgroup_root)
+        self.backend = "cgroup_v2" if self.cgroup_parent else "procfs"
+
+        self._accounts: Dict[str, _SandboxAccount] = {}
+        self._lock = threading.Lock()
+        # /proc 대체 계측은 프로세스별 누적값을 갱신하므로 한 번에 하나만
+        self._proc_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls, logger: Optional[logging.Logger] = None) -> "ResourceAccountant":
+        try:
+            interval = float(os.getenv("BOOSAAN_RESOURCE_SAMPLE_INTERVAL", DEFAULT_SAMPLE_INTERVAL))
+        except ValueError:
+            interval = DEFAULT_SAMPLE_INTERVAL
+        return cls(os.getenv("BOOSAAN_CGROUP_ROOT"), interval, logger)
+
+    # === cgroup v2 준비 ===
+    def _prepare_cgroup_parent(self, cgroup_root: Optional[str]) -> Optional[Path]:
+        """샌드박스 그룹을 만들 상위 디렉터리 (쓸 수 없으면 None → /proc 대체)"""
+        if not (CGROUP_MOUNT / "cgroup.controllers").exists():
+            return None
+
+        if cgroup_root:
+            base = Path(cgroup_root)
+        else:
+            own = _read(PROC / "self" / "cgroup") or ""
+            relative = next((line[3:].strip() for line in own.splitlines() if line.startswith("0::")), None)
+            if relative is None:
+                return None
+            base = CGROUP_MOUNT / relative.lstrip("/")
+
+        parent = base / "boosaan-sandboxes"
+        try:
+            parent.mkdir(exist_ok=True)
+        except OSError as e:
+            self.logger.info(f"cgroup v2 그룹 생성 불가, /proc 샘플링 사용: {e}")
+            return None
+
+        # 하위 그룹에서 cpu/memory/pids/io 컨트롤러 사용 (위임되지 않았으면 카운터만 사용)
+        available = (_read(parent / "cgroup.controllers") or "").split()
+        wanted = [c for c in ("cpu", "memory", "pids", "io") if c in available]
+        if wanted and not _write(parent / "cgroup.subtree_control", " ".join(f"+{c}" for c in wanted)):
+            self.logger.info("cgroup 컨트롤러 위임 실패, 제한 없이 카운터만 사용")
+        return parent
+
+    # === 샌드박스 등록 / 해제 ===
+    def create_group(self, sandbox_id: str, resource_limits: Dict[str, Any]) -> Dict[str, bool]:
+        """샌드박스 계측 시작 (cgroup 사용 시 제한값 적용) → 적용된 제한 목록"""
+        cgroup = None
+        enforced: Dict[str, bool] = {}
+
+        if self.cgroup_parent:
+            cgroup = self.cgroup_parent / safe_path_component(sandbox_id)
+            try:
+                cgroup.mkdir(exist_ok=True)
+            except OSError as e:
+                self.logger.warning(f"샌드박스 cgroup 생성 실패: {sandbox_id} ({e})")
+                cgroup = None
+
+        if cgroup:
+            cpu_percent = resource_limits.get("cpu_percent")
+            if cpu_percent:
+                quota = max(1000, int(CPU_PERIOD_USEC * cpu_percent / 100))
+                enforced["cpu"] = _write(cgroup / "cpu.max", f"{quota} {CPU_PERIOD_USEC}")
+            memory_mb = resource_limits.get("memory_mb")
+            if memory_mb:
+                enforced["memory"] = _write(cgroup / "memory.max", str(int(memory_mb) * 1024 * 1024))
+            process_count = resource_limits.get("process_count")
+            if process_count:
+                enforced["pids"] = _write(cgroup / "pids.max", str(int(process_count)))
+
+        account = _SandboxAccount(sandbox_id, cgroup)
+        account.enforced = enforced
+        with self._lock:
+            self._accounts[sandbox_id] = account
+        self._ensure_sampler()
+        return enforced
+
+    def cgroup_preexec(self, sandbox_id: str):
+        """자식 프로세스를 exec 전에 샌드박스 cgroup 으로 옮기는 preexec_fn (cgroup 이 없으면 None)
+
+        생성 후 attach 로 옮기면 그 사이에 fork 한 자손은 계측/제한을 벗어나므로 자식이 직접
+        cgroup.procs 에 0(자기 자신)을 기록. 경로는 부모에서 미리 인코딩 (자식에서는 open/write 만).
+        """
+        account = self._accounts.get(sandbox_id)
+        if account is None or account.cgroup is None:
+            return None
+        procs = os.fsencode(account.cgroup / "cgroup.procs")
+        account.tracking = True
+
+        def _preexec():
+            fd = os.open(procs, os.O_WRONLY)
+            try:
+                os.write(fd, b"0")
+            finally:
+                os.close(fd)
+
+        return _preexec
+
+    def attach(self, sandbox_id: str, pid: int):
+        """실행한 프로세스를 샌드박스 계측 대상에 추가 (cgroup_preexec 를 쓰지 못한 경우의 대체 경로)"""
+        account = self._accounts.get(sandbox_id)
+        if account is None:
+            return
+        account.tracking = True
+        if account.cgroup and _write(account.cgroup / "cgroup.procs", str(pid)):
+            return
+        with self._lock:
+            account.roots.add(pid)
+
+    def remove_group(self, sandbox_id: str):
+        """샌드박스 계측 종료 (남은 프로세스 종료 후 cgroup 삭제)"""
+        with self._lock:
+            account = self._accounts.pop(sandbox_id, None)
+        if account is None or account.cgroup is None:
+            return
+
+        _write(account.cgroup / "cgroup.kill", "1")
+        for _ in range(10):
+            try:
+                account.cgroup.rmdir()
+                return
+            except OSError:
+                time.sleep(0.05)
+        self.logger.warning(f"샌드박스 cgroup 삭제 실패: {sandbox_id}")
+
+    def has(self, sandbox_id: str) -> bool:
+        return sandbox_id in self._accounts
+
+    def is_tracking(self, sandbox_id: str) -> bool:
+        """계측 중인 프로세스가 있었던 샌드박스인지"""
+        account = self._accounts.get(sandbox_id)
+        return account is not None and account.tracking
+
+    # === 카운터 읽기 ===
+    def counters(self, sandbox_id: str) -> Optional[Dict[str, int]]:
+        """누적 카운터 (cpu_usec, memory_bytes, memory_peak_bytes, read/write_bytes, pids)"""
+        account = self._accounts.get(sandbox_id)
+        if account is None:
+            return None
+        if account.cgroup:
+            return self._cgroup_counters(account.cgroup)
+        with self._proc_lock:
+            return self._proc_counters(account)
+
+    @staticmethod
+    def _cgroup_counters(cgroup: Path) -> Dict[str, int]:
+        counters = {"cpu_usec": 0, "memory_bytes": 0, "memory_peak_bytes": 0,
+                    "read_bytes": 0, "write_bytes": 0, "pids": 0}
+
+        for line in (_read(cgroup / "cpu.stat") or "").splitlines():
+            key, _, value = line.partition(" ")
+            if key == "usage_usec":
+                counters["cpu_usec"] = int(value)
+        counters["memory_bytes"] = int((_read(cgroup / "memory.current") or "0").strip() or 0)
+        counters["memory_peak_bytes"] = int((_read(cgroup / "memory.peak") or "0").strip() or 0)
+        counters["pids"] = int((_read(cgroup / "pids.current") or "0").strip() or 0)
+
+        # io.stat: "<major>:<minor> rbytes=.. wbytes=.. ..." (장치별 합산)
+        for line in (_read(cgroup / "io.stat") or "").splitlines():
+            for field in line.split()[1:]:
+                key, _, value = field.partition("=")
+                if key == "rbytes":
+                    counters["read_bytes"] += int(value)
+                elif key == "wbytes":
+                    counters["write_bytes"] += int(value)
+        return counters
+
+    def _proc_counters(self, account: _SandboxAccount) -> Dict[str, int]:
+        """/proc 대체: 등록된 프로세스와 그 자손 프로세스 합산"""
+        with self._lock:
+            roots = set(account.roots)
+        tree = self._descendants(roots) if roots else set()
+
+        cpu_usec = memory_bytes = read_bytes = write_bytes = 0
+        process_cpu: Dict[int, int] = {}
+        for pid in tree:
+            stat = _read(PROC / str(pid) / "stat")
+            if not stat:
+                continue
+            fields = stat.rsplit(")", 1)[-1].split()
+            process_cpu[pid] = (int(fields[11]) + int(fields[12])) * 1_000_000 // _CLOCK_TICKS
+            cpu_usec += process_cpu[pid]
+            memory_bytes += int(fields[21]) * _PAGE_SIZE
+            for line in (_read(PROC / str(pid) / "io") or "").splitlines():
+                key, _, value = line.partition(": ")
+                if key == "read_bytes":
+                    read_bytes += int(value)
+                elif key == "write_bytes":
+                    write_bytes += int(value)
+
+        with self._lock:
+            # 종료된 프로세스는 마지막으로 관측한 CPU 사용량을 누적에 보존
+            for pid, last_usec in account.process_cpu_usec.items():
+                if pid not in process_cpu:
+                    account.exited_cpu_usec += last_usec
+            account.process_cpu_usec = process_cpu
+            account.roots &= tree
+
+        return {
+            "cpu_usec": account.exited_cpu_usec + cpu_usec,
+            "memory_bytes": memory_bytes,
+            "memory_peak_bytes": 0,
+            "read_bytes": read_bytes,
+            "write_bytes": write_bytes,
+            "pids": len(tree)
+        }
+
+    @staticmethod
+    def _descendants(roots: set) -> set:
+        """루트 프로세스와 모든 자손 PID"""
+        children: Dict[int, List[int]] = {}
+        try:
+            entries = [entry for entry in os.listdir(PROC) if entry.isdigit()]
+        except OSError:
+            return set()
+        for entry in entries:
+            stat = _read(PROC / entry / "stat")
+            if stat:
+                ppid = int(stat.rsplit(")", 1)[-1].split()[1])
+                children.setdefault(ppid, []).append(int(entry))
+
+        alive = {pid for pid in roots if (PROC / str(pid)).exists()}
+        stack = list(alive)
+        while stack:
+            for child in children.get(stack.pop(), ()):
+                if child not in alive:
+                    alive.add(child)
+                    stack.append(child)
+        return alive
+
+    # === 샘플링 ===
+    def _ensure_sampler(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._sample_loop, name="boosaan-resource-sampler", daemon=True)
+            self._thread.start()
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.sample_interval):
+            with self._lock:
+                accounts = list(self._accounts.values())
+            for account in accounts:
+                try:
+                    self._sample(account)
+                except Exception as e:
+                    self.logger.debug(f"리소스 샘플링 실패: {account.sandbox_id} ({e})")
+
+    def _sample(self, account: _SandboxAccount) -> Dict[str, Any]:
+        counters = self.counters(account.sandbox_id)
+        if counters is None:
+            return {}
+        now = time.time()
+
+        cpu_percent = 0.0
+        if account.last_cpu:
+            last_time, last_usec = account.last_cpu
+            elapsed = now - last_time
+            if elapsed > 0:
+                cpu_percent = max(0.0, (counters["cpu_usec"] - last_usec) / (elapsed * 1_000_000) * 100)
+        account.last_cpu = (now, counters["cpu_usec"])
+
+        point = {
+            "timestamp": now,
+            "cpu_percent": round(cpu_percent, 2),
+            "memory_mb": round(counters["memory_bytes"] / (1024 * 1024), 2),
+            "read_bytes": counters["read_bytes"],
+            "write_bytes": counters["write_bytes"],
+            "pids": counters["pids"]
+        }
+        account.series.append(point)
+        return point
+
+    def begin_execution(self, sandbox_id: str) -> Optional[Dict[str, int]]:
+        """실행 직전 카운터 (cgroup 사용 시에만, /proc 스캔은 생략)"""
+        account = self._accounts.get(sandbox_id)
+        if account is None or account.cgroup is None:
+            return None
+        return self._cgroup_counters(account.cgroup)
+
+    def execution_usage(self, sandbox_id: str, baseline: Optional[Dict[str, int]],
+                        elapsed: float) -> Optional[Dict[str, Any]]:
+        """실행 하나의 사용량 (cgroup: 카운터 차이, /proc: 최근 샘플)"""
+        if baseline is None:
+            return self.usage(sandbox_id)
+        counters = self.counters(sandbox_id)
+        if counters is None:
+            return None
+        cpu_usec = counters["cpu_usec"] - baseline["cpu_usec"]
+        return {
+            "cpu_percent": cpu_usec / (elapsed * 1_000_000) * 100 if elapsed > 0 else 0.0,
+            "cpu_seconds": cpu_usec / 1_000_000,
+            "memory_mb": max(counters["memory_peak_bytes"], counters["memory_bytes"]) / (1024 * 1024),
+            "read_bytes": counters["read_bytes"] - baseline["read_bytes"],
+            "write_bytes": counters["write_bytes"] - baseline["write_bytes"],
+            "backend": "cgroup_v2"
+        }
+
+    def usage(self, sandbox_id: str) -> Optional[Dict[str, Any]]:
+        """최근 사용량 (get_sandbox_status 용, 계측한 프로세스가 없으면 None)"""
+        account = self._accounts.get(sandbox_id)
+        if account is None or not account.tracking:
+            return None
+        latest = account.series[-1] if account.series else self._sample(account)
+        return {
+            "cpu_percent": latest.get("cpu_percent", 0.0),
+            "memory_mb": latest.get("memory_mb", 0.0),
+            "read_bytes": latest.get("read_bytes", 0),
+            "write_bytes": latest.get("write_bytes", 0),
+            "pids": latest.get("pids", 0),
+            "backend": "cgroup_v2" if account.cgroup else "procfs"
+        }
+
+    def series(self, sandbox_id: str, limit: int = HISTORY_LENGTH) -> Optional[Dict[str, Any]]:
+        """시계열 + 한도 산정용 요약 (최대/평균)"""
+        account = self._accounts.get(sandbox_id)
+        if account is None:
+            return None
+        points = list(account.series)[-limit:]
+
+        summary = {}
+        if points:
+            summary = {
+                "samples": len(points),
+                "peak_memory_mb": max(p["memory_mb"] for p in points),
+                "peak_cpu_percent": max(p["cpu_percent"] for p in points),
+                "average_cpu_percent": round(sum(p["cpu_percent"] for p in points) / len(points), 2),
+                "peak_pids": max(p["pids"] for p in points),
+                "read_bytes": points[-1]["read_bytes"],
+                "write_bytes": points[-1]["write_bytes"]
+            }
+
+        return {
+            "sandbox_id": sandbox_id,
+            "backend": "cgroup_v2" if account.cgroup else "procfs",
+            "enforced_limits": account.enforced,
+            "sample_interval": self.sample_interval,
+            "summary": summary,
+            "points": points
+        }
+
+    def close(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.sample_interval + 1)
+        for sandbox_id in list(self._accounts):
+            self.remove_group(sandbox_id)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 사고 결과 캐시
+- sequential_thinking / thinking_advancement 결과(구조화 데이터)를 정규화 해시 키로 재사용
+- 키 정규화: 유니코드 NFC + 공백 정리 + casefold, 모델 목록은 순서 무관, 임계값은 소수 3자리
+- 메모리: LRU 상한 + TTL, 선택적으로 작업 공간 sqlite 에 영속 (재시작 후에도 적중)
+
+설정: BOOSAAN_THINKING_CACHE_SIZE=<항목 수> (기본 256, 0이면 비활성)
+      BOOSAAN_THINKING_CACHE_TTL=<초> (기본 3600)
+      BOOSAAN_THINKING_CACHE_PERSIST=on (기본 off)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL_SECONDS = 3600
+# 디스크에는 메모리 상한의 몇 배까지 보관할지
+DISK_ENTRY_FACTOR = 4
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip().casefold()
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return normalize_text(value)
+    if isinstance(value, float):
+        return round(value, 3)
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+class ResultCache:
+    """TTL + LRU 결과 캐시 (선택적 디스크 영속)"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL_SECONDS,
+                 persist_path: Optional[str] = None, logger: Optional[logging.Logger] = None):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+        self._db: Optional[sqlite3.Connection] = None
+        if persist_path:
+            Path(persist_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(persist_path)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS thinking_results (
+                    cache_key TEXT PRIMARY KEY,
+                    tool_name TEXT,
+                    data TEXT,
+                    created REAL
+                )
+            """)
+
+    @classmethod
+    def from_env(cls, workspace: str, logger: Optional[logging.Logger] = None) -> Optional["ResultCache"]:
+        try:
+            max_entries = int(os.getenv("BOOSAAN_THINKING_CACHE_SIZE", str(DEFAULT_MAX_ENTRIES)))
+            ttl = float(os.getenv("BOOSAAN_THINKING_CACHE_TTL", str(DEFAULT_TTL_SECONDS)))
+        except ValueError:
+            max_entries, ttl = DEFAULT_MAX_ENTRIES, DEFAULT_TTL_SECONDS
+        if max_entries <= 0:
+            return None
+        persist = os.getenv("BOOSAAN_THINKING_CACHE_PERSIST", "off").lower() in ("on", "1", "true")
+        persist_path = str(Path(workspace) / "thinking_cache" / "results.db") if persist else None
+        return cls(max_entries, ttl, persist_path, logger)
+
+    @staticmethod
+    def make_key(tool_name: str, fields: Dict[str, Any]) -> str:
+        """정규화한 입력 필드의 해시"""
+        payload = json.dumps([tool_name, _normalize(fields)], ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    # === 조회 / 저장 ===
+    def get(self, cache_key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """(저장된 데이터, 경과 초) 또는 None"""
+        now = time.time()
+        entry = self._entries.get(cache_key)
+        if entry is not None:
+            created, data = entry
+            if now - created <= self.ttl:
+                self._entries.move_to_end(cache_key)
+                self.stats["hits"] += 1
+                return data, now - created
+            del self._entries[cache_key]
+            self.stats["expired"] += 1
+
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT data, created FROM thinking_results WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if row and now - row[1] <= self.ttl:
+                data = json.loads(row[0])
+                self._remember(cache_key, row[1], data)
+                self.stats["hits"] += 1
+                self.stats["disk_hits"] += 1
+                return data, now - row[1]
+
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, cache_key: str, tool_name: str, data: Dict[str, Any]):
+        created = time.time()
+        self._remember(cache_key, created, data)
+        if self._db is not None:
+            try:
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO thinking_results VALUES (?, ?, ?, ?)",
+                        (cache_key, tool_name, json.dumps(data, ensure_ascii=False, default=str), created)
+                    )
+            except sqlite3.Error as e:
+                self.logger.warning(f"사고 결과 캐시 저장 실패: {e}")
+
+    def _remember(self, cache_key: str, created: float, data: Dict[str, Any]):
+        self._entries[cache_key] = (created, data)
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def prune(self) -> int:
+        """만료 항목 제거 (디스크는 TTL 초과분 + 보관 상한 초과분) → 제거 수"""
+        cutoff = time.time() - self.ttl
+        expired = [key for key, (created, _) in self._entries.items() if created < cutoff]
+        for key in expired:
+            del self._entries[key]
+        removed = len(expired)
+
+        if self._db is not None:
+            with self._db:
+                removed += self._db.execute(
+                    "DELETE FROM thinking_results WHERE created < ?", (cutoff,)
+                ).rowcount
+                removed += self._db.execute(
+                    "DELETE FROM thinking_results WHERE cache_key IN "
+                    "(SELECT cache_key FROM thinking_results ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries * DISK_ENTRY_FACTOR,)
+                ).rowcount
+        return removed
+
+    # === 메트릭 / 종료 ===
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return dict(
+            self.stats,
+            entries=len(self._entries),
+            max_entries=self.max_entries,
+            ttl=self.ttl,
+            persistent=self._db is not None,
+            hit_rate=self.stats["hits"] / lookups if lookups else 0.0
+        )
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
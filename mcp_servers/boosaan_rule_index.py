@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 컴파일된 규칙 색인
+- 규칙을 (범위, 프로젝트, 타입) 슬롯으로 나눠 보관 → 프로젝트의 유효 규칙은 해당 슬롯만 모아서 계산
+  유효 규칙 = 프로젝트 없는 규칙(모든 프로젝트에 적용) + 그 프로젝트 규칙, 타입별로 묶고
+  범위 우선순위(임시 > 세션 > 프로젝트 > 전역) → 추가 순서로 정렬
+- 프로젝트별 유효 규칙 뷰를 미리 계산해서 캐시
+  규칙 추가/삭제 시 그 프로젝트 뷰만 무효화 (프로젝트 없는 규칙은 모든 뷰에 영향 → 전체 무효화)
+- 임시/세션 규칙 만료: 해시 타이머 휠 (틱 1초 × 3600칸)
+  만료 처리 비용 = 지난 틱 수 + 만료된 규칙 수 (전체 규칙을 훑지 않음), 조회 시마다 휠을 현재 시각까지 진행
+- 규칙과 만료 시각은 sqlite 에 영속 (재시작 시 이미 만료된 규칙은 버림)
+- 만료는 이 색인에 추가할 때 정해짐 (임시/세션 범위 기본 TTL 또는 지정 ttl, ttl=0 이면 만료 없음)
+  → 색인 도입 전부터 있던 규칙을 가져올 때는 ttl=0 으로 추가해서 없던 수명을 만들지 않음
+- 만료된 규칙 ID 는 묘비(tombstone)로 남김 → 원본(규칙 격리 시스템)에 남아 있어도 다시 가져오지 않음
+  (원본 삭제는 호출자가 명시적으로, 원본에서 사라진 규칙의 묘비는 retain_tombstones 로 정리)
+
+설정: BOOSAAN_RULE_TEMPORARY_TTL=<초> (기본 3600), BOOSAAN_RULE_SESSION_TTL=<초> (기본 28800)
+"""
+
+import math
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# 범위 우선순위 (앞일수록 우선)
+SCOPE_PRECEDENCE = ("TEMPORARY", "SESSION", "PROJECT", "GLOBAL")
+EXPIRING_SCOPES = ("TEMPORARY", "SESSION")
+
+DEFAULT_TTLS = {"TEMPORARY": 3600.0, "SESSION": 8 * 3600.0}
+DEFAULT_TICK = 1.0
+DEFAULT_WHEEL_SIZE = 3600
+
+SlotKey = Tuple[str, Optional[str], str]
+
+
+class TimerWheel:
+    """해시 타이머 휠 — 칸마다 {키: 만료 틱}, 한 바퀴 넘는 만료는 같은 칸에 남아서 다음 바퀴에 처리"""
+
+    def __init__(self, tick: float = DEFAULT_TICK, size: int = DEFAULT_WHEEL_SIZE, now: Optional[float] = None):
+        self.tick = tick
+        self.size = size
+        self._slots: List[Dict[str, int]] = [{} for _ in range(size)]
+        self._deadlines: Dict[str, int] = {}
+        self._current = int((time.time() if now is None else now) / tick)
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, key: str, deadline: float):
+        self.cancel(key)
+        target = max(math.ceil(deadline / self.tick), self._current + 1)
+        self._slots[target % self.size][key] = target
+        self._deadlines[key] = target
+
+    def cancel(self, key: str):
+        target = self._deadlines.pop(key, None)
+        if target is not None:
+            self._slots[target % self.size].pop(key, None)
+
+    def advance(self, now: Optional[float] = None) -> List[str]:
+        """현재 시각까지 휠 진행 → 만료된 키"""
+        target = int((time.time() if now is None else now) / self.tick)
+        if target <= self._current:
+            return []
+        if target - self._current >= self.size:
+            # 한 바퀴 이상 지남 → 모든 칸을 한 번씩
+            slots = range(self.size)
+        else:
+            slots = (tick % self.size for tick in range(self._current + 1, target + 1))
+        expired = []
+        for index in slots:
+            slot = self._slots[index]
+            if not slot:
+                continue
+            for key in [key for key, tick in slot.items() if tick <= target]:
+                del slot[key]
+                del self._deadlines[key]
+                expired.append(key)
+        self._current = target
+        return expired
+
+
+class RuleIndex:
+    """(범위, 프로젝트, 타입) 슬롯 + 프로젝트별 유효 규칙 뷰 + 만료 타이머 휠"""
+
+    def __init__(self, db_path: Optional[str] = None, ttls: Optional[Dict[str, float]] = None):
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.wheel = TimerWheel()
+
+        self._rules: Dict[str, Dict[str, object]] = {}
+        self._slots: Dict[SlotKey, Dict[str, Dict[str, object]]] = {}
+        # 프로젝트(None = 모든 프로젝트) → 슬롯 키
+        self._project_slots: Dict[Optional[str], Set[SlotKey]] = {}
+        self._views: Dict[Optional[str], Dict[str, List[Dict[str, object]]]] = {}
+        self._sequence = 0
+        self.stats = {"lookups": 0, "view_hits": 0, "view_builds": 0, "invalidations": 0, "expired": 0}
+
+        self._db = None
+        self._tombstones: Set[str] = set()
+        self.is_new = True
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(db_path)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS rule_index (
+                    rule_id TEXT PRIMARY KEY,
+                    scope TEXT,
+                    project TEXT,
+                    rule_type TEXT,
+                    content TEXT,
+                    created REAL,
+                    expires_at REAL
+                )
+            """)
+            self._db.execute("CREATE TABLE IF NOT EXISTS rule_tombstones (rule_id TEXT PRIMARY KEY)")
+            self._tombstones = {row[0] for row in self._db.execute("SELECT rule_id FROM rule_tombstones")}
+            now = time.time()
+            rows = self._db.execute("SELECT * FROM rule_index ORDER BY created").fetchall()
+            self.is_new = not rows
+            stale = []
+            for rule_id, scope, project, rule_type, content, created, expires_at in rows:
+                if expires_at is not None and expires_at <= now:
+                    stale.append((rule_id,))
+                    continue
+                self._add(rule_id, scope, project, rule_type, content, created, expires_at)
+            if stale:
+                with self._db:
+                    self._db.executemany("DELETE FROM rule_index WHERE rule_id = ?", stale)
+                self.tombstone(rule_id for rule_id, in stale)
+
+    @classmethod
+    def from_env(cls, db_path: Optional[str] = None) -> "RuleIndex":
+        ttls = {}
+        for scope in EXPIRING_SCOPES:
+            try:
+                ttls[scope] = float(os.getenv(f"BOOSAAN_RULE_{scope}_TTL", str(DEFAULT_TTLS[scope])))
+            except ValueError:
+                pass
+        return cls(db_path, ttls)
+
+    # === 슬롯 ===
+    def _add(self, rule_id: str, scope: str, project: Optional[str], rule_type: str, content: str,
+             created: float, expires_at: Optional[float]):
+        # 전역 규칙은 프로젝트와 무관
+        project = None if scope == "GLOBAL" else project
+        self._sequence += 1
+        rule = {
+            "rule_id": rule_id, "scope": scope, "project": project, "rule_type": rule_type,
+            "content": content, "created": created, "expires_at": expires_at, "_sequence": self._sequence
+        }
+        key = (scope, project, rule_type)
+        self._rules[rule_id] = rule
+        self._slots.setdefault(key, {})[rule_id] = rule
+        self._project_slots.setdefault(project, set()).add(key)
+        if expires_at is not None:
+            self.wheel.schedule(rule_id, expires_at)
+        self._invalidate(project)
+
+    def _remove(self, rule_id: str) -> bool:
+        rule = self._rules.pop(rule_id, None)
+        if rule is None:
+            return False
+        key = (rule["scope"], rule["project"], rule["rule_type"])
+        slot = self._slots[key]
+        del slot[rule_id]
+        if not slot:
+            del self._slots[key]
+            self._project_slots[rule["project"]].discard(key)
+            if not self._project_slots[rule["project"]]:
+                del self._project_slots[rule["project"]]
+        self.wheel.cancel(rule_id)
+        self._invalidate(rule["project"])
+        return True
+
+    def _invalidate(self, project: Optional[str]):
+        if project is None:
+            if self._views:
+                self._views.clear()
+                self.stats["invalidations"] += 1
+        elif self._views.pop(project, None) is not None:
+            self.stats["invalidations"] += 1
+
+    # === 갱신 ===
+    def expiry_for(self, scope: str, created: float, ttl: Optional[float] = None) -> Optional[float]:
+        """생성 시각 기준 만료 시각 (만료 없는 범위 또는 ttl=0 이면 None)"""
+        if ttl is None:
+            ttl = self.ttls.get(scope)
+        return created + ttl if ttl else None
+
+    def add(self, rule_id: str, content: str, scope: str, project: Optional[str] = None, rule_type: str = "",
+            ttl: Optional[float] = None, created: Optional[float] = None) -> Optional[float]:
+        """규칙 추가 → 만료 시각 (임시/세션 범위 또는 ttl 지정 시, created 를 주면 그 시각 기준)"""
+        self.expire()
+        self._remove(rule_id)
+        self._clear_tombstone(rule_id)
+        created = time.time() if created is None else created
+        expires_at = self.expiry_for(scope, created, ttl)
+        self._add(rule_id, scope, project, rule_type, content, created, expires_at)
+        if self._db is not None:
+            rule = self._rules[rule_id]
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO rule_index VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (rule_id, scope, rule["project"], rule_type, content, created, expires_at)
+                )
+        return expires_at
+
+    def remove(self, rule_id: str):
+        if self._remove(rule_id) and self._db is not None:
+            with self._db:
+                self._db.execute("DELETE FROM rule_index WHERE rule_id = ?", (rule_id,))
+
+    def __contains__(self, rule_id: str) -> bool:
+        return rule_id in self._rules
+
+    def rule_ids(self) -> List[str]:
+        return list(self._rules)
+
+    # === 묘비 ===
+    def tombstone(self, rule_ids: Iterable[str]):
+        """만료된 규칙 기록 (원본에서 사라질 때까지 유지)"""
+        new = [rule_id for rule_id in rule_ids if rule_id not in self._tombstones]
+        self._tombstones.update(new)
+        if new and self._db is not None:
+            with self._db:
+                self._db.executemany("INSERT OR IGNORE INTO rule_tombstones VALUES (?)", [(rule_id,) for rule_id in new])
+
+    def _clear_tombstone(self, rule_id: str):
+        if rule_id in self._tombstones:
+            self._tombstones.discard(rule_id)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM rule_tombstones WHERE rule_id = ?", (rule_id,))
+
+    def tombstones(self) -> List[str]:
+        return list(self._tombstones)
+
+    def is_tombstoned(self, rule_id: str) -> bool:
+        return rule_id in self._tombstones
+
+    def retain_tombstones(self, rule_ids: Iterable[str]):
+        """원본에서 사라진 규칙의 묘비 정리"""
+        stale = self._tombstones - set(rule_ids)
+        self._tombstones -= stale
+        if stale and self._db is not None:
+            with self._db:
+                self._db.executemany("DELETE FROM rule_tombstones WHERE rule_id = ?", [(rule_id,) for rule_id in stale])
+
+    def expire(self, now: Optional[float] = None) -> List[str]:
+        """타이머 휠을 현재 시각까지 진행하고 만료된 규칙 제거 → 만료된 규칙 ID"""
+        expired = [rule_id for rule_id in self.wheel.advance(now) if self._remove(rule_id)]
+        if expired:
+            self.stats["expired"] += len(expired)
+            if self._db is not None:
+                with self._db:
+                    self._db.executemany("DELETE FROM rule_index WHERE rule_id = ?", [(rule_id,) for rule_id in expired])
+            self.tombstone(expired)
+        return expired
+
+    # === 조회 ===
+    def _build_view(self, project: Optional[str]) -> Dict[str, List[Dict[str, object]]]:
+        keys = set(self._project_slots.get(None, ()))
+        if project is not None:
+            keys |= self._project_slots.get(project, set())
+        precedence = {scope: rank for rank, scope in enumerate(SCOPE_PRECEDENCE)}
+        view: Dict[str, List[Dict[str, object]]] = {}
+        for key in keys:
+            view.setdefault(key[2], []).extend(self._slots[key].values())
+        for rules in view.values():
+            rules.sort(key=lambda rule: (precedence.get(rule["scope"], len(precedence)), rule["_sequence"]))
+        return view
+
+    def effective_rules(self, project: Optional[str] = None,
+                        rule_types: Optional[Iterable[str]] = None) -> Dict[str, List[Dict[str, object]]]:
+        """타입 → 유효 규칙 목록 (우선순위 순)"""
+        self.expire()
+        self.stats["lookups"] += 1
+        view = self._views.get(project)
+        if view is None:
+            view = self._views[project] = self._build_view(project)
+            self.stats["view_builds"] += 1
+        else:
+            self.stats["view_hits"] += 1
+        wanted = set(rule_types) if rule_types else None
+        return {
+            rule_type: [{k: v for k, v in rule.items() if k != "_sequence"} for rule in rules]
+            for rule_type, rules in view.items()
+            if wanted is None or rule_type in wanted
+        }
+
+    def metrics(self) -> Dict[str, object]:
+        lookups = self.stats["lookups"]
+        return dict(
+            self.stats,
+            rules=len(self._rules),
+            slots=len(self._slots),
+            cached_views=len(self._views),
+            scheduled_expiries=len(self.wheel),
+            tombstones=len(self._tombstones),
+            view_hit_rate=self.stats["view_hits"] / lookups if lookups else 0.0,
+            ttls=dict(self.ttls)
+        )
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 규칙 유사도 색인 (MinHash + LSH)
+- 규칙 내용 → 토큰 집합(소문자 단어 + 한글 2-gram) → MinHash 서명 (기본 128개 해시)
+- 서명을 밴드(기본 32밴드 × 4행)로 나눠 버킷에 등록 → 같은 버킷을 공유하는 규칙만 후보
+  (전체 규칙과 쌍별 비교하지 않음: 조회 비용 = 밴드 수 + 후보 수)
+- 후보만 실제 토큰 집합 자카드 유사도로 다시 계산해서 임계값(기본 0.6) 이상만 보고
+- 서명은 규칙 격리 디렉터리의 sqlite 에 규칙과 함께 영속 → 재시작 시 해시 재계산 없이 버킷 재구성
+- 해시 계산: NumPy 가 있으면 (해시 함수 × 토큰) 행렬 연산, 없으면 순수 Python (결과 동일)
+- 벤치마크: python boosaan_rule_minhash.py [규칙 수 ...] (기본 1만/3만)
+"""
+
+import hashlib
+import random
+import sqlite3
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from boosaan_context_index import tokenize
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 32
+DEFAULT_THRESHOLD = 0.6
+
+GLOBAL_SCOPE = "GLOBAL"
+
+# 해시 함수 h(x) = (a·x + b) mod P — a, b, x < P = 2^31 - 1 이라 uint64 안에서 넘치지 않음
+_PRIME = (1 << 31) - 1
+_MAX_HASH = (1 << 64) - 1
+_SEED = 1
+
+
+def shingles(text: str) -> FrozenSet[str]:
+    return frozenset(tokenize(text))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """고정 시드 해시 함수 묶음 (서명이 재시작 후에도 같아야 하므로 시드 고정)"""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = _SEED):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.a = [rng.randrange(1, _PRIME) for _ in range(num_perm)]
+        self.b = [rng.randrange(0, _PRIME) for _ in range(num_perm)]
+        if np is not None:
+            self._a = np.array(self.a, dtype=np.uint64)[:, None]
+            self._b = np.array(self.b, dtype=np.uint64)[:, None]
+
+    @staticmethod
+    def _token_hashes(tokens: Iterable[str]) -> List[int]:
+        return [int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little") % _PRIME
+                for token in tokens]
+
+    def signature(self, tokens: FrozenSet[str]) -> array:
+        hashes = self._token_hashes(tokens)
+        if not hashes:
+            return array("Q", [_MAX_HASH] * self.num_perm)
+        if np is not None:
+            values = (self._a * np.array(hashes, dtype=np.uint64)[None, :] + self._b) % np.uint64(_PRIME)
+            return array("Q", values.min(axis=1).tolist())
+        return array("Q", [min((a * x + b) % _PRIME for x in hashes) for a, b in zip(self.a, self.b)])
+
+
+class _Rule:
+    __slots__ = ("scope", "project", "rule_type", "content", "tokens", "signature")
+
+    def __init__(self, scope: str, project: Optional[str], rule_type: str, content: str,
+                 tokens: FrozenSet[str], signature: array):
+        self.scope = scope
+        self.project = project
+        self.rule_type = rule_type
+        self.content = content
+        self.tokens = tokens
+        self.signature = signature
+
+
+class RuleSimilarityIndex:
+    """규칙 MinHash 서명 + LSH 밴드 버킷"""
+
+    def __init__(self, db_path: Optional[str] = None, num_perm: int = DEFAULT_NUM_PERM,
+                 bands: int = DEFAULT_BANDS, threshold: float = DEFAULT_THRESHOLD):
+        if num_perm % bands:
+            raise ValueError(f"해시 수({num_perm})가 밴드 수({bands})로 나누어떨어지지 않음")
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+
+        self._rules: Dict[str, _Rule] = {}
+        self._buckets: Dict[Tuple[int, bytes], Set[str]] = {}
+        self._projects: Dict[str, Set[str]] = {}
+        self._global: Set[str] = set()
+        self.stats = {"lookups": 0, "candidates": 0, "matches": 0}
+
+        self._db = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(db_path)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS rule_signatures (
+                    rule_id TEXT PRIMARY KEY,
+                    scope TEXT,
+                    project TEXT,
+                    rule_type TEXT,
+                    content TEXT,
+                    num_perm INTEGER,
+                    signature BLOB
+                )
+            """)
+            for rule_id, scope, project, rule_type, content, num_perm, blob in self._db.execute(
+                    "SELECT * FROM rule_signatures"):
+                signature = array("Q")
+                signature.frombytes(blob)
+                if num_perm != self.hasher.num_perm:
+                    # 해시 수가 바뀐 경우에만 다시 계산
+                    signature = None
+                self._add(rule_id, scope, project, rule_type, content, signature)
+
+    # === 버킷 ===
+    def _band_keys(self, signature: array) -> List[Tuple[int, bytes]]:
+        rows = self.rows
+        return [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(self.bands)]
+
+    def _add(self, rule_id: str, scope: str, project: Optional[str], rule_type: str, content: str,
+             signature: Optional[array] = None) -> array:
+        tokens = shingles(content)
+        if signature is None:
+            signature = self.hasher.signature(tokens)
+        self._rules[rule_id] = _Rule(scope, project, rule_type, content, tokens, signature)
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, set()).add(rule_id)
+        if scope == GLOBAL_SCOPE:
+            self._global.add(rule_id)
+        elif project:
+            self._projects.setdefault(project, set()).add(rule_id)
+        return signature
+
+    def _remove(self, rule_id: str) -> bool:
+        rule = self._rules.pop(rule_id, None)
+        if rule is None:
+            return False
+        for key in self._band_keys(rule.signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(rule_id)
+                if not bucket:
+                    del self._buckets[key]
+        self._global.discard(rule_id)
+        if rule.project in self._projects:
+            self._projects[rule.project].discard(rule_id)
+            if not self._projects[rule.project]:
+                del self._projects[rule.project]
+        return True
+
+    # === 갱신 ===
+    def add(self, rule_id: str, content: str, scope: str, project: Optional[str] = None, rule_type: str = ""):
+        self._remove(rule_id)
+        signature = self._add(rule_id, scope, project, rule_type, content)
+        if self._db is not None:
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO rule_signatures VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (rule_id, scope, project, rule_type, content, self.hasher.num_perm, signature.tobytes())
+                )
+
+    def remove(self, rule_id: str):
+        if self._remove(rule_id) and self._db is not None:
+            with self._db:
+                self._db.execute("DELETE FROM rule_signatures WHERE rule_id = ?", (rule_id,))
+
+    def __contains__(self, rule_id: str) -> bool:
+        return rule_id in self._rules
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    # === 조회 ===
+    def _candidates(self, signature: array) -> Set[str]:
+        candidates: Set[str] = set()
+        for key in self._band_keys(signature):
+            bucket = self._buckets.get(key)
+            if bucket:
+                candidates |= bucket
+        return candidates
+
+    def similar(self, content: str, scopes: Optional[Sequence[str]] = None, project: Optional[str] = None,
+                threshold: Optional[float] = None, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """내용과 유사한 규칙 [(규칙 ID, 자카드)] — LSH 후보만 정확히 재계산, 유사도 내림차순
+
+        scopes 가 있으면 해당 범위만, project 가 있으면 전역 규칙 + 그 프로젝트 규칙만.
+        """
+        tokens = shingles(content)
+        return self._similar(tokens, self.hasher.signature(tokens), scopes, project, threshold, exclude)
+
+    def _similar(self, tokens: FrozenSet[str], signature: array, scopes: Optional[Sequence[str]],
+                 project: Optional[str], threshold: Optional[float], exclude: Optional[str]) -> List[Tuple[str, float]]:
+        threshold = self.threshold if threshold is None else threshold
+        candidates = self._candidates(signature)
+        candidates.discard(exclude)
+        self.stats["lookups"] += 1
+        self.stats["candidates"] += len(candidates)
+
+        matches = []
+        for rule_id in candidates:
+            rule = self._rules[rule_id]
+            if scopes is not None and rule.scope not in scopes:
+                continue
+            if project is not None and rule.scope != GLOBAL_SCOPE and rule.project != project:
+                continue
+            similarity = jaccard(tokens, rule.tokens)
+            if similarity >= threshold:
+                matches.append((rule_id, similarity))
+        self.stats["matches"] += len(matches)
+        matches.sort(key=lambda item: -item[1])
+        return matches
+
+    def contamination(self, project: str, threshold: Optional[float] = None) -> List[Dict[str, object]]:
+        """프로젝트 규칙 중 전역 규칙과 거의 같은 쌍 (프로젝트 규칙 수 × 후보 수만 비교)"""
+        pairs = []
+        for rule_id in sorted(self._projects.get(project, ())):
+            rule = self._rules[rule_id]
+            for global_id, similarity in self._similar(rule.tokens, rule.signature, (GLOBAL_SCOPE,),
+                                                       None, threshold, rule_id):
+                pairs.append({
+                    "project_rule_id": rule_id,
+                    "project_rule": rule.content,
+                    "global_rule_id": global_id,
+                    "global_rule": self._rules[global_id].content,
+                    "similarity": similarity
+                })
+        pairs.sort(key=lambda pair: -pair["similarity"])
+        return pairs
+
+    def rule(self, rule_id: str) -> Optional[Dict[str, Optional[str]]]:
+        rule = self._rules.get(rule_id)
+        if rule is None:
+            return None
+        return {"rule_id": rule_id, "scope": rule.scope, "project": rule.project,
+                "rule_type": rule.rule_type, "content": rule.content}
+
+    def rules(self) -> List[Dict[str, Optional[str]]]:
+        return [self.rule(rule_id) for rule_id in self._rules]
+
+    def metrics(self) -> Dict[str, object]:
+        return dict(
+            self.stats,
+            rules=len(self._rules),
+            global_rules=len(self._global),
+            projects=len(self._projects),
+            buckets=len(self._buckets),
+            bands=self.bands,
+            rows=self.rows,
+            threshold=self.threshold,
+            hashing="numpy" if np is not None else "python"
+        )
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+# === 벤치마크 ===
+def _synthetic_rules(count: int, rng: random.Random) -> List[str]:
+    vocabulary = [f"word{i}" for i in range(5_000)]
+    return [" ".join(rng.sample(vocabulary, 12)) for _ in range(count)]
+
+
+def benchmark_contamination(rule_counts: Sequence[int] = (10_000, 30_000),
+                            project_rules: int = 50) -> Dict[int, Dict[str, float]]:
+    """전역 규칙 수별: 색인 구축(µs/규칙), 프로젝트 오염 검사 LSH vs 쌍별 비교(ms), 재현율"""
+    rng = random.Random(7)
+    results: Dict[int, Dict[str, float]] = {}
+    for count in rule_counts:
+        index = RuleSimilarityIndex()
+        contents = _synthetic_rules(count, rng)
+
+        start = time.perf_counter()
+        for i, content in enumerate(contents):
+            index.add(f"G{i}", content, GLOBAL_SCOPE)
+        build = (time.perf_counter() - start) / count * 1e6
+
+        # 절반은 전역 규칙을 조금 바꾼 복사본 (단어 1개 교체 → 자카드 ≈ 0.85)
+        for i in range(project_rules):
+            words = contents[rng.randrange(count)].split() if i % 2 == 0 else _synthetic_rules(1, rng)[0].split()
+            words[0] = "changed"
+            index.add(f"P{i}", " ".join(words), "PROJECT", "bench")
+
+        start = time.perf_counter()
+        found = {(pair["project_rule_id"], pair["global_rule_id"]) for pair in index.contamination("bench")}
+        lsh = (time.perf_counter() - start) * 1e3
+
+        start = time.perf_counter()
+        exact = set()
+        for i in range(project_rules):
+            tokens = index._rules[f"P{i}"].tokens
+            for global_id in index._global:
+                if jaccard(tokens, index._rules[global_id].tokens) >= index.threshold:
+                    exact.add((f"P{i}", global_id))
+        pairwise = (time.perf_counter() - start) * 1e3
+
+        results[count] = {
+            "build_us": build,
+            "lsh_ms": lsh,
+            "pairwise_ms": pairwise,
+            "recall": len(found & exact) / len(exact) if exact else 1.0
+        }
+    return results
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 30_000]
+    print("🧬 규칙 MinHash/LSH 색인 벤치마크")
+    for count, timings in benchmark_contamination(counts).items():
+        print(f"  • 전역 규칙 {count:>6,}개: 서명 {timings['build_us']:.1f}µs/규칙"
+              f" | 오염 검사 LSH {timings['lsh_ms']:.1f}ms / 쌍별 비교 {timings['pairwise_ms']:.1f}ms"
+              f" | 재현율 {timings['recall']:.2f}")
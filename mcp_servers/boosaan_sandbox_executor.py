@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 비동기 샌드박스 실행 엔진
+- asyncio 서브프로세스로 명령 실행 → 실행 중에도 이벤트 루프는 다른 요청 처리
+- 전역 동시 실행 상한 + 샌드박스별 동시 실행 상한 (세마포어)
+- 여러 샌드박스 × 여러 명령 일괄 실행 (fan-out) 후 결과 집계
+- 출력은 head/tail 버퍼로만 메모리에 보관, 전체 출력은 실행별 파일로 저장
+  (async 엔진만 해당 — manager 엔진은 관리자가 전체 출력을 문자열로 돌려주므로 메모리 상한 없음)
+
+엔진 선택: BOOSAAN_SANDBOX_ENGINE=manager (기본) | async
+  manager: 모든 명령을 SandboxManager.execute_in_sandbox 로 위임 (스레드에서 실행, 관리자의 명령 검사 적용)
+           프로세스를 관리자가 만들므로 리소스 계측(ResourceAccountant)은 적용되지 않음
+           관리자가 stdout/stderr 전체를 메모리에 모은 뒤 반환하므로 출력 메모리 상한도 적용되지 않음
+           (반환된 출력을 캡처에 옮겨 응답 크기와 실행별 로그 파일만 같은 형식으로 맞춤)
+  async: 등록된 샌드박스는 직접 실행 — 금지 경로 참조 검사와 메모리/CPU 시간 상한만 적용하고
+         SandboxManager 의 명령 검사, network_allowed, process_count, allowed_paths 는 적용하지 않음
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import re
+import shlex
+import shutil
+import signal
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from boosaan_output_capture import OutputCapture, safe_path_component, read_range
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_PER_SANDBOX_CONCURRENCY = 2
+MAX_BATCH_JOBS = 64
+MAX_EXECUTIONS_PER_SANDBOX = 20
+OUTPUT_STREAMS = ("stdout", "stderr")
+_READ_CHUNK = 64 * 1024
+_ENV_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+@dataclass
+class SandboxSpec:
+    """네이티브 실행에 필요한 샌드박스 설정 (create_sandbox 시 등록)"""
+    sandbox_id: str
+    cwd: str
+    time_limit: int
+    forbidden_paths: List[str] = field(default_factory=list)
+    resource_limits: Dict[str, Any] = field(default_factory=dict)
+    permission_level: str = ""
+
+
+class SandboxExecutor:
+    """동시 실행 제한이 있는 비동기 명령 실행기"""
+
+    def __init__(self, sandbox_manager, max_concurrency: Optional[int] = None,
+                 per_sandbox_concurrency: int = DEFAULT_PER_SANDBOX_CONCURRENCY,
+                 native: bool = False, output_dir: Optional[str] = None,
+                 accountant=None, logger: Optional[logging.Logger] = None):
+        self.sandbox_manager = sandbox_manager
+        self.accountant = accountant
+        # 명령 대부분은 대기 시간이 길므로 ThreadPoolExecutor 기본값과 같은 기준 사용
+        self.max_concurrency = max(1, max_concurrency or min(32, (os.cpu_count() or 1) + 4))
+        self.per_sandbox_concurrency = max(1, per_sandbox_concurrency)
+        self.native = native
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._specs: Dict[str, SandboxSpec] = {}
+        self._global_slots: Optional[asyncio.Semaphore] = None
+        self._sandbox_slots: Dict[str, asyncio.Semaphore] = {}
+        
+        # 실행별 전체 출력 저장 위치: output_dir/<sandbox>/<execution_id>/{stdout,stderr}
+        self.output_dir = Path(output_dir) if output_dir else None
+        self._executions: Dict[str, Path] = {}
+        self._sandbox_executions: Dict[str, deque] = {}
+        self._execution_sequence = itertools.count(1)
+
+        self.stats = {"native": 0, "delegated": 0, "blocked": 0, "timeouts": 0, "running": 0, "queued": 0}
+
+    @classmethod
+    def from_env(cls, sandbox_manager, output_dir: Optional[str] = None, accountant=None,
+                 logger: Optional[logging.Logger] = None) -> "SandboxExecutor":
+        def _int_env(name: str, default: Optional[int]) -> Optional[int]:
+            try:
+                return int(os.environ[name])
+            except (KeyError, ValueError):
+                return default
+
+        return cls(
+            sandbox_manager,
+            max_concurrency=_int_env("BOOSAAN_SANDBOX_MAX_CONCURRENCY", None),
+            per_sandbox_concurrency=_int_env("BOOSAAN_SANDBOX_PER_SANDBOX_CONCURRENCY", DEFAULT_PER_SANDBOX_CONCURRENCY),
+            native=os.getenv("BOOSAAN_SANDBOX_ENGINE", "manager").lower() == "async",
+            output_dir=output_dir,
+            accountant=accountant,
+            logger=logger
+        )
+
+    # === 샌드박스 등록 ===
+    def register(self, spec: SandboxSpec):
+        self._specs[spec.sandbox_id] = spec
+
+    def get_spec(self, sandbox_id: str) -> Optional[SandboxSpec]:
+        return self._specs.get(sandbox_id)
+
+    def unregister(self, sandbox_id: str):
+        self._specs.pop(sandbox_id, None)
+        self._sandbox_slots.pop(sandbox_id, None)
+        
+        # 샌드박스 삭제 시 저장된 출력도 정리
+        for execution_id in self._sandbox_executions.pop(sandbox_id, ()):
+            self._executions.pop(execution_id, None)
+        if self.output_dir:
+            shutil.rmtree(self.output_dir / safe_path_component(sandbox_id), ignore_errors=True)
+
+    # === 출력 저장 ===
+    def _open_captures(self, sandbox_id: str) -> Tuple[Optional[str], Dict[str, OutputCapture]]:
+        """실행 하나의 stdout/stderr 캡처 생성 (저장 위치가 없으면 메모리만 사용)"""
+        if self.output_dir is None:
+            return None, {stream: OutputCapture() for stream in OUTPUT_STREAMS}
+
+        execution_id = f"{int(time.time() * 1000):x}{next(self._execution_sequence):04d}"
+        execution_dir = self.output_dir / safe_path_component(sandbox_id) / execution_id
+        execution_dir.mkdir(parents=True, exist_ok=True)
+        self._executions[execution_id] = execution_dir
+
+        # 샌드박스별 최근 실행만 보관
+        history = self._sandbox_executions.setdefault(sandbox_id, deque())
+        history.append(execution_id)
+        while len(history) > MAX_EXECUTIONS_PER_SANDBOX:
+            expired = history.popleft()
+            shutil.rmtree(self._executions.pop(expired), ignore_errors=True)
+
+        return execution_id, {stream: OutputCapture(execution_dir / stream) for stream in OUTPUT_STREAMS}
+
+    @staticmethod
+    def _attach_output(result: Dict[str, Any], execution_id: Optional[str],
+                       captures: Dict[str, OutputCapture]) -> Dict[str, Any]:
+        for stream, capture in captures.items():
+            capture.close()
+            result[stream] = capture.preview()
+        result["execution_id"] = execution_id
+        result["output"] = {stream: capture.to_dict() for stream, capture in captures.items()}
+        return result
+
+    def read_output(self, execution_id: str, stream: str, offset: int = 0, length: int = _READ_CHUNK) -> Dict[str, Any]:
+        """저장된 전체 출력의 일부 조회"""
+        execution_dir = self._executions.get(execution_id)
+        if execution_dir is None or stream not in OUTPUT_STREAMS:
+            raise KeyError(f"{execution_id}/{stream}")
+        return read_range(execution_dir / stream, offset, length)
+
+    # === 실행 ===
+    async def execute(self, sandbox_id: str, command: str, input_data: Optional[str] = None,
+                      env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """명령 하나 실행 (동시 실행 상한 적용, env 는 추가 환경 변수)"""
+        for name in env or ():
+            if not _ENV_NAME.fullmatch(name):
+                return {"status": "ERROR", "message": f"잘못된 환경 변수 이름: {name}"}
+
+        if self._global_slots is None:
+            self._global_slots = asyncio.Semaphore(self.max_concurrency)
+        sandbox_slots = self._sandbox_slots.setdefault(
+            sandbox_id, asyncio.Semaphore(self.per_sandbox_concurrency)
+        )
+
+        self.stats["queued"] += 1
+        async with sandbox_slots, self._global_slots:
+            self.stats["queued"] -= 1
+            self.stats["running"] += 1
+            try:
+                spec = self._specs.get(sandbox_id)
+                if self.native and spec is not None:
+                    self.stats["native"] += 1
+                    return await self._execute_native(spec, command, input_data, env)
+
+                # 설정을 모르는 샌드박스는 기존 SandboxManager 경로로 (스레드에서 실행)
+                self.stats["delegated"] += 1
+                if env:
+                    exports = " ".join(shlex.quote(f"{name}={value}") for name, value in env.items())
+                    command = f"export {exports}; {command}"
+                result = await asyncio.to_thread(
+                    self.sandbox_manager.execute_in_sandbox, sandbox_id, command, input_data
+                )
+                if "stdout" not in result and "stderr" not in result:
+                    return result
+                
+                # 관리자가 이미 전체 출력을 메모리에 모은 상태 → 여기서는 응답 형식만 맞춤 (메모리 상한 아님)
+                execution_id, captures = self._open_captures(sandbox_id)
+                for stream, capture in captures.items():
+                    capture.write((result.get(stream) or "").encode())
+                return self._attach_output(dict(result), execution_id, captures)
+            finally:
+                self.stats["running"] -= 1
+
+    async def execute_many(self, jobs: List[Tuple[str, str, Optional[str]]]) -> List[Dict[str, Any]]:
+        """(샌드박스 ID, 명령, 입력) 목록을 동시에 실행 (결과는 입력 순서대로)"""
+        async def _run(sandbox_id: str, command: str, input_data: Optional[str]) -> Dict[str, Any]:
+            try:
+                return await self.execute(sandbox_id, command, input_data)
+            except Exception as e:
+                return {"status": "ERROR", "message": str(e)}
+
+        return await asyncio.gather(*(_run(*job) for job in jobs))
+
+    def _preflight(self, spec: SandboxSpec, command: str, status: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """실행 전 검사 (샌드박스 활성 상태, 금지 경로 참조)"""
+        if status.get("status") != "ACTIVE":
+            return {"status": "ERROR", "message": f"샌드박스가 활성 상태가 아님: {status.get('status')}"}
+
+        for forbidden in spec.forbidden_paths:
+            if re.search(rf"(?<![\w/.]){re.escape(forbidden)}(?=/|\s|$|['\"])", command):
+                self.stats["blocked"] += 1
+                return {"status": "BLOCKED", "reason": f"금지 경로 접근: {forbidden}"}
+
+        return None
+
+    async def _execute_native(self, spec: SandboxSpec, command: str, input_data: Optional[str],
+                              env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        # 관리자 호출은 풀의 관리자 잠금을 기다릴 수 있으므로 스레드에서
+        status = await asyncio.to_thread(self.sandbox_manager.get_sandbox_status, spec.sandbox_id)
+        rejected = self._preflight(spec, command, status)
+        if rejected:
+            return rejected
+
+        execution_id, captures = self._open_captures(spec.sandbox_id)
+        baseline = self.accountant.begin_execution(spec.sandbox_id) if self.accountant else None
+        start = time.time()
+        process = await asyncio.create_subprocess_shell(
+            command,
+            cwd=spec.cwd,
+            env={**os.environ, **env} if env else None,
+            stdin=asyncio.subprocess.PIPE if input_data is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+            preexec_fn=self._preexec(spec)
+        )
+        if self.accountant:
+            # preexec 에서 이미 cgroup 에 들어갔으면 같은 그룹에 다시 기록 (변화 없음)
+            self.accountant.attach(spec.sandbox_id, process.pid)
+
+        try:
+            await asyncio.wait_for(
+                self._stream_process(process, input_data, captures),
+                timeout=spec.time_limit
+            )
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            self._kill_group(process.pid)
+            await process.wait()
+            return self._attach_output({
+                "status": "TIMEOUT",
+                "execution_time": time.time() - start,
+                "message": f"시간 제한 {spec.time_limit}초 초과로 종료됨"
+            }, execution_id, captures)
+        except BaseException:
+            self._kill_group(process.pid)
+            for capture in captures.values():
+                capture.close()
+            raise
+
+        elapsed = time.time() - start
+        return self._attach_output({
+            "status": "SUCCESS",
+            "return_code": process.returncode,
+            "execution_time": elapsed,
+            "resource_usage": self.accountant.execution_usage(spec.sandbox_id, baseline, elapsed) if self.accountant else None
+        }, execution_id, captures)
+
+    @staticmethod
+    async def _stream_process(process, input_data: Optional[str], captures: Dict[str, OutputCapture]):
+        """stdout/stderr 를 청크 단위로 캡처에 흘려보내고 종료 대기"""
+        async def _pump(reader, capture: OutputCapture):
+            while True:
+                chunk = await reader.read(_READ_CHUNK)
+                if not chunk:
+                    return
+                capture.write(chunk)
+
+        async def _feed():
+            try:
+                process.stdin.write(input_data.encode())
+                await process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                process.stdin.close()
+
+        tasks = [_pump(process.stdout, captures["stdout"]), _pump(process.stderr, captures["stderr"])]
+        if input_data is not None:
+            tasks.append(_feed())
+        await asyncio.gather(*tasks)
+        await process.wait()
+
+    def _preexec(self, spec: SandboxSpec):
+        """exec 전 자식 프로세스 준비: 샌드박스 cgroup 합류 → rlimit 적용"""
+        steps = [step for step in (
+            self.accountant.cgroup_preexec(spec.sandbox_id) if self.accountant else None,
+            self._limits_preexec(spec)
+        ) if step is not None]
+        if not steps:
+            return None
+
+        def _run():
+            for step in steps:
+                step()
+
+        return _run
+
+    @staticmethod
+    def _limits_preexec(spec: SandboxSpec):
+        """메모리 / CPU 시간 상한을 exec 전에 자식 프로세스에서 적용하는 preexec_fn
+
+        생성 후 prlimit 으로 적용하면 그 사이에 fork 한 자손은 상한 없이 실행되므로 exec 전에 설정.
+        자식에서는 미리 계산한 값으로 setrlimit 만 호출 (할당/잠금 없음).
+        """
+        if resource is None:
+            return None
+        limits = []
+        memory_mb = spec.resource_limits.get("memory_mb")
+        if memory_mb:
+            limit = int(memory_mb) * 1024 * 1024
+            limits.append((resource.RLIMIT_AS, (limit, limit)))
+        limits.append((resource.RLIMIT_CPU, (spec.time_limit, spec.time_limit + 5)))
+
+        def _clamp(kind, value):
+            # 현재 hard 상한보다 높게는 설정할 수 없음
+            _, hard = resource.getrlimit(kind)
+            if hard == resource.RLIM_INFINITY:
+                return value
+            return min(value[0], hard), min(value[1], hard)
+
+        limits = [(kind, _clamp(kind, value)) for kind, value in limits]
+
+        def _preexec():
+            for kind, value in limits:
+                resource.setrlimit(kind, value)
+
+        return _preexec
+
+    @staticmethod
+    def _kill_group(pid: int):
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "engine": "async" if self.native else "manager",
+            "max_concurrency": self.max_concurrency,
+            "per_sandbox_concurrency": self.per_sandbox_concurrency,
+            "registered_sandboxes": len(self._specs),
+            **self.stats
+        }
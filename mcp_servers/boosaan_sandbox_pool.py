@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 웜 샌드박스 풀
+- 권한 레벨 / 리소스 프로필(네트워크, 시간 제한, 프로젝트 경로)별로 미리 만든 샌드박스 보관
+- 임대는 deque pop 한 번 (O(1)), 사용자 ID는 풀 샌드박스 ID에 별칭으로 연결
+- 반환된 샌드박스는 백그라운드에서 삭제 후 새로 프로비저닝 (상태 초기화 보장)
+- 풀 적중률 / 프로비저닝 지연 메트릭 제공
+- SandboxManager 는 스레드 안전하지 않으므로 풀 사용 시 서버의 관리자 호출도 guarded_manager 를 거쳐
+  풀의 백그라운드 스레드와 같은 잠금으로 직렬화 — 샌드박스 생성/삭제/조회 같은 장부 작업만 잠그고
+  명령 실행(execute_in_sandbox)은 잠그지 않음 (긴 명령이 다른 샌드박스 작업과 일괄 실행을 막지 않도록)
+- 풀 샌드박스 ID(POOL_ID_PREFIX)는 예약 → 목록에서 숨기고 같은 접두사 / 임대 중인 ID 로 생성 거부
+
+활성화: BOOSAAN_SANDBOX_POOL_SIZE=<프로필별 목표 크기> (기본 0 = 비활성)
+"""
+
+import itertools
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+DEFAULT_POOL_SIZE = 0
+MAX_PROFILES = 8
+POOL_ID_PREFIX = "__pool_"
+# 잠그지 않는 관리자 메서드 (실행 시간이 명령에 달린 것)
+UNLOCKED_METHODS = ("execute_in_sandbox",)
+
+ConfigFactory = Callable[[str], Any]
+
+
+class _ProfilePool:
+    """프로필 하나의 대기 샌드박스 목록"""
+
+    __slots__ = ("make_config", "idle", "provisioning")
+
+    def __init__(self, make_config: ConfigFactory):
+        self.make_config = make_config
+        self.idle: deque = deque()      # (풀 샌드박스 ID, 생성 결과)
+        self.provisioning = 0
+
+
+class _GuardedManager:
+    """SandboxManager 장부 메서드 호출을 하나의 잠금으로 직렬화하는 프록시 (UNLOCKED_METHODS 제외)"""
+
+    def __init__(self, manager, lock: threading.RLock):
+        self._manager = manager
+        self._lock = lock
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._manager, name)
+        if not callable(attribute) or name in UNLOCKED_METHODS:
+            return attribute
+
+        def _locked(*args, **kwargs):
+            with self._lock:
+                return attribute(*args, **kwargs)
+
+        return _locked
+
+
+class SandboxPool:
+    """프로필별 웜 샌드박스 풀"""
+
+    def __init__(self, sandbox_manager, target_size: int = DEFAULT_POOL_SIZE,
+                 max_profiles: int = MAX_PROFILES, logger: Optional[logging.Logger] = None):
+        self.sandbox_manager = sandbox_manager
+        self.target_size = max(0, target_size)
+        self.max_profiles = max(1, max_profiles)
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._profiles: "OrderedDict[Hashable, _ProfilePool]" = OrderedDict()
+        self._aliases: Dict[str, tuple] = {}     # 사용자 ID → (풀 샌드박스 ID, 프로필 키)
+        self._sequence = itertools.count(1)
+        self._id_token = secrets.token_hex(4)
+
+        # 풀 상태(짧게 보유)와 SandboxManager 호출을 분리해서 보호
+        #   → 백그라운드 프로비저닝 중에도 풀 적중 임대는 기다리지 않음
+        self._lock = threading.Lock()
+        self._manager_lock = threading.RLock()
+        self.guarded_manager = _GuardedManager(sandbox_manager, self._manager_lock)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="boosaan-sandbox-pool")
+        self._closed = False
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "recycled": 0,
+            "provisioned": 0,
+            "provision_failures": 0,
+            "provision_time_total": 0.0,
+            "last_provision_time": 0.0
+        }
+
+    @classmethod
+    def from_env(cls, sandbox_manager, logger: Optional[logging.Logger] = None) -> Optional["SandboxPool"]:
+        try:
+            size = int(os.getenv("BOOSAAN_SANDBOX_POOL_SIZE", str(DEFAULT_POOL_SIZE)))
+        except ValueError:
+            size = DEFAULT_POOL_SIZE
+        if size <= 0:
+            return None
+        return cls(sandbox_manager, size, logger=logger)
+
+    # === 예약 ID ===
+    def is_reserved(self, sandbox_id: str) -> bool:
+        """호출자가 쓸 수 없는 ID (풀 내부 ID 또는 이미 임대 중인 ID)"""
+        return sandbox_id.startswith(POOL_ID_PREFIX) or sandbox_id in self._aliases
+
+    def filter_listing(self, listing: Dict[str, Any]) -> Dict[str, Any]:
+        """list_sandboxes 결과에서 대기 중인 풀 샌드박스를 숨기고 임대 중인 것은 사용자 ID 로 표시"""
+        by_pooled_id = {pooled_id: user_id for user_id, (pooled_id, _) in list(self._aliases.items())}
+        sandboxes = listing.get("sandboxes")
+
+        def _visible_id(sandbox_id):
+            if isinstance(sandbox_id, str) and sandbox_id.startswith(POOL_ID_PREFIX):
+                return by_pooled_id.get(sandbox_id)
+            return sandbox_id
+
+        if isinstance(sandboxes, dict):
+            sandboxes = {_visible_id(key): value for key, value in sandboxes.items() if _visible_id(key)}
+        elif isinstance(sandboxes, list):
+            visible = []
+            for entry in sandboxes:
+                if isinstance(entry, dict) and "sandbox_id" in entry:
+                    user_id = _visible_id(entry["sandbox_id"])
+                    if user_id:
+                        visible.append(dict(entry, sandbox_id=user_id))
+                elif _visible_id(entry):
+                    visible.append(_visible_id(entry))
+            sandboxes = visible
+        else:
+            return listing
+
+        filtered = dict(listing, sandboxes=sandboxes)
+        if "total_sandboxes" in listing:
+            filtered["total_sandboxes"] = len(sandboxes)
+        return filtered
+
+    # === 임대 / 반환 ===
+    def acquire(self, sandbox_id: str, profile_key: Hashable, make_config: ConfigFactory) -> Dict[str, Any]:
+        """샌드박스 임대 (풀 적중 시 즉시, 아니면 기존 방식으로 생성 후 풀 예열)"""
+        if self.is_reserved(sandbox_id):
+            return {"status": "FAILED", "reason": f"이미 사용 중이거나 예약된 샌드박스 ID: {sandbox_id}", "pooled": False}
+        with self._lock:
+            profile = self._profiles.get(profile_key)
+            if profile is None:
+                profile = self._register_profile(profile_key, make_config)
+            else:
+                self._profiles.move_to_end(profile_key)
+
+            if profile.idle:
+                pooled_id, result = profile.idle.popleft()
+                self._aliases[sandbox_id] = (pooled_id, profile_key)
+                self.stats["hits"] += 1
+                self._schedule_refill(profile_key)
+                return dict(result, pooled=True)
+
+            self.stats["misses"] += 1
+
+        # 미스: 사용자 ID 그대로 생성 (기존 동작)
+        result = self._provision(sandbox_id, make_config)
+        self._schedule_refill(profile_key)
+        return dict(result, pooled=False)
+
+    def resolve(self, sandbox_id: str) -> str:
+        """사용자 ID → 실제 샌드박스 ID"""
+        alias = self._aliases.get(sandbox_id)
+        return alias[0] if alias else sandbox_id
+
+    def release(self, sandbox_id: str) -> Optional[Dict[str, Any]]:
+        """풀에서 임대한 샌드박스 반환 (풀 샌드박스가 아니면 None)"""
+        with self._lock:
+            alias = self._aliases.pop(sandbox_id, None)
+        if alias is None:
+            return None
+
+        pooled_id, profile_key = alias
+        self._executor.submit(self._recycle, pooled_id, profile_key)
+        return {"status": "SUCCESS", "terminated_processes": 0, "cleaned_up": True, "recycled": True}
+
+    # === 백그라운드 프로비저닝 ===
+    def _register_profile(self, profile_key: Hashable, make_config: ConfigFactory) -> _ProfilePool:
+        profile = _ProfilePool(make_config)
+        self._profiles[profile_key] = profile
+
+        # 프로필 수 상한 초과 시 가장 오래 쓰지 않은 프로필의 대기 샌드박스 정리
+        while len(self._profiles) > self.max_profiles:
+            _, stale = self._profiles.popitem(last=False)
+            for pooled_id, _ in stale.idle:
+                self._executor.submit(self._destroy, pooled_id)
+            stale.idle.clear()
+
+        return profile
+
+    def _provision(self, sandbox_id: str, make_config: ConfigFactory) -> Dict[str, Any]:
+        start = time.perf_counter()
+        with self._manager_lock:
+            result = self.sandbox_manager.create_sandbox(make_config(sandbox_id))
+        elapsed = time.perf_counter() - start
+
+        self.stats["provision_time_total"] += elapsed
+        self.stats["last_provision_time"] = elapsed
+        if result.get("status") == "SUCCESS":
+            self.stats["provisioned"] += 1
+        else:
+            self.stats["provision_failures"] += 1
+        return result
+
+    def _schedule_refill(self, profile_key: Hashable):
+        if not self._closed:
+            self._executor.submit(self._refill, profile_key)
+
+    def _refill(self, profile_key: Hashable):
+        """프로필의 대기 샌드박스를 목표 크기까지 채움"""
+        while not self._closed:
+            with self._lock:
+                profile = self._profiles.get(profile_key)
+                if profile is None or len(profile.idle) + profile.provisioning >= self.target_size:
+                    return
+                profile.provisioning += 1
+                pooled_id = f"{POOL_ID_PREFIX}{self._id_token}_{next(self._sequence):06d}"
+
+            try:
+                result = self._provision(pooled_id, profile.make_config)
+            except Exception as e:
+                self.stats["provision_failures"] += 1
+                self.logger.warning(f"샌드박스 풀 프로비저닝 실패: {e}")
+                result = None
+            finally:
+                with self._lock:
+                    profile.provisioning -= 1
+
+            if not result or result.get("status") != "SUCCESS":
+                # 위험도 평가 거부 등은 재시도해도 같으므로 중단
+                return
+
+            with self._lock:
+                if self._profiles.get(profile_key) is profile:
+                    profile.idle.append((pooled_id, result))
+                    continue
+            self._destroy(pooled_id)
+            return
+
+    def _recycle(self, pooled_id: str, profile_key: Hashable):
+        """반환된 샌드박스 삭제 후 새 샌드박스로 보충"""
+        self._destroy(pooled_id)
+        self.stats["recycled"] += 1
+        self._refill(profile_key)
+
+    def _destroy(self, pooled_id: str):
+        try:
+            with self._manager_lock:
+                self.sandbox_manager.destroy_sandbox(pooled_id)
+        except Exception as e:
+            self.logger.warning(f"풀 샌드박스 삭제 실패: {pooled_id} ({e})")
+
+    # === 메트릭 / 종료 ===
+    def metrics(self) -> Dict[str, Any]:
+        leases = self.stats["hits"] + self.stats["misses"]
+        attempts = self.stats["provisioned"] + self.stats["provision_failures"]
+        return {
+            "target_size": self.target_size,
+            "profiles": len(self._profiles),
+            "idle_sandboxes": sum(len(p.idle) for p in self._profiles.values()),
+            "leased_sandboxes": len(self._aliases),
+            "hits": self.stats["hits"],
+            "misses": self.stats["misses"],
+            "hit_rate": self.stats["hits"] / leases if leases else 0.0,
+            "recycled": self.stats["recycled"],
+            "provisioned": self.stats["provisioned"],
+            "provision_failures": self.stats["provision_failures"],
+            "average_provision_time": self.stats["provision_time_total"] / attempts if attempts else 0.0,
+            "last_provision_time": self.stats["last_provision_time"]
+        }
+
+    def close(self):
+        """대기 샌드박스 정리 (임대 중인 샌드박스는 SandboxManager 정리에 맡김)"""
+        self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            idle = [pooled_id for profile in self._profiles.values() for pooled_id, _ in profile.idle]
+            self._profiles.clear()
+        for pooled_id in idle:
+            self._destroy(pooled_id)
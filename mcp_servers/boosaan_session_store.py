@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 세션 저장소 액터
+- 전담 스레드 하나가 SQLite 연결을 소유
+- 읽기/쓰기 작업은 우선순위 큐로 직렬화 (읽기 > 대기 쓰기 > 백그라운드 쓰기)
+- 비동기 호출자는 future를 await → 이벤트 루프는 디스크 I/O로 블록되지 않음
+- 읽기가 먼저 처리되므로, 방금 쓴 기록을 읽어야 하는 호출자는 read(after=키) 로 그 키의
+  대기 중인 백그라운드 쓰기가 끝난 뒤 읽음
+- 빈 페이지 회수는 auto_vacuum=INCREMENTAL + incremental_vacuum 단계 실행 (VACUUM 으로 큐를 멈추지 않음)
+"""
+
+import asyncio
+import itertools
+import logging
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Set
+
+# 우선순위 (작을수록 먼저 처리)
+PRIORITY_READ = 0
+PRIORITY_WRITE = 1
+PRIORITY_BACKGROUND_WRITE = 2
+_PRIORITY_SHUTDOWN = 3
+
+# incremental_vacuum 한 단계에서 회수할 페이지 수 (기본 4KB 페이지 → 약 1MB)
+VACUUM_STEP_PAGES = 256
+
+Operation = Callable[[sqlite3.Connection], Any]
+
+
+class SessionStore:
+    """세션 DB 전담 스레드 (모든 SQLite I/O의 단일 소유자)"""
+
+    def __init__(self, db_path: str, logger: Optional[logging.Logger] = None):
+        self.db_path = db_path
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._closed = False
+        self._ready = threading.Event()
+        # 키별 아직 끝나지 않은 백그라운드 쓰기 (완료 콜백은 저장소 스레드에서 호출되므로 잠금)
+        self._pending_lock = threading.Lock()
+        self._pending_writes: Dict[str, Set[Future]] = {}
+
+        self.stats = {
+            "reads": 0,
+            "writes": 0,
+            "background_writes": 0,
+            "failed_operations": 0
+        }
+
+        self._thread = threading.Thread(target=self._run, name="boosaan-session-store", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def _run(self):
+        """작업 큐 처리 루프 (전담 스레드)"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            # 새 DB 에만 적용됨 (기존 DB 는 enable_incremental_vacuum 으로 한 번 전환)
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.DatabaseError as e:
+            self.logger.warning(f"세션 DB PRAGMA 설정 실패: {e}")
+        self._ready.set()
+
+        while True:
+            priority, _, operation, future = self._queue.get()
+            if operation is None:
+                break
+
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                result = operation(conn)
+                if priority != PRIORITY_READ:
+                    conn.commit()
+            except Exception as e:
+                conn.rollback()
+                self.stats["failed_operations"] += 1
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+        conn.close()
+
+    def submit(self, operation: Operation, priority: int = PRIORITY_READ) -> Future:
+        """작업 제출 (concurrent.futures.Future 반환)"""
+        if self._closed:
+            raise RuntimeError("세션 저장소가 이미 종료되었습니다")
+
+        if priority == PRIORITY_READ:
+            self.stats["reads"] += 1
+        elif priority == PRIORITY_WRITE:
+            self.stats["writes"] += 1
+        else:
+            self.stats["background_writes"] += 1
+
+        future: Future = Future()
+        self._queue.put((priority, next(self._sequence), operation, future))
+        return future
+
+    async def read(self, operation: Operation, after: Optional[str] = None) -> Any:
+        """읽기 작업 (최우선 처리, after 키를 주면 그 키의 대기 중인 백그라운드 쓰기 이후)"""
+        if after is not None:
+            await self.flush(after)
+        return await asyncio.wrap_future(self.submit(operation, PRIORITY_READ))
+
+    async def flush(self, key: str):
+        """key 로 제출된 백그라운드 쓰기가 모두 끝날 때까지 대기 (실패는 write_background 가 로그)"""
+        with self._pending_lock:
+            pending = list(self._pending_writes.get(key, ()))
+        if pending:
+            await asyncio.wait([asyncio.wrap_future(future) for future in pending])
+
+    async def write(self, operation: Operation) -> Any:
+        """쓰기 작업 (완료까지 대기)"""
+        return await asyncio.wrap_future(self.submit(operation, PRIORITY_WRITE))
+
+    def write_background(self, operation: Operation, description: str = "백그라운드 쓰기",
+                         key: Optional[str] = None) -> Future:
+        """백그라운드 쓰기 (결과를 기다리지 않음, 실패는 로그로만 남김, key 로 flush 대상 지정)"""
+        future = self.submit(operation, PRIORITY_BACKGROUND_WRITE)
+        if key is not None:
+            with self._pending_lock:
+                self._pending_writes.setdefault(key, set()).add(future)
+
+        def _on_done(done: Future):
+            if key is not None:
+                with self._pending_lock:
+                    pending = self._pending_writes.get(key)
+                    if pending is not None:
+                        pending.discard(done)
+                        if not pending:
+                            del self._pending_writes[key]
+            if not done.cancelled() and done.exception() is not None:
+                self.logger.error(f"{description} 실패: {done.exception()}")
+
+        future.add_done_callback(_on_done)
+        return future
+
+    def call(self, operation: Operation, write: bool = False) -> Any:
+        """동기 호출 (이벤트 루프 밖의 초기화 경로 전용)"""
+        priority = PRIORITY_WRITE if write else PRIORITY_READ
+        return self.submit(operation, priority).result()
+
+    def enable_incremental_vacuum(self) -> bool:
+        """기존 DB 를 auto_vacuum=INCREMENTAL 로 전환 → 전환했으면 True
+
+        전환에는 VACUUM 이 한 번 필요하므로 액터 큐가 아닌 별도 연결에서 실행
+        (WAL 이라 읽기는 계속되고, 그동안의 쓰기는 연결 timeout 만큼 대기). 호출 스레드를 블록함.
+        """
+        conn = sqlite3.connect(self.db_path, timeout=60.0)
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                return False
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+            return True
+        finally:
+            conn.close()
+
+    def pending_operations(self) -> int:
+        """대기 중인 작업 수"""
+        return self._queue.qsize()
+
+    def close(self, timeout: float = 5.0):
+        """남은 작업을 모두 처리한 뒤 스레드 종료"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put((_PRIORITY_SHUTDOWN, next(self._sequence), None, None))
+        self._thread.join(timeout)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 도구 결과 객체
+- 도구 핸들러는 구조화 데이터(dict)만 만든다
+- 사람이 읽는 텍스트는 클라이언트가 요청할 때만 지연 렌더링
+- 직렬화는 응답 전송 시 한 번만 수행
+"""
+
+from typing import Dict, Any, Callable, Optional
+
+# 지원하는 응답 형식
+#   text: 기존과 동일한 포맷 텍스트만 반환
+#   json: 구조화 데이터(structuredContent)만 반환 (텍스트 렌더링 생략)
+#   both: 두 가지 모두 반환
+RESPONSE_FORMATS = ("text", "json", "both")
+DEFAULT_RESPONSE_FORMAT = "text"
+
+
+class ToolResult:
+    """구조화 도구 결과 (텍스트는 지연 렌더링)"""
+
+    __slots__ = ("tool_name", "data", "meta", "_renderer", "_text")
+
+    def __init__(self, tool_name: str, data: Dict[str, Any],
+                 renderer: Callable[[Dict[str, Any]], str]):
+        self.tool_name = tool_name
+        self.data = data
+        self.meta: Dict[str, Any] = {}
+        self._renderer = renderer
+        self._text: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        """포맷 텍스트 (최초 접근 시 한 번만 렌더링)"""
+        if self._text is None:
+            self._text = self._renderer(self.data)
+        return self._text
+
+    def to_response(self, response_format: str = DEFAULT_RESPONSE_FORMAT) -> Dict[str, Any]:
+        """MCP tools/call 응답으로 변환"""
+        if response_format not in RESPONSE_FORMATS:
+            response_format = DEFAULT_RESPONSE_FORMAT
+
+        response: Dict[str, Any] = {"content": []}
+
+        if response_format in ("text", "both"):
+            response["content"].append({
+                "type": "text",
+                "text": self.text
+            })
+
+        if response_format in ("json", "both"):
+            response["structuredContent"] = self.data
+
+        return response
+
+
+def resolve_response_format(requested: Optional[str], default: str = DEFAULT_RESPONSE_FORMAT) -> str:
+    """요청된 응답 형식 결정 (알 수 없는 값은 기본값으로)"""
+    if requested in RESPONSE_FORMATS:
+        return requested
+    return default if default in RESPONSE_FORMATS else DEFAULT_RESPONSE_FORMAT
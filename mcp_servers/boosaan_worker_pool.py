@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 워커 프로세스 풀 (선택 기능)
+- stdio 프런트엔드(메인 프로세스)는 전송/세션 기록만 담당
+- CPU 집약 도구는 도구 분류별 워커 프로세스에서 실행 (GIL 우회)
+- 워커가 죽으면 풀을 재생성하고 한 번 재시도 (클라이언트 연결은 유지)
+- 호출자가 취소(지연 시간 예산 만료 등)해도 이미 워커에서 실행 중인 호출은 멈출 수 없음
+  → 분산 가능한 분류는 모든 워커가 버려진 호출에 묶이면 풀을 새로 만들고, 기존 프로세스는
+  현재 호출을 마친 뒤 종료 (분류당 정리 중인 풀은 하나뿐 → 추가 프로세스는 최대 워커 수만큼)
+
+활성화: BOOSAAN_WORKER_PROCESSES=<사고 도구 워커 수> (0 또는 미설정이면 비활성)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Set, Tuple
+
+# 도구 분류 → 담당 도구
+#   thinking: 요청 단위 계산이라 여러 워커로 분산 가능
+#   rules: 규칙 상태를 변경하므로 단일 워커가 소유 (쓰기 직렬화)
+TOOL_CLASSES = {
+    "thinking": ("sequential_thinking", "thinking_advancement"),
+    "rules": ("analyze_user_intention", "check_rule_contamination", "add_rule_with_isolation",
+              "get_effective_rules"),
+}
+
+_SINGLE_OWNER_CLASSES = ("rules",)
+
+# === 워커 프로세스 측 ===
+_worker_server = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _init_worker(workspace: str, tool_class: str):
+    """워커 프로세스 초기화 (그 분류의 도구가 쓰는 서브시스템만 생성, 전송/세션 DB 없음)"""
+    global _worker_server, _worker_loop
+    from boosaan_mcp_server import BOOSAANUltimateMCPServer
+
+    _worker_server = BOOSAANUltimateMCPServer.create_worker(workspace, tool_class)
+    _worker_loop = asyncio.new_event_loop()
+
+
+def _run_tool(tool_name: str, arguments: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """워커에서 도구 실행 → (data, meta) 반환 (렌더러는 프런트엔드에서 연결)"""
+    result = _worker_loop.run_until_complete(_worker_server._dispatch_tool(tool_name, arguments))
+    if hasattr(result, "data"):
+        return result.data, result.meta
+    return result, {}
+
+
+# === 프런트엔드 측 ===
+class WorkerPool:
+    """도구 분류별 프로세스 풀 라우터"""
+
+    def __init__(self, workspace: str, processes: int, logger: Optional[logging.Logger] = None):
+        self.workspace = workspace
+        self.processes = max(1, processes)
+        self.logger = logger or logging.getLogger(__name__)
+
+        # 세션 저장소 스레드가 있는 프로세스를 fork하지 않도록 spawn 사용
+        self._context = multiprocessing.get_context("spawn")
+        self._pools: Dict[str, ProcessPoolExecutor] = {}
+        self._routes = {tool: tool_class for tool_class, tools in TOOL_CLASSES.items() for tool in tools}
+        # 분류별 취소됐지만 아직 실행 중인 호출 / 교체되어 그 호출들을 마무리 중인 이전 풀의 호출
+        self._abandoned: Dict[str, Set[Future]] = {}
+        self._retired: Dict[str, Set[Future]] = {}
+
+        self.stats = {"dispatched": 0, "restarts": 0, "failures": 0, "abandoned": 0, "retired_pools": 0}
+
+    @classmethod
+    def from_env(cls, workspace: str, logger: Optional[logging.Logger] = None) -> Optional["WorkerPool"]:
+        """환경 변수로 활성화된 경우에만 생성"""
+        try:
+            processes = int(os.getenv("BOOSAAN_WORKER_PROCESSES", "0"))
+        except ValueError:
+            processes = 0
+        if processes <= 0:
+            return None
+        return cls(workspace, processes, logger)
+
+    def handles(self, tool_name: str) -> bool:
+        return tool_name in self._routes
+
+    def _workers_for(self, tool_class: str) -> int:
+        return 1 if tool_class in _SINGLE_OWNER_CLASSES else self.processes
+
+    def _pool_for(self, tool_class: str) -> ProcessPoolExecutor:
+        pool = self._pools.get(tool_class)
+        if pool is None:
+            workers = self._workers_for(tool_class)
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=self._context,
+                initializer=_init_worker,
+                initargs=(self.workspace, tool_class)
+            )
+            self._pools[tool_class] = pool
+            self.logger.info(f"워커 풀 시작: {tool_class} ({workers}개 프로세스)")
+        return pool
+
+    def _restart(self, tool_class: str):
+        """죽은 풀 폐기 후 다음 요청에서 재생성"""
+        pool = self._pools.pop(tool_class, None)
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self.stats["restarts"] += 1
+        self.logger.warning(f"워커 풀 재시작: {tool_class}")
+
+    def _abandon(self, tool_class: str, pool: ProcessPoolExecutor, future: Future):
+        """호출자가 취소했지만 워커에서 이미 실행 중인 호출 기록 (결과는 버려짐)"""
+        self.stats["abandoned"] += 1
+        abandoned = self._abandoned.setdefault(tool_class, set())
+        abandoned.add(future)
+        future.add_done_callback(abandoned.discard)
+
+        # 단일 소유 분류는 워커가 상태를 가지므로 교체하지 않음 (쓰기 소유자가 둘이 되면 안 됨)
+        if tool_class in _SINGLE_OWNER_CLASSES or self._pools.get(tool_class) is not pool:
+            return
+        if len(abandoned) >= self._workers_for(tool_class) and not self._retired.get(tool_class):
+            self._pools.pop(tool_class)
+            pool.shutdown(wait=False, cancel_futures=True)
+            self._retired[tool_class] = self._abandoned.pop(tool_class)
+            self.stats["retired_pools"] += 1
+            self.logger.warning(f"워커 풀 교체: {tool_class} (모든 워커가 취소된 호출 실행 중)")
+
+    async def run(self, tool_name: str, arguments: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """도구를 담당 워커에서 실행 (워커 크래시 시 한 번 재시도)"""
+        tool_class = self._routes[tool_name]
+        self.stats["dispatched"] += 1
+
+        for attempt in range(2):
+            pool = self._pool_for(tool_class)
+            future = pool.submit(_run_tool, tool_name, arguments)
+            try:
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                # 대기 중이던 호출은 wrap_future 가 취소함, 이미 실행 중이면 끝날 때까지 워커를 점유
+                if not future.done():
+                    self._abandon(tool_class, pool, future)
+                raise
+            except BrokenProcessPool:
+                self._restart(tool_class)
+                if attempt == 1:
+                    self.stats["failures"] += 1
+                    raise RuntimeError(f"워커 프로세스 비정상 종료: {tool_name}")
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "processes": self.processes,
+            "active_classes": sorted(self._pools),
+            "abandoned_running": sum(len(futures) for futures in self._abandoned.values())
+                                 + sum(len(futures) for futures in self._retired.values()),
+            **self.stats
+        }
+
+    def close(self):
+        for pool in self._pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+        self._pools.clear()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+BOOSAAN 샌드박스 작업 공간 복제
+- 큰 프로젝트 트리를 샌드박스 전용 작업 공간으로 빠르게 복제
+- 전략 (auto 순서): reflink(FICLONE / APFS clonefile) → overlay 마운트(권한 있을 때) → 전체 복사
+- hardlink: 하드링크 팜 + 명시적 copy-on-first-write (ensure_private)
+  하드링크는 원본과 inode 를 공유하므로 제자리 쓰기가 원본에 반영됨 → 쓰기 경로를 모두 ensure_private 로
+  분리할 수 있는 호출자 전용 (임의 명령을 실행하는 샌드박스에는 ISOLATED_STRATEGIES 만 노출)
+- 전략별 벤치마크: python boosaan_workspace_provisioner.py [파일 수]
+"""
+
+import errno
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from boosaan_output_capture import safe_path_component
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+STRATEGIES = ("reflink", "hardlink", "overlay", "copy")
+# 작업 공간 쓰기가 원본에 반영되지 않는 전략
+ISOLATED_STRATEGIES = ("reflink", "overlay", "copy")
+AUTO_ORDER = ("reflink", "overlay", "copy")
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+_UNSUPPORTED_ERRNOS = {errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.EPERM}
+
+
+class StrategyUnavailable(OSError):
+    """현재 파일시스템/권한으로는 사용할 수 없는 전략"""
+
+
+@dataclass
+class ProvisionedWorkspace:
+    sandbox_id: str
+    source: str
+    path: str
+    strategy: str
+    files: int
+    seconds: float
+    private_paths: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "path": self.path,
+            "strategy": self.strategy,
+            "files": self.files,
+            "seconds": self.seconds
+        }
+
+
+def _clone_tree(source: Path, target: Path, clone_file: Callable[[str, str, os.stat_result], None]) -> int:
+    """디렉터리 구조/심볼릭 링크는 그대로 만들고 일반 파일만 clone_file 로 복제 → 파일 수"""
+    count = 0
+    stack = [(str(source), str(target))]
+    os.makedirs(target, exist_ok=True)
+
+    while stack:
+        src_dir, dst_dir = stack.pop()
+        with os.scandir(src_dir) as entries:
+            for entry in entries:
+                dst_path = os.path.join(dst_dir, entry.name)
+                if entry.is_symlink():
+                    os.symlink(os.readlink(entry.path), dst_path)
+                elif entry.is_dir(follow_symlinks=False):
+                    os.mkdir(dst_path)
+                    stack.append((entry.path, dst_path))
+                elif entry.is_file(follow_symlinks=False):
+                    clone_file(entry.path, dst_path, entry.stat(follow_symlinks=False))
+                    count += 1
+    return count
+
+
+def _reflink_file(src: str, dst: str, st: os.stat_result):
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, st.st_mode & 0o7777)
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        except OSError as e:
+            os.close(dst_fd)
+            dst_fd = -1
+            os.unlink(dst)
+            if e.errno in _UNSUPPORTED_ERRNOS:
+                raise StrategyUnavailable(e.errno, f"reflink 미지원: {e.strerror}")
+            raise
+        finally:
+            if dst_fd >= 0:
+                os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
+def _hardlink_file(src: str, dst: str, st: os.stat_result):
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        if e.errno in _UNSUPPORTED_ERRNOS:
+            raise StrategyUnavailable(e.errno, f"하드링크 불가: {e.strerror}")
+        raise
+
+
+class WorkspaceProvisioner:
+    """샌드박스별 작업 공간 복제 관리"""
+
+    def __init__(self, base_dir: str, logger: Optional[logging.Logger] = None):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.logger = logger or logging.getLogger(__name__)
+        self._workspaces: Dict[str, ProvisionedWorkspace] = {}
+
+    def provision(self, sandbox_id: str, source: str, strategy: str = "auto",
+                  target: Optional[Path] = None) -> ProvisionedWorkspace:
+        """프로젝트 트리 복제 (auto: 가능한 가장 저렴한 전략부터 시도)"""
+        source_path = Path(source).resolve()
+        if not source_path.is_dir():
+            raise NotADirectoryError(f"프로젝트 경로가 디렉터리가 아님: {source}")
+
+        if target is None:
+            target = self.base_dir / safe_path_component(sandbox_id)
+        if target.exists():
+            raise FileExistsError(f"작업 공간이 이미 존재함: {target}")
+
+        candidates = AUTO_ORDER if strategy == "auto" else (strategy,)
+        last_error: Optional[Exception] = None
+
+        for candidate in candidates:
+            if candidate not in STRATEGIES:
+                raise ValueError(f"알 수 없는 복제 전략: {candidate}")
+            start = time.perf_counter()
+            try:
+                files = getattr(self, f"_provision_{candidate}")(source_path, target)
+            except BaseException as e:
+                # 어떤 실패든 부분 복제본을 남기지 않음 (다음 전략/재시도가 FileExistsError 로 막히지 않게)
+                self._remove(target)
+                if not isinstance(e, StrategyUnavailable):
+                    raise
+                last_error = e
+                self.logger.info(f"작업 공간 복제 전략 사용 불가: {candidate} ({e})")
+                continue
+
+            workspace = ProvisionedWorkspace(
+                sandbox_id=sandbox_id,
+                source=str(source_path),
+                path=str(target / "merged") if candidate == "overlay" else str(target),
+                strategy=candidate,
+                files=files,
+                seconds=time.perf_counter() - start
+            )
+            self._workspaces[sandbox_id] = workspace
+            return workspace
+
+        raise StrategyUnavailable(errno.EOPNOTSUPP, f"사용 가능한 복제 전략 없음: {last_error}")
+
+    def get(self, sandbox_id: str) -> Optional[ProvisionedWorkspace]:
+        return self._workspaces.get(sandbox_id)
+
+    def ensure_private(self, sandbox_id: str, relative_path: str) -> str:
+        """hardlink 작업 공간에서 쓰기 전에 파일을 독립 사본으로 분리 (copy-on-first-write)"""
+        workspace = self._workspaces[sandbox_id]
+        path = Path(workspace.path) / relative_path
+        if not path.resolve().is_relative_to(Path(workspace.path).resolve()):
+            raise PermissionError(f"작업 공간 밖 경로: {relative_path}")
+
+        if workspace.strategy == "hardlink" and path.is_file() and not path.is_symlink():
+            if path.stat().st_nlink > 1:
+                fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=".cow_")
+                os.close(fd)
+                shutil.copy2(path, tmp)
+                os.replace(tmp, path)
+                workspace.private_paths.append(relative_path)
+        return str(path)
+
+    def release(self, sandbox_id: str):
+        """작업 공간 삭제 (overlay 는 먼저 언마운트)"""
+        workspace = self._workspaces.pop(sandbox_id, None)
+        if workspace is None:
+            return
+        root = Path(workspace.path).parent if workspace.strategy == "overlay" else Path(workspace.path)
+        if workspace.strategy == "overlay":
+            subprocess.run(["umount", workspace.path], capture_output=True)
+        self._remove(root)
+
+    def close(self):
+        for sandbox_id in list(self._workspaces):
+            self.release(sandbox_id)
+
+    # === 전략 구현 ===
+    def _provision_reflink(self, source: Path, target: Path) -> int:
+        if sys.platform == "darwin":
+            # APFS clonefile: cp -c 가 디렉터리 전체를 한 번에 복제
+            result = subprocess.run(["cp", "-cR", str(source), str(target)], capture_output=True, text=True)
+            if result.returncode != 0:
+                raise StrategyUnavailable(errno.EOPNOTSUPP, result.stderr.strip() or "clonefile 실패")
+            return sum(len(files) for _, _, files in os.walk(target))
+
+        if fcntl is None or not sys.platform.startswith("linux"):
+            raise StrategyUnavailable(errno.EOPNOTSUPP, "reflink 는 Linux/macOS 에서만 지원")
+        return _clone_tree(source, target, _reflink_file)
+
+    def _provision_hardlink(self, source: Path, target: Path) -> int:
+        return _clone_tree(source, target, _hardlink_file)
+
+    def _provision_overlay(self, source: Path, target: Path) -> int:
+        if not sys.platform.startswith("linux") or os.geteuid() != 0:
+            raise StrategyUnavailable(errno.EPERM, "overlay 마운트 권한 없음")
+
+        for name in ("upper", "work", "merged"):
+            (target / name).mkdir(parents=True)
+        options = f"lowerdir={source},upperdir={target / 'upper'},workdir={target / 'work'}"
+        result = subprocess.run(
+            ["mount", "-t", "overlay", "overlay", "-o", options, str(target / "merged")],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise StrategyUnavailable(errno.EPERM, result.stderr.strip() or "overlay 마운트 실패")
+        # 마운트는 파일을 복제하지 않으므로 0
+        return 0
+
+    def _provision_copy(self, source: Path, target: Path) -> int:
+        return _clone_tree(source, target, lambda src, dst, st: shutil.copy2(src, dst))
+
+    @staticmethod
+    def _remove(path: Path):
+        if path.exists() or path.is_symlink():
+            shutil.rmtree(path, ignore_errors=True)
+
+
+# === 벤치마크 ===
+def generate_tree(root: Path, file_count: int, files_per_dir: int = 100, file_size: int = 512) -> Path:
+    """벤치마크용 트리 생성 (디렉터리당 files_per_dir 개, 2단계 중첩)"""
+    payload = os.urandom(file_size)
+    for index in range(file_count):
+        directory = root / f"pkg_{index // (files_per_dir * 100):03d}" / f"mod_{(index // files_per_dir) % 100:03d}"
+        if index % files_per_dir == 0:
+            directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"file_{index:07d}.py").write_bytes(payload)
+    return root
+
+
+def benchmark_strategies(file_count: int = 100_000, base_dir: Optional[str] = None) -> Dict[str, Dict[str, object]]:
+    """전략별 복제 시간 측정 (사용 불가 전략은 사유 기록)"""
+    results: Dict[str, Dict[str, object]] = {}
+    with tempfile.TemporaryDirectory(dir=base_dir, prefix="boosaan_provision_bench_") as tmp:
+        tmp_path = Path(tmp)
+        start = time.perf_counter()
+        source = generate_tree(tmp_path / "source", file_count)
+        results["generate"] = {"files": file_count, "seconds": time.perf_counter() - start}
+
+        provisioner = WorkspaceProvisioner(str(tmp_path / "workspaces"))
+        for strategy in STRATEGIES:
+            try:
+                workspace = provisioner.provision(f"bench_{strategy}", str(source), strategy)
+                results[strategy] = workspace.to_dict()
+            except OSError as e:
+                results[strategy] = {"unavailable": str(e)}
+            finally:
+                provisioner.release(f"bench_{strategy}")
+    return results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"📦 작업 공간 복제 벤치마크 ({count:,}개 파일)")
+    for name, result in benchmark_strategies(count).items():
+        if "unavailable" in result:
+            print(f"  • {name:9s}: 사용 불가 ({result['unavailable']})")
+        else:
+            print(f"  • {name:9s}: {result['seconds']:.2f}초 ({result['files']:,}개 파일)")
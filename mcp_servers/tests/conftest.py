@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# mcp_servers 의 모듈은 패키지가 아니라 평면 모듈 (서버가 같은 디렉터리에서 import)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,73 @@
+import pytest
+
+from boosaan_context_index import ContextIndex, np, tokenize
+
+SCORING = [False] + ([True] if np is not None else [])
+
+
+@pytest.fixture(params=SCORING, ids=lambda vectorized: "numpy" if vectorized else "python")
+def index(request, tmp_path):
+    index = ContextIndex(str(tmp_path / "index.db"), vectorized=request.param)
+    index.upsert("g1", "GLOBAL", "python asyncio event loop")
+    index.upsert("g2", "GLOBAL", "sqlite write ahead log")
+    index.upsert("p1", "PROJECT", "python packaging and wheels")
+    yield index
+    index.close()
+
+
+def test_tokenize_adds_hangul_bigrams():
+    assert tokenize("Hello 맥락관리") == ["hello", "맥락관리", "맥락", "락관", "관리"]
+
+
+def test_search_ranks_matching_nodes(index):
+    total, top = index.search("python", k=5)
+    assert total == 2
+    assert {context_id for context_id, _ in top} == {"g1", "p1"}
+    assert all(0 < score <= 1 for _, score in top)
+
+
+def test_level_filter_only_reads_that_level(index):
+    total, top = index.search("python", level="PROJECT")
+    assert total == 1 and top[0][0] == "p1"
+
+
+def test_threshold_and_k(index):
+    assert index.search("python loop", k=1)[1][0][0] == "g1"
+    assert index.search("python", threshold=1.01) == (0, [])
+    assert index.search("unknownword") == (0, [])
+
+
+def test_upsert_replaces_postings(index):
+    index.upsert("g1", "GLOBAL", "rust tokio runtime")
+    assert index.search("asyncio") == (0, [])
+    assert index.search("tokio")[1][0][0] == "g1"
+    assert index.find_content("GLOBAL", "rust tokio runtime") == "g1"
+    assert index.find_content("GLOBAL", "python asyncio event loop") is None
+
+
+def test_remove_frees_row_for_reuse(index):
+    index.remove("g2")
+    assert index.get("g2") is None and len(index) == 2
+    index.upsert("g3", "GLOBAL", "sqlite vacuum")
+    assert index.search("sqlite")[1][0][0] == "g3"
+
+
+def test_search_counts_access_for_returned_nodes(index):
+    index.search("python", level="PROJECT")
+    assert index.get("p1")["access_count"] == 1
+    assert index.get("g1")["access_count"] == 0
+
+
+def test_persisted_nodes_reload(tmp_path):
+    path = str(tmp_path / "index.db")
+    index = ContextIndex(path)
+    index.upsert("a", "SESSION", "맥락 검색 색인")
+    index.close()
+
+    reloaded = ContextIndex(path)
+    try:
+        assert reloaded.ids() == ["a"]
+        assert reloaded.search("검색")[1][0][0] == "a"
+        assert reloaded.levels() == ["SESSION"]
+    finally:
+        reloaded.close()
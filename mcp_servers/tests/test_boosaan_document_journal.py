@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from boosaan_document_journal import DocumentJournal
+
+
+def _instruction(number):
+    return {"instruction_id": f"inst_{number}", "content": f"instruction {number}"}
+
+
+@pytest.fixture
+def journal_dir(tmp_path):
+    return tmp_path / "journal"
+
+
+def _open(journal_dir):
+    return DocumentJournal(str(journal_dir), fsync=False)
+
+
+def test_append_survives_restart(journal_dir):
+    journal = _open(journal_dir)
+    journal.append("user_instructions", _instruction(1))
+    journal.close()
+
+    reopened = _open(journal_dir)
+    try:
+        assert reopened.pending("user_instructions") == [_instruction(1)]
+        assert reopened.has_pending()
+    finally:
+        reopened.close()
+
+
+def test_flush_applies_each_document_once(journal_dir):
+    journal = _open(journal_dir)
+    applied = []
+    try:
+        journal.append("user_instructions", _instruction(1))
+        journal.append("user_instructions", _instruction(2))
+        results = journal.flush(lambda document_type, record: applied.append(record) or "m_" + record["instruction_id"])
+        assert results["user_instructions"] == [("inst_1", "m_inst_1"), ("inst_2", "m_inst_2")]
+        assert not journal.has_pending()
+        assert journal.flush(lambda *_: pytest.fail("nothing left to apply")) == {
+            "user_instructions": [], "feature_specs": []
+        }
+    finally:
+        journal.close()
+    assert len(applied) == 2
+
+
+def test_interrupted_flush_resumes_without_reapplying(journal_dir):
+    journal = _open(journal_dir)
+    applied = []
+
+    def fail_on_second(document_type, record):
+        if record["instruction_id"] == "inst_2":
+            raise RuntimeError("manager write failed")
+        applied.append(record["instruction_id"])
+        return record["instruction_id"]
+
+    journal.append("user_instructions", _instruction(1))
+    journal.append("user_instructions", _instruction(2))
+    with pytest.raises(RuntimeError):
+        journal.flush(fail_on_second)
+    journal.append("user_instructions", _instruction(3))
+    journal.close()
+
+    reopened = _open(journal_dir)
+    try:
+        assert [record["instruction_id"] for record in reopened.pending("user_instructions")] == ["inst_2", "inst_3"]
+        reopened.flush(lambda document_type, record: applied.append(record["instruction_id"]) or "ok")
+    finally:
+        reopened.close()
+    assert applied == ["inst_1", "inst_2", "inst_3"]
+
+
+def test_truncated_last_line_is_dropped(journal_dir):
+    journal = _open(journal_dir)
+    journal.append("user_instructions", _instruction(1))
+    journal.close()
+    with open(journal_dir / "user_instructions.jsonl", "ab") as f:
+        f.write(b'{"instruction_id": "inst_2", "cont')
+
+    reopened = _open(journal_dir)
+    try:
+        assert reopened.pending("user_instructions") == [_instruction(1)]
+        assert reopened.stats["recovered_partial_lines"] == 1
+        reopened.append("user_instructions", _instruction(3))
+    finally:
+        reopened.close()
+    lines = (journal_dir / "user_instructions.jsonl").read_text().splitlines()
+    assert [json.loads(line)["instruction_id"] for line in lines] == ["inst_1", "inst_3"]
+
+
+def test_migrate_legacy_skips_documents_the_manager_has(journal_dir):
+    journal_dir.mkdir()
+    (journal_dir / "user_instructions.json").write_text(json.dumps([_instruction(1), _instruction(2)]))
+    journal = _open(journal_dir)
+    try:
+        assert journal.migrate_legacy({"user_instructions": {"inst_1"}}) == 1
+        assert journal.pending("user_instructions") == [_instruction(2)]
+        assert not (journal_dir / "user_instructions.json").exists()
+    finally:
+        journal.close()
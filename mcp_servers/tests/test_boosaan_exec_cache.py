@@ -0,0 +1,86 @@
+import os
+import time
+
+import pytest
+
+from boosaan_exec_cache import ExecutionCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ExecutionCache(str(tmp_path / "cache"))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "work"
+    (root / "src").mkdir(parents=True)
+    (root / "src" / "a.py").write_text("print(1)\n")
+    (root / "src" / "b.py").write_text("print(2)\n")
+    return root
+
+
+def _key(cache, tree, inputs=("src",), command="pytest", env=None):
+    return cache.make_key(command, env or {}, "STANDARD", str(tree), list(inputs))
+
+
+def test_key_follows_declared_input_contents(cache, tree):
+    first = _key(cache, tree)
+    assert _key(cache, tree) == first
+    (tree / "src" / "b.py").write_text("print(3)\n")
+    assert _key(cache, tree) != first
+
+
+def test_key_includes_command_and_env(cache, tree):
+    base = _key(cache, tree)
+    assert _key(cache, tree, command="pytest -x") != base
+    assert _key(cache, tree, env={"DEBUG": "1"}) != base
+
+
+def test_refuses_without_declared_inputs(cache, tree):
+    with pytest.raises(ValueError):
+        _key(cache, tree, inputs=())
+
+
+def test_rejects_inputs_outside_the_sandbox(cache, tree):
+    with pytest.raises(ValueError):
+        _key(cache, tree, inputs=("../outside",))
+    with pytest.raises(FileNotFoundError):
+        _key(cache, tree, inputs=("missing.py",))
+
+
+def test_file_hash_reused_when_stat_unchanged(cache, tree):
+    old = time.time() - 60
+    for path in (tree / "src").iterdir():
+        os.utime(path, (old, old))
+    _key(cache, tree)
+    hashed = cache.file_index.stats["hashed"]
+    _key(cache, tree)
+    assert cache.file_index.stats["hashed"] == hashed
+    assert cache.file_index.stats["reused"] == 2
+
+
+def test_put_get_round_trip(cache):
+    assert cache.get("k") is None
+    cache.put("k", "pytest", {"return_code": 0, "stdout": "ok", "stderr": "",
+                              "output": {"stdout": {"total_bytes": 2, "truncated": False, "spill_path": "/x"}}})
+    result = cache.get("k")
+    assert result["stdout"] == "ok" and result["return_code"] == 0
+    assert "spill_path" not in result["output"]["stdout"]
+    assert cache.metrics()["hits"] == 1 and cache.metrics()["misses"] == 1
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ExecutionCache(str(tmp_path / "small"), max_bytes=400)
+    try:
+        for name in ("a", "b", "c"):
+            cache.put(name, "cmd", {"return_code": 0, "stdout": name * 100})
+            time.sleep(0.01)
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+        assert cache.metrics()["bytes"] <= 400
+        assert cache.stats["evictions"] >= 1
+    finally:
+        cache.close()
@@ -0,0 +1,95 @@
+import math
+
+import pytest
+
+from boosaan_forgetting_queue import ForgettingQueue
+
+HOUR = 3600.0
+
+
+class FakeIndex:
+    """ForgettingQueue 가 쓰는 색인 인터페이스만 구현 (level, touched, access)"""
+
+    def __init__(self):
+        self.nodes = {}
+
+    def add(self, context_id, level="즉시", touched=0.0, access=0):
+        self.nodes[context_id] = [level, touched, access]
+
+    def retention(self, context_id):
+        node = self.nodes.get(context_id)
+        return tuple(node) if node else None
+
+    def ids(self):
+        return list(self.nodes)
+
+    def remove(self, context_id):
+        self.nodes.pop(context_id, None)
+
+
+@pytest.fixture
+def index():
+    index = FakeIndex()
+    index.add("short", "즉시")
+    index.add("long", "전역")
+    return index
+
+
+def test_expiry_is_when_score_reaches_threshold(index):
+    queue = ForgettingQueue(index)
+    expiry = queue._scheduled["short"]
+    assert expiry == pytest.approx(HOUR * math.log2(1 / queue.threshold))
+    assert queue.retention_score("short", now=expiry) == pytest.approx(queue.threshold)
+
+
+def test_cycle_only_evaluates_expired_nodes(index):
+    queue = ForgettingQueue(index)
+    stats = queue.run_cycle(now=10 * HOUR)
+    assert stats["evaluated_nodes"] == 1 and stats["forgotten_nodes"] == 1
+    assert index.ids() == ["long"]
+    assert stats["queued_nodes"] == 1
+
+
+def test_reused_node_is_rescheduled_not_forgotten(index):
+    queue = ForgettingQueue(index)
+    index.nodes["short"][1] = 9 * HOUR   # 만료 전에 다시 사용됨
+    stats = queue.run_cycle(now=10 * HOUR)
+    assert stats["preserved_nodes"] == 1 and "short" in index.ids()
+    assert queue._scheduled["short"] > 10 * HOUR
+
+
+def test_access_count_extends_retention(index):
+    index.add("popular", "즉시", access=50)
+    queue = ForgettingQueue(index)
+    assert queue._scheduled["popular"] > queue._scheduled["short"]
+
+
+def test_candidates_mode_leaves_index_and_defer_reschedules(index):
+    queue = ForgettingQueue(index)
+    stats = queue.run_cycle(now=10 * HOUR, evict=False)
+    assert stats["candidates"] == ["short"] and "short" in index.ids()
+    assert "short" not in queue._scheduled
+
+    queue.defer("short", now=10 * HOUR)
+    assert queue._scheduled["short"] == 11 * HOUR
+    assert queue.run_cycle(now=10.5 * HOUR, evict=False)["candidates"] == []
+
+
+def test_max_nodes_limits_one_cycle():
+    index = FakeIndex()
+    for number in range(5):
+        index.add(f"n{number}")
+    queue = ForgettingQueue(index)
+    assert queue.run_cycle(now=10 * HOUR, max_nodes=2)["evaluated_nodes"] == 2
+    assert queue.run_cycle(now=10 * HOUR)["evaluated_nodes"] == 3
+
+
+def test_stale_heap_entries_are_skipped(index):
+    queue = ForgettingQueue(index)
+    for _ in range(3):
+        queue.schedule("short")
+    queue.forget("long")
+    stats = queue.run_cycle(now=1000 * 86400)
+    assert stats["evaluated_nodes"] == 1
+    # 중복 등록된 short 3개 + 큐에서 제거된 long 1개
+    assert queue.metrics()["stale_entries"] == 4
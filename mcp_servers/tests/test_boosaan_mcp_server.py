@@ -0,0 +1,58 @@
+"""서버 초기화 — 핵심 서브시스템 모듈이 없는 환경에서는 건너뜀"""
+
+import pytest
+
+server_module = pytest.importorskip("boosaan_mcp_server")
+
+
+@pytest.fixture
+def make_server(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    servers = []
+
+    def make():
+        server = server_module.BOOSAANUltimateMCPServer()
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        server.shutdown()
+
+
+def test_failed_context_backfill_does_not_block_startup(make_server, monkeypatch):
+    def fail(self):
+        raise RuntimeError("manager scan failed")
+
+    monkeypatch.setattr(server_module.BOOSAANUltimateMCPServer, "_scan_context_nodes", fail)
+    server = make_server()
+    assert server.context_index_complete is False
+
+
+def test_partial_context_backfill_stays_incomplete(make_server, monkeypatch):
+    monkeypatch.setattr(server_module.BOOSAANUltimateMCPServer, "_scan_context_nodes",
+                        lambda self: [(None, "GLOBAL", "only node")])
+    monkeypatch.setattr(server_module.ContextHierarchyManager, "get_context_summary",
+                        lambda self: {"total_nodes": 3}, raising=False)
+    server = make_server()
+    assert server.context_index_complete is False
+    assert server.context_index.find_content("GLOBAL", "only node") is not None
+
+
+def test_reconcile_keeps_nodes_whose_content_differs(make_server):
+    server = make_server()
+    server.context_index.upsert("a", "GLOBAL", "alpha")
+    server.context_index.upsert("b", "GLOBAL", "beta")
+    removed = server._reconcile_context_index(["a", "b"], ([(None, "GLOBAL", "Alpha"), (None, "GLOBAL", "beta")], 2), [])
+    assert removed == 0
+    assert sorted(server.context_index.ids()) == ["a", "b"]
+
+
+def test_reconcile_refreshes_content_by_node_id(make_server):
+    server = make_server()
+    server.context_index.upsert("a", "GLOBAL", "alpha")
+    server.context_index.upsert("b", "GLOBAL", "beta")
+    removed = server._reconcile_context_index(["a", "b"], ([("a", "GLOBAL", "alpha v2")], 1), [])
+    assert removed == 1
+    assert server.context_index.ids() == ["a"]
+    assert server.context_index.get("a")["content"] == "alpha v2"
@@ -0,0 +1,58 @@
+import pytest
+
+from boosaan_output_capture import MAX_READ_BYTES, OutputCapture, RingBuffer, read_range, safe_path_component
+
+
+@pytest.mark.parametrize("chunks", [
+    [b"abc"],
+    [b"abcd", b"ef"],
+    [b"a", b"b", b"c", b"d", b"e", b"f", b"g"],
+    [b"0123456789"],
+    [b"xy", b"0123456789", b"z"],
+])
+def test_ring_buffer_keeps_last_capacity_bytes(chunks):
+    ring = RingBuffer(5)
+    for chunk in chunks:
+        ring.write(chunk)
+    assert ring.getvalue() == b"".join(chunks)[-5:]
+
+
+def test_small_output_is_kept_whole():
+    capture = OutputCapture(head_bytes=4, tail_bytes=8)
+    capture.write(b"hello ")
+    capture.write(b"world")
+    assert capture.preview() == "hello world"
+    assert capture.truncated is False
+    assert capture.total_bytes == 11
+
+
+def test_large_output_keeps_head_and_tail():
+    capture = OutputCapture(head_bytes=4, tail_bytes=4)
+    for index in range(100):
+        capture.write(f"{index:03d}\n".encode())
+    preview = capture.preview()
+    assert capture.truncated
+    assert preview.startswith("000\n")
+    assert preview.endswith("099\n")
+    assert "392 bytes 생략" in preview
+
+
+def test_spill_file_has_full_output_and_ranges(tmp_path):
+    spill = tmp_path / "stdout"
+    capture = OutputCapture(spill, head_bytes=2, tail_bytes=2)
+    capture.write(b"0123456789")
+    capture.close()
+    assert spill.read_bytes() == b"0123456789"
+    assert capture.to_dict()["spill_path"] == str(spill)
+
+    part = read_range(spill, offset=3, length=4)
+    assert part["text"] == "3456" and part["eof"] is False
+    tail = read_range(spill, offset=8, length=MAX_READ_BYTES * 2)
+    assert tail["text"] == "89" and tail["eof"] is True
+    assert read_range(spill, offset=100)["length"] == 0
+
+
+def test_safe_path_component():
+    assert safe_path_component("../../etc/passwd") == "_.._etc_passwd"
+    assert safe_path_component("...") == "_"
+    assert safe_path_component("sandbox-1.a") == "sandbox-1.a"
@@ -0,0 +1,76 @@
+import sqlite3
+
+import pytest
+
+from boosaan_pagination import (
+    InvalidCursorError, MAX_PAGE_SIZE, clamp_page_bytes, clamp_page_size, collect_page,
+    decode_cursor, encode_cursor, keyset_condition, query_scope
+)
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE rows (ts TEXT, id INTEGER, body TEXT)")
+    # 같은 ts 가 여러 행 → id 로 순서가 정해져야 함
+    conn.executemany("INSERT INTO rows VALUES (?, ?, ?)",
+                     [(f"2024-01-0{1 + i // 3}", i, "x" * 10) for i in range(9)])
+    yield conn
+    conn.close()
+
+
+def _page(conn, after, page_size, max_bytes=1 << 20):
+    sql = "SELECT ts, id, body FROM rows"
+    params = ()
+    if after:
+        sql += " WHERE " + keyset_condition("ts", "id")
+        params = (after[0], after[0], after[1])
+    sql += " ORDER BY ts DESC, id DESC"
+    return collect_page(conn.execute(sql, params), page_size, max_bytes, lambda row: {"id": row[1], "body": row[2]})
+
+
+def test_cursor_round_trip_and_scope_check():
+    scope = query_scope(tool="history", status=None)
+    cursor = encode_cursor("2024-01-01", 7, scope)
+    assert decode_cursor(cursor, scope) == ("2024-01-01", 7)
+    assert decode_cursor(None, scope) is None
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, query_scope(tool="other"))
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor", scope)
+
+
+def test_query_scope_ignores_filter_order():
+    assert query_scope(a=1, b="x") == query_scope(b="x", a=1)
+
+
+def test_clamps():
+    assert clamp_page_size(None, 20) == 20
+    assert clamp_page_size("bad", 20) == 20
+    assert clamp_page_size(0, 20) == 1
+    assert clamp_page_size(10_000, 20) == MAX_PAGE_SIZE
+    assert clamp_page_bytes(10) == 1024
+    assert clamp_page_bytes(10 ** 9) == clamp_page_bytes(None)
+
+
+def test_keyset_pages_cover_every_row_once(conn):
+    seen, after = [], None
+    while True:
+        page = _page(conn, after, page_size=4)
+        seen += [entry["id"] for entry in page["entries"]]
+        if not page["has_more"]:
+            break
+        after = page["last_key"]
+    assert seen == sorted(range(9), key=lambda i: (1 + i // 3, i), reverse=True)
+
+
+def test_byte_budget_truncates_but_keeps_one_row(conn):
+    page = _page(conn, None, page_size=9, max_bytes=1)
+    assert len(page["entries"]) == 1
+    assert page["truncated_by_bytes"] and page["has_more"]
+
+
+def test_last_page_reports_no_more(conn):
+    page = _page(conn, None, page_size=9)
+    assert len(page["entries"]) == 9
+    assert page["has_more"] is False
@@ -0,0 +1,90 @@
+import json
+import os
+
+import pytest
+
+from boosaan_port_table import PortTable
+
+
+class FakePortManager:
+    """상태 파일에 프로젝트 → 포트 블록을 저장하는 포트 관리자 대역"""
+
+    def __init__(self, state_file):
+        self.state_file = str(state_file)
+        self.projects = {}
+        self.calls = {"summary": 0, "project": 0}
+        self._save()
+
+    def _save(self):
+        with open(self.state_file, "w") as f:
+            json.dump(self.projects, f)
+
+    def reserve(self, project, start):
+        self.projects[project] = {"start": start, "end": start + 9}
+        self._save()
+
+    def get_port_status_summary(self):
+        self.calls["summary"] += 1
+        return {"reserved_projects": list(self.projects), "total": len(self.projects)}
+
+    def get_project_port_info(self, project):
+        self.calls["project"] += 1
+        return self.projects.get(project)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = FakePortManager(tmp_path / "ports.json")
+    manager.reserve("alpha", 3000)
+    return manager
+
+
+def test_from_env_finds_state_file_attribute(manager, monkeypatch):
+    monkeypatch.delenv("BOOSAAN_PORT_STATE_FILE", raising=False)
+    assert str(PortTable.from_env(manager).state_file) == manager.state_file
+
+
+def test_snapshot_is_cached_until_state_file_changes(manager):
+    table = PortTable(manager, manager.state_file)
+    assert table.get_project_port_info("alpha")["start"] == 3000
+    table.summary()
+    assert (table.stats["reads"], table.stats["hits"]) == (1, 1)
+
+    manager.reserve("beta", 3010)
+    stat = os.stat(manager.state_file)
+    os.utime(manager.state_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert table.get_project_port_info("beta")["start"] == 3010
+    assert table.stats["reads"] == 2 and table.revision == 2
+
+
+def test_invalidate_forces_reload(manager):
+    table = PortTable(manager, manager.state_file)
+    table.snapshot()
+    table.invalidate()
+    table.snapshot()
+    assert table.stats["reads"] == 2
+
+
+def test_update_project_reads_only_that_project(manager):
+    table = PortTable(manager, manager.state_file)
+    table.snapshot()
+    manager.reserve("beta", 3010)
+    project_calls = manager.calls["project"]
+
+    assert table.update_project("beta")["start"] == 3010
+    assert manager.calls["project"] == project_calls + 1
+    assert table.stats["reads"] == 1
+
+    # 요약은 다음 조회에서 한 번만 다시 읽음
+    summaries = manager.calls["summary"]
+    assert table.summary()["total"] == 2
+    assert manager.calls["summary"] == summaries + 1
+    table.summary()
+    assert manager.calls["summary"] == summaries + 1
+
+
+def test_without_state_file_uses_ttl(manager):
+    table = PortTable(manager, ttl=0)
+    table.snapshot()
+    table.snapshot()
+    assert table.stats["reads"] == 2
@@ -0,0 +1,85 @@
+import time
+
+from boosaan_rule_index import RuleIndex, TimerWheel
+
+
+def test_timer_wheel_expires_in_order():
+    wheel = TimerWheel(tick=1.0, size=8, now=100)
+    wheel.schedule("a", 102)
+    wheel.schedule("b", 105)
+    wheel.schedule("c", 103)
+    wheel.cancel("c")
+    assert wheel.advance(101) == []
+    assert wheel.advance(103) == ["a"]
+    assert wheel.advance(110) == ["b"]
+    assert len(wheel) == 0
+
+
+def test_timer_wheel_keeps_deadlines_beyond_one_turn():
+    wheel = TimerWheel(tick=1.0, size=8, now=0)
+    wheel.schedule("far", 20)   # 20 % 8 == 4 → 4, 12 에서는 만료되지 않아야 함
+    assert wheel.advance(4) == []
+    assert wheel.advance(12) == []
+    assert wheel.advance(25) == ["far"]
+
+
+def test_effective_rules_follow_scope_precedence():
+    index = RuleIndex()
+    index.add("g", "global style", "GLOBAL", rule_type="style")
+    index.add("p", "project style", "PROJECT", project="alpha", rule_type="style")
+    index.add("t", "temporary style", "TEMPORARY", project="alpha", rule_type="style")
+    index.add("other", "other project", "PROJECT", project="beta", rule_type="style")
+    rules = index.effective_rules("alpha")
+    assert [rule["rule_id"] for rule in rules["style"]] == ["t", "p", "g"]
+    assert [rule["rule_id"] for rule in index.effective_rules("beta")["style"]] == ["other", "g"]
+    assert "_sequence" not in rules["style"][0]
+
+
+def test_views_are_cached_and_invalidated_per_project():
+    index = RuleIndex()
+    index.add("p", "alpha rule", "PROJECT", project="alpha", rule_type="naming")
+    index.add("q", "beta rule", "PROJECT", project="beta", rule_type="naming")
+    index.effective_rules("alpha")
+    index.effective_rules("beta")
+    index.effective_rules("alpha")
+    assert index.stats["view_hits"] == 1
+
+    index.add("p2", "alpha rule 2", "PROJECT", project="alpha", rule_type="naming")
+    builds = index.stats["view_builds"]
+    index.effective_rules("beta")
+    assert index.stats["view_builds"] == builds
+    assert len(index.effective_rules("alpha")["naming"]) == 2
+    assert index.stats["view_builds"] == builds + 1
+
+
+def test_expiring_scopes_use_ttl_and_tombstone():
+    index = RuleIndex(ttls={"TEMPORARY": 10})
+    created = time.time()
+    assert index.add("t", "short lived", "TEMPORARY", created=created) == created + 10
+    assert index.add("forever", "imported", "TEMPORARY", ttl=0) is None
+    assert index.add("g", "global", "GLOBAL") is None
+
+    assert index.expire(created + 11) == ["t"]
+    assert "t" not in index and "forever" in index
+    assert index.is_tombstoned("t")
+
+    index.add("t", "re-added", "PROJECT", project="alpha")
+    assert not index.is_tombstoned("t")
+
+
+def test_persisted_expired_rules_are_dropped_on_load(tmp_path):
+    path = str(tmp_path / "rules.db")
+    index = RuleIndex(path, ttls={"SESSION": 5})
+    index.add("old", "expired session rule", "SESSION", created=time.time() - 60)
+    index.add("keep", "project rule", "PROJECT", project="alpha")
+    index.close()
+
+    reloaded = RuleIndex(path)
+    try:
+        assert reloaded.rule_ids() == ["keep"]
+        assert reloaded.tombstones() == ["old"]
+        reloaded.retain_tombstones([])
+        assert reloaded.tombstones() == []
+        assert not reloaded.is_new
+    finally:
+        reloaded.close()
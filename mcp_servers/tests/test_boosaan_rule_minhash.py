@@ -0,0 +1,72 @@
+import pytest
+
+from boosaan_rule_minhash import GLOBAL_SCOPE, MinHasher, RuleSimilarityIndex, jaccard, shingles
+
+GLOBAL_RULE = "always use four spaces for indentation in python files"
+NEAR_COPY = "always use four spaces for indentation in python source files"
+UNRELATED = "deploy to staging before tagging a release"
+
+
+@pytest.fixture
+def index():
+    index = RuleSimilarityIndex()
+    index.add("g1", GLOBAL_RULE, GLOBAL_SCOPE)
+    index.add("p1", NEAR_COPY, "PROJECT", project="alpha")
+    index.add("p2", UNRELATED, "PROJECT", project="alpha")
+    index.add("q1", NEAR_COPY, "PROJECT", project="beta")
+    return index
+
+
+def test_signature_estimates_jaccard():
+    hasher = MinHasher(256)
+    a, b = shingles(GLOBAL_RULE), shingles(NEAR_COPY)
+    sig_a, sig_b = hasher.signature(a), hasher.signature(b)
+    estimate = sum(x == y for x, y in zip(sig_a, sig_b)) / hasher.num_perm
+    assert estimate == pytest.approx(jaccard(a, b), abs=0.15)
+    assert MinHasher(256).signature(a) == sig_a   # 고정 시드 → 재시작 후에도 같은 서명
+
+
+def test_similar_reports_exact_jaccard_above_threshold(index):
+    matches = index.similar(GLOBAL_RULE)
+    assert matches[0] == ("g1", 1.0)
+    assert {rule_id for rule_id, _ in matches} == {"g1", "p1", "q1"}
+    assert all(similarity >= index.threshold for _, similarity in matches)
+
+
+def test_project_filter_keeps_global_and_own_rules(index):
+    matches = index.similar(NEAR_COPY, project="alpha", exclude="p1")
+    assert {rule_id for rule_id, _ in matches} == {"g1"}
+
+
+def test_contamination_pairs_project_rules_with_globals(index):
+    pairs = index.contamination("alpha")
+    assert [(pair["project_rule_id"], pair["global_rule_id"]) for pair in pairs] == [("p1", "g1")]
+    assert index.contamination("gamma") == []
+
+
+def test_remove_drops_rule_from_buckets(index):
+    index.remove("g1")
+    assert "g1" not in index
+    assert index.contamination("alpha") == []
+    assert all(rule_id != "g1" for rule_id, _ in index.similar(GLOBAL_RULE))
+
+
+def test_signatures_persist(tmp_path):
+    path = str(tmp_path / "rules.db")
+    index = RuleSimilarityIndex(path)
+    index.add("g1", GLOBAL_RULE, GLOBAL_SCOPE)
+    index.add("p1", NEAR_COPY, "PROJECT", project="alpha")
+    index.close()
+
+    reloaded = RuleSimilarityIndex(path)
+    try:
+        assert len(reloaded) == 2
+        assert reloaded.rule("p1")["project"] == "alpha"
+        assert [pair["global_rule_id"] for pair in reloaded.contamination("alpha")] == ["g1"]
+    finally:
+        reloaded.close()
+
+
+def test_rejects_uneven_bands():
+    with pytest.raises(ValueError):
+        RuleSimilarityIndex(num_perm=100, bands=32)
@@ -0,0 +1,77 @@
+import threading
+
+from boosaan_sandbox_pool import SandboxPool, POOL_ID_PREFIX
+
+
+class FakeManager:
+    def __init__(self):
+        self.sandboxes = {}
+        self.release_execution = threading.Event()
+        self.executing = threading.Event()
+
+    def create_sandbox(self, config):
+        self.sandboxes[config] = "ACTIVE"
+        return {"status": "SUCCESS", "risk_assessment": {"risk_level": "LOW"}}
+
+    def destroy_sandbox(self, sandbox_id):
+        self.sandboxes.pop(sandbox_id, None)
+        return {"status": "SUCCESS"}
+
+    def get_sandbox_status(self, sandbox_id):
+        return {"status": self.sandboxes.get(sandbox_id, "NOT_FOUND")}
+
+    def list_sandboxes(self):
+        return {"sandboxes": list(self.sandboxes), "total_sandboxes": len(self.sandboxes)}
+
+    def execute_in_sandbox(self, sandbox_id, command, input_data=None):
+        self.executing.set()
+        self.release_execution.wait(5)
+        return {"status": "SUCCESS", "stdout": command}
+
+
+def make_pool(size=1):
+    manager = FakeManager()
+    return manager, SandboxPool(manager, target_size=size)
+
+
+def test_long_command_does_not_block_bookkeeping():
+    manager, pool = make_pool()
+    try:
+        guarded = pool.guarded_manager
+        guarded.create_sandbox("sb1")
+        runner = threading.Thread(target=guarded.execute_in_sandbox, args=("sb1", "sleep"))
+        runner.start()
+        assert manager.executing.wait(5)
+
+        status = {}
+        reader = threading.Thread(target=lambda: status.update(guarded.get_sandbox_status("sb1")))
+        reader.start()
+        reader.join(1)
+        assert not reader.is_alive()
+        assert status["status"] == "ACTIVE"
+
+        manager.release_execution.set()
+        runner.join(5)
+    finally:
+        manager.release_execution.set()
+        pool.close()
+
+
+def test_pooled_sandboxes_are_hidden_and_reserved():
+    manager, pool = make_pool()
+    try:
+        first = pool.acquire("user", "profile", lambda sandbox_id: sandbox_id)
+        assert first["pooled"] is False
+        pool._executor.submit(lambda: None).result(5)
+
+        listing = pool.filter_listing(manager.list_sandboxes())
+        assert listing["sandboxes"] == ["user"]
+        assert pool.is_reserved(POOL_ID_PREFIX + "x")
+
+        second = pool.acquire("other", "profile", lambda sandbox_id: sandbox_id)
+        assert second["pooled"] is True
+        assert pool.resolve("other").startswith(POOL_ID_PREFIX)
+        assert pool.is_reserved("other")
+        assert "other" in pool.filter_listing(manager.list_sandboxes())["sandboxes"]
+    finally:
+        pool.close()
@@ -0,0 +1,29 @@
+import asyncio
+import threading
+
+from boosaan_session_store import SessionStore, PRIORITY_READ
+
+
+def _count(conn):
+    return conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+
+def test_read_after_key_sees_pending_background_writes(tmp_path):
+    store = SessionStore(str(tmp_path / "session.db"))
+    store.call(lambda conn: conn.execute("CREATE TABLE records (value INTEGER)"), write=True)
+    release = threading.Event()
+
+    async def scenario():
+        # 저장소 스레드를 잡아 두고 백그라운드 쓰기를 큐에 쌓음 → 읽기가 먼저 처리될 상황
+        store.submit(lambda conn: release.wait(5), PRIORITY_READ)
+        store.write_background(lambda conn: conn.execute("INSERT INTO records VALUES (1)"), key="terminal")
+        read = asyncio.ensure_future(store.read(_count, after="terminal"))
+        await asyncio.sleep(0.05)
+        release.set()
+        return await read
+
+    try:
+        assert asyncio.run(scenario()) == 1
+        assert store._pending_writes == {}
+    finally:
+        store.close()